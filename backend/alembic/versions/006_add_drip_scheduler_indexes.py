@@ -0,0 +1,32 @@
+"""Add indexes for the drip scheduler.
+
+Revision ID: 006_add_drip_scheduler_indexes
+Revises: 005_add_password_change_otp
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006_add_drip_scheduler_indexes'
+down_revision: Union[str, None] = '005_add_password_change_otp'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX idx_leads_qualified_score
+        ON leads (campaign_id, bant_score DESC NULLS LAST)
+        WHERE status = 'qualified'
+    """)
+    op.execute("""
+        CREATE INDEX idx_emails_campaign_sent
+        ON emails (campaign_id, sent_at)
+        WHERE sent_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_emails_campaign_sent")
+    op.execute("DROP INDEX IF EXISTS idx_leads_qualified_score")
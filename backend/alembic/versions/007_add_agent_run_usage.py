@@ -0,0 +1,38 @@
+"""Add usage columns to agent_runs.
+
+Revision ID: 007_add_agent_run_usage
+Revises: 006_add_drip_scheduler_indexes
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007_add_agent_run_usage'
+down_revision: Union[str, None] = '006_add_drip_scheduler_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # updated_at is declared by the model but was missing from the initial schema
+    op.execute("""
+        ALTER TABLE agent_runs
+        ADD COLUMN api_calls INTEGER,
+        ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    """)
+    op.execute("""
+        CREATE TRIGGER update_agent_runs_updated_at
+        BEFORE UPDATE ON agent_runs
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS update_agent_runs_updated_at ON agent_runs")
+    op.execute("""
+        ALTER TABLE agent_runs
+        DROP COLUMN IF EXISTS updated_at,
+        DROP COLUMN IF EXISTS api_calls
+    """)
@@ -0,0 +1,25 @@
+"""Add intent confidence to leads.
+
+Revision ID: 008_add_lead_intent_confidence
+Revises: 007_add_agent_run_usage
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008_add_lead_intent_confidence'
+down_revision: Union[str, None] = '007_add_agent_run_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE leads
+        ADD COLUMN intent_confidence DOUBLE PRECISION
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE leads DROP COLUMN IF EXISTS intent_confidence")
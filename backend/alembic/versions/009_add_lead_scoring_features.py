@@ -0,0 +1,92 @@
+"""Add scoring features to leads.
+
+Revision ID: 009_add_lead_scoring_features
+Revises: 008_add_lead_intent_confidence
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '009_add_lead_scoring_features'
+down_revision: Union[str, None] = '008_add_lead_intent_confidence'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE leads
+        ADD COLUMN employees_min INTEGER,
+        ADD COLUMN employees_max INTEGER,
+        ADD COLUMN size_bucket VARCHAR(10),
+        ADD COLUMN seniority_tier VARCHAR(20),
+        ADD COLUMN has_linkedin BOOLEAN NOT NULL DEFAULT FALSE
+    """)
+
+    # Backfill with the rules of app.services.lead_features: headcount range
+    # from the numbers in company_size (clamped to INTEGER), buckets aligned
+    # with the BANT budget tiers, seniority from the authority keywords
+    op.execute(r"""
+        UPDATE leads
+        SET employees_min = sizes.employees_min,
+            employees_max = sizes.employees_max
+        FROM (
+            SELECT leads.id,
+                   min(LEAST(numbers.value[1]::numeric, 2147483647))::integer AS employees_min,
+                   max(LEAST(numbers.value[1]::numeric, 2147483647))::integer AS employees_max
+            FROM leads
+            CROSS JOIN LATERAL regexp_matches(leads.company_size, '\d+', 'g') AS numbers (value)
+            GROUP BY leads.id
+        ) AS sizes
+        WHERE leads.id = sizes.id
+    """)
+    op.execute("""
+        UPDATE leads
+        SET size_bucket = CASE
+                WHEN employees_max IS NULL THEN NULL
+                WHEN employees_max < 10 THEN '<10'
+                WHEN employees_max < 30 THEN '10-29'
+                WHEN employees_max < 100 THEN '30-99'
+                WHEN employees_max < 500 THEN '100-499'
+                ELSE '500+'
+            END,
+            seniority_tier = CASE
+                WHEN COALESCE(job_title, '') = '' THEN NULL
+                WHEN strpos(lower(translate(job_title, 'É', 'é')), 'ceo') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'cto') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'cfo') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'coo') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'founder') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'president') > 0 THEN 'c_level'
+                WHEN strpos(lower(translate(job_title, 'É', 'é')), 'vp') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'vice president') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'head of') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'directeur général') > 0 THEN 'vp'
+                WHEN strpos(lower(translate(job_title, 'É', 'é')), 'director') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'directeur') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'directrice') > 0 THEN 'director'
+                WHEN strpos(lower(translate(job_title, 'É', 'é')), 'manager') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'responsable') > 0
+                  OR strpos(lower(translate(job_title, 'É', 'é')), 'chef de') > 0 THEN 'manager'
+                ELSE 'individual'
+            END,
+            has_linkedin = COALESCE(linkedin_url, '') <> ''
+    """)
+
+    op.execute("""
+        CREATE INDEX idx_leads_org_size_bucket
+        ON leads (organization_id, size_bucket)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_leads_org_size_bucket")
+    op.execute("""
+        ALTER TABLE leads
+        DROP COLUMN IF EXISTS has_linkedin,
+        DROP COLUMN IF EXISTS seniority_tier,
+        DROP COLUMN IF EXISTS size_bucket,
+        DROP COLUMN IF EXISTS employees_max,
+        DROP COLUMN IF EXISTS employees_min
+    """)
@@ -0,0 +1,23 @@
+"""Add scoring rules to campaigns.
+
+Revision ID: 010_add_campaign_scoring_rules
+Revises: 009_add_lead_scoring_features
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '010_add_campaign_scoring_rules'
+down_revision: Union[str, None] = '009_add_lead_scoring_features'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL keeps the default rules of app.services.scoring_plan
+    op.execute("ALTER TABLE campaigns ADD COLUMN scoring_rules JSONB")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE campaigns DROP COLUMN IF EXISTS scoring_rules")
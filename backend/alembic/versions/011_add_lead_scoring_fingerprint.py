@@ -0,0 +1,31 @@
+"""Add scoring fingerprint and plan version to leads.
+
+Revision ID: 011_add_lead_scoring_fingerprint
+Revises: 010_add_campaign_scoring_rules
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '011_add_lead_scoring_fingerprint'
+down_revision: Union[str, None] = '010_add_campaign_scoring_rules'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL: existing scores are recomputed once by the next rescore
+    op.execute("""
+        ALTER TABLE leads
+        ADD COLUMN scoring_fingerprint VARCHAR(32),
+        ADD COLUMN scoring_plan_version VARCHAR(16)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE leads
+        DROP COLUMN IF EXISTS scoring_plan_version,
+        DROP COLUMN IF EXISTS scoring_fingerprint
+    """)
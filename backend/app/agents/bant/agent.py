@@ -1,17 +1,40 @@
 """BANT qualifier agent."""
 
+import asyncio
 from typing import Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.agents.base import BaseVectraAgent
-from app.agents.bant.prompts import BANT_MAIN_PROMPT
+from app.agents.bant.prompts import (
+    BANT_MAIN_PROMPT,
+    BANT_BATCH_PROMPT,
+    BANT_BATCH_LEAD_FIELDS,
+    BANT_BATCH_LEAD_TOKENS,
+)
+from app.agents.prompting import PromptBuilder
+from app.agents.telemetry import summarize_input
 from app.services.scoring import BANTScoringService
+from app.services.scoring_plan import ScoringPlan, compile_scoring_plan
+from app.db.repositories.lead import LeadRepository
+from app.db.models.campaign import Campaign
 from app.db.models.lead import Lead, LeadStatus
+from app.db.models.agent_run import AgentType
+from app.orchestrator.state_machine import LeadStateMachine
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+BANT_CRITERIA = ("budget", "authority", "need", "timeline")
+
+_BATCH_PROMPT = PromptBuilder(
+    BANT_BATCH_PROMPT,
+    "bant_batch",
+    item_fields=BANT_BATCH_LEAD_FIELDS,
+    item_token_budget=BANT_BATCH_LEAD_TOKENS,
+    items_field="leads",
+)
+
 
 class BANTAgent(BaseVectraAgent):
     """
@@ -24,6 +47,8 @@ class BANTAgent(BaseVectraAgent):
     - Update lead status in database
     """
 
+    agent_type = AgentType.BANT_QUALIFIER
+
     def __init__(
         self,
         config: Optional[Dict[str, Any]] = None,
@@ -39,6 +64,38 @@ class BANTAgent(BaseVectraAgent):
         super().__init__(config)
         self.db = db
         self.scoring_service = BANTScoringService()
+        # Compiled scoring plans registered per campaign ID at launch
+        self.scoring_plans: Dict[str, ScoringPlan] = {}
+
+    def use_scoring_plan(self, campaign_id: Any, plan: ScoringPlan) -> None:
+        """
+        Score the leads of a campaign with a compiled plan.
+        
+        Args:
+            campaign_id: Campaign ID
+            plan: Plan compiled from the campaign's rules (ScoringPlan.for_campaign)
+        """
+        self.scoring_plans[str(campaign_id)] = plan
+
+    def scoring_plan(self, campaign: Dict[str, Any]) -> ScoringPlan:
+        """
+        Return the plan scoring a campaign's leads.
+        
+        Args:
+            campaign: Campaign info (id, bant_threshold, scoring_rules)
+            
+        Returns:
+            The plan registered for the campaign, or the plan compiled from
+            the campaign info when none was registered
+        """
+        plan = self.scoring_plans.get(str(campaign.get("id")))
+        if plan is None:
+            plan = compile_scoring_plan(campaign.get("scoring_rules"), campaign.get("bant_threshold"))
+        return plan
+
+    def _summarize_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the lead as the fields the BANT prompt reads, not its raw enrichment."""
+        return summarize_input(input_data, {"lead_data": _BATCH_PROMPT.item})
 
     def _get_role(self) -> str:
         """Return the agent's role."""
@@ -54,7 +111,7 @@ class BANTAgent(BaseVectraAgent):
         Tu maîtrises parfaitement le framework BANT et tu sais analyser des profils pour évaluer
         leur budget, leur autorité décisionnelle, leur besoin et leur timeline d'achat."""
 
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute BANT qualification.
         
@@ -62,7 +119,8 @@ class BANTAgent(BaseVectraAgent):
             input_data: Input data with lead information:
                 - lead_id: UUID (optional)
                 - lead_data: Dict with lead fields (email, job_title, company_size, etc.)
-                - campaign: Dict with campaign info (product_description, bant_threshold, etc.)
+                - campaign: Dict with campaign info (id, product_description,
+                  bant_threshold, scoring_rules, etc.)
                 
         Returns:
             Result dictionary with BANT score and qualification status
@@ -82,8 +140,8 @@ class BANTAgent(BaseVectraAgent):
             industry = lead_data.get("company_industry") or lead_data.get("company_name")
             linkedin_url = lead_data.get("linkedin_url")
             
-            # Calculate BANT score using scoring service
-            bant_result = self.scoring_service.calculate_bant_score(
+            # Calculate BANT score with the campaign's compiled plan
+            bant_result = self.scoring_plan(campaign).score(
                 company_size=company_size,
                 job_title=job_title,
                 enrichment_data=enrichment_data,
@@ -101,6 +159,9 @@ class BANTAgent(BaseVectraAgent):
                 if lead:
                     lead.bant_score = bant_score
                     lead.bant_breakdown = bant_breakdown
+                    # Scored from lead_data, not the stored row: the next rescore recomputes it
+                    lead.scoring_fingerprint = None
+                    lead.scoring_plan_version = None
                     lead.status = LeadStatus.QUALIFIED if qualified else LeadStatus.REJECTED
                     self.db.commit()
                     self.logger.info(f"Updated lead {lead_id} with BANT score {bant_score}")
@@ -131,3 +192,172 @@ class BANTAgent(BaseVectraAgent):
                     "qualified": False,
                 },
             }
+
+    def rescore_campaign(self, campaign_id: UUID, full: bool = False) -> Dict[str, Any]:
+        """
+        Re-score the leads of a campaign with the campaign's scoring plan.
+        
+        Only leads whose score is stale are loaded and scored: leads never
+        scored by the plan's version, and leads whose scoring inputs changed
+        since (their fingerprint differs). Unchanged leads cost nothing
+        beyond the filter of the SELECT.
+        
+        Scores the stale leads in one columnar pass and writes the scores
+        back with bulk UPDATEs and a single commit, instead of one execute()
+        and one commit per lead. Lead statuses are left to the pipeline.
+        
+        Args:
+            campaign_id: Campaign ID
+            full: Re-score every lead, stale or not
+            
+        Returns:
+            Result dictionary with the number of leads scored and how many
+            of them reach the campaign's qualification threshold
+        """
+        if not self.db:
+            raise ValueError("A database session is required to re-score a campaign")
+        
+        plan = self._campaign_plan(campaign_id)
+        repository = LeadRepository(self.db)
+        columns = repository.scoring_columns(campaign_id, stale_for=None if full else plan.version)
+        results = plan.score_columns(
+            columns["company_sizes"],
+            columns["job_titles"],
+            columns["industries"],
+            columns["signals"],
+            max_employees=columns["max_employees"],
+            seniority_tiers=columns["seniority_tiers"],
+        )
+        
+        repository.update_scores(
+            [
+                {"id": lead_id, "bant_score": result["bant_score"], "bant_breakdown": result["bant_breakdown"]}
+                for lead_id, result in zip(columns["ids"], results)
+            ],
+            plan_version=plan.version,
+        )
+        self.db.commit()
+        
+        qualified = sum(1 for result in results if result["qualified"])
+        self.logger.info(f"Re-scored {len(results)} leads of campaign {campaign_id} ({qualified} qualified)")
+        
+        return {
+            "success": True,
+            "data": {"scored": len(results), "qualified": qualified},
+        }
+
+    def requalify_campaign(self, campaign_id: UUID) -> Dict[str, Any]:
+        """
+        Apply a campaign's current rules and threshold to its scored leads.
+        
+        Run after the campaign's threshold or scoring rules change. Stale
+        scores are recomputed first (none when only the threshold changed,
+        as the plan version does not depend on it), then QUALIFIED leads
+        now below the threshold are moved to REJECTED with one SQL pass.
+        REJECTED is terminal, so lowering the threshold only affects leads
+        qualified from then on.
+        
+        Args:
+            campaign_id: Campaign ID
+            
+        Returns:
+            Result dictionary with the number of leads re-scored and rejected
+        """
+        if not self.db:
+            raise ValueError("A database session is required to re-qualify a campaign")
+        
+        # Compiled from the campaign as it is now, not a plan registered earlier
+        campaign = self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        if not campaign:
+            raise ValueError(f"Campaign {campaign_id} not found")
+        plan = ScoringPlan.for_campaign(campaign)
+        self.use_scoring_plan(campaign_id, plan)
+        
+        rescored = self.rescore_campaign(campaign_id)["data"]["scored"]
+        below = LeadRepository(self.db).qualified_below(campaign_id, plan.threshold)
+        rejected = LeadStateMachine.transition_many(
+            below, LeadStatus.REJECTED, self.db, reason="Below the BANT threshold", commit=False
+        )["moved"]
+        self.db.commit()
+        
+        self.logger.info(
+            f"Re-qualified campaign {campaign_id} at threshold {plan.threshold}: "
+            f"{rescored} leads re-scored, {len(rejected)} rejected"
+        )
+        
+        return {
+            "success": True,
+            "data": {"scored": rescored, "rejected": len(rejected)},
+        }
+
+    def _campaign_plan(self, campaign_id: UUID) -> ScoringPlan:
+        """Return the plan registered for a campaign, or compile it from the campaign."""
+        plan = self.scoring_plans.get(str(campaign_id))
+        if plan is None:
+            campaign = self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
+            if not campaign:
+                raise ValueError(f"Campaign {campaign_id} not found")
+            plan = ScoringPlan.for_campaign(campaign)
+        return plan
+
+    async def analyze_leads(
+        self,
+        leads: Dict[str, Dict[str, Any]],
+        campaign: Dict[str, Any],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Score leads with the LLM, several leads per request.
+        
+        Args:
+            leads: Lead data (as in the lead_data input) keyed by lead ID
+            campaign: Campaign info (product_description, bant_threshold)
+            
+        Returns:
+            BANT result per lead ID (bant_score, bant_breakdown, qualified,
+            recommendation, summary); leads the LLM could not score are absent
+        """
+        threshold = campaign.get("bant_threshold") or 60
+        
+        def build_prompt(block: str) -> str:
+            return _BATCH_PROMPT.build(
+                block,
+                product_description=campaign.get("product_description", ""),
+                bant_threshold=threshold,
+            )
+        
+        payloads = {str(lead_id): _BATCH_PROMPT.item(lead_data) for lead_id, lead_data in leads.items()}
+        return await asyncio.to_thread(
+            self._analyze_in_batches,
+            payloads,
+            build_prompt,
+            "JSON with a results list holding one BANT evaluation per lead id",
+            lambda analysis: self._normalize_analysis(analysis, threshold),
+        )
+
+    @staticmethod
+    def _normalize_analysis(analysis: Dict[str, Any], threshold: int) -> Optional[Dict[str, Any]]:
+        """Convert an LLM BANT evaluation to the scoring service's result format."""
+        breakdown = {}
+        for criterion in BANT_CRITERIA:
+            entry = analysis.get(criterion)
+            if not isinstance(entry, dict):
+                return None
+            try:
+                score = int(entry.get("score"))
+            except (TypeError, ValueError):
+                return None
+            breakdown[criterion] = {
+                "score": max(0, min(25, score)),
+                "reasoning": str(entry.get("reasoning", "")),
+            }
+        
+        # Recompute the total and the decision rather than trusting the model
+        total_score = sum(entry["score"] for entry in breakdown.values())
+        qualified = total_score >= threshold
+        return {
+            "bant_score": total_score,
+            "bant_breakdown": breakdown,
+            "qualified": qualified,
+            "recommendation": "contact" if qualified else ("nurture" if total_score >= 40 else "reject"),
+            "summary": str(analysis.get("summary", "")),
+        }
@@ -88,3 +88,73 @@ TIMELINE (0-25 points):
 - Sois objectif et factuel
 - En cas de doute, penche vers une évaluation conservatrice
 """
+
+BANT_BATCH_PROMPT = """
+[ROLE]
+Tu es un expert en qualification commerciale B2B utilisant le framework BANT (Budget, Authority, Need, Timeline).
+
+[CONTEXTE]
+Tu dois évaluer, pour chaque prospect ci-dessous, s'il est qualifié pour une démonstration produit.
+
+[NOTRE PRODUIT]
+{product_description}
+
+[PROSPECTS]
+Un profil JSON par ligne, chacun avec son "id":
+{leads}
+
+[CRITÈRES D'ÉVALUATION]
+BUDGET (0-25): de la startup early-stage (0-5) à la grande entreprise avec budget dédié (21-25)
+AUTHORITY (0-25): du contributeur individuel (0-5) au C-Level / Founder (21-25)
+NEED (0-25): de l'absence d'indicateur (0-5) au besoin explicite exprimé (21-25)
+TIMELINE (0-25): de l'absence d'urgence (0-5) à l'urgence explicite / deadline connue (21-25)
+
+[INSTRUCTIONS]
+1. Évalue chaque prospect indépendamment des autres
+2. Attribue un score à chaque critère avec une justification courte
+3. Calcule le score total et donne une recommandation
+4. Reprends exactement l'"id" de chaque prospect et n'en omets aucun
+
+[FORMAT DE SORTIE]
+Uniquement ce JSON, sans texte autour:
+{{
+  "results": [
+    {{
+      "id": "...",
+      "budget": {{"score": 0-25, "reasoning": "..."}},
+      "authority": {{"score": 0-25, "reasoning": "..."}},
+      "need": {{"score": 0-25, "reasoning": "..."}},
+      "timeline": {{"score": 0-25, "reasoning": "..."}},
+      "total_score": 0-100,
+      "qualified": true/false,
+      "recommendation": "contact" | "nurture" | "reject",
+      "summary": "Résumé en 1-2 phrases"
+    }}
+  ]
+}}
+
+[CONTRAINTES]
+- Seuil de qualification: {bant_threshold}
+- Sois objectif et factuel
+- En cas de doute, penche vers une évaluation conservatrice
+"""
+
+# Lead fields sent with BANT_BATCH_PROMPT (the raw RocketReach dump is left out)
+BANT_BATCH_LEAD_FIELDS = (
+    "job_title",
+    "seniority_level",
+    "enrichment_data.seniority_level",
+    "company_name",
+    "company_size",
+    "enrichment_data.company_size",
+    "company_industry",
+    "enrichment_data.company_industry",
+    "location",
+    "enrichment_data.location",
+    "linkedin_url",
+    "enrichment_data.notes",
+    "enrichment_data.raw_data.updated_at",
+)
+
+# Token budget of one lead in BANT_BATCH_PROMPT
+BANT_BATCH_LEAD_TOKENS = 200
@@ -1,14 +1,26 @@
 """Base agent class for Vectra agents."""
 
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, List
+from uuid import UUID
 from crewai import Agent, Task, Crew
+from crewai.crews.crew_output import CrewOutput
 from crewai.memory import ShortTermMemory
+from crewai.types.usage_metrics import UsageMetrics
 
-from app.agents.crew import get_llm, get_memory, get_default_agent_config
+from app.agents.batching import estimate_tokens, parse_batch_results, plan_batches
+from app.agents.llm_cache import get_llm_cache
+from app.agents.registry import get_agent_registry
+from app.agents.telemetry import AgentRunRecorder, summarize_input
 from app.agents.tools import get_shared_tools
+from app.db.models.agent_run import AgentType
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.usage import record_tokens, track_usage
 
 logger = get_logger(__name__)
 
@@ -16,27 +28,36 @@ logger = get_logger(__name__)
 class BaseVectraAgent(ABC):
     """Base class for all Vectra agents using CrewAI."""
 
+    # Agent type recorded in AgentRun rows (None disables recording)
+    agent_type: Optional[AgentType] = None
+    
+    # Set to False for agents whose crew results must never be reused
+    # (a single instance can also opt out with config {"llm_cache": False})
+    llm_cache_enabled: bool = True
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize the agent with CrewAI configuration."""
         self.config = config or {}
         self.logger = get_logger(self.__class__.__name__)
         
-        # Get default config and merge with provided config
-        default_config = get_default_agent_config()
-        agent_config = {**default_config, **self.config}
-        
-        # Initialize CrewAI Agent
-        self.crewai_agent = self._create_crewai_agent(agent_config)
+        # Buffers AgentRun rows, attached by the orchestrator
+        self.run_recorder: Optional[AgentRunRecorder] = None
         
-        # Tools available to this agent
-        self.tools = self._get_tools()
+        # CrewAI Agent and tools, built once per process for this class and
+        # config (defaults merged in by the registry); each crew runs a copy
+        self.crewai_agent, self.tools = get_agent_registry().get(self, self.config)
 
-    def _create_crewai_agent(self, config: Dict[str, Any]) -> Agent:
+    def _create_crewai_agent(
+        self,
+        config: Dict[str, Any],
+        tools: Optional[List[Any]] = None,
+    ) -> Agent:
         """
         Create a CrewAI Agent instance.
         
         Args:
-            config: Agent configuration
+            config: Agent configuration, already merged with the defaults
+            tools: Tools for the agent (defaults to _get_tools())
             
         Returns:
             CrewAI Agent instance
@@ -52,17 +73,18 @@ class BaseVectraAgent(ABC):
         }
         
         # Add tools if available
-        tools = self._get_tools()
+        if tools is None:
+            tools = self._get_tools()
         if tools:
             agent_kwargs["tools"] = tools
         
         # Add LLM if configured
-        llm = config.get("llm") or get_llm()
+        llm = config.get("llm")
         if llm:
             agent_kwargs["llm"] = llm
         
         # Add memory if configured
-        memory = config.get("memory") or get_memory()
+        memory = config.get("memory")
         if memory:
             agent_kwargs["memory"] = memory
         
@@ -131,10 +153,43 @@ class BaseVectraAgent(ABC):
             return {"success": True, "data": result}
         return {"success": True, "data": str(result)}
 
-    @abstractmethod
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Execute the agent task.
+        Execute the agent task and record its telemetry.
+        
+        Times the run and counts the LLM tokens and external API calls made
+        by _execute. When a run recorder is attached and the input names a
+        campaign, the run is buffered as an AgentRun row.
+        
+        Args:
+            input_data: Input data for the agent
+            
+        Returns:
+            Result dictionary with 'success' and 'data' keys
+        """
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        
+        with track_usage() as usage:
+            try:
+                result = await self._execute(input_data)
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                if result is not None and not result.get("success", False):
+                    error = result.get("error")
+                self._record_run(input_data, result, error, started_at, duration_ms, usage)
+        
+        return result
+
+    @abstractmethod
+    async def _execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the agent task.
         
         Args:
             input_data: Input data for the agent
@@ -144,6 +199,57 @@ class BaseVectraAgent(ABC):
         """
         pass
 
+    def _record_run(
+        self,
+        input_data: Dict[str, Any],
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+        started_at: datetime,
+        duration_ms: int,
+        usage: Dict[str, Any],
+    ) -> None:
+        """Log the run's timing and usage and buffer it in the run recorder."""
+        success = result is not None and result.get("success", False)
+        api_calls = sum(usage["api_calls"].values())
+        
+        self.logger.info(
+            f"{self.__class__.__name__} run took {duration_ms}ms",
+            extra={
+                "agent": self.__class__.__name__,
+                "duration_ms": duration_ms,
+                "success": success,
+                "tokens_used": usage["tokens"],
+                "api_calls": usage["api_calls"],
+            },
+        )
+        
+        campaign_id = input_data.get("campaign_id") or (input_data.get("campaign") or {}).get("id")
+        if self.run_recorder is None or self.agent_type is None or not campaign_id:
+            return
+        
+        self.run_recorder.record(
+            agent_type=self.agent_type,
+            campaign_id=UUID(str(campaign_id)),
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+            duration_ms=duration_ms,
+            success=success,
+            input_data=self._summarize_input(input_data),
+            output_data=result.get("data") if result else None,
+            error_message=error,
+            tokens_used=usage["tokens"],
+            api_calls=api_calls,
+        )
+
+    def _summarize_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the part of an input recorded with the agent run.
+        
+        Agents whose inputs carry full lead or prospect payloads override
+        this to keep only the fields their prompt reads.
+        """
+        return summarize_input(input_data)
+
     def _create_task(self, description: str, expected_output: str = "") -> Task:
         """
         Create a CrewAI Task for this agent.
@@ -170,22 +276,184 @@ class BaseVectraAgent(ABC):
         """
         Execute a Crew with tasks.
         
+        Identical requests (same model, role and task prompts) are answered
+        from the LLM response cache unless the agent opts out.
+        
+        ``crew.kickoff()`` blocks until the LLM answers, so coroutines must
+        run this (or ``_analyze_in_batches``) with ``asyncio.to_thread``.
+        A CrewAI agent keeps per-execution state (its executor and crew), so
+        each crew runs its own copy of the registry's agent and concurrent
+        crews of the same agent class do not wait for each other.
+        
         Args:
             tasks: List of tasks to execute
             
         Returns:
             Crew execution result
+            
+        Raises:
+            RuntimeError: If called from a running event loop
         """
         from crewai import Process
         
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("_execute_crew blocks its thread; run it with asyncio.to_thread")
+        
+        cache = get_llm_cache() if self._llm_cache_enabled() else None
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(
+                model=str(getattr(self.crewai_agent.llm, "model", "") or ""),
+                role=self._get_role(),
+                prompts=[(task.description, task.expected_output) for task in tasks],
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"LLM cache hit for {self.__class__.__name__}")
+                return CrewOutput(raw=cached, tasks_output=[], token_usage=UsageMetrics())
+        
+        self.logger.info(f"Executing crew with {len(tasks)} task(s)")
+        agent = self.crewai_agent.copy()
+        for task in tasks:
+            task.agent = agent
         crew = Crew(
-            agents=[self.crewai_agent],
+            agents=[agent],
             tasks=tasks,
             process=Process.sequential,
             verbose=True,
         )
-        
-        self.logger.info(f"Executing crew with {len(tasks)} task(s)")
         result = crew.kickoff()
         
+        token_usage = getattr(result, "token_usage", None)
+        record_tokens(getattr(token_usage, "total_tokens", 0) or 0)
+        
+        raw = getattr(result, "raw", None)
+        if cache is not None and isinstance(raw, str) and raw:
+            cache.set(cache_key, raw)
+        
         return result
+
+    def _analyze_in_batches(
+        self,
+        items: Dict[str, Dict[str, Any]],
+        build_prompt: Callable[[str], str],
+        expected_output: str = "",
+        parse_item: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze many items with as few LLM requests as possible.
+        
+        Items are serialized one JSON object per line (with their "id") and
+        packed into batches sized to the model's context window. Items whose
+        result is missing or invalid in a batch answer are retried alone;
+        items that still fail are left out of the result.
+        
+        Args:
+            items: Item payloads keyed by ID
+            build_prompt: Returns the full prompt for a block of serialized items
+            expected_output: Expected output format
+            parse_item: Converts one item's result, returning None if invalid
+            
+        Returns:
+            Parsed result per item ID
+        """
+        ids = list(items)
+        serialized = [
+            json.dumps({**items[item_id], "id": item_id}, ensure_ascii=False, default=str)
+            for item_id in ids
+        ]
+        batches = plan_batches(
+            serialized,
+            prompt_tokens=estimate_tokens(build_prompt("")),
+            context_window=self._context_window(),
+            output_tokens_per_item=settings.LLM_BATCH_OUTPUT_TOKENS_PER_ITEM,
+            max_items=settings.LLM_BATCH_MAX_ITEMS,
+        )
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        llm_calls = 0
+        fallbacks = 0
+        prompt_tokens = 0
+        for batch in batches:
+            batch_ids = [ids[index] for index in batch]
+            block = "\n".join(serialized[index] for index in batch)
+            prompt = build_prompt(block)
+            prompt_tokens += estimate_tokens(prompt)
+            results.update(self._run_batch(prompt, batch_ids, expected_output, parse_item))
+            llm_calls += 1
+            
+            # Retry the items the batch answer did not cover, one per request
+            if len(batch) > 1:
+                for index in batch:
+                    if ids[index] in results:
+                        continue
+                    fallbacks += 1
+                    llm_calls += 1
+                    prompt = build_prompt(serialized[index])
+                    prompt_tokens += estimate_tokens(prompt)
+                    results.update(self._run_batch(prompt, [ids[index]], expected_output, parse_item))
+        
+        self.logger.info(
+            f"Analyzed {len(results)}/{len(ids)} items in {llm_calls} LLM request(s)",
+            extra={
+                "agent": self.__class__.__name__,
+                "items": len(ids),
+                "batches": len(batches),
+                "llm_calls": llm_calls,
+                "fallbacks": fallbacks,
+                "prompt_tokens": prompt_tokens,
+            },
+        )
+        return results
+
+    def _run_batch(
+        self,
+        prompt: str,
+        ids: List[str],
+        expected_output: str,
+        parse_item: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run one batch prompt and return its valid per-item results (empty on error)."""
+        self.logger.debug(
+            f"Sending batch of {len(ids)} item(s)",
+            extra={
+                "agent": self.__class__.__name__,
+                "items": len(ids),
+                "prompt_tokens": estimate_tokens(prompt),
+            },
+        )
+        try:
+            result = self._execute_crew([self._create_task(prompt, expected_output)])
+        except Exception as e:
+            self.logger.warning(f"Batch of {len(ids)} item(s) failed: {e}")
+            return {}
+        
+        parsed = parse_batch_results(str(getattr(result, "raw", result) or ""), ids)
+        if parse_item is None:
+            return parsed
+        
+        results = {}
+        for item_id, entry in parsed.items():
+            item = parse_item(entry)
+            if item is not None:
+                results[item_id] = item
+        return results
+
+    def _context_window(self) -> int:
+        """Return the context window of the agent's LLM in tokens."""
+        llm = getattr(self.crewai_agent, "llm", None)
+        try:
+            size = llm.get_context_window_size()
+        except Exception:
+            size = None
+        return size if isinstance(size, int) and size > 0 else settings.LLM_CONTEXT_WINDOW
+
+    def _llm_cache_enabled(self) -> bool:
+        """Return True if crew results of this agent may be cached."""
+        if not settings.LLM_CACHE_ENABLED or not self.llm_cache_enabled:
+            return False
+        return self.config.get("llm_cache", True)
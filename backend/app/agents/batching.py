@@ -0,0 +1,132 @@
+"""Packing several leads into one LLM request and parsing the answers."""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Rough size of a token for French/English prose and JSON
+CHARS_PER_TOKEN = 4
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_DECODER = json.JSONDecoder()
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an estimate of the number of tokens in text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def plan_batches(
+    items: List[str],
+    prompt_tokens: int,
+    context_window: int,
+    output_tokens_per_item: int,
+    max_items: int,
+) -> List[List[int]]:
+    """
+    Split serialized items into batches that fit the model's context window.
+
+    Each item costs its own tokens plus the tokens of its answer; a batch is
+    closed when the next item would overflow what the window leaves after
+    the prompt, or when it holds ``max_items``. An item too large for any
+    batch still gets a batch of its own.
+
+    Args:
+        items: Serialized items, in order
+        prompt_tokens: Tokens of the prompt without the items
+        context_window: Model context window in tokens
+        output_tokens_per_item: Tokens reserved for each item's answer
+        max_items: Maximum items per batch
+
+    Returns:
+        Batches as lists of item indexes
+    """
+    budget = context_window - prompt_tokens
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+
+    for index, text in enumerate(items):
+        cost = estimate_tokens(text) + output_tokens_per_item
+        if current and (used + cost > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def extract_json(raw: str) -> Optional[Any]:
+    """
+    Return the first JSON value found in an LLM answer.
+
+    Accepts bare JSON, JSON inside a Markdown code fence, or JSON surrounded
+    by prose.
+
+    Returns:
+        Parsed value, or None if the answer holds no valid JSON
+    """
+    if not raw:
+        return None
+
+    candidates = [raw.strip()] + [match.strip() for match in _FENCE.findall(raw)]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            pass
+
+    # Scan for the first position where a JSON object or array decodes
+    for start, char in enumerate(raw):
+        if char in "[{":
+            try:
+                value, _ = _DECODER.raw_decode(raw, start)
+                return value
+            except ValueError:
+                continue
+    return None
+
+
+def parse_batch_results(raw: str, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse per-item results from a batched LLM answer.
+
+    The answer may be a list of objects with an "id", an object holding such
+    a list under "results", or an object keyed by ID. Entries with an
+    unknown ID or that are not objects are ignored, so the caller can retry
+    exactly the items that are missing.
+
+    Args:
+        raw: Raw LLM answer
+        ids: IDs of the items sent in the batch
+
+    Returns:
+        Mapping of item ID to its result
+    """
+    expected = {str(item_id) for item_id in ids}
+    data = extract_json(raw)
+
+    if isinstance(data, dict):
+        if isinstance(data.get("results"), list):
+            data = data["results"]
+        elif expected & set(data):
+            data = [
+                {**value, "id": key}
+                for key, value in data.items()
+                if isinstance(value, dict)
+            ]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    if not isinstance(data, list):
+        return results
+
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        item_id = str(entry.get("id", ""))
+        if item_id in expected and item_id not in results:
+            results[item_id] = entry
+    return results
@@ -2,14 +2,78 @@
 
 from typing import Optional, Any
 from crewai import Agent, Crew, Process, Task, LLM
+from crewai.llms.base_llm import BaseLLM
 from crewai.memory import ShortTermMemory
 
+from app.agents.llm_gateway import get_llm_gateway
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.usage import record_tokens
 
 logger = get_logger(__name__)
 
 
+class GatewayLLM(BaseLLM):
+    """CrewAI LLM sending every completion through the LLM gateway."""
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        context_window: int,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        """
+        Initialize gateway LLM.
+        
+        Args:
+            provider: Gateway provider name
+            model: Model name
+            context_window: Model context window in tokens
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+        """
+        super().__init__(model=model, temperature=temperature, provider=provider)
+        self.context_window = context_window
+        self.max_tokens = max_tokens or settings.LLM_MAX_OUTPUT_TOKENS
+
+    def call(self, messages: Any, *args: Any, **kwargs: Any) -> str:
+        """
+        Send one completion request through the gateway (blocking).
+        
+        CrewAI calls this from ``crew.kickoff()``, which agents run in a
+        worker thread; coroutines use ``acall``.
+        """
+        response = get_llm_gateway().complete_sync(**self._request(messages))
+        return self._result(response)
+
+    async def acall(self, messages: Any, *args: Any, **kwargs: Any) -> str:
+        """Send one completion request through the gateway."""
+        response = await get_llm_gateway().complete(**self._request(messages))
+        return self._result(response)
+
+    def get_context_window_size(self) -> int:
+        """Return the model context window in tokens."""
+        return self.context_window
+
+    def _request(self, messages: Any) -> dict:
+        """Build gateway request arguments."""
+        return {
+            "messages": self._format_messages(messages),
+            "provider": self.provider,
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stop": self.stop or None,
+        }
+
+    def _result(self, response: dict) -> str:
+        """Record the tokens of a gateway response and return its text."""
+        record_tokens(response["prompt_tokens"] + response["completion_tokens"])
+        return self._apply_stop_words(response["text"])
+
+
 def get_llm() -> Optional[Any]:
     """
     Get configured LLM for CrewAI agents.
@@ -19,13 +83,21 @@ def get_llm() -> Optional[Any]:
     2. Claude API (fallback) if CLAUDE_API_KEY configured
     3. None (will use default)
     
-    Note: CrewAI automatically detects LLM providers via environment variables:
+    With LLM_GATEWAY_ENABLED, the LLM sends every request through the
+    process-wide LLM gateway, which enforces per-provider concurrency and
+    rate limits. Otherwise CrewAI detects providers via environment variables:
     - OLLAMA_BASE_URL and OLLAMA_MODEL for Ollama
     - ANTHROPIC_API_KEY for Claude
     
     Returns:
         LLM instance or None (will use CrewAI default)
     """
+    if settings.LLM_GATEWAY_ENABLED:
+        provider = get_llm_gateway().default_provider()
+        if provider is not None:
+            logger.info(f"LLM configured: {provider.name} {provider.model} via LLM gateway")
+            return GatewayLLM(provider.name, provider.model, provider.context_window)
+    
     # Ollama Cloud API (priority if API key is set)
     if settings.LLM_PROVIDER == "ollama" and settings.OLLAMA_API_KEY:
         try:
@@ -1 +1,5 @@
 """Intent classifier agent package."""
+
+from app.agents.intent.agent import IntentClassifierAgent
+
+__all__ = ["IntentClassifierAgent"]
@@ -0,0 +1,177 @@
+"""Intent classifier agent for inbound replies."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.agents.base import BaseVectraAgent
+from app.agents.intent.prompts import INTENT_BATCH_PROMPT, INTENT_BATCH_REPLY_TOKENS
+from app.agents.intent.rules import classify_by_rules, normalize_reply
+from app.agents.prompting import PromptBuilder
+from app.db.models.agent_run import AgentType
+from app.db.models.lead import Lead, LeadIntent
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+INTENT_VALUES = {intent.value for intent in LeadIntent}
+
+_BATCH_PROMPT = PromptBuilder(
+    INTENT_BATCH_PROMPT,
+    "intent_batch",
+    item_fields=("reply",),
+    item_token_budget=INTENT_BATCH_REPLY_TOKENS,
+    items_field="replies",
+)
+
+
+class IntentClassifierAgent(BaseVectraAgent):
+    """
+    Agent Intent: Classifies the intent of inbound replies.
+
+    Responsibilities:
+    - Classify easy replies (out of office, wrong person, unsubscribe) with
+      deterministic rules, at no LLM cost
+    - Classify the remaining, ambiguous replies with the LLM, in batches
+    - Store intent and confidence on the lead
+    """
+
+    agent_type = AgentType.INTENT_CLASSIFIER
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        db: Optional[Session] = None,
+    ):
+        """
+        Initialize Intent classifier agent.
+
+        Args:
+            config: Agent configuration
+            db: Database session (optional, required for updating leads)
+        """
+        super().__init__(config)
+        self.db = db
+
+    def _get_role(self) -> str:
+        """Return the agent's role."""
+        return "Reply Intent Analyst"
+
+    def _get_goal(self) -> str:
+        """Return the agent's goal."""
+        return "Identifier l'intention des prospects qui répondent aux emails de prospection pour adapter le suivi commercial."
+
+    def _get_backstory(self) -> str:
+        """Return the agent's backstory."""
+        return """Tu es un expert en analyse des réponses commerciales B2B.
+        Tu sais distinguer un intérêt réel d'un refus poli, repérer les objections de prix
+        ou de timing et reconnaître les réponses automatiques."""
+
+    async def _execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute intent classification.
+
+        Args:
+            input_data: Input data with replies to classify:
+                - replies: List of {"lead_id": str, "text": str}
+                - campaign_id: UUID (optional, for telemetry)
+
+        Returns:
+            Result dictionary with one classification per reply
+        """
+        try:
+            replies = input_data.get("replies") or []
+            if not replies:
+                raise ValueError("replies are required")
+
+            results: List[Dict[str, Any]] = []
+            ambiguous: Dict[str, Dict[str, Any]] = {}
+
+            # Step 1: Deterministic rules for the easy majority
+            for index, reply in enumerate(replies):
+                text = reply.get("text") or ""
+                result = {
+                    "lead_id": reply.get("lead_id"),
+                    "intent": None,
+                    "confidence": None,
+                    "source": None,
+                }
+                match = classify_by_rules(text)
+                if match:
+                    intent, confidence, rule = match
+                    result.update(intent=intent.value, confidence=confidence, source=f"rule:{rule}")
+                elif normalize_reply(text):
+                    ambiguous[str(index)] = _BATCH_PROMPT.item({"reply": normalize_reply(text)})
+                results.append(result)
+
+            # Step 2: Batched LLM classification of the ambiguous replies
+            if ambiguous:
+                classified = await asyncio.to_thread(
+                    self._analyze_in_batches,
+                    ambiguous,
+                    _BATCH_PROMPT.build,
+                    "JSON with a results list holding one intent per reply id",
+                    self._parse_classification,
+                )
+                for index, classification in classified.items():
+                    results[int(index)].update(source="llm", **classification)
+
+            if self.db:
+                self._store(results)
+
+            by_rules = sum(1 for r in results if (r["source"] or "").startswith("rule:"))
+            by_llm = sum(1 for r in results if r["source"] == "llm")
+
+            self.logger.info(
+                f"Intent classification completed: {by_rules} by rules, {by_llm} by LLM, "
+                f"{len(results) - by_rules - by_llm} unclassified"
+            )
+
+            return {
+                "success": True,
+                "data": {
+                    "results": results,
+                    "classified_by_rules": by_rules,
+                    "classified_by_llm": by_llm,
+                    "unclassified": len(results) - by_rules - by_llm,
+                },
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error in intent classifier agent: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e),
+                "data": {"results": []},
+            }
+
+    @staticmethod
+    def _parse_classification(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Validate one LLM classification (None if the intent is unknown)."""
+        intent = str(entry.get("intent", "")).strip().lower()
+        if intent not in INTENT_VALUES:
+            return None
+        try:
+            confidence = float(entry.get("confidence"))
+        except (TypeError, ValueError):
+            confidence = 0.5
+        return {"intent": intent, "confidence": round(max(0.0, min(1.0, confidence)), 3)}
+
+    def _store(self, results: List[Dict[str, Any]]) -> None:
+        """Save intent and confidence on the classified leads with one commit."""
+        classified = {}
+        for result in results:
+            if result["intent"] and result["lead_id"]:
+                classified[UUID(str(result["lead_id"]))] = result
+        if not classified:
+            return
+
+        leads = self.db.query(Lead).filter(Lead.id.in_(list(classified))).all()
+        for lead in leads:
+            result = classified[lead.id]
+            lead.intent = LeadIntent(result["intent"])
+            lead.intent_confidence = result["confidence"]
+        self.db.commit()
+        self.logger.info(f"Updated intent of {len(leads)} leads")
@@ -0,0 +1,45 @@
+"""Prompts for the Intent classifier agent."""
+
+INTENT_BATCH_PROMPT = """
+[ROLE]
+Tu es un expert en analyse des réponses aux emails de prospection B2B.
+
+[CONTEXTE]
+Tu classes l'intention de prospects qui ont répondu à un email de prospection.
+
+[RÉPONSES À CLASSER]
+Une réponse JSON par ligne, chacune avec son "id":
+{replies}
+
+[INTENTIONS POSSIBLES]
+- interested_now: veut échanger ou prendre rendez-vous rapidement
+- interested_later: intéressé mais pas maintenant (recontacter plus tard)
+- objection_price: objection sur le prix ou le budget
+- objection_timing: objection sur le moment (pas la priorité, projet en cours)
+- polite_decline: refus poli
+- not_interested: refus clair ou demande de ne plus être contacté
+- out_of_office: réponse automatique d'absence
+- wrong_person: pas le bon interlocuteur ou a quitté l'entreprise
+
+[INSTRUCTIONS]
+1. Classe chaque réponse indépendamment des autres
+2. Choisis exactement une intention dans la liste
+3. Donne une confiance entre 0 et 1
+4. Reprends exactement l'"id" de chaque réponse et n'en omets aucune
+
+[FORMAT DE SORTIE]
+Uniquement ce JSON, sans texte autour:
+{{
+  "results": [
+    {{
+      "id": "...",
+      "intent": "interested_now" | "interested_later" | "objection_price" | "objection_timing" | "polite_decline" | "not_interested" | "out_of_office" | "wrong_person",
+      "confidence": 0.0-1.0,
+      "reasoning": "Une phrase"
+    }}
+  ]
+}}
+"""
+
+# Token budget of one reply in INTENT_BATCH_PROMPT
+INTENT_BATCH_REPLY_TOKENS = 300
@@ -0,0 +1,93 @@
+"""Deterministic intent rules for inbound replies."""
+
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from app.db.models.lead import LeadIntent
+
+# Lines where the quoted original message starts ("On ... wrote:", "Le ... a écrit :")
+_QUOTE_HEADER = re.compile(
+    r"^\s*(on .+ wrote:|le .+ a ecrit\s*:|-{2,}\s*original message|-{2,}\s*message d'origine|from:|de\s*:)"
+)
+
+# (intent, confidence, name, pattern) matched against the normalized reply
+_RULES: List[Tuple[LeadIntent, float, str, re.Pattern]] = [
+    (
+        LeadIntent.OUT_OF_OFFICE,
+        0.95,
+        "out_of_office",
+        re.compile(
+            r"\b(out of (the )?office|ooo|auto(matic)?[- ]?reply|on (annual |parental )?leave"
+            r"|on vacation|away from (the office|my desk) until|absente? (du bureau|jusqu)"
+            r"|en conges?|reponse automatique|message automatique|de retour le)\b"
+        ),
+    ),
+    (
+        LeadIntent.WRONG_PERSON,
+        0.9,
+        "wrong_person",
+        re.compile(
+            r"\b(not the right (person|contact)|wrong (person|contact)|no longer (with|at|work)"
+            r"|(have|has) left the company|not (in charge|responsible) (of|for)"
+            r"|pas la bonne personne|pas le bon (interlocuteur|contact)"
+            r"|ne (suis|travaille) plus (chez|dans|a)|n'est plus (chez|dans)"
+            r"|a quitte (la societe|l'entreprise)|(ne suis|n'est) pas en charge)\b"
+        ),
+    ),
+    (
+        LeadIntent.NOT_INTERESTED,
+        0.95,
+        "unsubscribe",
+        re.compile(
+            r"(\b(unsubscribe|remove me|take me off|stop (emailing|contacting|sending)"
+            r"|do not (contact|email) me|desinscri\w*|desabonn\w*|retirez[- ]moi"
+            r"|ne (plus )?me (contactez|recontactez|ecrivez))\b|^\s*stop\s*[.!]*\s*$)"
+        ),
+    ),
+]
+
+
+def normalize_reply(text: str) -> str:
+    """
+    Return the reply's own text, lowercased and without accents.
+
+    The quoted original message is dropped so that words of our own email
+    never trigger a rule.
+    """
+    decomposed = unicodedata.normalize("NFKD", (text or "").lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+
+    lines = []
+    for line in plain.splitlines():
+        if line.lstrip().startswith(">"):
+            continue
+        if _QUOTE_HEADER.match(line):
+            break
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def classify_by_rules(text: str) -> Optional[Tuple[LeadIntent, float, str]]:
+    """
+    Classify a reply with the deterministic rules.
+
+    Args:
+        text: Reply body
+
+    Returns:
+        (intent, confidence, rule name), or None if no rule matches or rules
+        for different intents match (the reply is ambiguous)
+    """
+    normalized = normalize_reply(text)
+    if not normalized:
+        return None
+
+    matches = [
+        (intent, confidence, name)
+        for intent, confidence, name, pattern in _RULES
+        if pattern.search(normalized)
+    ]
+    if len({intent for intent, _, _ in matches}) != 1:
+        return None
+    return matches[0]
@@ -0,0 +1,188 @@
+"""Content-addressed cache of LLM responses for agent crews."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM responses keyed on a hash of the request.
+
+    The key covers the model, the agent role and every task prompt (its
+    description and expected output), so only identical requests share an
+    entry. Lookups go to an in-process LRU first, then to Redis (shared by
+    every worker); a Redis hit is copied into the LRU. Both tiers expire
+    entries after ``ttl`` seconds and the LRU holds at most ``max_entries``.
+
+    Redis errors are logged and treated as misses, so a cache outage only
+    costs the LLM latency it would have saved.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        namespace: str = "llm:cache:",
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            redis_client: Redis client (None keeps the cache in-process only)
+            max_entries: Maximum entries in the in-process LRU
+            ttl: Seconds before an entry expires
+            namespace: Prefix of the Redis keys
+        """
+        self.redis_client = redis_client
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.namespace = namespace
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(model: str, role: str, prompts: Iterable[Tuple[str, str]]) -> str:
+        """
+        Return the cache key of an LLM request.
+
+        Args:
+            model: Model name
+            role: Agent role
+            prompts: (task description, expected output) of every task
+
+        Returns:
+            SHA-256 hex digest of the request
+        """
+        payload = json.dumps(
+            {"model": model, "role": role, "prompts": [list(prompt) for prompt in prompts]},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for a key, or None.
+
+        Args:
+            key: Cache key from make_key
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["local_hits"] += 1
+                    return value
+                del self._entries[key]
+
+        value = self._redis_get(key)
+
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["redis_hits"] += 1
+            self._store_local(key, value, now)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Cache key from make_key
+            value: Raw LLM response
+        """
+        with self._lock:
+            self._stats["sets"] += 1
+            self._store_local(key, value, time.monotonic())
+
+        if self.redis_client:
+            try:
+                self.redis_client.setex(self.namespace + key, self.ttl, value)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to write LLM cache entry: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss metrics.
+
+        Returns:
+            Hits per tier, misses, sets, LRU evictions and size, hit rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        hits = stats["local_hits"] + stats["redis_hits"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop the in-process entries and reset the metrics (Redis is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {key: 0 for key in self._stats}
+
+    def _store_local(self, key: str, value: str, now: float) -> None:
+        """Insert into the LRU, evicting the oldest entries (caller holds the lock)."""
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _redis_get(self, key: str) -> Optional[str]:
+        """Read an entry from Redis."""
+        if not self.redis_client:
+            return None
+        try:
+            value = self.redis_client.get(self.namespace + key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read LLM cache entry: {e}")
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_pid: Optional[int] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get the process-wide LLM response cache.
+
+    A new cache (and Redis connection) is created after a fork so that
+    Celery prefork children never share the parent's socket.
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _cache, _cache_pid
+
+    if _cache is None or _cache_pid != os.getpid():
+        client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+        _cache = LLMResponseCache(client)
+        _cache_pid = os.getpid()
+
+    return _cache
@@ -0,0 +1,930 @@
+"""Rate-limited gateway for every LLM provider request."""
+
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.agents.batching import estimate_tokens
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Successful request latencies kept per provider for the hedge threshold
+LATENCY_WINDOW = 100
+
+
+class LLMGatewayTimeoutError(Exception):
+    """A request waited in the gateway queue past its deadline."""
+
+
+class LLMProviderError(Exception):
+    """The provider rejected a request or returned an unusable response."""
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute`` tokens per minute.
+
+    The bucket holds at most one minute of tokens. Times are passed in by the
+    caller (the gateway uses its loop clock), which keeps the bucket free of
+    any clock or lock of its own.
+    """
+
+    def __init__(self, per_minute: int, now: float = 0.0):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Tokens added per minute (also the capacity)
+            now: Current time in seconds
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        if now > self.updated:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Return the seconds until ``amount`` tokens are available.
+
+        Requests larger than the capacity only wait for a full bucket.
+        """
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        """Remove tokens (the level may go negative for oversized requests)."""
+        self._refill(now)
+        self.level -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Give back (positive) or charge (negative) tokens after the fact."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMProvider:
+    """Connection settings, limits and wire format of one LLM provider."""
+
+    name = ""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = 4,
+        requests_per_minute: int = 60,
+        tokens_per_minute: int = 100_000,
+        context_window: Optional[int] = None,
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            base_url: API base URL
+            model: Default model
+            headers: Headers sent with every request
+            concurrency: Maximum requests in flight
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Token rate limit (prompt and completion)
+            context_window: Model context window in tokens
+        """
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.context_window = context_window or settings.LLM_CONTEXT_WINDOW
+
+    def build_request(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        max_tokens: int,
+        temperature: Optional[float],
+        stop: Optional[List[str]],
+        stream: bool = False,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the request path and JSON body."""
+        raise NotImplementedError
+
+    def parse_response(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        """Return (text, prompt tokens, completion tokens) from a response body."""
+        raise NotImplementedError
+
+    def parse_stream_line(self, line: str) -> Tuple[str, int, int]:
+        """
+        Return (text delta, prompt tokens, completion tokens) from a line of a
+        streamed response; token counts are 0 on lines that do not report them.
+        """
+        raise NotImplementedError
+
+
+class OllamaProvider(LLMProvider):
+    """Ollama chat API (local, remote or Ollama Cloud)."""
+
+    name = "ollama"
+
+    def build_request(self, messages, model, max_tokens, temperature, stop, stream=False):
+        options: Dict[str, Any] = {"num_predict": max_tokens}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if stop:
+            options["stop"] = stop
+        return "/api/chat", {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "options": options,
+        }
+
+    def parse_response(self, data):
+        try:
+            text = data["message"]["content"]
+        except (KeyError, TypeError):
+            raise LLMProviderError(self.name, "response has no message content")
+        return text, int(data.get("prompt_eval_count") or 0), int(data.get("eval_count") or 0)
+
+    def parse_stream_line(self, line):
+        # One JSON object per line; the last one ("done") carries the token counts
+        if not line.strip():
+            return "", 0, 0
+        try:
+            data = json.loads(line)
+        except ValueError:
+            raise LLMProviderError(self.name, "malformed stream line")
+        if data.get("error"):
+            raise LLMProviderError(self.name, str(data["error"]))
+        text = (data.get("message") or {}).get("content") or ""
+        return text, int(data.get("prompt_eval_count") or 0), int(data.get("eval_count") or 0)
+
+
+class ClaudeProvider(LLMProvider):
+    """Anthropic Messages API."""
+
+    name = "claude"
+
+    def build_request(self, messages, model, max_tokens, temperature, stop, stream=False):
+        system = "\n\n".join(m["content"] for m in messages if m.get("role") == "system")
+        body: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [
+                {"role": m["role"], "content": m["content"]}
+                for m in messages
+                if m.get("role") != "system"
+            ],
+        }
+        if system:
+            body["system"] = system
+        if temperature is not None:
+            body["temperature"] = temperature
+        if stop:
+            body["stop_sequences"] = stop
+        if stream:
+            body["stream"] = True
+        return "/v1/messages", body
+
+    def parse_response(self, data):
+        try:
+            text = "".join(
+                block.get("text", "") for block in data["content"] if block.get("type") == "text"
+            )
+        except (KeyError, TypeError, AttributeError):
+            raise LLMProviderError(self.name, "response has no content")
+        usage = data.get("usage") or {}
+        return text, int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+
+    def parse_stream_line(self, line):
+        # Server-sent events: only "data:" lines carry payloads
+        if not line.startswith("data:"):
+            return "", 0, 0
+        try:
+            data = json.loads(line[5:])
+        except ValueError:
+            raise LLMProviderError(self.name, "malformed stream event")
+        kind = data.get("type")
+        if kind == "error":
+            raise LLMProviderError(self.name, str((data.get("error") or {}).get("message", "stream error")))
+        if kind == "content_block_delta":
+            return (data.get("delta") or {}).get("text") or "", 0, 0
+        if kind == "message_start":
+            usage = (data.get("message") or {}).get("usage") or {}
+            return "", int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+        if kind == "message_delta":
+            return "", 0, int((data.get("usage") or {}).get("output_tokens") or 0)
+        return "", 0, 0
+
+
+class _ProviderState:
+    """Limits, connection pool and counters of a provider on the gateway loop."""
+
+    def __init__(self, provider: LLMProvider, now: float, transport: Optional[httpx.AsyncBaseTransport]):
+        self.provider = provider
+        self.semaphore = asyncio.Semaphore(provider.concurrency)
+        self.requests = TokenBucket(provider.requests_per_minute, now)
+        self.tokens = TokenBucket(provider.tokens_per_minute, now)
+        self.paused_until = 0.0
+        self.client = httpx.AsyncClient(
+            base_url=provider.base_url,
+            headers=provider.headers,
+            timeout=settings.LLM_GATEWAY_REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=provider.concurrency,
+                max_keepalive_connections=provider.concurrency,
+            ),
+            transport=transport,
+        )
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.strikes = 0
+        self.demoted_until = 0.0
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "queued": 0,
+            "in_flight": 0,
+            "tokens": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "demotions": 0,
+        }
+
+    def latency_percentile(self, fraction: float) -> Optional[float]:
+        """Return a percentile of recent request latencies in seconds (None if too few)."""
+        if len(self.latencies) < settings.LLM_GATEWAY_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(max(math.ceil(fraction * len(ordered)) - 1, 0), len(ordered) - 1)
+        return ordered[index]
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and clear the provider's strikes."""
+        self.latencies.append(latency)
+        self.strikes = 0
+
+    def record_failure(self, now: float) -> None:
+        """Count an error, timeout or lost hedge, demoting the provider after too many."""
+        self.strikes += 1
+        if self.strikes >= settings.LLM_GATEWAY_DEMOTE_AFTER:
+            self.strikes = 0
+            self.demoted_until = now + settings.LLM_GATEWAY_DEMOTE_SECONDS
+            self.stats["demotions"] += 1
+            logger.warning(
+                f"{self.provider.name} demoted for {settings.LLM_GATEWAY_DEMOTE_SECONDS:.0f}s",
+                extra={"provider": self.provider.name},
+            )
+
+
+class LLMGateway:
+    """
+    Single entry point for LLM requests, with per-provider limits.
+
+    Every provider gets a concurrency limit, request-per-minute and
+    token-per-minute buckets and one pooled HTTP client. Requests queue until
+    all three allow them or until their deadline passes. A 429 pauses the
+    whole provider for its Retry-After, so concurrent callers back off
+    together instead of retrying into the limit.
+
+    Each call also has a latency budget. When the primary provider has not
+    answered by its recent p95 latency (or fails), the same request is
+    hedged to the next provider; the first answer wins and the other request
+    is cancelled. Providers that keep failing or losing hedges are demoted
+    behind the others for a while.
+
+    Limits and pools live on an event loop owned by the gateway (in a daemon
+    thread), so they are shared by every caller in the process: agents on the
+    runtime loop, CrewAI worker threads and Celery tasks alike.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        queue_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize gateway.
+
+        Args:
+            providers: Providers, the first being the default
+            queue_timeout: Seconds a request may wait for a slot
+            max_retries: Retries of a rate-limited request
+            transport: HTTP transport (tests use httpx.MockTransport)
+        """
+        self.providers = {provider.name: provider for provider in providers}
+        self.queue_timeout = queue_timeout or settings.LLM_GATEWAY_QUEUE_TIMEOUT
+        self.max_retries = settings.LLM_GATEWAY_MAX_RETRIES if max_retries is None else max_retries
+        self.transport = transport
+        self._states: Dict[str, _ProviderState] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def default_provider(self) -> Optional[LLMProvider]:
+        """Return the provider used when a request names none."""
+        return next(iter(self.providers.values()), None)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the gateway loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-gateway", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        budget: Optional[float] = None,
+        hedge: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a chat completion through the gateway.
+
+        Args:
+            messages: Chat messages ({"role", "content"})
+            provider: Preferred provider (defaults to the first provider)
+            model: Model of the preferred provider (defaults to its model)
+            max_tokens: Maximum completion tokens
+            temperature: Sampling temperature
+            stop: Stop sequences
+            timeout: Seconds a request may wait in a provider queue
+            budget: Seconds the whole call may take, hedges included
+            hedge: Whether to hedge to another provider (default from settings)
+
+        Returns:
+            Dict with text, provider, model, prompt_tokens, completion_tokens
+
+        Raises:
+            LLMGatewayTimeoutError: No provider answered within the budget or queue deadline
+            LLMProviderError: The providers failed or kept rate limiting
+        """
+        coro = self._dispatch(
+            messages, provider, model, max_tokens, temperature, stop, timeout, budget, hedge
+        )
+        loop = self.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def complete_sync(self, messages: List[Dict[str, str]], **kwargs: Any) -> Dict[str, Any]:
+        """
+        Blocking counterpart of ``complete`` for synchronous callers (e.g. CrewAI).
+
+        Blocks the calling thread until the gateway loop answers, so it must
+        run in a worker thread: on an event loop it would stall every other
+        coroutine (or deadlock on the gateway's own loop).
+
+        Raises:
+            RuntimeError: If called from a running event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("complete_sync blocks its thread; await complete() from coroutines")
+
+        coro = self._dispatch(
+            messages,
+            kwargs.get("provider"),
+            kwargs.get("model"),
+            kwargs.get("max_tokens"),
+            kwargs.get("temperature"),
+            kwargs.get("stop"),
+            kwargs.get("timeout"),
+            kwargs.get("budget"),
+            kwargs.get("hedge"),
+        )
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion through the gateway, yielding text as it arrives.
+
+        The request goes through the same limits as ``complete`` but is not
+        hedged: once text has been shown it cannot switch providers. Closing
+        the iterator early cancels the request.
+
+        Args:
+            messages: Chat messages ({"role", "content"})
+            provider: Provider (defaults to the first non-demoted provider)
+            model: Model (defaults to the provider's model)
+            max_tokens: Maximum completion tokens
+            temperature: Sampling temperature
+            stop: Stop sequences
+            timeout: Seconds the request may wait in the provider queue
+
+        Yields:
+            Text deltas
+
+        Raises:
+            LLMGatewayTimeoutError: The request waited past its queue deadline
+            LLMProviderError: The provider failed or kept rate limiting
+        """
+        caller = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def emit(item: Any) -> None:
+            caller.call_soon_threadsafe(queue.put_nowait, item)
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(messages, provider, model, max_tokens, temperature, stop, timeout, emit),
+            self.loop,
+        )
+        future.add_done_callback(lambda _: emit(done))
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+
+    async def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        provider_name: Optional[str],
+        model: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        stop: Optional[List[str]],
+        timeout: Optional[float],
+        emit: Callable[[str], None],
+    ) -> Dict[str, Any]:
+        """Run a streamed completion on the gateway loop, passing text deltas to emit."""
+        ranked = self._ranked(provider_name)
+        if not ranked:
+            raise LLMProviderError(provider_name or "default", "provider not configured")
+        state = self._state(ranked[0].name)
+        provider = state.provider
+        model = model or provider.model
+        max_tokens = max_tokens or settings.LLM_MAX_OUTPUT_TOKENS
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.queue_timeout)
+
+        path, body = provider.build_request(messages, model, max_tokens, temperature, stop, stream=True)
+        reserved = sum(estimate_tokens(m.get("content") or "") for m in messages) + max_tokens
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with self._slot(state, reserved, deadline):
+                    start = time.perf_counter()
+                    prompt_tokens = completion_tokens = 0
+                    try:
+                        async with state.client.stream("POST", path, json=body) as response:
+                            if response.status_code == 429:
+                                state.stats["rate_limited"] += 1
+                                pause = self._retry_after(response, attempt)
+                                state.paused_until = max(state.paused_until, loop.time() + pause)
+                                continue
+
+                            if response.status_code >= 400:
+                                await response.aread()
+                                state.stats["errors"] += 1
+                                raise LLMProviderError(
+                                    provider.name,
+                                    f"HTTP {response.status_code}: {response.text[:200]}",
+                                    status_code=response.status_code,
+                                )
+
+                            async for line in response.aiter_lines():
+                                text, prompt, completion = provider.parse_stream_line(line)
+                                prompt_tokens = max(prompt_tokens, prompt)
+                                completion_tokens = max(completion_tokens, completion)
+                                if text:
+                                    emit(text)
+                    except httpx.HTTPError as e:
+                        state.stats["errors"] += 1
+                        raise LLMProviderError(provider.name, f"request failed: {e}")
+
+                used = prompt_tokens + completion_tokens
+                if used:
+                    state.tokens.adjust(reserved - used)
+                state.stats["requests"] += 1
+                state.stats["tokens"] += used
+                state.record_success(time.perf_counter() - start)
+                return {
+                    "provider": provider.name,
+                    "model": model,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                }
+        except (LLMProviderError, LLMGatewayTimeoutError):
+            state.record_failure(loop.time())
+            raise
+
+        state.stats["errors"] += 1
+        state.record_failure(loop.time())
+        raise LLMProviderError(provider.name, "rate limited after retries", status_code=429)
+
+    async def _dispatch(
+        self,
+        messages: List[Dict[str, str]],
+        provider_name: Optional[str],
+        model: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        stop: Optional[List[str]],
+        timeout: Optional[float],
+        budget: Optional[float],
+        hedge: Optional[bool],
+    ) -> Dict[str, Any]:
+        """Run a call on the gateway loop, hedging across providers within its budget."""
+        loop = asyncio.get_running_loop()
+        budget = budget or settings.LLM_GATEWAY_LATENCY_BUDGET
+        deadline = loop.time() + budget
+        requested = provider_name or (self.default_provider().name if self.providers else None)
+        ranked = self._ranked(provider_name)
+        if not ranked:
+            raise LLMProviderError(provider_name or "default", "provider not configured")
+
+        def start(provider: LLMProvider) -> asyncio.Task:
+            return asyncio.ensure_future(self._complete(
+                messages,
+                provider.name,
+                model if provider.name == requested else None,
+                max_tokens,
+                temperature,
+                stop,
+                timeout,
+            ))
+
+        primary = ranked[0]
+        primary_state = self._state(primary.name)
+        first = start(primary)
+
+        if hedge is None:
+            hedge = settings.LLM_GATEWAY_HEDGE_ENABLED
+        if not hedge or len(ranked) < 2:
+            done, _ = await asyncio.wait({first}, timeout=budget)
+            if first in done:
+                return first.result()
+            first.cancel()
+            primary_state.stats["timeouts"] += 1
+            primary_state.record_failure(loop.time())
+            raise LLMGatewayTimeoutError(f"{primary.name}: no answer within {budget:.1f}s")
+
+        delay = primary_state.latency_percentile(settings.LLM_GATEWAY_HEDGE_PERCENTILE)
+        if delay is None:
+            delay = settings.LLM_GATEWAY_HEDGE_DELAY
+        done, _ = await asyncio.wait({first}, timeout=min(delay, budget))
+        if first in done and first.exception() is None:
+            return first.result()
+
+        # The primary failed or is slower than usual: race the next provider
+        secondary = ranked[1]
+        self._state(secondary.name).stats["hedged"] += 1
+        second = start(secondary)
+        pending = {second} if first in done else {first, second}
+        errors = [first.exception()] if first in done else []
+        logger.info(
+            f"Hedging LLM request from {primary.name} to {secondary.name}",
+            extra={"primary": primary.name, "secondary": secondary.name, "delay_s": round(delay, 3)},
+        )
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(deadline - loop.time(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                if task.exception() is not None:
+                    errors.append(task.exception())
+                    continue
+                for other in pending:
+                    other.cancel()
+                if task is second:
+                    self._state(secondary.name).stats["hedge_wins"] += 1
+                    if first in pending:
+                        primary_state.record_failure(loop.time())
+                return task.result()
+
+        for task in pending:
+            task.cancel()
+        if not pending and errors:
+            raise errors[-1]
+        primary_state.stats["timeouts"] += 1
+        primary_state.record_failure(loop.time())
+        raise LLMGatewayTimeoutError(f"no provider answered within {budget:.1f}s")
+
+    def _ranked(self, preferred: Optional[str]) -> List[LLMProvider]:
+        """Return providers in the order to try them: preferred first, demoted last."""
+        providers = list(self.providers.values())
+        if preferred in self.providers:
+            providers.remove(self.providers[preferred])
+            providers.insert(0, self.providers[preferred])
+        elif preferred:
+            return []
+
+        now = asyncio.get_running_loop().time()
+        return sorted(providers, key=lambda provider: self._state(provider.name).demoted_until > now)
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        provider_name: Optional[str],
+        model: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        stop: Optional[List[str]],
+        timeout: Optional[float],
+    ) -> Dict[str, Any]:
+        """Run a completion on one provider, tracking its health."""
+        state = self._state(provider_name)
+        provider = state.provider
+        model = model or provider.model
+        max_tokens = max_tokens or settings.LLM_MAX_OUTPUT_TOKENS
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.queue_timeout)
+
+        path, body = provider.build_request(messages, model, max_tokens, temperature, stop)
+        reserved = sum(estimate_tokens(m.get("content") or "") for m in messages) + max_tokens
+
+        try:
+            return await self._send(state, path, body, model, reserved, deadline)
+        except (LLMProviderError, LLMGatewayTimeoutError):
+            state.record_failure(loop.time())
+            raise
+
+    async def _send(
+        self,
+        state: _ProviderState,
+        path: str,
+        body: Dict[str, Any],
+        model: str,
+        reserved: int,
+        deadline: float,
+    ) -> Dict[str, Any]:
+        """Send a request to one provider, retrying after 429s."""
+        provider = state.provider
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(self.max_retries + 1):
+            async with self._slot(state, reserved, deadline):
+                start = time.perf_counter()
+                try:
+                    response = await state.client.post(path, json=body)
+                except httpx.HTTPError as e:
+                    state.stats["errors"] += 1
+                    raise LLMProviderError(provider.name, f"request failed: {e}")
+                latency = time.perf_counter() - start
+
+            if response.status_code == 429:
+                state.stats["rate_limited"] += 1
+                pause = self._retry_after(response, attempt)
+                state.paused_until = max(state.paused_until, loop.time() + pause)
+                logger.warning(
+                    f"{provider.name} rate limited, pausing {pause:.1f}s",
+                    extra={"provider": provider.name, "attempt": attempt + 1},
+                )
+                continue
+
+            if response.status_code >= 400:
+                state.stats["errors"] += 1
+                raise LLMProviderError(
+                    provider.name,
+                    f"HTTP {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code,
+                )
+
+            text, prompt_tokens, completion_tokens = provider.parse_response(response.json())
+            used = prompt_tokens + completion_tokens
+            if used:
+                state.tokens.adjust(reserved - used)
+            state.stats["requests"] += 1
+            state.stats["tokens"] += used
+            state.record_success(latency)
+            return {
+                "text": text,
+                "provider": provider.name,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+
+        state.stats["errors"] += 1
+        raise LLMProviderError(provider.name, "rate limited after retries", status_code=429)
+
+    @asynccontextmanager
+    async def _slot(self, state: _ProviderState, tokens: int, deadline: float) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and rate budget, holding the slot inside."""
+        loop = asyncio.get_running_loop()
+        state.stats["queued"] += 1
+        try:
+            try:
+                await asyncio.wait_for(state.semaphore.acquire(), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                state.stats["timeouts"] += 1
+                raise LLMGatewayTimeoutError(f"{state.provider.name}: no free slot before deadline")
+
+            try:
+                await self._wait_for_budget(state, tokens, deadline)
+            except BaseException:
+                state.semaphore.release()
+                raise
+        finally:
+            state.stats["queued"] -= 1
+
+        state.stats["in_flight"] += 1
+        try:
+            yield
+        finally:
+            state.stats["in_flight"] -= 1
+            state.semaphore.release()
+
+    @staticmethod
+    async def _wait_for_budget(state: _ProviderState, tokens: int, deadline: float) -> None:
+        """Sleep until the provider is not paused and both buckets allow the request."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            wait = max(
+                state.paused_until - now,
+                state.requests.wait_time(1, now),
+                state.tokens.wait_time(tokens, now),
+            )
+            if wait <= 0:
+                break
+            if now + wait > deadline:
+                state.stats["timeouts"] += 1
+                raise LLMGatewayTimeoutError(
+                    f"{state.provider.name}: rate limit budget not available before deadline"
+                )
+            await asyncio.sleep(wait)
+
+        state.requests.take(1, now)
+        state.tokens.take(tokens, now)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response, attempt: int) -> float:
+        """Return the pause requested by a 429 (exponential backoff if absent)."""
+        value = response.headers.get("retry-after")
+        if value:
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(value)
+                    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+        return min(2 ** attempt, 30)
+
+    def _state(self, provider_name: Optional[str]) -> _ProviderState:
+        """Return the loop-side state of a provider (called on the gateway loop)."""
+        provider = self.providers.get(provider_name) if provider_name else self.default_provider()
+        if provider is None:
+            raise LLMProviderError(provider_name or "default", "provider not configured")
+
+        state = self._states.get(provider.name)
+        if state is None:
+            now = asyncio.get_running_loop().time()
+            state = self._states[provider.name] = _ProviderState(provider, now, self.transport)
+        return state
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return per-provider counters.
+
+        Returns:
+            Completed requests, errors, 429s, queue timeouts, queued and
+            in-flight requests and tokens used, per provider
+        """
+        return {name: dict(state.stats) for name, state in list(self._states.items())}
+
+    def close(self) -> None:
+        """Close the connection pools and stop the gateway loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+
+        async def shutdown() -> None:
+            for state in self._states.values():
+                await state.client.aclose()
+            self._states.clear()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+        loop.close()
+
+
+def build_providers() -> List[LLMProvider]:
+    """
+    Return the configured providers, the preferred one first.
+
+    Ollama (Cloud if OLLAMA_API_KEY is set, else OLLAMA_BASE_URL) comes first
+    when LLM_PROVIDER is "ollama"; Claude is used when CLAUDE_API_KEY is set.
+    """
+    providers: List[LLMProvider] = []
+
+    if settings.OLLAMA_API_KEY or settings.OLLAMA_BASE_URL:
+        cloud = bool(settings.OLLAMA_API_KEY)
+        providers.append(OllamaProvider(
+            base_url=settings.OLLAMA_CLOUD_HOST if cloud else settings.OLLAMA_BASE_URL,
+            model=settings.OLLAMA_MODEL,
+            headers={"Authorization": f"Bearer {settings.OLLAMA_API_KEY}"} if cloud else None,
+            concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+            requests_per_minute=settings.OLLAMA_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.OLLAMA_TOKENS_PER_MINUTE,
+        ))
+
+    if settings.CLAUDE_API_KEY:
+        providers.append(ClaudeProvider(
+            base_url="https://api.anthropic.com",
+            model=settings.CLAUDE_MODEL,
+            headers={
+                "x-api-key": settings.CLAUDE_API_KEY,
+                "anthropic-version": "2023-06-01",
+            },
+            concurrency=settings.CLAUDE_MAX_CONCURRENCY,
+            requests_per_minute=settings.CLAUDE_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.CLAUDE_TOKENS_PER_MINUTE,
+            context_window=200_000,
+        ))
+
+    if settings.LLM_PROVIDER != "ollama":
+        providers.sort(key=lambda provider: provider.name == "ollama")
+    return providers
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_pid: Optional[int] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get the process-wide LLM gateway.
+
+    A new gateway is created after a fork: the parent's loop thread does not
+    exist in the child, and its limits must not be shared across processes.
+
+    Returns:
+        LLMGateway instance
+    """
+    global _gateway, _gateway_pid
+
+    if _gateway is None or _gateway_pid != os.getpid():
+        _gateway = LLMGateway(build_providers())
+        _gateway_pid = os.getpid()
+
+    return _gateway
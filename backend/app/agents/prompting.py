@@ -0,0 +1,221 @@
+"""Compact agent prompts: field projection, token budgets and compiled templates."""
+
+import json
+from string import Formatter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.agents.batching import CHARS_PER_TOKEN, estimate_tokens
+
+# Marker appended to truncated values
+ELLIPSIS = "…"
+
+# A field is never cut below this many characters
+MIN_FIELD_CHARS = 40
+
+
+def project(payload: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Keep only the given fields of a payload.
+
+    A field may be a dotted path into nested dicts ("enrichment_data.location");
+    its value is stored under the path's last key. When several fields map to
+    the same key, the first non-empty one wins. Empty values are dropped.
+
+    Args:
+        payload: Full payload (lead, prospect, reply...)
+        fields: Fields to keep, in output order
+
+    Returns:
+        Flat dict with the non-empty projected values
+    """
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        value: Any = payload
+        for key in field.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                break
+        key = field.rsplit(".", 1)[-1]
+        if key in projected or value in (None, "", [], {}):
+            continue
+        projected[key] = _flatten(value)
+    return projected
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens tokens, marking the cut with an ellipsis."""
+    max_chars = max(max_tokens * CHARS_PER_TOKEN, MIN_FIELD_CHARS)
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - len(ELLIPSIS)].rstrip() + ELLIPSIS
+
+
+def fit(item: Dict[str, Any], max_tokens: int) -> Dict[str, Any]:
+    """
+    Shrink the longest text values of an item until it fits max_tokens.
+
+    Values are cut no shorter than MIN_FIELD_CHARS, so an item with many
+    fields may stay over budget; the batch planner still gives it a request.
+
+    Args:
+        item: Projected item (flat dict of scalars and text)
+        max_tokens: Token budget of the serialized item
+
+    Returns:
+        A new item whose serialized size is within budget when possible
+    """
+    item = dict(item)
+    while True:
+        excess = estimate_tokens(_dumps(item)) - max_tokens
+        if excess <= 0:
+            return item
+        texts = [(len(value), key) for key, value in item.items() if isinstance(value, str)]
+        length, key = max(texts, default=(0, None))
+        if key is None or length <= MIN_FIELD_CHARS:
+            return item
+        keep = max(length - excess * CHARS_PER_TOKEN, MIN_FIELD_CHARS)
+        item[key] = item[key][: keep - len(ELLIPSIS)].rstrip() + ELLIPSIS
+
+
+class PromptTemplate:
+    """
+    A prompt template parsed once and rendered by concatenation.
+
+    Templates use str.format syntax ("{field}", "{{" for a literal brace),
+    without format specs or conversions. A field may be a dotted path
+    ("{lead.first_name}") resolved through dict keys or attributes; missing
+    or None values render as an empty string.
+    """
+
+    def __init__(self, template: str, name: str = "prompt", roots: Optional[Sequence[str]] = None):
+        """
+        Compile a template.
+
+        Args:
+            template: Template text
+            name: Name used in logs
+            roots: Names of the values the template is rendered with; other
+                placeholders (e.g. "{prénom}" in an example email) are kept
+                as written. None substitutes every placeholder.
+
+        Raises:
+            ValueError: If a placeholder is not a plain (dotted) field name
+        """
+        self.name = name
+        self._parts: List[Tuple[str, Optional[Tuple[str, ...]]]] = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is None:
+                self._parts.append((literal, None))
+                continue
+            path = tuple(field.split("."))
+            if roots is not None and path[0] not in roots:
+                self._parts.append((literal + "{" + field + "}", None))
+                continue
+            if not all(key.isidentifier() for key in path) or spec or conversion:
+                raise ValueError(f"Unsupported placeholder {{{field}}} in prompt {name}")
+            self._parts.append((literal, path))
+        self.fields = frozenset(path[0] for _, path in self._parts if path is not None)
+
+    def render(self, **values: Any) -> str:
+        """
+        Render the template.
+
+        Raises:
+            KeyError: If a field has no value
+        """
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Missing values for prompt {self.name}: {', '.join(sorted(missing))}")
+        return "".join(
+            literal + (_resolve(values, path) if path is not None else "")
+            for literal, path in self._parts
+        )
+
+
+class PromptBuilder:
+    """
+    Builds compact batch prompts for one agent prompt.
+
+    Each item is projected to the fields the prompt needs and fitted to a
+    per-item token budget; context values (criteria, product description)
+    are truncated to a per-prompt budget.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        name: str,
+        item_fields: Sequence[str],
+        item_token_budget: int,
+        context_token_budget: int = 500,
+        items_field: str = "items",
+    ):
+        """
+        Initialize a prompt builder.
+
+        Args:
+            template: Prompt template (str.format syntax)
+            name: Prompt name used in logs
+            item_fields: Fields of an item payload sent to the LLM
+            item_token_budget: Token budget of one serialized item
+            context_token_budget: Token budget of each context value
+            items_field: Placeholder receiving the serialized items
+        """
+        self.template = PromptTemplate(template, name)
+        self.name = name
+        self.item_fields = tuple(item_fields)
+        self.item_token_budget = item_token_budget
+        self.context_token_budget = context_token_budget
+        self.items_field = items_field
+
+    def item(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the compact form of an item payload."""
+        return fit(project(payload, self.item_fields), self.item_token_budget)
+
+    def items(self, payloads: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Return the compact form of item payloads keyed by ID."""
+        return {item_id: self.item(payload) for item_id, payload in payloads.items()}
+
+    def context(self, value: Any) -> str:
+        """Serialize a context value and truncate it to the context budget."""
+        if not isinstance(value, str):
+            value = _dumps(value)
+        return truncate(value, self.context_token_budget)
+
+    def build(self, block: str, **context: Any) -> str:
+        """
+        Render the prompt for a block of serialized items.
+
+        Args:
+            block: Serialized items (one JSON object per line)
+            **context: Context values, truncated to the context budget
+
+        Returns:
+            Prompt text
+        """
+        values = {key: self.context(value) for key, value in context.items()}
+        values[self.items_field] = block
+        return self.template.render(**values)
+
+
+def _resolve(values: Dict[str, Any], path: Tuple[str, ...]) -> str:
+    """Return the text of a (dotted) field."""
+    value: Any = values[path[0]]
+    for key in path[1:]:
+        if value is None:
+            break
+        value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+    return "" if value is None else str(value)
+
+
+def _flatten(value: Any) -> Any:
+    """Turn lists of scalars into text so they can be truncated like text."""
+    if isinstance(value, (list, tuple)) and all(not isinstance(v, (dict, list, tuple)) for v in value):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value the way items are sent to the LLM."""
+    return json.dumps(value, ensure_ascii=False, default=str)
+
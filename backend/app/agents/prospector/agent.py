@@ -1,5 +1,6 @@
 """Prospector agent for finding and enriching prospects."""
 
+import asyncio
 from typing import Dict, List, Any, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
@@ -9,14 +10,27 @@ from app.agents.base import BaseVectraAgent
 from app.agents.prospector.prompts import (
     PROSPECTOR_MAIN_PROMPT,
     PROSPECTOR_ANALYSIS_PROMPT,
+    PROSPECTOR_BATCH_ANALYSIS_PROMPT,
+    PROSPECTOR_BATCH_PROFILE_FIELDS,
+    PROSPECTOR_BATCH_PROFILE_TOKENS,
     PROSPECTOR_ENRICHMENT_PROMPT,
 )
+from app.agents.prompting import PromptBuilder
 from app.services.rocketreach import RocketReachService
 from app.services.enrichment import EnrichmentService
+from app.db.models.agent_run import AgentType
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+_BATCH_PROMPT = PromptBuilder(
+    PROSPECTOR_BATCH_ANALYSIS_PROMPT,
+    "prospector_batch",
+    item_fields=PROSPECTOR_BATCH_PROFILE_FIELDS,
+    item_token_budget=PROSPECTOR_BATCH_PROFILE_TOKENS,
+    items_field="profiles",
+)
+
 
 class ProspectorAgent(BaseVectraAgent):
     """
@@ -30,6 +44,8 @@ class ProspectorAgent(BaseVectraAgent):
     - Return sorted list of qualified prospects
     """
 
+    agent_type = AgentType.PROSPECTOR
+
     def __init__(
         self,
         config: Optional[Dict[str, Any]] = None,
@@ -67,7 +83,7 @@ class ProspectorAgent(BaseVectraAgent):
         pour trouver des contacts professionnels et tu sais identifier les signaux positifs
         ainsi que les objections potentielles."""
 
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute prospection task.
         
@@ -80,7 +96,10 @@ class ProspectorAgent(BaseVectraAgent):
                 - company_sizes: List[str] (optional)
                 - locations: List[str] (optional)
                 - limit: int (default: 50)
+                - start: int (optional, 1-based position of the first
+                  search result, to page through a search)
                 - target_criteria: Dict (optional, for scoring)
+                - llm_analysis: bool (optional, analyze the returned prospects with the LLM)
                 
         Returns:
             Result dictionary with prospects list and metadata
@@ -94,6 +113,7 @@ class ProspectorAgent(BaseVectraAgent):
             company_sizes = input_data.get("company_sizes", [])
             locations = input_data.get("locations", [])
             limit = input_data.get("limit", 50)
+            start = input_data.get("start", 1)
             target_criteria = input_data.get("target_criteria", {})
             
             if not campaign_id or not organization_id:
@@ -114,6 +134,7 @@ class ProspectorAgent(BaseVectraAgent):
                 company_sizes=company_sizes if company_sizes else None,
                 locations=locations if locations else None,
                 limit=limit,
+                start=start,
             )
             
             if not raw_prospects:
@@ -157,11 +178,16 @@ class ProspectorAgent(BaseVectraAgent):
             ]
             
             # Step 4: Use LLM to analyze top prospects if enabled
-            # For now, we'll skip LLM analysis and rely on firmographic scoring
-            # This can be added later for more sophisticated analysis
+            top_prospects = qualified_prospects[:limit]
+            if input_data.get("llm_analysis") and top_prospects:
+                analyses = await self.analyze_prospects(top_prospects, target_criteria)
+                for index, prospect in enumerate(top_prospects):
+                    analysis = analyses.get(str(index))
+                    if analysis:
+                        prospect["llm_analysis"] = analysis
             
             result = {
-                "prospects": qualified_prospects[:limit],  # Return top N
+                "prospects": top_prospects,  # Return top N
                 "total_found": len(raw_prospects),
                 "total_processed": len(processed_prospects),
                 "total_qualified": len(qualified_prospects),
@@ -188,3 +214,33 @@ class ProspectorAgent(BaseVectraAgent):
                     "total_qualified": 0,
                 },
             }
+
+    async def analyze_prospects(
+        self,
+        prospects: List[Dict[str, Any]],
+        target_criteria: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze prospect profiles with the LLM, several profiles per request.
+        
+        Args:
+            prospects: Prospect profiles
+            target_criteria: Targeting criteria
+            
+        Returns:
+            Analysis (match, score, signals, objections, recommendation, notes)
+            keyed by the prospect's index as a string; prospects the LLM could
+            not analyze are absent
+        """
+        criteria = _BATCH_PROMPT.context(target_criteria or {})
+        
+        def build_prompt(block: str) -> str:
+            return _BATCH_PROMPT.build(block, target_criteria=criteria)
+        
+        profiles = {str(index): _BATCH_PROMPT.item(prospect) for index, prospect in enumerate(prospects)}
+        return await asyncio.to_thread(
+            self._analyze_in_batches,
+            profiles,
+            build_prompt,
+            "JSON with a results list holding one analysis per profile id",
+        )
@@ -135,3 +135,63 @@ Tu es un analyste de données B2B spécialisé dans l'enrichissement de profils.
   "notes": "..."
 }}
 """
+
+# Prompt for analyzing several profiles in one request
+PROSPECTOR_BATCH_ANALYSIS_PROMPT = """
+[ROLE]
+Tu es un expert en analyse de profils B2B pour la prospection.
+
+[CONTEXTE]
+Tu analyses plusieurs profils de prospects pour déterminer lesquels correspondent à notre cible.
+
+[CRITÈRES DE CIBLAGE]
+{target_criteria}
+
+[PROFILS À ANALYSER]
+Un profil JSON par ligne, chacun avec son "id":
+{profiles}
+
+[INSTRUCTIONS]
+1. Analyse chaque profil indépendamment des autres
+2. Évalue si le profil correspond aux critères de ciblage
+3. Identifie les signaux positifs et les objections potentielles
+4. Donne un score de pertinence 0-100 basé sur les critères firmographiques
+5. Reprends exactement l'"id" de chaque profil et n'en omets aucun
+
+[FORMAT DE SORTIE]
+Uniquement ce JSON, sans texte autour:
+{{
+  "results": [
+    {{
+      "id": "...",
+      "match": true/false,
+      "score": 0-100,
+      "signals": ["signal1", "signal2"],
+      "objections": ["objection1"],
+      "recommendation": "contact" | "skip" | "manual_review",
+      "notes": "..."
+    }}
+  ]
+}}
+"""
+
+# Profile fields sent with PROSPECTOR_BATCH_ANALYSIS_PROMPT (the raw RocketReach dump is left out)
+PROSPECTOR_BATCH_PROFILE_FIELDS = (
+    "name",
+    "first_name",
+    "last_name",
+    "job_title",
+    "current_title",
+    "seniority_level",
+    "company_name",
+    "current_employer",
+    "company_size",
+    "company_industry",
+    "company_domain",
+    "location",
+    "linkedin_url",
+    "firmographic_score",
+)
+
+# Token budget of one profile in PROSPECTOR_BATCH_ANALYSIS_PROMPT
+PROSPECTOR_BATCH_PROFILE_TOKENS = 200
@@ -0,0 +1,158 @@
+"""Process-wide registry of built CrewAI agents."""
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from crewai import Agent
+
+from app.agents.crew import get_default_agent_config
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from app.agents.base import BaseVectraAgent
+
+logger = get_logger(__name__)
+
+
+def _config_key(config: Dict[str, Any]) -> str:
+    """Return a key for an agent config: its JSON form, objects by their string."""
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+class AgentRegistry:
+    """
+    Cache of CrewAI agents built once per agent type and config.
+
+    Building a ``BaseVectraAgent`` resolves the LLM and memory defaults
+    (which sets provider environment variables and creates a new
+    ``ShortTermMemory``) and constructs a CrewAI ``Agent``. Campaign runners
+    and Celery tasks create agents for every run, so the registry resolves
+    the defaults once and keeps the built agent and its tools for reuse by
+    every later instance of the same class with the same config.
+
+    A cached CrewAI agent is shared by every run of the process, including
+    the worker threads that run crews, and it keeps per-execution state
+    (its executor and crew), so it serves as a template: each crew runs a
+    copy of it, which reuses its LLM and tools (see
+    ``BaseVectraAgent._execute_crew``).
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._defaults: Optional[Dict[str, Any]] = None
+        self._defaults_ms = 0.0
+        self._agents: Dict[Tuple[type, str], Tuple[Agent, List[Any]]] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def default_config(self) -> Dict[str, Any]:
+        """Return the default agent config, resolving the LLM and memory once."""
+        with self._lock:
+            return dict(self._resolve_defaults())
+
+    def _resolve_defaults(self) -> Dict[str, Any]:
+        """Resolve the default config on first use (caller holds the lock)."""
+        if self._defaults is None:
+            start = time.perf_counter()
+            self._defaults = get_default_agent_config()
+            self._defaults_ms = (time.perf_counter() - start) * 1000
+        return self._defaults
+
+    def get(
+        self,
+        agent: "BaseVectraAgent",
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Agent, List[Any]]:
+        """
+        Return the CrewAI agent and tools for an agent, building them once.
+
+        Args:
+            agent: Vectra agent being initialized
+            config: Agent config overriding the defaults
+
+        Returns:
+            Tuple of (CrewAI Agent, tools)
+        """
+        config = config or {}
+        agent_class = type(agent)
+        key = (agent_class, _config_key(config))
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                agent_class.__name__, {"builds": 0, "hits": 0, "build_ms": 0.0}
+            )
+
+            entry = self._agents.get(key)
+            if entry is not None:
+                stats["hits"] += 1
+                return entry
+
+            agent_config = {**self._resolve_defaults(), **config}
+            start = time.perf_counter()
+            tools = agent._get_tools()
+            crewai_agent = agent._create_crewai_agent(agent_config, tools)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            stats["builds"] += 1
+            stats["build_ms"] += build_ms
+            entry = self._agents[key] = (crewai_agent, tools)
+
+        logger.info(
+            f"Built {agent_class.__name__} in {build_ms:.1f}ms",
+            extra={"agent": agent_class.__name__, "build_ms": round(build_ms, 1)},
+        )
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the measured construction cost.
+
+        Returns:
+            Time spent resolving defaults and, per agent class, the number of
+            builds and cache hits, total and average build time in ms
+        """
+        with self._lock:
+            agents = {}
+            for name, stats in self._stats.items():
+                builds = int(stats["builds"])
+                agents[name] = {
+                    "builds": builds,
+                    "hits": int(stats["hits"]),
+                    "build_ms": round(stats["build_ms"], 3),
+                    "avg_build_ms": round(stats["build_ms"] / builds, 3) if builds else 0.0,
+                }
+            return {"defaults_ms": round(self._defaults_ms, 3), "agents": agents}
+
+    def reset(self) -> None:
+        """Drop every cached agent and the resolved defaults."""
+        with self._lock:
+            self._defaults = None
+            self._defaults_ms = 0.0
+            self._agents.clear()
+            self._stats.clear()
+
+
+_registry: Optional[AgentRegistry] = None
+_registry_pid: Optional[int] = None
+
+
+def get_agent_registry() -> AgentRegistry:
+    """
+    Get the process-wide agent registry.
+
+    A new registry is created after a fork so that Celery prefork children
+    never reuse memory clients opened by the parent.
+
+    Returns:
+        AgentRegistry instance
+    """
+    global _registry, _registry_pid
+
+    if _registry is None or _registry_pid != os.getpid():
+        _registry = AgentRegistry()
+        _registry_pid = os.getpid()
+
+    return _registry
@@ -1,5 +1,21 @@
 """Scheduler agent package."""
 
-from app.agents.scheduler.agent import SchedulerAgent
+from importlib import import_module
+from typing import Any
 
-__all__ = ["SchedulerAgent"]
\ No newline at end of file
+# Resolved on first access: the draft streaming endpoint imports the
+# Scheduler prompts from the API process, which must not load CrewAI.
+_EXPORTS = {
+    "SchedulerAgent": "app.agents.scheduler.agent",
+}
+
+__all__ = ["SchedulerAgent"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import exported classes lazily."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,6 +1,8 @@
 """Scheduler agent for generating and sending personalized emails."""
 
-from typing import Dict, Any, Optional
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 
@@ -11,6 +13,7 @@ from app.services.calendly import CalendlyService
 from app.services.resend import send_email
 from app.db.models.lead import Lead, LeadStatus
 from app.db.models.email import Email, EmailStatus
+from app.db.models.agent_run import AgentType
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -27,10 +30,13 @@ class SchedulerAgent(BaseVectraAgent):
     - Update lead and email status in database
     """
 
+    agent_type = AgentType.SCHEDULER
+
     def __init__(
         self,
         config: Optional[Dict[str, Any]] = None,
         db: Optional[Session] = None,
+        email_sender: Optional[Callable[..., Dict[str, Any]]] = None,
     ):
         """
         Initialize Scheduler agent.
@@ -38,9 +44,11 @@ class SchedulerAgent(BaseVectraAgent):
         Args:
             config: Agent configuration
             db: Database session (optional, required for saving emails)
+            email_sender: Function sending emails (defaults to Resend send_email)
         """
         super().__init__(config)
         self.db = db
+        self.email_sender = email_sender or send_email
         self.email_generator = EmailGeneratorService()
         self.calendly_service = CalendlyService()
 
@@ -58,7 +66,7 @@ class SchedulerAgent(BaseVectraAgent):
         Tu sais créer des emails personnalisés qui génèrent des réponses positives et tu utilises
         des outils comme Calendly pour faciliter la prise de rendez-vous."""
 
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute email generation and sending.
         
@@ -120,7 +128,9 @@ class SchedulerAgent(BaseVectraAgent):
             sent = False
             if should_send and lead_email:
                 try:
-                    send_email(
+                    # Blocking HTTP call (Resend SDK): keep it off the event loop
+                    await asyncio.to_thread(
+                        self.email_sender,
                         to=lead_email,
                         subject=subject,
                         html_content=body,
@@ -132,6 +142,7 @@ class SchedulerAgent(BaseVectraAgent):
                         email = self.db.query(Email).filter(Email.id == UUID(email_id)).first()
                         if email:
                             email.status = EmailStatus.SENT
+                            email.sent_at = datetime.utcnow()
                             self.db.commit()
                     
                     # Update lead status
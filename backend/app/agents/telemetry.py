@@ -0,0 +1,183 @@
+"""Batched recording of agent runs (timing, tokens, API calls)."""
+
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.agents.prompting import truncate
+from app.db.models.agent_run import AgentRun, AgentRunStatus, AgentType
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Token budget of one text value in a recorded input summary
+SUMMARY_TEXT_TOKENS = 50
+
+# Lists of scalars longer than this are recorded as their length
+SUMMARY_MAX_LIST = 20
+
+
+def summarize_input(
+    input_data: Dict[str, Any],
+    projections: Optional[Mapping[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """
+    Return the compact form of an agent input stored in AgentRun.input_data.
+
+    Payloads named in ``projections`` are reduced by their function (e.g. to
+    the fields the agent's prompt reads). Other payloads keep their scalars
+    (ids, flags, thresholds, text cut to SUMMARY_TEXT_TOKENS) one level
+    deep, so raw enrichment documents are left out, and lists of records
+    are replaced by a ``<name>_count``.
+
+    Args:
+        input_data: Agent input
+        projections: Functions projecting top-level payloads, by key
+
+    Returns:
+        Summary of the input
+    """
+    projections = projections or {}
+    summary: Dict[str, Any] = {}
+    for key, value in input_data.items():
+        if key in projections and isinstance(value, dict):
+            summary[key] = projections[key](value)
+        else:
+            _summarize_value(summary, key, value, depth=1)
+    return summary
+
+
+def _summarize_value(summary: Dict[str, Any], key: str, value: Any, depth: int) -> None:
+    """Add the summary of one value to ``summary``."""
+    if isinstance(value, dict):
+        if depth > 0:
+            nested: Dict[str, Any] = {}
+            for nested_key, nested_value in value.items():
+                _summarize_value(nested, nested_key, nested_value, depth - 1)
+            summary[key] = nested
+    elif isinstance(value, (list, tuple)):
+        if len(value) <= SUMMARY_MAX_LIST and all(_is_scalar(item) for item in value):
+            summary[key] = [_summarize_scalar(item) for item in value]
+        else:
+            summary[f"{key}_count"] = len(value)
+    else:
+        summary[key] = _summarize_scalar(value)
+
+
+def _is_scalar(value: Any) -> bool:
+    """Return True for values that are not containers."""
+    return not isinstance(value, (dict, list, tuple, set))
+
+
+def _summarize_scalar(value: Any) -> Any:
+    """Cut long text; keep other scalars as they are."""
+    return truncate(value, SUMMARY_TEXT_TOKENS) if isinstance(value, str) else value
+
+
+def _jsonable(value: Any) -> Any:
+    """Return value with UUIDs, datetimes, etc. converted for a JSONB column."""
+    if value is None:
+        return None
+    return json.loads(json.dumps(value, default=str))
+
+
+class AgentRunRecorder:
+    """
+    Buffer of AgentRun rows written in batches.
+
+    Rows are added to the session with one multi-row INSERT once the buffer
+    is full (or on ``flush``) and are never committed here: they are
+    committed with the caller's next commit, so recording adds no commit per
+    lead. A failed insert only drops telemetry, it never fails the caller.
+    """
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            db: Database session
+            batch_size: Buffered rows that trigger a flush
+        """
+        self.db = db
+        self.batch_size = batch_size or settings.AGENT_RUN_RECORDER_BATCH_SIZE
+        self._rows: List[Dict[str, Any]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet added to the session."""
+        return len(self._rows)
+
+    def record(
+        self,
+        agent_type: AgentType,
+        campaign_id: UUID,
+        started_at: datetime,
+        completed_at: datetime,
+        duration_ms: int,
+        success: bool,
+        input_data: Optional[Dict[str, Any]] = None,
+        output_data: Optional[Any] = None,
+        error_message: Optional[str] = None,
+        tokens_used: int = 0,
+        api_calls: int = 0,
+    ) -> None:
+        """
+        Buffer one agent run.
+
+        Args:
+            agent_type: Agent type
+            campaign_id: Campaign the run belongs to
+            started_at: Start time (UTC)
+            completed_at: End time (UTC)
+            duration_ms: Wall time in milliseconds
+            success: Whether the run succeeded
+            input_data: Agent input summary (see summarize_input)
+            output_data: Agent output data
+            error_message: Error of a failed run
+            tokens_used: LLM tokens used
+            api_calls: External API calls made
+        """
+        self._rows.append({
+            "campaign_id": campaign_id,
+            "agent_type": agent_type,
+            "status": AgentRunStatus.COMPLETED if success else AgentRunStatus.FAILED,
+            "input_data": _jsonable(input_data),
+            "output_data": _jsonable(output_data),
+            "error_message": error_message,
+            "started_at": started_at,
+            "completed_at": completed_at,
+            "duration_ms": duration_ms,
+            "tokens_used": tokens_used,
+            "api_calls": api_calls,
+        })
+
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Add the buffered rows to the session with one INSERT (no commit).
+
+        Returns:
+            Number of rows written
+        """
+        if not self._rows:
+            return 0
+
+        rows, self._rows = self._rows, []
+        try:
+            # Savepoint so a failed insert does not abort the caller's transaction
+            with self.db.begin_nested():
+                self.db.execute(insert(AgentRun), rows)
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to record {len(rows)} agent runs: {e}")
+            return 0
+
+        return len(rows)
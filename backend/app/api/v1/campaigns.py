@@ -73,6 +73,7 @@ def create_campaign(
         target_criteria=request.target_criteria,
         email_template=request.email_template,
         bant_threshold=request.bant_threshold,
+        scoring_rules=request.scoring_rules,
         daily_limit=request.daily_limit,
     )
     
@@ -100,6 +101,7 @@ def update_campaign(
         target_criteria=request.target_criteria,
         email_template=request.email_template,
         bant_threshold=request.bant_threshold,
+        scoring_rules=request.scoring_rules,
         daily_limit=request.daily_limit,
     )
     
@@ -2,6 +2,7 @@
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
@@ -18,6 +19,7 @@ from app.schemas.lead import (
 from app.db.models.user import User
 from app.db.models.lead import Lead, LeadStatus
 from app.services.lead import LeadService
+from app.services.email_draft import EmailDraftService
 
 router = APIRouter()
 
@@ -32,6 +34,8 @@ def list_leads(
     search: Optional[str] = Query(None, description="Search by name, email, company"),
     created_after: Optional[datetime] = Query(None, description="Filter by creation date (after)"),
     created_before: Optional[datetime] = Query(None, description="Filter by creation date (before)"),
+    size_bucket: Optional[str] = Query(None, description="Filter by company size bucket (<10, 10-29, 30-99, 100-499, 500+)"),
+    seniority_tier: Optional[str] = Query(None, description="Filter by seniority tier"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_organization_user),
@@ -40,7 +44,8 @@ def list_leads(
     """
     List leads for current user's organization.
     
-    Supports filtering by campaign, status, intent, BANT score, and search.
+    Supports filtering by campaign, status, intent, BANT score, company size
+    bucket, seniority tier, and search.
     """
     service = LeadService(db)
     leads, total = service.list_leads(
@@ -53,6 +58,8 @@ def list_leads(
         search=search,
         created_after=created_after,
         created_before=created_before,
+        size_bucket=size_bucket,
+        seniority_tier=seniority_tier,
         skip=skip,
         limit=limit,
     )
@@ -108,7 +115,7 @@ def list_leads(
             job={"title": lead.job_title} if lead.job_title else None,
             bant=bant_info,
             intent=lead.intent.value if lead.intent else None,
-            intent_confidence=None,  # TODO: Store intent confidence
+            intent_confidence=lead.intent_confidence,
             status=lead.status.value,
             email_status=email_status,
             email_sent_at=email_sent_at,
@@ -214,7 +221,7 @@ def get_lead(
         job={"title": lead.job_title} if lead.job_title else None,
         bant=bant_info,
         intent=lead.intent.value if lead.intent else None,
-        intent_confidence=None,
+        intent_confidence=lead.intent_confidence,
         status=lead.status.value,
         email_status=email_status,
         email_sent_at=email_sent_at,
@@ -269,6 +276,29 @@ def get_lead_interactions(
     )
 
 
+@router.post("/{lead_id}/email-draft")
+def stream_email_draft(
+    lead_id: UUID,
+    current_user: User = Depends(get_organization_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Generate (or regenerate) a lead's email draft, streamed over SSE.
+    
+    Events: "start", one "token" per text delta as the LLM writes the draft,
+    then "done" with the draft saved as a PENDING email, or "error".
+    """
+    service = EmailDraftService(db)
+    # Resolve the lead first so a missing lead is a 404, not a broken stream
+    draft = service.build_prompt(user=current_user, lead_id=lead_id)
+    
+    return StreamingResponse(
+        service.stream_draft(draft),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{lead_id}", response_model=LeadResponse)
 def update_lead(
     lead_id: UUID,
@@ -337,7 +367,7 @@ def update_lead(
         job={"title": lead.job_title} if lead.job_title else None,
         bant=bant_info,
         intent=lead.intent.value if lead.intent else None,
-        intent_confidence=None,
+        intent_confidence=lead.intent_confidence,
         status=lead.status.value,
         email_status=email_status,
         email_sent_at=email_sent_at,
@@ -1,8 +1,15 @@
 """Application configuration using Pydantic Settings."""
 
+import os
+from pathlib import Path
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
+# backend/ directory, holding the default data directory var/
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
 
 class Settings(BaseSettings):
     """Application settings."""
@@ -33,6 +40,7 @@ class Settings(BaseSettings):
     OLLAMA_API_KEY: str = ""  # Set via environment variable
     OLLAMA_CLOUD_HOST: str = "https://ollama.com"
     CLAUDE_API_KEY: str = ""  # Set via environment variable
+    CLAUDE_MODEL: str = "claude-3-5-sonnet-latest"
 
     # External APIs
     ROCKETREACH_API_KEY: str = ""  # Set via environment variable
@@ -43,6 +51,70 @@ class Settings(BaseSettings):
     CALENDLY_API_KEY: str = ""  # Set via environment variable
     HUBSPOT_API_KEY: str = ""
 
+    # Campaign execution
+    CAMPAIGN_EXECUTION_MODE: str = "pipelined"  # "pipelined" or "phased"
+    CAMPAIGN_PIPELINE_QUEUE_SIZE: int = 100
+    CAMPAIGN_PIPELINE_BANT_CONCURRENCY: int = 8
+    CAMPAIGN_PIPELINE_BANT_BATCH_SIZE: int = 20  # Leads whose outcomes share one commit
+    CAMPAIGN_BANT_LLM_ANALYSIS: bool = False  # Score with batched LLM analysis, rules as fallback
+    CAMPAIGN_PIPELINE_SCHEDULER_CONCURRENCY: int = 4
+    CAMPAIGN_PIPELINE_SCHEDULER_BATCH_SIZE: int = 10  # Leads whose emails share one commit
+    CAMPAIGN_PROSPECTING_PAGE_SIZE: int = 25  # Prospects searched and inserted per page
+    CAMPAIGN_QUALIFICATION_BATCH_SIZE: int = 200
+    CAMPAIGN_SCHEDULING_BATCH_SIZE: int = 50
+    CAMPAIGN_CHECKPOINT_TTL: int = 7 * 24 * 3600  # 7 days
+    AGENT_RUNTIME_MAX_CONCURRENCY: int = 16
+    AGENT_RUN_RECORDER_BATCH_SIZE: int = 100
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 24 * 3600  # 1 day
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+
+    # Batched LLM analysis (several leads per request)
+    LLM_BATCH_MAX_ITEMS: int = 25
+    LLM_BATCH_OUTPUT_TOKENS_PER_ITEM: int = 300
+    LLM_CONTEXT_WINDOW: int = 8192  # Used when the model does not report one
+
+    # LLM gateway (per-provider limits shared by every agent in a process)
+    LLM_GATEWAY_ENABLED: bool = True
+    LLM_GATEWAY_QUEUE_TIMEOUT: float = 120.0  # Seconds a request may wait for a slot
+    LLM_GATEWAY_REQUEST_TIMEOUT: float = 120.0
+    LLM_GATEWAY_MAX_RETRIES: int = 3  # Retries after a 429
+    LLM_MAX_OUTPUT_TOKENS: int = 2048
+    LLM_GATEWAY_LATENCY_BUDGET: float = 90.0  # Seconds per LLM call, hedges included
+    LLM_GATEWAY_HEDGE_ENABLED: bool = True
+    LLM_GATEWAY_HEDGE_PERCENTILE: float = 0.95  # Primary latency that triggers a hedge
+    LLM_GATEWAY_HEDGE_DELAY: float = 15.0  # Hedge threshold until enough latencies are known
+    LLM_GATEWAY_HEDGE_MIN_SAMPLES: int = 20
+    LLM_GATEWAY_DEMOTE_AFTER: int = 3  # Consecutive failures or lost hedges
+    LLM_GATEWAY_DEMOTE_SECONDS: float = 60.0
+    OLLAMA_MAX_CONCURRENCY: int = 4
+    OLLAMA_REQUESTS_PER_MINUTE: int = 120
+    OLLAMA_TOKENS_PER_MINUTE: int = 200_000
+    CLAUDE_MAX_CONCURRENCY: int = 4
+    CLAUDE_REQUESTS_PER_MINUTE: int = 50
+    CLAUDE_TOKENS_PER_MINUTE: int = 40_000
+
+    # Streamed email drafts (approval queue)
+    EMAIL_DRAFT_MAX_TOKENS: int = 800
+    EMAIL_DRAFT_QUEUE_TIMEOUT: float = 10.0  # Seconds a draft may wait for an LLM slot
+    EMAIL_DRAFT_SKELETON_CACHE_ENABLED: bool = True  # Reuse drafts across leads with the same profile
+    EMAIL_DRAFT_SKELETON_TTL: int = 7 * 24 * 3600  # 7 days
+
+    # Drip scheduling (hours are UTC)
+    DRIP_SEND_WINDOW_START_HOUR: int = 8
+    DRIP_SEND_WINDOW_END_HOUR: int = 18
+    DRIP_TICK_SECONDS: int = 300
+
+    # Fuzzy lead deduplication across an organization's campaigns
+    LEAD_DEDUP_ENABLED: bool = True
+    LEAD_DEDUP_THRESHOLD: float = 0.85  # Cosine similarity of name and company
+    LEAD_SIMILARITY_DIMENSIONS: int = 128
+    # Absolute path shared by the API and the workers of one host (docker-compose
+    # mounts a volume); defaults to the backend's writable var/ directory
+    LEAD_SIMILARITY_INDEX_DIR: str = str(BACKEND_DIR / "var" / "lead_similarity")
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     EMAIL_DAILY_LIMIT: int = 50
@@ -61,6 +133,14 @@ class Settings(BaseSettings):
     # Platform Admin
     PLATFORM_ADMIN_EMAIL: str = "admin@vectra.io"  # Configurable via env
 
+    @field_validator("LEAD_SIMILARITY_INDEX_DIR")
+    @classmethod
+    def _absolute_index_dir(cls, value: str) -> str:
+        """Reject relative index paths, which would depend on each process's cwd."""
+        if not os.path.isabs(value):
+            raise ValueError("LEAD_SIMILARITY_INDEX_DIR must be an absolute path")
+        return value
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
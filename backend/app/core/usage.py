@@ -0,0 +1,41 @@
+"""Per-run usage metering (LLM tokens, external API calls)."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# Usage counters of the agent run executing in the current context
+_current_usage: ContextVar[Optional[Dict[str, Any]]] = ContextVar("agent_run_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[Dict[str, Any]]:
+    """
+    Collect LLM tokens and external API calls made inside the block.
+
+    The counters live in a context variable, so concurrent agent runs on the
+    same event loop (each in its own task) never mix their usage.
+
+    Yields:
+        Dict with "tokens" and "api_calls" (calls per service)
+    """
+    usage: Dict[str, Any] = {"tokens": 0, "api_calls": {}}
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_tokens(count: int) -> None:
+    """Add LLM tokens to the current agent run, if any."""
+    usage = _current_usage.get()
+    if usage is not None and count:
+        usage["tokens"] += count
+
+
+def record_api_call(service: str) -> None:
+    """Count one external API call for the current agent run, if any."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage["api_calls"][service] = usage["api_calls"].get(service, 0) + 1
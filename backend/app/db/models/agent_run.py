@@ -70,6 +70,7 @@ class AgentRun(BaseModel):
 
     # Resource usage
     tokens_used = Column(Integer)
+    api_calls = Column(Integer)
 
     # Relationships
     campaign = relationship("Campaign", back_populates="agent_runs")
@@ -62,6 +62,8 @@ class Campaign(BaseModel):
 
     # BANT qualification settings
     bant_threshold = Column(Integer, default=60, nullable=False)
+    # Overrides of the default scoring rules (app.services.scoring_plan)
+    scoring_rules = Column(JSONB)
 
     # Rate limiting
     daily_limit = Column(Integer, default=50, nullable=False)
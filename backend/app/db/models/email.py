@@ -1,6 +1,6 @@
 """Email model for generated and sent emails."""
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -102,3 +102,12 @@ class Email(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Email {self.subject[:30]}... ({self.status.value})>"
+
+
+# Emails sent per campaign and day (daily_limit enforcement)
+Index(
+    "idx_emails_campaign_sent",
+    Email.campaign_id,
+    Email.sent_at,
+    postgresql_where=Email.sent_at.isnot(None),
+)
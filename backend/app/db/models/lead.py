@@ -1,6 +1,6 @@
 """Lead model with BANT qualification."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum as SQLEnum, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import enum
@@ -74,15 +74,27 @@ class Lead(BaseModel):
     # Enrichment data from RocketReach/APIs
     enrichment_data = Column(JSONB, default=dict, nullable=False)
 
+    # Scoring features parsed once at ingest (see app.services.lead_features)
+    employees_min = Column(Integer)
+    employees_max = Column(Integer)
+    size_bucket = Column(String(10))  # "<10", "10-29", "30-99", "100-499", "500+"
+    seniority_tier = Column(String(20))  # c_level, vp, director, manager, individual
+    has_linkedin = Column(Boolean, default=False, nullable=False)
+
     # BANT qualification
     bant_score = Column(Integer, index=True)
     bant_breakdown = Column(JSONB)  # {budget: 20, authority: 25, need: 18, timeline: 15}
+    # Inputs and rules the rule-based score was computed from (see
+    # LeadRepository.update_scores); NULL means the score must be recomputed
+    scoring_fingerprint = Column(String(32))
+    scoring_plan_version = Column(String(16))
 
     # Intent classification (from email responses)
     intent = Column(
         SQLEnum(LeadIntent, name="lead_intent", create_type=False),
         nullable=True
     )
+    intent_confidence = Column(Float, nullable=True)  # 0.0-1.0
 
     # Status
     status = Column(
@@ -115,3 +127,15 @@ class Lead(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Lead {self.email} (score={self.bant_score})>"
+
+
+# Partial index used by the drip scheduler to pick the next leads to contact
+Index(
+    "idx_leads_qualified_score",
+    Lead.campaign_id,
+    Lead.bant_score.desc().nulls_last(),
+    postgresql_where=Lead.status == LeadStatus.QUALIFIED,
+)
+
+# Size filter of the leads list
+Index("idx_leads_org_size_bucket", Lead.organization_id, Lead.size_bucket)
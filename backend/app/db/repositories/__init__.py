@@ -2,5 +2,6 @@
 
 from app.db.repositories.user import UserRepository
 from app.db.repositories.organization import OrganizationRepository
+from app.db.repositories.lead import LeadRepository
 
-__all__ = ["UserRepository", "OrganizationRepository"]
+__all__ = ["UserRepository", "OrganizationRepository", "LeadRepository"]
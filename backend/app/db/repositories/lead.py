@@ -0,0 +1,277 @@
+"""Lead repository for database operations."""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import literal_column, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models.lead import Lead, LeadStatus
+from app.services.lead_features import lead_features, parse_company_size
+from app.services.title_classifier import classify_seniority
+
+# Rows per multi-row INSERT; keeps bind parameters well under PostgreSQL's 65535 limit
+INGEST_BATCH_SIZE = 1000
+
+# Rows per score UPDATE; values travel as three array parameters, so this
+# only bounds the size of one statement
+SCORE_UPDATE_BATCH_SIZE = 10000
+
+# Digest of the lead columns the rule-based score reads: company size, job
+# title, company name (the industry the pipeline passes) and the enrichment
+# signals. Any change to them changes the fingerprint.
+SCORING_FINGERPRINT_SQL = """md5(jsonb_build_array(
+        leads.company_size,
+        leads.job_title,
+        leads.company_name,
+        leads.enrichment_data #> '{raw_data,current_employer_size}',
+        leads.enrichment_data #> '{raw_data,seniority_level}',
+        leads.enrichment_data #> '{raw_data,updated_at}'
+    )::text)"""
+
+_SCORING_FINGERPRINT = literal_column(SCORING_FINGERPRINT_SQL)
+
+# Scores from a scoring plan record the fingerprint of the row they were
+# computed from; other scores (e.g. from the LLM) clear it
+_UPDATE_SCORES = text(
+    """
+    UPDATE leads
+    SET bant_score = scores.bant_score,
+        bant_breakdown = scores.bant_breakdown,
+        scoring_fingerprint = CASE WHEN CAST(:plan_version AS varchar) IS NULL THEN NULL ELSE {fingerprint} END,
+        scoring_plan_version = CAST(:plan_version AS varchar),
+        updated_at = now()
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:bant_scores AS integer[]), CAST(:bant_breakdowns AS jsonb[]))
+        AS scores (id, bant_score, bant_breakdown)
+    WHERE leads.id = scores.id
+    """.format(fingerprint=SCORING_FINGERPRINT_SQL)
+)
+
+
+class LeadRepository:
+    """Repository for set-based Lead operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def existing_emails(
+        self,
+        campaign_id: UUID,
+        emails: Iterable[str],
+        batch_size: int = INGEST_BATCH_SIZE,
+    ) -> Set[str]:
+        """Return the subset of emails that already have a lead in the campaign."""
+        unique = list({email for email in emails if email})
+        existing: Set[str] = set()
+
+        for start in range(0, len(unique), batch_size):
+            chunk = unique[start:start + batch_size]
+            rows = (
+                self.db.query(Lead.email)
+                .filter(Lead.campaign_id == campaign_id, Lead.email.in_(chunk))
+                .all()
+            )
+            existing.update(row.email for row in rows)
+
+        return existing
+
+    def bulk_insert(
+        self,
+        campaign_id: UUID,
+        organization_id: UUID,
+        prospects: List[Dict[str, Any]],
+        status: LeadStatus = LeadStatus.ENRICHED,
+        batch_size: int = INGEST_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Insert prospects as leads with one statement per batch.
+
+        Uses ``INSERT ... ON CONFLICT ON CONSTRAINT uq_lead_campaign_email
+        DO NOTHING RETURNING id`` so duplicates are skipped by the database
+        instead of being checked one SELECT at a time.
+
+        Args:
+            campaign_id: Campaign ID
+            organization_id: Organization ID
+            prospects: Prospect dictionaries (as returned by the Prospector)
+            status: Initial lead status
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            Dictionary with inserted/skipped/invalid counts and inserted lead IDs
+        """
+        rows = []
+        seen: Set[str] = set()
+        invalid = 0
+
+        for prospect in prospects:
+            email = prospect.get("email")
+            if not email:
+                invalid += 1
+                continue
+            if email in seen:
+                continue
+            seen.add(email)
+
+            rows.append({
+                "id": uuid4(),
+                "campaign_id": campaign_id,
+                "organization_id": organization_id,
+                "email": email,
+                "first_name": prospect.get("first_name"),
+                "last_name": prospect.get("last_name"),
+                "phone": prospect.get("phone"),
+                "job_title": prospect.get("job_title"),
+                "company_name": prospect.get("company_name"),
+                "company_size": prospect.get("company_size"),
+                "linkedin_url": prospect.get("linkedin_url"),
+                "enrichment_data": prospect.get("enrichment_data") or {},
+                "status": status,
+                "source": prospect.get("source", "rocketreach"),
+                # Parsed once here so scoring and filters read columns
+                **lead_features(
+                    prospect.get("company_size"),
+                    prospect.get("job_title"),
+                    prospect.get("linkedin_url"),
+                ),
+            })
+
+        inserted_ids: List[UUID] = []
+        for start in range(0, len(rows), batch_size):
+            stmt = (
+                pg_insert(Lead)
+                .values(rows[start:start + batch_size])
+                .on_conflict_do_nothing(constraint="uq_lead_campaign_email")
+                .returning(Lead.id)
+            )
+            inserted_ids.extend(self.db.execute(stmt).scalars().all())
+
+        self.db.commit()
+
+        return {
+            "inserted": len(inserted_ids),
+            "skipped": len(prospects) - len(inserted_ids) - invalid,
+            "invalid": invalid,
+            "lead_ids": inserted_ids,
+        }
+
+    def scoring_columns(self, campaign_id: UUID, stale_for: Optional[str] = None) -> Dict[str, List[Any]]:
+        """
+        Load the BANT scoring inputs of a campaign's leads as columns.
+
+        Company sizes and titles are read as their stored features (parsed
+        at ingest; rows written before the features existed are parsed
+        here), and only the enrichment signals the scorer reads are
+        extracted from the JSONB document, so full enrichment payloads are
+        not transferred.
+
+        Args:
+            campaign_id: Campaign ID
+            stale_for: Scoring plan version; when given, only leads whose
+                score was not computed by this plan version from their
+                current inputs are loaded
+
+        Returns:
+            Dictionary of equal-length lists: ids, company_sizes,
+            max_employees, job_titles, seniority_tiers, industries (the company name, as
+            the campaign pipeline passes it) and signals (see
+            BANTScoringService.enrichment_signals)
+        """
+        raw_data = Lead.enrichment_data["raw_data"]
+        query = (
+            self.db.query(
+                Lead.id,
+                Lead.company_size,
+                Lead.employees_max,
+                Lead.job_title,
+                Lead.seniority_tier,
+                Lead.company_name,
+                raw_data["current_employer_size"],
+                raw_data["seniority_level"],
+                raw_data["updated_at"],
+            )
+            .filter(Lead.campaign_id == campaign_id)
+        )
+        if stale_for is not None:
+            query = query.filter(or_(
+                Lead.scoring_plan_version.is_distinct_from(stale_for),
+                Lead.scoring_fingerprint.is_distinct_from(_SCORING_FINGERPRINT),
+            ))
+        rows = query.order_by(Lead.id).all()
+        return {
+            "ids": [row[0] for row in rows],
+            "company_sizes": [row[1] for row in rows],
+            "max_employees": [
+                row[2] if row[2] is not None or not row[1] else parse_company_size(row[1])[1]
+                for row in rows
+            ],
+            "job_titles": [row[3] for row in rows],
+            "seniority_tiers": [row[4] or classify_seniority(row[3]) for row in rows],
+            "industries": [row[5] for row in rows],
+            "signals": [(bool(row[6]), bool(row[7]), bool(row[8])) for row in rows],
+        }
+
+    def update_scores(
+        self,
+        scores: List[Dict[str, Any]],
+        batch_size: int = SCORE_UPDATE_BATCH_SIZE,
+        plan_version: Optional[str] = None,
+    ) -> int:
+        """
+        Write BANT scores for many leads in one UPDATE per batch.
+
+        Uses ``UPDATE leads ... FROM unnest(ids, scores, breakdowns)`` so the
+        whole batch is a single statement with three array parameters rather
+        than one statement per lead. Does not commit, so callers can group it
+        with the status transitions of the same batch.
+
+        Args:
+            scores: Dictionaries with "id", "bant_score" and "bant_breakdown"
+            batch_size: Rows per UPDATE statement
+            plan_version: Version of the scoring plan that computed the
+                scores; each lead then records it with the fingerprint of its
+                current inputs, so later rescores can skip it. Without it the
+                fingerprint is cleared.
+
+        Returns:
+            Number of leads updated
+        """
+        updated = 0
+        for start in range(0, len(scores), batch_size):
+            chunk = scores[start:start + batch_size]
+            result = self.db.execute(_UPDATE_SCORES, {
+                "plan_version": plan_version,
+                "ids": [score["id"] for score in chunk],
+                "bant_scores": [score["bant_score"] for score in chunk],
+                "bant_breakdowns": [
+                    json.dumps(score["bant_breakdown"], ensure_ascii=False)
+                    if score["bant_breakdown"] is not None else None
+                    for score in chunk
+                ],
+            })
+            updated += result.rowcount
+        return updated
+
+    def qualified_below(self, campaign_id: UUID, threshold: int) -> List[UUID]:
+        """
+        Return the QUALIFIED leads of a campaign whose score is below a threshold.
+
+        Args:
+            campaign_id: Campaign ID
+            threshold: Qualification threshold
+
+        Returns:
+            Lead IDs
+        """
+        rows = (
+            self.db.query(Lead.id)
+            .filter(
+                Lead.campaign_id == campaign_id,
+                Lead.status == LeadStatus.QUALIFIED,
+                Lead.bant_score < threshold,
+            )
+            .all()
+        )
+        return [row[0] for row in rows]
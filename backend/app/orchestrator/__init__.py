@@ -1,6 +1,23 @@
 """Orchestrator package for campaign state management."""
 
-from app.orchestrator.state_machine import LeadStateMachine
-from app.orchestrator.campaign_runner import CampaignRunner
+from importlib import import_module
+from typing import Any
+
+# Exports resolved on first access: importing a submodule (e.g. the state
+# machine from an API route) must not load the agents and CrewAI through
+# campaign_runner.
+_EXPORTS = {
+    "LeadStateMachine": "app.orchestrator.state_machine",
+    "CampaignRunner": "app.orchestrator.campaign_runner",
+}
 
 __all__ = ["LeadStateMachine", "CampaignRunner"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import exported classes lazily."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,23 +1,38 @@
 """Campaign orchestrator for running prospection campaigns."""
 
-from typing import Dict, Any, Optional, List
+import asyncio
+import copy
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Iterator
 from uuid import UUID
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.email import Email, EmailStatus
 from app.db.models.lead import Lead, LeadStatus
 from app.db.models.user import User
-from app.orchestrator.state_machine import LeadStateMachine, TransitionError
+from app.db.repositories.lead import LeadRepository
+from app.orchestrator.state_machine import LeadStateMachine
+from app.orchestrator.checkpoint import CampaignCheckpoint
+from app.orchestrator.drip import DripScheduler
+from app.orchestrator.pipeline import Pipeline, PipelineStage
+from app.orchestrator.runtime import AgentRuntime, get_runtime
 from app.agents.prospector.agent import ProspectorAgent
 from app.agents.bant.agent import BANTAgent
 from app.agents.scheduler.agent import SchedulerAgent
+from app.agents.telemetry import AgentRunRecorder
+from app.services.lead_similarity import LeadSimilarityService
+from app.services.rocketreach import RocketReachService
+from app.services.scoring_plan import ScoringPlan
 from app.core.logging import get_logger
 from app.core.config import settings
+import json
 import redis
 
 logger = get_logger(__name__)
 
+EXECUTION_MODES = ("pipelined", "phased")
+
 
 class CampaignRunner:
     """
@@ -25,23 +40,67 @@ class CampaignRunner:
     
     Flow:
     PROSPECTING → QUALIFYING → SCHEDULING → COMPLETED
+    
+    Emails are capped at the campaign's daily_limit: leads over today's
+    quota stay QUALIFIED and the campaign stays ACTIVE until the drip
+    scheduler has contacted them on the following days.
+    
+    Progress is checkpointed in Redis (phase, keyset cursor and counts), so
+    running a campaign whose previous run was interrupted resumes it instead
+    of starting over.
+    
+    Two execution modes are available:
+    - phased: each phase runs over every lead before the next one starts
+    - pipelined: leads flow through prospect → BANT → schedule stages
+      connected by bounded queues, so the first email goes out as soon as
+      the first lead is qualified
     """
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        mode: Optional[str] = None,
+        runtime: Optional[AgentRuntime] = None,
+        rocketreach_service: Optional[RocketReachService] = None,
+        email_sender: Optional[Callable[..., Dict[str, Any]]] = None,
+        agent_config: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize campaign runner.
         
         Args:
             db: Database session
+            mode: Execution mode ("pipelined" or "phased"), defaults to settings
+            runtime: Agent runtime (defaults to the process-wide runtime)
+            rocketreach_service: RocketReach service (defaults to one using
+                the runtime's HTTP client)
+            email_sender: Function sending outreach emails (defaults to Resend)
+            agent_config: CrewAI config passed to every agent (e.g. the LLM)
         """
         self.db = db
+        self.mode = mode or settings.CAMPAIGN_EXECUTION_MODE
+        if self.mode not in EXECUTION_MODES:
+            raise ValueError(f"Invalid execution mode: {self.mode}")
+        
         self.redis_client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
         self.state_machine = LeadStateMachine()
+        self.runtime = runtime or get_runtime()
         
         # Initialize agents
-        self.prospector = ProspectorAgent(db=db)
-        self.bant = BANTAgent(db=db)
-        self.scheduler = SchedulerAgent(db=db)
+        self.prospector = ProspectorAgent(
+            config=agent_config,
+            db=db,
+            rocketreach_service=(
+                rocketreach_service or RocketReachService(http_client=self.runtime.http_client)
+            ),
+        )
+        self.bant = BANTAgent(config=agent_config, db=db)
+        self.scheduler = SchedulerAgent(config=agent_config, db=db, email_sender=email_sender)
+        
+        # AgentRun rows are flushed into the session before batch commits
+        self.run_recorder = AgentRunRecorder(db)
+        for agent in (self.prospector, self.bant, self.scheduler):
+            agent.run_recorder = self.run_recorder
     
     def run_campaign(self, campaign_id: UUID) -> Dict[str, Any]:
         """
@@ -49,7 +108,7 @@ class CampaignRunner:
         
         Args:
             campaign_id: Campaign UUID
-            
+        
         Returns:
             Result dictionary with campaign execution status
         """
@@ -59,10 +118,10 @@ class CampaignRunner:
                 raise ValueError(f"Campaign {campaign_id} not found")
             
             # Check email verification
-            if campaign.created_by:
-                creator = self.db.query(User).filter(User.id == campaign.created_by).first()
-                if creator and not creator.email_verified_at:
-                    raise ValueError("Email verification required to launch campaigns. Please verify your email first.")
+            self.check_creator_verified(campaign)
+            
+            # Scoring rules are compiled once for the whole run
+            self.use_scoring_plan(campaign)
             
             # Update campaign status
             campaign.status = CampaignStatus.ACTIVE
@@ -73,36 +132,57 @@ class CampaignRunner:
             # Store campaign state in Redis
             self._set_campaign_state(campaign_id, {"status": "running", "started_at": datetime.utcnow().isoformat()})
             
-            # Step 1: Prospecting
-            logger.info(f"Starting prospecting for campaign {campaign_id}")
-            prospecting_result = self._run_prospecting(campaign)
+            # Resume an interrupted run from its checkpoint
+            checkpoint = CampaignCheckpoint(campaign_id, self.redis_client)
+            resume_from = checkpoint.load()
+            if checkpoint.is_resumable(resume_from):
+                logger.info(
+                    f"Resuming campaign {campaign_id} from {resume_from.get('phase')}",
+                    extra={"campaign_id": str(campaign_id), "cursor": resume_from.get("cursor")}
+                )
+                checkpoint.resume()
+            else:
+                resume_from = {}
+                checkpoint.start(self.mode)
             
-            # Step 2: Qualification (BANT)
-            logger.info(f"Starting qualification for campaign {campaign_id}")
-            qualification_result = self._run_qualification(campaign)
+            if self.mode == "pipelined":
+                logger.info(f"Running campaign {campaign_id} in pipelined mode")
+                phase_results = self.runtime.run(self._run_pipelined(campaign, checkpoint, resume_from))
+            else:
+                phase_results = self._run_phased(campaign, checkpoint, resume_from)
             
-            # Step 3: Scheduling (Email sending)
-            logger.info(f"Starting email scheduling for campaign {campaign_id}")
-            scheduling_result = self._run_scheduling(campaign)
+            # Agent runs still buffered (pipelined mode records per lead)
+            if self.run_recorder.flush():
+                self.db.commit()
             
-            # Update campaign status
-            campaign.status = CampaignStatus.COMPLETED
-            campaign.completed_at = datetime.utcnow()
-            self.db.commit()
+            checkpoint.complete()
             
-            self._set_campaign_state(campaign_id, {"status": "completed", "completed_at": datetime.utcnow().isoformat()})
+            # Leads over today's quota are left to the drip scheduler
+            if DripScheduler(self.db, runner=self).has_pending_leads(campaign.id):
+                self._set_campaign_state(campaign_id, {"status": "dripping", "updated_at": datetime.utcnow().isoformat()})
+            else:
+                # Update campaign status
+                campaign.status = CampaignStatus.COMPLETED
+                campaign.completed_at = datetime.utcnow()
+                self.db.commit()
+                
+                self._set_campaign_state(campaign_id, {"status": "completed", "completed_at": datetime.utcnow().isoformat()})
             
             return {
                 "success": True,
                 "campaign_id": str(campaign_id),
-                "prospecting": prospecting_result,
-                "qualification": qualification_result,
-                "scheduling": scheduling_result,
+                "mode": self.mode,
+                "resumed_from": resume_from.get("phase"),
+                **phase_results,
             }
-            
+        
         except Exception as e:
             logger.error(f"Error running campaign {campaign_id}: {e}", exc_info=True)
             
+            # Keep phase and cursor so the next run resumes
+            self.db.rollback()
+            CampaignCheckpoint(campaign_id, self.redis_client).fail(str(e))
+            
             # Update campaign status to paused on error
             campaign = self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
             if campaign:
@@ -115,192 +195,791 @@ class CampaignRunner:
                 "error": str(e),
             }
     
+    @staticmethod
+    def _check_phase(phase: str, result: Dict[str, Any]) -> None:
+        """
+        Stop the run if a phase failed.
+        
+        The error reaches run_campaign, which marks the checkpoint failed
+        (keeping its phase) and pauses the campaign.
+        
+        Raises:
+            RuntimeError: If the phase result is not successful
+        """
+        if not result.get("success"):
+            raise RuntimeError(f"Campaign {phase} failed: {result.get('error', 'unknown error')}")
+    
+    def use_scoring_plan(self, campaign: Campaign) -> None:
+        """Compile the campaign's scoring rules and register the plan on the BANT agent."""
+        self.bant.use_scoring_plan(campaign.id, ScoringPlan.for_campaign(campaign))
+    
+    def check_creator_verified(self, campaign: Campaign) -> None:
+        """
+        Ensure the campaign creator has verified their email.
+        
+        Raises:
+            ValueError: If the creator's email is not verified
+        """
+        if campaign.created_by:
+            creator = self.db.query(User).filter(User.id == campaign.created_by).first()
+            if creator and not creator.email_verified_at:
+                raise ValueError("Email verification required to launch campaigns. Please verify your email first.")
+    
+    def run_prospecting(self, campaign: Campaign) -> Dict[str, Any]:
+        """
+        Run prospecting once for the campaign.
+        
+        Used by distributed runs, where qualification and scheduling are
+        fanned out to Celery workers afterwards.
+        """
+        return self._run_prospecting(campaign)
+    
+    def qualify_leads(
+        self,
+        campaign: Campaign,
+        lead_ids: List[UUID],
+        include_scoring: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Qualify the given leads as one batch.
+        
+        Leads that are no longer ENRICHED (e.g. handled by another worker)
+        are skipped.
+        
+        Args:
+            campaign: Campaign
+            lead_ids: Lead IDs to qualify
+            include_scoring: Also qualify leads left in SCORING by an
+                interrupted run
+            
+        Returns:
+            Counts of qualified and rejected leads
+        """
+        statuses = [LeadStatus.ENRICHED]
+        if include_scoring:
+            statuses.append(LeadStatus.SCORING)
+        
+        leads = self.db.query(Lead).filter(
+            Lead.id.in_(lead_ids),
+            Lead.campaign_id == campaign.id,
+            Lead.status.in_(statuses)
+        ).all()
+        if not leads:
+            return {"qualified": 0, "rejected": 0}
+        
+        self.use_scoring_plan(campaign)
+        return self.runtime.run(self._qualify_batch(campaign, leads))
+    
+    def schedule_leads(self, campaign: Campaign, lead_ids: List[UUID]) -> Dict[str, int]:
+        """
+        Send outreach emails to the given qualified leads.
+        
+        Args:
+            campaign: Campaign
+            lead_ids: Lead IDs to contact
+            
+        Returns:
+            Counts of sent and failed emails
+        """
+        leads = self.db.query(Lead).filter(
+            Lead.id.in_(lead_ids),
+            Lead.campaign_id == campaign.id,
+            Lead.status == LeadStatus.QUALIFIED
+        ).all()
+        
+        return self._schedule_batch(campaign, leads)
+    
+    def _run_phased(
+        self,
+        campaign: Campaign,
+        checkpoint: CampaignCheckpoint,
+        resume_from: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run each phase over every lead before starting the next one.
+        
+        A phase that fails stops the run before the checkpoint moves past
+        it, so the next run resumes from that phase.
+        """
+        resumed_phase = resume_from.get("phase")
+        
+        # Step 1: Prospecting
+        if checkpoint.phase_done(resume_from, "prospecting"):
+            prospecting_result = {"success": True, "skipped": True}
+        else:
+            logger.info(f"Starting prospecting for campaign {campaign.id}")
+            prospecting_result = self._run_prospecting(campaign)
+            self._check_phase("prospecting", prospecting_result)
+            checkpoint.set_phase("qualification")
+        
+        # Step 2: Qualification (BANT)
+        if checkpoint.phase_done(resume_from, "qualification"):
+            qualification_result = {"success": True, "skipped": True}
+        else:
+            logger.info(f"Starting qualification for campaign {campaign.id}")
+            qualification_result = self._run_qualification(
+                campaign,
+                checkpoint,
+                cursor=resume_from.get("cursor") if resumed_phase == "qualification" else None,
+            )
+            self._check_phase("qualification", qualification_result)
+            checkpoint.set_phase("scheduling")
+        
+        # Step 3: Scheduling (Email sending)
+        logger.info(f"Starting email scheduling for campaign {campaign.id}")
+        scheduling_result = self._run_scheduling(campaign, checkpoint)
+        self._check_phase("scheduling", scheduling_result)
+        
+        return {
+            "prospecting": prospecting_result,
+            "qualification": qualification_result,
+            "scheduling": scheduling_result,
+        }
+    
+    async def _run_pipelined(
+        self,
+        campaign: Campaign,
+        checkpoint: CampaignCheckpoint,
+        resume_from: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run prospect → BANT → schedule as overlapping stages.
+        
+        Each stage has its own concurrency; bounded queues between stages
+        keep memory flat and apply backpressure to the stage upstream.
+        Qualification and scheduling take the leads already waiting in
+        their queue as a small batch, so a batch's scores (or emails) and
+        outcomes are written in one commit. Each stage writes through its own
+        session (see ``_stage_runner``), so a commit in one stage never
+        carries another stage's pending writes. Leads an
+        earlier run left in SCORING are qualified again and leads left in
+        QUALIFIED go straight to scheduling. If prospecting fails, the leads
+        it already emitted are still processed, then the run fails without
+        moving the checkpoint past prospecting.
+        """
+        counts = {"qualified": 0, "rejected": 0, "sent": 0, "failed": 0, "deferred": 0}
+        already_qualified = set()
+        
+        # Stages hand lead IDs to each other and load them in their own session
+        qualifying = self._stage_runner()
+        scheduling = self._stage_runner()
+        
+        async def prospect(emit: Callable[[UUID], Awaitable[None]]) -> Dict[str, Any]:
+            async def emit_enriched(lead_ids: List[UUID]) -> None:
+                # Move leads to SCORING one batch (and one commit) at a time
+                batch_size = settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE
+                for start in range(0, len(lead_ids), batch_size):
+                    moved = self.state_machine.transition_many(
+                        lead_ids[start:start + batch_size], LeadStatus.SCORING, self.db
+                    )["moved"]
+                    for lead_id in sorted(moved):
+                        await emit(lead_id)
+            
+            # Leads an earlier run stranded mid-way, whether or not it is resumed
+            stranded = self.db.query(Lead.id, Lead.status).filter(
+                Lead.campaign_id == campaign.id,
+                Lead.status.in_([LeadStatus.SCORING, LeadStatus.QUALIFIED])
+            ).all()
+            for lead_id, status in stranded:
+                if status == LeadStatus.QUALIFIED:
+                    already_qualified.add(lead_id)
+                await emit(lead_id)
+            
+            # Leads left over from a previous run go first
+            leftover = self.db.query(Lead.id).filter(
+                Lead.campaign_id == campaign.id,
+                Lead.status == LeadStatus.ENRICHED
+            ).order_by(Lead.id).all()
+            await emit_enriched([row.id for row in leftover])
+            
+            # New leads flow downstream page by page, while the next page is searched
+            if checkpoint.phase_done(resume_from, "prospecting"):
+                result = {"success": True, "skipped": True}
+            else:
+                result = await self._prospect(campaign, on_page=emit_enriched)
+                if result["success"]:
+                    checkpoint.set_phase("qualification")
+            
+            return result
+        
+        # Shared by all qualification workers, so batching does not multiply LLM calls
+        bant_slots = asyncio.Semaphore(settings.CAMPAIGN_PIPELINE_BANT_CONCURRENCY)
+        qualifying_campaign = qualifying.db.get(Campaign, campaign.id)
+        
+        async def qualify(lead_ids: List[UUID]) -> List[UUID]:
+            resumed = [lead_id for lead_id in lead_ids if lead_id in already_qualified]
+            pending = [lead_id for lead_id in lead_ids if lead_id not in already_qualified]
+            if not pending:
+                return resumed
+            
+            # Scores and outcomes of the whole batch share one commit
+            leads = qualifying.db.query(Lead).filter(Lead.id.in_(pending)).order_by(Lead.id).all()
+            outcomes = await qualifying._qualify_batch_outcomes(qualifying_campaign, leads, bant_slots)
+            batch_counts = {outcome: len(ids) for outcome, ids in outcomes.items()}
+            for outcome, count in batch_counts.items():
+                counts[outcome] += count
+            checkpoint.advance(**batch_counts)
+            return resumed + outcomes["qualified"]
+        
+        # Today's quota; qualified leads beyond it are left to the drip scheduler
+        remaining = DripScheduler(self.db, runner=self).remaining_today(campaign)
+        scheduling_campaign = scheduling.db.get(Campaign, campaign.id)
+        
+        async def schedule(lead_ids: List[UUID]) -> List[UUID]:
+            nonlocal remaining
+            batch = lead_ids[:max(remaining, 0)]
+            counts["deferred"] += len(lead_ids) - len(batch)
+            if not batch:
+                return []
+            
+            # Reserve the slots before awaiting so concurrent workers cannot overshoot
+            remaining -= len(batch)
+            leads = scheduling.db.query(Lead).filter(
+                Lead.id.in_(batch),
+                Lead.status == LeadStatus.QUALIFIED
+            ).all()
+            # Emails and outcomes of the whole batch share one commit
+            sent = await scheduling._schedule_batch_outcomes(scheduling_campaign, leads)
+            remaining += len(batch) - len(sent)
+            batch_counts = {"sent": len(sent), "failed": len(batch) - len(sent)}
+            for outcome, count in batch_counts.items():
+                counts[outcome] += count
+            checkpoint.advance(**batch_counts)
+            return sent
+        
+        pipeline = Pipeline(
+            source=prospect,
+            source_name="prospecting",
+            stages=[
+                PipelineStage(
+                    "qualification",
+                    qualify,
+                    settings.CAMPAIGN_PIPELINE_BANT_CONCURRENCY,
+                    batch_size=settings.CAMPAIGN_PIPELINE_BANT_BATCH_SIZE,
+                ),
+                PipelineStage(
+                    "scheduling",
+                    schedule,
+                    settings.CAMPAIGN_PIPELINE_SCHEDULER_CONCURRENCY,
+                    batch_size=settings.CAMPAIGN_PIPELINE_SCHEDULER_BATCH_SIZE,
+                ),
+            ],
+            queue_size=settings.CAMPAIGN_PIPELINE_QUEUE_SIZE,
+        )
+        try:
+            report = await pipeline.run()
+        finally:
+            qualifying.db.close()
+            scheduling.db.close()
+        self._check_phase("prospecting", report["source"])
+        
+        return {
+            "prospecting": report["source"],
+            "qualification": {
+                "success": True,
+                "qualified": counts["qualified"],
+                "rejected": counts["rejected"],
+            },
+            "scheduling": {
+                "success": True,
+                "sent": counts["sent"],
+                "failed": counts["failed"],
+                "deferred": counts["deferred"],
+            },
+            "pipeline": {
+                "elapsed_s": report["elapsed_s"],
+                "time_to_first_email_s": report["time_to_first_output_s"],
+                "stages": report["stages"],
+            },
+        }
+    
+    def _stage_runner(self) -> "CampaignRunner":
+        """
+        Return a copy of this runner writing through a session of its own.
+        
+        The stages of a pipelined run interleave on one event loop. With a
+        session, agent run recorder and BANT/scheduler agent copies per
+        stage, a stage's commit only holds that stage's writes (prospecting
+        keeps the runner's own session). The caller closes the session.
+        """
+        stage = copy.copy(self)
+        stage.db = Session(bind=self.db.get_bind())
+        stage.run_recorder = AgentRunRecorder(stage.db)
+        for name in ("bant", "scheduler"):
+            agent = copy.copy(getattr(self, name))
+            agent.db = stage.db
+            agent.run_recorder = stage.run_recorder
+            setattr(stage, name, agent)
+        return stage
+    
     def _run_prospecting(self, campaign: Campaign) -> Dict[str, Any]:
         """Run prospecting phase."""
+        return self.runtime.run(self._prospect(campaign))
+    
+    async def _prospect(
+        self,
+        campaign: Campaign,
+        on_page: Optional[Callable[[List[UUID]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Find prospects for the campaign and store them as enriched leads.
+        
+        The search is paged: each page of prospects is inserted as soon as
+        the prospector returns it, then ``on_page`` is awaited with the IDs of
+        the leads inserted, so they can be qualified while the next page is
+        searched.
+        
+        Args:
+            campaign: Campaign
+            on_page: Coroutine function called with each page's new lead IDs
+        """
+        limit = campaign.daily_limit
+        page_size = settings.CAMPAIGN_PROSPECTING_PAGE_SIZE
+        repository = LeadRepository(self.db)
+        searched = 0
+        totals = {"leads_found": 0, "leads_created": 0, "leads_skipped": 0}
+        
         try:
-            input_data = {
-                "campaign_id": str(campaign.id),
-                "organization_id": str(campaign.organization_id),
-                "job_titles": campaign.target_criteria.get("job_titles", []),
-                "geography": campaign.target_criteria.get("geography", []),
-                "company_size": campaign.target_criteria.get("company_size", []),
-                "limit": campaign.daily_limit,
-            }
-            
-            import asyncio
-            result = asyncio.run(self.prospector.execute(input_data))
-            
-            if result["success"]:
+            while searched < limit:
+                size = min(page_size, limit - searched)
+                input_data = {
+                    "campaign_id": str(campaign.id),
+                    "organization_id": str(campaign.organization_id),
+                    "job_titles": campaign.target_criteria.get("job_titles", []),
+                    "geography": campaign.target_criteria.get("geography", []),
+                    "company_size": campaign.target_criteria.get("company_size", []),
+                    "limit": size,
+                    "start": searched + 1,
+                }
+                
+                result = await self.prospector.execute(input_data)
+                self.run_recorder.flush()
+                
+                if not result["success"]:
+                    return {**result, **totals}
+                
                 prospects = result["data"].get("prospects", [])
-                leads_created = 0
                 
-                for prospect in prospects:
-                    # Check for duplicates
-                    existing = self.db.query(Lead).filter(
-                        Lead.campaign_id == campaign.id,
-                        Lead.email == prospect.get("email")
-                    ).first()
-                    
-                    if not existing:
-                        lead = Lead(
-                            campaign_id=campaign.id,
-                            organization_id=campaign.organization_id,
-                            email=prospect.get("email"),
-                            first_name=prospect.get("first_name"),
-                            last_name=prospect.get("last_name"),
-                            job_title=prospect.get("job_title"),
-                            company_name=prospect.get("company_name"),
-                            company_size=prospect.get("company_size"),
-                            linkedin_url=prospect.get("linkedin_url"),
-                            enrichment_data=prospect.get("enrichment_data", {}),
-                            status=LeadStatus.ENRICHED,
-                            source=prospect.get("source", "rocketreach"),
-                        )
-                        self.db.add(lead)
-                        leads_created += 1
+                # One multi-row INSERT ... ON CONFLICT DO NOTHING per batch
+                ingestion = repository.bulk_insert(
+                    campaign_id=campaign.id,
+                    organization_id=campaign.organization_id,
+                    prospects=prospects,
+                )
                 
-                self.db.commit()
+                # Later prospecting runs skip near-duplicates of these leads
+                if settings.LEAD_DEDUP_ENABLED:
+                    try:
+                        LeadSimilarityService(self.db).add_leads(campaign.organization_id, ingestion["lead_ids"])
+                    except Exception as e:
+                        logger.warning(f"Could not index new leads for deduplication: {e}")
                 
-                return {
-                    "success": True,
-                    "leads_found": len(prospects),
-                    "leads_created": leads_created,
-                }
-            else:
-                return result
+                totals["leads_found"] += len(prospects)
+                totals["leads_created"] += ingestion["inserted"]
+                totals["leads_skipped"] += ingestion["skipped"]
+                
+                if on_page and ingestion["lead_ids"]:
+                    await on_page(ingestion["lead_ids"])
                 
+                # A short page means the search is exhausted
+                searched += size
+                if result["data"].get("total_found", 0) < size:
+                    break
+            
+            return {"success": True, **totals}
+        
         except Exception as e:
             logger.error(f"Error in prospecting: {e}", exc_info=True)
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), **totals}
     
-    def _run_qualification(self, campaign: Campaign) -> Dict[str, Any]:
-        """Run BANT qualification phase."""
+    def _run_qualification(
+        self,
+        campaign: Campaign,
+        checkpoint: Optional[CampaignCheckpoint] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run BANT qualification phase.
+        
+        Leads are qualified in batches; each batch costs two commits (one for
+        the move to SCORING, one for scores and outcomes) regardless of size.
+        Leads are walked in ID order and the last ID of each batch is
+        checkpointed, so a resumed run starts right after it. Leads an
+        earlier run left in SCORING are qualified first.
+        
+        Args:
+            campaign: Campaign
+            checkpoint: Progress checkpoint
+            cursor: Lead ID to resume after
+        """
+        checkpoint = checkpoint or CampaignCheckpoint(campaign.id, None)
+        batch_size = settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE
+        
         try:
-            # Get all enriched leads
-            leads = self.db.query(Lead).filter(
-                Lead.campaign_id == campaign.id,
-                Lead.status == LeadStatus.ENRICHED
-            ).all()
+            qualified = 0
+            rejected = 0
             
-            qualified_count = 0
-            rejected_count = 0
+            # Leads moved to SCORING by an interrupted run never got an outcome
+            for leads in self._iter_lead_batches(campaign, LeadStatus.SCORING, batch_size):
+                counts = self.runtime.run(self._qualify_batch(campaign, leads))
+                qualified += counts["qualified"]
+                rejected += counts["rejected"]
+                checkpoint.advance(**counts)
             
-            for lead in leads:
-                try:
-                    # Transition to scoring
-                    self.state_machine.transition(lead, LeadStatus.SCORING, self.db)
-                    
-                    # Run BANT qualification
-                    input_data = {
-                        "lead_id": str(lead.id),
-                        "lead_data": {
-                            "company_size": lead.company_size,
-                            "job_title": lead.job_title,
-                            "company_industry": lead.company_name,
-                            "enrichment_data": lead.enrichment_data,
-                            "linkedin_url": lead.linkedin_url,
-                        },
-                        "campaign": {
-                            "product_description": campaign.description or "",
-                            "bant_threshold": campaign.bant_threshold,
-                        },
-                    }
-                    
-                    import asyncio
-                    result = asyncio.run(self.bant.execute(input_data))
-                    
-                    if result["success"]:
-                        qualified = result["data"].get("qualified", False)
-                        
-                        if qualified:
-                            self.state_machine.transition(lead, LeadStatus.QUALIFIED, self.db)
-                            qualified_count += 1
-                        else:
-                            self.state_machine.transition(lead, LeadStatus.REJECTED, self.db)
-                            rejected_count += 1
-                    else:
-                        self.state_machine.transition(lead, LeadStatus.REJECTED, self.db, reason=result.get("error"))
-                        rejected_count += 1
-                        
-                except TransitionError as e:
-                    logger.warning(f"Transition error for lead {lead.id}: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error qualifying lead {lead.id}: {e}", exc_info=True)
-                    try:
-                        self.state_machine.transition(lead, LeadStatus.REJECTED, self.db, reason=str(e))
-                    except:
-                        pass
-                    rejected_count += 1
+            for leads in self._iter_lead_batches(campaign, LeadStatus.ENRICHED, batch_size, cursor):
+                cursor = str(leads[-1].id)
+                counts = self.runtime.run(self._qualify_batch(campaign, leads))
+                qualified += counts["qualified"]
+                rejected += counts["rejected"]
+                checkpoint.advance(cursor=cursor, **counts)
             
             return {
                 "success": True,
-                "qualified": qualified_count,
-                "rejected": rejected_count,
+                "qualified": qualified,
+                "rejected": rejected,
             }
-            
+        
         except Exception as e:
             logger.error(f"Error in qualification: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
-    def _run_scheduling(self, campaign: Campaign) -> Dict[str, Any]:
-        """Run email scheduling phase."""
-        try:
-            # Get all qualified leads
-            leads = self.db.query(Lead).filter(
+    def _iter_lead_batches(
+        self,
+        campaign: Campaign,
+        status: LeadStatus,
+        batch_size: int,
+        cursor: Optional[str] = None,
+    ) -> Iterator[List[Lead]]:
+        """
+        Yield the campaign's leads in a status, one batch at a time.
+        
+        Uses keyset pagination on the lead ID: each batch starts after the
+        last ID of the previous one (or after ``cursor``), so resuming never
+        rescans leads that were already handled.
+        """
+        last_id = UUID(cursor) if cursor else None
+        
+        while True:
+            query = self.db.query(Lead).filter(
                 Lead.campaign_id == campaign.id,
-                Lead.status == LeadStatus.QUALIFIED
-            ).all()
+                Lead.status == status
+            )
+            if last_id is not None:
+                query = query.filter(Lead.id > last_id)
+            leads = query.order_by(Lead.id).limit(batch_size).all()
+            
+            if not leads:
+                return
+            
+            last_id = leads[-1].id
+            yield leads
+    
+    async def _qualify_batch(self, campaign: Campaign, leads: List[Lead]) -> Dict[str, int]:
+        """
+        Qualify a batch of enriched leads.
+        
+        Returns:
+            Counts of qualified and rejected leads
+        """
+        outcomes = await self._qualify_batch_outcomes(campaign, leads)
+        return {outcome: len(lead_ids) for outcome, lead_ids in outcomes.items()}
+    
+    async def _qualify_batch_outcomes(
+        self,
+        campaign: Campaign,
+        leads: List[Lead],
+        slots: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, List[UUID]]:
+        """
+        Qualify a batch of leads with one commit for all scores and outcomes.
+        
+        Leads already in SCORING (moved by the pipeline, or left by an
+        interrupted run) are scored without being moved again. With
+        CAMPAIGN_BANT_LLM_ANALYSIS, the batch is first scored by the BANT
+        agent's batched LLM analysis; leads it could not score fall back to
+        the campaign's rule plan.
+        
+        Args:
+            campaign: Campaign
+            leads: ENRICHED or SCORING leads
+            slots: Semaphore bounding BANT calls across concurrent batches
+                (defaults to CAMPAIGN_PIPELINE_BANT_CONCURRENCY per batch)
+        
+        Returns:
+            IDs of the leads moved to QUALIFIED and to REJECTED
+        """
+        # Build agent inputs before the commit expires the loaded leads
+        inputs = {lead.id: self._bant_input(campaign, lead) for lead in leads}
+        # Scores come from the lead rows through the campaign's plan, so they
+        # keep its fingerprint and later rescores skip them
+        plan_version = self.bant.scoring_plan({
+            "id": str(campaign.id),
+            "bant_threshold": campaign.bant_threshold,
+            "scoring_rules": campaign.scoring_rules,
+        }).version
+        scoring = [lead.id for lead in leads if lead.status == LeadStatus.SCORING]
+        
+        skip = set(scoring)
+        enriched = [lead_id for lead_id in inputs if lead_id not in skip]
+        moved = scoring + self.state_machine.transition_many(
+            enriched, LeadStatus.SCORING, self.db
+        )["moved"]
+        
+        analyses: Dict[str, Dict[str, Any]] = {}
+        if settings.CAMPAIGN_BANT_LLM_ANALYSIS and moved:
+            analyses = await self._analyze_leads(moved, inputs, slots)
+        
+        async def score(lead_id: UUID) -> Dict[str, Any]:
+            if slots is None:
+                return await self._score_lead(inputs[lead_id])
+            async with slots:
+                return await self._score_lead(inputs[lead_id])
+        
+        rule_scored = [lead_id for lead_id in moved if str(lead_id) not in analyses]
+        results = dict(zip(rule_scored, await self.runtime.gather(
+            score,
+            rule_scored,
+            concurrency=settings.CAMPAIGN_PIPELINE_BANT_CONCURRENCY,
+        )))
+        
+        plan_scores = []
+        llm_scores = []
+        outcomes: Dict[LeadStatus, List[UUID]] = {
+            LeadStatus.QUALIFIED: [],
+            LeadStatus.REJECTED: [],
+        }
+        for lead_id in moved:
+            analysis = analyses.get(str(lead_id))
+            result = {"success": True, "data": analysis} if analysis else results[lead_id]
+            if result["success"]:
+                data = result["data"]
+                (llm_scores if analysis else plan_scores).append({
+                    "id": lead_id,
+                    "bant_score": data.get("bant_score"),
+                    "bant_breakdown": data.get("bant_breakdown"),
+                })
+                to_status = LeadStatus.QUALIFIED if data.get("qualified") else LeadStatus.REJECTED
+            else:
+                to_status = LeadStatus.REJECTED
+            outcomes[to_status].append(lead_id)
+        
+        # Scores and both outcome transitions share one commit; LLM scores
+        # carry no plan version, so rescores recompute them with the rules
+        repository = LeadRepository(self.db)
+        repository.update_scores(plan_scores, plan_version=plan_version)
+        if llm_scores:
+            repository.update_scores(llm_scores)
+        qualified = self.state_machine.transition_many(
+            outcomes[LeadStatus.QUALIFIED], LeadStatus.QUALIFIED, self.db, commit=False
+        )
+        rejected = self.state_machine.transition_many(
+            outcomes[LeadStatus.REJECTED], LeadStatus.REJECTED, self.db, commit=False
+        )
+        self.run_recorder.flush()
+        self.db.commit()
+        
+        return {
+            "qualified": qualified["moved"],
+            "rejected": rejected["moved"],
+        }
+    
+    async def _analyze_leads(
+        self,
+        lead_ids: List[UUID],
+        inputs: Dict[UUID, Dict[str, Any]],
+        slots: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Score a batch of leads with the BANT agent's batched LLM analysis.
+        
+        Args:
+            lead_ids: Leads to score
+            inputs: BANT agent inputs by lead ID (see _bant_input)
+            slots: Semaphore bounding BANT calls across concurrent batches
+        
+        Returns:
+            BANT result per lead ID string; leads the LLM could not score
+            (or all of them, if the analysis failed) are absent
+        """
+        leads = {str(lead_id): inputs[lead_id]["lead_data"] for lead_id in lead_ids}
+        campaign = inputs[lead_ids[0]]["campaign"]
+        try:
+            if slots is None:
+                return await self.bant.analyze_leads(leads, campaign)
+            async with slots:
+                return await self.bant.analyze_leads(leads, campaign)
+        except Exception as e:
+            logger.error(f"Error analyzing leads with the LLM: {e}", exc_info=True)
+            return {}
+    
+    async def _score_lead(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the BANT agent for one lead, turning exceptions into a failed result."""
+        try:
+            return await self.bant.execute(input_data)
+        except Exception as e:
+            logger.error(f"Error qualifying lead: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+    
+    def _bant_input(self, campaign: Campaign, lead: Lead) -> Dict[str, Any]:
+        """
+        Build BANT agent input for a lead.
+        
+        No lead_id is passed: the runner persists scores and status itself,
+        so the agent does not write and commit each lead on its own.
+        """
+        return {
+            "lead_data": {
+                "company_size": lead.company_size,
+                "job_title": lead.job_title,
+                "company_industry": lead.company_name,
+                "enrichment_data": lead.enrichment_data,
+                "linkedin_url": lead.linkedin_url,
+            },
+            "campaign": {
+                "id": str(campaign.id),
+                "product_description": campaign.description or "",
+                "bant_threshold": campaign.bant_threshold,
+            },
+        }
+    
+    def _run_scheduling(
+        self,
+        campaign: Campaign,
+        checkpoint: Optional[CampaignCheckpoint] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run email scheduling phase.
+        
+        Contacts the best-scored qualified leads up to what remains of the
+        campaign's daily_limit today, one batch at a time. Contacted leads
+        leave QUALIFIED, so a resumed run does not email them twice.
+        
+        Args:
+            campaign: Campaign
+            checkpoint: Progress checkpoint
+        """
+        checkpoint = checkpoint or CampaignCheckpoint(campaign.id, None)
+        drip = DripScheduler(self.db, runner=self)
+        batch_size = settings.CAMPAIGN_SCHEDULING_BATCH_SIZE
+        
+        try:
+            sent = 0
+            failed = 0
             
-            sent_count = 0
-            failed_count = 0
+            lead_ids = drip.next_lead_ids(campaign.id, drip.remaining_today(campaign))
+            for start in range(0, len(lead_ids), batch_size):
+                counts = self.schedule_leads(campaign, lead_ids[start:start + batch_size])
+                sent += counts["sent"]
+                failed += counts["failed"]
+                checkpoint.advance(**counts)
             
-            for lead in leads:
-                try:
-                    input_data = {
-                        "lead_id": str(lead.id),
-                        "lead_data": {
-                            "email": lead.email,
-                            "first_name": lead.first_name,
-                            "last_name": lead.last_name,
-                            "job_title": lead.job_title,
-                            "company_name": lead.company_name,
-                        },
-                        "campaign": {
-                            "product_description": campaign.description or "",
-                            "value_prop": campaign.target_criteria.get("value_prop", ""),
-                        },
-                        "send_email": True,
-                    }
-                    
-                    import asyncio
-                    result = asyncio.run(self.scheduler.execute(input_data))
-                    
-                    if result["success"] and result["data"].get("sent"):
-                        self.state_machine.transition(lead, LeadStatus.CONTACTED, self.db)
-                        sent_count += 1
-                    else:
-                        failed_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error sending email to lead {lead.id}: {e}", exc_info=True)
-                    failed_count += 1
+            deferred = self.db.query(Lead).filter(
+                Lead.campaign_id == campaign.id,
+                Lead.status == LeadStatus.QUALIFIED
+            ).count()
             
             return {
                 "success": True,
-                "sent": sent_count,
-                "failed": failed_count,
+                "sent": sent,
+                "failed": failed,
+                "deferred": deferred,
             }
-            
+        
         except Exception as e:
             logger.error(f"Error in scheduling: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
     
+    def _schedule_batch(self, campaign: Campaign, leads: List[Lead]) -> Dict[str, int]:
+        """Send outreach emails to a batch of qualified leads."""
+        sent = self.runtime.run(self._schedule_batch_outcomes(campaign, leads))
+        return {
+            "sent": len(sent),
+            "failed": len(leads) - len(sent),
+        }
+    
+    async def _schedule_batch_outcomes(self, campaign: Campaign, leads: List[Lead]) -> List[UUID]:
+        """
+        Send outreach emails to a batch of leads with one commit for the batch.
+        
+        The emails, the CONTACTED transitions and the agent runs of the
+        whole batch are written together after every send has returned.
+        
+        Args:
+            campaign: Campaign
+            leads: QUALIFIED leads
+        
+        Returns:
+            IDs of the leads whose email was sent
+        """
+        # Build agent inputs before the commit expires the loaded leads
+        inputs = {lead.id: self._scheduler_input(campaign, lead) for lead in leads}
+        lead_ids = list(inputs)
+        results = await self.runtime.gather(
+            lambda lead_id: self._send_outreach(inputs[lead_id]),
+            lead_ids,
+            concurrency=settings.CAMPAIGN_PIPELINE_SCHEDULER_CONCURRENCY,
+        )
+        
+        sent = []
+        sent_at = datetime.utcnow()
+        for lead_id, result in zip(lead_ids, results):
+            if not result["success"]:
+                continue
+            data = result["data"]
+            if data.get("sent"):
+                sent.append(lead_id)
+            if data.get("subject") and data.get("body"):
+                self.db.add(Email(
+                    lead_id=lead_id,
+                    campaign_id=campaign.id,
+                    subject=data["subject"],
+                    body=data["body"],
+                    status=EmailStatus.SENT if data.get("sent") else EmailStatus.PENDING,
+                    sent_at=sent_at if data.get("sent") else None,
+                ))
+        
+        self.state_machine.transition_many(sent, LeadStatus.CONTACTED, self.db, commit=False)
+        self.run_recorder.flush()
+        self.db.commit()
+        
+        return sent
+    
+    async def _send_outreach(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the scheduler agent for one lead, turning exceptions into a failed result."""
+        try:
+            return await self.scheduler.execute(input_data)
+        except Exception as e:
+            logger.error(f"Error sending email: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+    
+    def _scheduler_input(self, campaign: Campaign, lead: Lead) -> Dict[str, Any]:
+        """
+        Build scheduler agent input for a lead.
+        
+        No lead_id is passed: the runner stores the email and moves the lead
+        itself, so the agent does not write and commit each lead on its own.
+        """
+        return {
+            "lead_data": {
+                "email": lead.email,
+                "first_name": lead.first_name,
+                "last_name": lead.last_name,
+                "job_title": lead.job_title,
+                "company_name": lead.company_name,
+            },
+            "campaign": {
+                "id": str(campaign.id),
+                "product_description": campaign.description or "",
+                "value_prop": campaign.target_criteria.get("value_prop", ""),
+            },
+            "send_email": True,
+        }
+    
     def _set_campaign_state(self, campaign_id: UUID, state: Dict[str, Any]) -> None:
         """Store campaign state in Redis."""
         if self.redis_client:
             key = f"campaign:{campaign_id}:state"
-            self.redis_client.setex(key, 86400, str(state))  # 24h TTL
+            self.redis_client.setex(key, 86400, json.dumps(state))  # 24h TTL
     
     def _get_campaign_state(self, campaign_id: UUID) -> Optional[Dict[str, Any]]:
         """Get campaign state from Redis."""
@@ -308,6 +987,5 @@ class CampaignRunner:
             key = f"campaign:{campaign_id}:state"
             data = self.redis_client.get(key)
             if data:
-                import json
                 return json.loads(data)
         return None
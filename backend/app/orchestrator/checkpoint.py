@@ -0,0 +1,171 @@
+"""Durable progress checkpoints for campaign runs."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import redis
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Campaign phases in execution order
+PHASES = ("prospecting", "qualification", "scheduling")
+
+_COUNT_PREFIX = "count:"
+
+
+class CampaignCheckpoint:
+    """
+    Progress record of a campaign run, stored as a Redis hash.
+
+    The hash holds the run status (running, completed, failed), the current
+    phase, a keyset cursor (the last lead ID handled in the phase, in ID
+    order) and one ``count:<name>`` counter per stage outcome. Counters use
+    HINCRBY, so parallel Celery batches can report into the same record.
+
+    Without a Redis client every method is a no-op and ``load`` returns an
+    empty record, so runs simply start from scratch.
+    """
+
+    def __init__(
+        self,
+        campaign_id: UUID,
+        redis_client: Optional[redis.Redis],
+        ttl: Optional[int] = None,
+    ):
+        """
+        Initialize checkpoint.
+
+        Args:
+            campaign_id: Campaign ID
+            redis_client: Redis client (None disables checkpointing)
+            ttl: Seconds to keep the record after its last update
+        """
+        self.campaign_id = campaign_id
+        self.key = f"campaign:{campaign_id}:checkpoint"
+        self.redis_client = redis_client
+        self.ttl = ttl or settings.CAMPAIGN_CHECKPOINT_TTL
+
+    @classmethod
+    def for_campaign(cls, campaign_id: UUID) -> "CampaignCheckpoint":
+        """Create a checkpoint using the configured Redis server."""
+        client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+        return cls(campaign_id, client)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the progress record.
+
+        Returns:
+            Record fields with counters grouped under "counts", or {} if none
+        """
+        if not self.redis_client:
+            return {}
+
+        try:
+            raw = self.redis_client.hgetall(self.key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read checkpoint for campaign {self.campaign_id}: {e}")
+            return {}
+        if not raw:
+            return {}
+
+        record: Dict[str, Any] = {"counts": {}}
+        for field, value in raw.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            value = value.decode() if isinstance(value, bytes) else value
+            if field.startswith(_COUNT_PREFIX):
+                record["counts"][field[len(_COUNT_PREFIX):]] = int(value)
+            else:
+                record[field] = value
+        return record
+
+    @staticmethod
+    def is_resumable(record: Dict[str, Any]) -> bool:
+        """Return True if the record belongs to a run that did not complete."""
+        return record.get("status") in ("running", "failed")
+
+    @staticmethod
+    def phase_done(record: Dict[str, Any], phase: str) -> bool:
+        """Return True if the recorded run already moved past ``phase``."""
+        recorded = record.get("phase")
+        if recorded not in PHASES:
+            return False
+        return PHASES.index(recorded) > PHASES.index(phase)
+
+    def start(self, mode: str) -> None:
+        """Start a fresh record for a new run."""
+        now = datetime.utcnow().isoformat()
+        self._write(
+            {
+                "status": "running",
+                "mode": mode,
+                "phase": PHASES[0],
+                "cursor": "",
+                "started_at": now,
+                "updated_at": now,
+            },
+            reset=True,
+        )
+
+    def resume(self) -> None:
+        """Mark an interrupted run as running again."""
+        self._write({"status": "running", "updated_at": datetime.utcnow().isoformat()})
+
+    def set_phase(self, phase: str) -> None:
+        """Record that ``phase`` has started, resetting the cursor."""
+        if phase not in PHASES:
+            raise ValueError(f"Unknown campaign phase: {phase}")
+        self._write({"phase": phase, "cursor": "", "updated_at": datetime.utcnow().isoformat()})
+
+    def advance(self, cursor: Optional[str] = None, **counts: int) -> None:
+        """
+        Record progress within the current phase.
+
+        Args:
+            cursor: Last lead ID handled, if the phase walks leads in ID order
+            **counts: Amounts to add to the named counters
+        """
+        fields = {"updated_at": datetime.utcnow().isoformat()}
+        if cursor is not None:
+            fields["cursor"] = cursor
+        self._write(fields, counts=counts)
+
+    def complete(self) -> None:
+        """Mark the run as completed so the next run starts from scratch."""
+        self._write({"status": "completed", "updated_at": datetime.utcnow().isoformat()})
+
+    def fail(self, error: str) -> None:
+        """Mark the run as failed, keeping its phase and cursor for resume."""
+        self._write({
+            "status": "failed",
+            "error": error,
+            "updated_at": datetime.utcnow().isoformat(),
+        })
+
+    def _write(
+        self,
+        fields: Dict[str, str],
+        counts: Optional[Dict[str, int]] = None,
+        reset: bool = False,
+    ) -> None:
+        """Apply field updates and counter increments in one round trip."""
+        if not self.redis_client:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline()
+            if reset:
+                pipe.delete(self.key)
+            pipe.hset(self.key, mapping=fields)
+            for name, amount in (counts or {}).items():
+                if amount:
+                    pipe.hincrby(self.key, f"{_COUNT_PREFIX}{name}", amount)
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            # Losing a checkpoint only costs redoing work on resume
+            logger.warning(f"Failed to write checkpoint for campaign {self.campaign_id}: {e}")
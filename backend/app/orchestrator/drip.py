@@ -0,0 +1,187 @@
+"""Drip scheduler spreading outreach emails over days within Campaign.daily_limit."""
+
+import math
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.email import Email
+from app.db.models.lead import Lead, LeadStatus
+from app.core.config import settings
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from app.orchestrator.campaign_runner import CampaignRunner
+
+logger = get_logger(__name__)
+
+
+class DripScheduler:
+    """
+    Send each active campaign's qualified leads a few at a time.
+
+    A campaign may send at most ``daily_limit`` emails per (UTC) day. Within
+    the day, sends are paced over the send window: at any moment the
+    campaign may have sent ``daily_limit`` times the elapsed fraction of the
+    window. Each tick sends the difference, highest BANT score first, so a
+    periodic tick spreads the quota evenly and starts over the next day.
+    """
+
+    def __init__(self, db: Session, runner: Optional["CampaignRunner"] = None):
+        """
+        Initialize drip scheduler.
+
+        Args:
+            db: Database session
+            runner: CampaignRunner used to send emails (created on first use)
+        """
+        self.db = db
+        self._runner = runner
+
+    @property
+    def runner(self) -> "CampaignRunner":
+        """Campaign runner sending the emails, built only when needed."""
+        if self._runner is None:
+            from app.orchestrator.campaign_runner import CampaignRunner
+
+            self._runner = CampaignRunner(self.db, mode="phased")
+        return self._runner
+
+    @staticmethod
+    def day_start(now: datetime) -> datetime:
+        """Return midnight (UTC) of the day containing now."""
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def window_fraction(cls, now: datetime) -> float:
+        """
+        Return the elapsed fraction of today's send window.
+
+        Returns:
+            0.0 before the window opens and after it closes, otherwise (0, 1]
+        """
+        start = cls.day_start(now) + timedelta(hours=settings.DRIP_SEND_WINDOW_START_HOUR)
+        end = cls.day_start(now) + timedelta(hours=settings.DRIP_SEND_WINDOW_END_HOUR)
+
+        if now < start or now >= end:
+            return 0.0
+        return max((now - start) / (end - start), 1e-9)
+
+    def sent_today(self, campaign_ids: List[UUID], now: datetime) -> Dict[UUID, int]:
+        """
+        Count emails sent today per campaign with one grouped query.
+
+        Args:
+            campaign_ids: Campaign IDs
+            now: Current time (UTC)
+
+        Returns:
+            Mapping of campaign ID to emails sent since midnight
+        """
+        if not campaign_ids:
+            return {}
+
+        rows = self.db.query(Email.campaign_id, func.count(Email.id)).filter(
+            Email.campaign_id.in_(campaign_ids),
+            Email.sent_at >= self.day_start(now),
+        ).group_by(Email.campaign_id).all()
+
+        return {campaign_id: count for campaign_id, count in rows}
+
+    def remaining_today(self, campaign: Campaign, now: Optional[datetime] = None) -> int:
+        """Return how many more emails the campaign may send today."""
+        now = now or datetime.utcnow()
+        sent = self.sent_today([campaign.id], now).get(campaign.id, 0)
+        return max(campaign.daily_limit - sent, 0)
+
+    def allowance(self, campaign: Campaign, sent_today: int, now: datetime) -> int:
+        """
+        Return how many emails the campaign may send at this point of the day.
+
+        Args:
+            campaign: Campaign
+            sent_today: Emails already sent today
+            now: Current time (UTC)
+        """
+        target = math.ceil(campaign.daily_limit * self.window_fraction(now))
+        return max(min(target, campaign.daily_limit) - sent_today, 0)
+
+    def next_lead_ids(self, campaign_id: UUID, limit: int) -> List[UUID]:
+        """
+        Return the best-scored qualified leads not contacted yet.
+
+        Served by the partial index idx_leads_qualified_score.
+        """
+        if limit <= 0:
+            return []
+
+        rows = self.db.query(Lead.id).filter(
+            Lead.campaign_id == campaign_id,
+            Lead.status == LeadStatus.QUALIFIED,
+        ).order_by(Lead.bant_score.desc().nulls_last()).limit(limit).all()
+
+        return [row.id for row in rows]
+
+    def tick(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Send the current allowance of every active campaign.
+
+        A campaign is marked COMPLETED once its last qualified lead is
+        contacted and no lead is still waiting for qualification.
+
+        Args:
+            now: Current time (UTC), defaults to now
+
+        Returns:
+            Per-campaign sent/failed counts and completed campaign IDs
+        """
+        now = now or datetime.utcnow()
+
+        has_qualified = self.db.query(Lead.id).filter(
+            Lead.campaign_id == Campaign.id,
+            Lead.status == LeadStatus.QUALIFIED,
+        ).exists()
+        campaigns = self.db.query(Campaign).filter(
+            Campaign.status == CampaignStatus.ACTIVE,
+            has_qualified,
+        ).all()
+
+        sent_today = self.sent_today([campaign.id for campaign in campaigns], now)
+        results: Dict[str, Dict[str, int]] = {}
+        completed: List[str] = []
+
+        for campaign in campaigns:
+            allowance = self.allowance(campaign, sent_today.get(campaign.id, 0), now)
+            lead_ids = self.next_lead_ids(campaign.id, allowance)
+            if not lead_ids:
+                continue
+
+            counts = self.runner.schedule_leads(campaign, lead_ids)
+            results[str(campaign.id)] = counts
+
+            if counts["sent"] and not self.has_pending_leads(campaign.id):
+                campaign.status = CampaignStatus.COMPLETED
+                campaign.completed_at = datetime.utcnow()
+                self.db.commit()
+                completed.append(str(campaign.id))
+
+        if results:
+            logger.info(
+                f"Drip tick sent emails for {len(results)} campaigns",
+                extra={"campaigns": results, "completed": completed},
+            )
+
+        return {"campaigns": results, "completed": completed}
+
+    def has_pending_leads(self, campaign_id: UUID) -> bool:
+        """Return True if leads are still waiting to be qualified or contacted."""
+        return self.db.query(
+            self.db.query(Lead.id).filter(
+                Lead.campaign_id == campaign_id,
+                Lead.status.in_([LeadStatus.ENRICHED, LeadStatus.SCORING, LeadStatus.QUALIFIED]),
+            ).exists()
+        ).scalar()
@@ -0,0 +1,455 @@
+"""Dry-run mode: run a campaign end to end against fake external services."""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+from crewai.llms.base_llm import BaseLLM
+from sqlalchemy.orm import Session
+
+from app.db.models.agent_run import AgentRun, AgentRunStatus, AgentType
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.organization import Organization
+from app.orchestrator.campaign_runner import CampaignRunner
+from app.services.rocketreach import ROCKETREACH_BASE_URL, RocketReachService
+from app.core.exceptions import BadRequestError
+from app.core.logging import get_logger
+from app.core.usage import record_tokens
+
+logger = get_logger(__name__)
+
+# Campaign phase covered by each agent's runs
+PHASE_AGENTS = {
+    "prospecting": AgentType.PROSPECTOR,
+    "qualification": AgentType.BANT_QUALIFIER,
+    "scheduling": AgentType.SCHEDULER,
+}
+
+_JOB_TITLES = ["VP Sales", "Head of Sales", "Sales Manager", "CEO", "Marketing Director", "Account Executive"]
+_COMPANY_SIZES = ["11-50", "51-200", "201-500", "501-1000", "1001-5000"]
+_INDUSTRIES = ["Software", "Fintech", "Retail", "Healthcare", "Manufacturing"]
+_LOCATIONS = ["Paris, France", "Lyon, France", "Berlin, Germany", "London, UK"]
+
+
+class FaultProfile:
+    """
+    Latency and failures injected by a fake service.
+
+    Each call waits ``latency_ms`` plus up to ``jitter_ms``, then fails with
+    probability ``error_rate`` (a server error) or ``rate_limit_rate`` (an
+    HTTP 429). A seed makes runs reproducible.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize fault profile.
+
+        Args:
+            latency_ms: Base latency per call
+            jitter_ms: Maximum random latency added per call
+            error_rate: Probability (0-1) of a server error
+            rate_limit_rate: Probability (0-1) of a 429 response
+            seed: Random seed
+        """
+        if not 0 <= error_rate + rate_limit_rate <= 1:
+            raise ValueError("error_rate + rate_limit_rate must be between 0 and 1")
+
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+
+    def delay_s(self) -> float:
+        """Return the latency of the next call in seconds."""
+        return (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+
+    def draw_fault(self) -> Optional[str]:
+        """Return "error", "rate_limit" or None for the next call."""
+        roll = self._random.random()
+        if roll < self.error_rate:
+            return "error"
+        if roll < self.error_rate + self.rate_limit_rate:
+            return "rate_limit"
+        return None
+
+
+class FakeServiceStats:
+    """Call counters of a fake service."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.busy_s = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return stats as a JSON-serializable dictionary."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "avg_latency_ms": round(self.busy_s / self.calls * 1000, 2) if self.calls else 0.0,
+        }
+
+
+def synthetic_prospects(count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generate RocketReach-like profiles.
+
+    Args:
+        count: Number of profiles
+        seed: Random seed
+
+    Returns:
+        Profiles in the shape returned by the RocketReach search API
+    """
+    rng = random.Random(seed)
+    run_id = uuid4().hex[:8]
+    return [
+        {
+            "email": f"prospect{i}.{run_id}@dry-run.example.com",
+            "first_name": "Prospect",
+            "last_name": str(i),
+            "job_title": rng.choice(_JOB_TITLES),
+            "company_name": f"Company {i % 97}",
+            "company_size": rng.choice(_COMPANY_SIZES),
+            "company_industry": rng.choice(_INDUSTRIES),
+            "location": rng.choice(_LOCATIONS),
+            "linkedin_url": f"https://linkedin.com/in/prospect-{run_id}-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+class FakeRocketReach:
+    """
+    In-process RocketReach API served through an httpx mock transport.
+
+    The real ``RocketReachService`` is used on top of it, so its retry and
+    error handling run exactly as in production.
+    """
+
+    def __init__(self, prospects: List[Dict[str, Any]], profile: Optional[FaultProfile] = None):
+        """
+        Initialize fake RocketReach API.
+
+        Args:
+            prospects: Profiles searches page through
+            profile: Latency and failures to inject
+        """
+        self.prospects = prospects
+        self.profile = profile or FaultProfile()
+        self.stats = FakeServiceStats()
+        self._by_email = {prospect["email"]: prospect for prospect in prospects}
+
+    def service(self) -> RocketReachService:
+        """Return a RocketReachService talking to this fake API."""
+        client = httpx.AsyncClient(
+            base_url=ROCKETREACH_BASE_URL,
+            transport=httpx.MockTransport(self._handle),
+        )
+        return RocketReachService(api_key="dry-run", http_client=client)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer one API request after the injected latency."""
+        delay = self.profile.delay_s()
+        await asyncio.sleep(delay)
+        self.stats.calls += 1
+        self.stats.busy_s += delay
+
+        fault = self.profile.draw_fault()
+        if fault == "rate_limit":
+            self.stats.rate_limited += 1
+            return httpx.Response(429, json={"error": "Rate limit exceeded"})
+        if fault == "error":
+            self.stats.errors += 1
+            return httpx.Response(500, json={"error": "Injected failure"})
+
+        query = json.loads(request.content or b"{}")
+        if request.url.path.endswith("/search/profile"):
+            start = query.get("start", 1) - 1
+            return httpx.Response(200, json={"profiles": self.prospects[start:start + query["limit"]]})
+
+        prospect = self._by_email.get(query.get("email"))
+        if not prospect:
+            return httpx.Response(404, json={"error": "Not found"})
+        return httpx.Response(200, json={"person": {
+            "email": prospect["email"],
+            "first_name": prospect["first_name"],
+            "last_name": prospect["last_name"],
+            "current_title": prospect["job_title"],
+            "current_employer": prospect["company_name"],
+            "current_employer_size": prospect["company_size"],
+            "current_employer_industry": prospect["company_industry"],
+            "location": prospect["location"],
+            "linkedin_url": prospect["linkedin_url"],
+        }})
+
+
+class FakeMailer:
+    """Drop-in replacement for ``send_email`` that never sends anything."""
+
+    def __init__(self, profile: Optional[FaultProfile] = None):
+        """
+        Initialize fake mailer.
+
+        Args:
+            profile: Latency and failures to inject
+        """
+        self.profile = profile or FaultProfile()
+        self.stats = FakeServiceStats()
+
+    def __call__(self, to: str, subject: str, **kwargs: Any) -> Dict[str, Any]:
+        """Pretend to send an email (blocking, like the Resend SDK)."""
+        delay = self.profile.delay_s()
+        time.sleep(delay)
+        self.stats.calls += 1
+        self.stats.busy_s += delay
+
+        fault = self.profile.draw_fault()
+        if fault == "rate_limit":
+            self.stats.rate_limited += 1
+            raise BadRequestError("Failed to send email: 429 Too Many Requests")
+        if fault == "error":
+            self.stats.errors += 1
+            raise BadRequestError("Failed to send email: injected failure")
+
+        return {"id": f"dry-run-{self.stats.calls}", "success": True}
+
+
+class FakeLLM(BaseLLM):
+    """CrewAI LLM returning a canned answer after the injected latency."""
+
+    def __init__(
+        self,
+        profile: Optional[FaultProfile] = None,
+        response: str = '{"success": true}',
+        tokens_per_call: int = 500,
+    ):
+        """
+        Initialize fake LLM.
+
+        Args:
+            profile: Latency and failures to inject
+            response: Text returned by every call
+            tokens_per_call: Tokens reported per call
+        """
+        super().__init__(model="dry-run")
+        self.profile = profile or FaultProfile()
+        self.response = response
+        self.tokens_per_call = tokens_per_call
+        self.stats = FakeServiceStats()
+
+    def call(self, messages: Any, *args: Any, **kwargs: Any) -> str:
+        """Answer one completion request."""
+        delay = self.profile.delay_s()
+        time.sleep(delay)
+        self.stats.calls += 1
+        self.stats.busy_s += delay
+
+        fault = self.profile.draw_fault()
+        if fault == "rate_limit":
+            self.stats.rate_limited += 1
+            raise RuntimeError("LLM rate limit exceeded (429)")
+        if fault == "error":
+            self.stats.errors += 1
+            raise RuntimeError("LLM injected failure")
+
+        record_tokens(self.tokens_per_call)
+        return self.response
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> int:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0
+    index = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class CampaignDryRun:
+    """
+    Benchmark a campaign run without external side effects.
+
+    Creates a throwaway organization and campaign, runs it through
+    ``CampaignRunner`` with fake RocketReach, LLM and email services, builds
+    a per-phase throughput/latency report from the recorded AgentRun rows,
+    then deletes everything it created.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        prospects: int = 100,
+        mode: Optional[str] = None,
+        rocketreach: Optional[FaultProfile] = None,
+        llm: Optional[FaultProfile] = None,
+        email: Optional[FaultProfile] = None,
+        seed: Optional[int] = None,
+        keep: bool = False,
+    ):
+        """
+        Initialize dry run.
+
+        Args:
+            db: Database session
+            prospects: Number of synthetic prospects
+            mode: Execution mode ("pipelined" or "phased"), defaults to settings
+            rocketreach: Faults injected into RocketReach calls
+            llm: Faults injected into LLM calls
+            email: Faults injected into email sends
+            seed: Random seed for prospects and faults
+            keep: Keep the campaign and its leads after the run
+        """
+        self.db = db
+        self.prospects = prospects
+        self.mode = mode
+        self.seed = seed
+        self.keep = keep
+        self.rocketreach = FakeRocketReach(synthetic_prospects(prospects, seed), rocketreach)
+        self.llm = FakeLLM(llm)
+        self.mailer = FakeMailer(email)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the campaign and return the report.
+
+        Returns:
+            Runner result, per-phase report and fake service stats
+        """
+        organization, campaign = self._create_campaign()
+        try:
+            runner = CampaignRunner(
+                self.db,
+                mode=self.mode,
+                rocketreach_service=self.rocketreach.service(),
+                email_sender=self.mailer,
+                agent_config={"llm": self.llm},
+            )
+
+            start = time.perf_counter()
+            result = runner.run_campaign(campaign.id)
+            elapsed = time.perf_counter() - start
+
+            return {
+                "mode": runner.mode,
+                "prospects": self.prospects,
+                "elapsed_s": round(elapsed, 3),
+                "success": result["success"],
+                "error": result.get("error"),
+                "phases": self._phase_report(campaign.id),
+                "pipeline": result.get("pipeline"),
+                "fakes": {
+                    "rocketreach": self.rocketreach.stats.to_dict(),
+                    "llm": self.llm.stats.to_dict(),
+                    "email": self.mailer.stats.to_dict(),
+                },
+            }
+        finally:
+            if not self.keep:
+                self._cleanup(organization.id)
+
+    def _create_campaign(self):
+        """Create the throwaway organization and active campaign."""
+        suffix = uuid4().hex[:8]
+        organization = Organization(name=f"Dry run {suffix}", slug=f"dry-run-{suffix}")
+        self.db.add(organization)
+        self.db.flush()
+
+        campaign = Campaign(
+            organization_id=organization.id,
+            name=f"Dry run {datetime.utcnow().isoformat(timespec='seconds')}",
+            description="Synthetic load",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={"job_titles": list(_JOB_TITLES)},
+            bant_threshold=60,
+            # The prospector returns at most daily_limit prospects
+            daily_limit=self.prospects,
+        )
+        self.db.add(campaign)
+        self.db.commit()
+        return organization, campaign
+
+    def _phase_report(self, campaign_id) -> Dict[str, Dict[str, Any]]:
+        """Summarize the campaign's agent runs per phase."""
+        runs = self.db.query(
+            AgentRun.agent_type,
+            AgentRun.status,
+            AgentRun.duration_ms,
+            AgentRun.started_at,
+            AgentRun.completed_at,
+        ).filter(AgentRun.campaign_id == campaign_id).all()
+
+        report = {}
+        for phase, agent_type in PHASE_AGENTS.items():
+            phase_runs = [run for run in runs if run.agent_type == agent_type]
+            durations = sorted(run.duration_ms or 0 for run in phase_runs)
+
+            elapsed = 0.0
+            if phase_runs:
+                started = min(run.started_at for run in phase_runs)
+                completed = max(run.completed_at for run in phase_runs)
+                elapsed = (completed - started).total_seconds()
+
+            report[phase] = {
+                "runs": len(phase_runs),
+                "failed": sum(1 for run in phase_runs if run.status == AgentRunStatus.FAILED),
+                "elapsed_s": round(elapsed, 3),
+                "throughput_per_s": round(len(phase_runs) / elapsed, 2) if elapsed > 0 else 0.0,
+                "latency_ms": {
+                    "mean": round(sum(durations) / len(durations), 1) if durations else 0.0,
+                    "p50": _percentile(durations, 0.50),
+                    "p95": _percentile(durations, 0.95),
+                    "max": durations[-1] if durations else 0,
+                },
+            }
+        return report
+
+    def _cleanup(self, organization_id) -> None:
+        """Delete the organization; campaigns, leads and runs cascade."""
+        self.db.rollback()
+        self.db.query(Organization).filter(Organization.id == organization_id).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a dry-run report as a text table."""
+    lines = [
+        f"Dry run: {report['prospects']} prospects, mode={report['mode']}, "
+        f"{report['elapsed_s']}s, success={report['success']}",
+    ]
+    if report.get("error"):
+        lines.append(f"Error: {report['error']}")
+
+    lines.append(
+        f"{'phase':<14}{'runs':>7}{'failed':>8}{'elapsed_s':>11}{'runs/s':>9}"
+        f"{'p50_ms':>9}{'p95_ms':>9}{'max_ms':>9}"
+    )
+    for phase, stats in report["phases"].items():
+        latency = stats["latency_ms"]
+        lines.append(
+            f"{phase:<14}{stats['runs']:>7}{stats['failed']:>8}{stats['elapsed_s']:>11}"
+            f"{stats['throughput_per_s']:>9}{latency['p50']:>9}{latency['p95']:>9}{latency['max']:>9}"
+        )
+
+    for name, stats in report["fakes"].items():
+        lines.append(
+            f"{name}: {stats['calls']} calls, {stats['errors']} errors, "
+            f"{stats['rate_limited']} rate limited, avg {stats['avg_latency_ms']}ms"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""Stage-overlapping pipeline for campaign execution."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Marker pushed into a stage queue to stop one of its workers
+_STOP = object()
+
+
+class StageStats:
+    """Counters collected for one pipeline stage."""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.processed = 0
+        self.forwarded = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def sample_depth(self, depth: int) -> None:
+        """Record the queue depth observed when an item is enqueued."""
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return stats as a JSON-serializable dictionary."""
+        elapsed = 0.0
+        if self.started_at is not None and self.finished_at is not None:
+            elapsed = self.finished_at - self.started_at
+
+        return {
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "forwarded": self.forwarded,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_queue_depth": (
+                round(self._depth_total / self._depth_samples, 2)
+                if self._depth_samples
+                else 0.0
+            ),
+        }
+
+
+class PipelineStage:
+    """
+    A pipeline stage: a handler run by N concurrent workers.
+
+    The handler receives one item and returns the item to forward to the
+    next stage, or None to drop it. Items returned by the last stage count
+    as pipeline outputs.
+
+    With ``batch_size`` > 1 the handler receives a list instead: each worker
+    takes the items already waiting in its queue, up to ``batch_size``
+    (never waiting for more than the first), and the handler returns the
+    list of items to forward.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Optional[Any]]],
+        concurrency: int = 1,
+        batch_size: int = 1,
+    ):
+        if concurrency < 1:
+            raise ValueError(f"Stage {name} concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError(f"Stage {name} batch size must be at least 1")
+
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+
+class Pipeline:
+    """
+    Run items through stages connected by bounded queues.
+
+    A source coroutine emits items into the first stage; every stage
+    processes its queue with its own concurrency and forwards results to the
+    next one. Because queues are bounded, a slow stage applies backpressure
+    upstream instead of buffering the whole campaign in memory.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[Callable[[Any], Awaitable[None]]], Awaitable[Any]],
+        stages: List[PipelineStage],
+        queue_size: int = 100,
+        source_name: str = "source",
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            source: Coroutine function called with an ``emit`` callback
+            stages: Ordered list of stages
+            queue_size: Maximum number of items waiting in front of each stage
+            source_name: Name used for the source in the stats report
+        """
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+
+        self.source = source
+        self.source_name = source_name
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the pipeline until the source is exhausted and all queues drain.
+
+        Returns:
+            Dictionary with the source result, per-stage stats and timing
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stats = [StageStats(stage.name, stage.concurrency) for stage in self.stages]
+        source_stats = StageStats(self.source_name, 1)
+
+        started = time.perf_counter()
+        first_output_at: Optional[float] = None
+        outputs = 0
+
+        async def put(index: int, item: Any) -> None:
+            stats[index].sample_depth(queues[index].qsize())
+            await queues[index].put(item)
+
+        async def emit(item: Any) -> None:
+            source_stats.processed += 1
+            source_stats.forwarded += 1
+            await put(0, item)
+
+        async def worker(index: int) -> None:
+            nonlocal first_output_at, outputs
+            stage = self.stages[index]
+            stage_stats = stats[index]
+            is_last = index == len(self.stages) - 1
+
+            stopped = False
+            while not stopped:
+                item = await queues[index].get()
+                if item is _STOP:
+                    return
+
+                # Batched stages also take whatever is already queued
+                items = [item]
+                while len(items) < stage.batch_size and not queues[index].empty():
+                    item = queues[index].get_nowait()
+                    if item is _STOP:
+                        stopped = True
+                        break
+                    items.append(item)
+
+                if stage_stats.started_at is None:
+                    stage_stats.started_at = time.perf_counter()
+
+                try:
+                    if stage.batch_size > 1:
+                        results = await stage.handler(items) or []
+                    else:
+                        results = [await stage.handler(items[0])]
+                except Exception as e:
+                    stage_stats.failed += len(items)
+                    logger.error(f"Pipeline stage {stage.name} failed: {e}", exc_info=True)
+                    results = []
+
+                stage_stats.processed += len(items)
+                stage_stats.finished_at = time.perf_counter()
+
+                for result in results:
+                    if result is None:
+                        continue
+
+                    stage_stats.forwarded += 1
+                    if is_last:
+                        outputs += 1
+                        if first_output_at is None:
+                            first_output_at = time.perf_counter()
+                    else:
+                        await put(index + 1, result)
+
+        workers = [
+            [asyncio.create_task(worker(index)) for _ in range(stage.concurrency)]
+            for index, stage in enumerate(self.stages)
+        ]
+
+        source_result = None
+        source_stats.started_at = time.perf_counter()
+        try:
+            source_result = await self.source(emit)
+        finally:
+            source_stats.finished_at = time.perf_counter()
+            # Drain stages in order so every item reaches the end
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.concurrency):
+                    await queues[index].put(_STOP)
+                await asyncio.gather(*workers[index])
+
+        finished = time.perf_counter()
+
+        return {
+            "source": source_result,
+            "outputs": outputs,
+            "elapsed_s": round(finished - started, 3),
+            "time_to_first_output_s": (
+                round(first_output_at - started, 3) if first_output_at is not None else None
+            ),
+            "stages": {
+                self.source_name: source_stats.to_dict(),
+                **{stage_stats.name: stage_stats.to_dict() for stage_stats in stats},
+            },
+        }
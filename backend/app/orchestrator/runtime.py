@@ -0,0 +1,149 @@
+"""Long-lived event loop for running agent coroutines from synchronous code."""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, List, Optional, TypeVar
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AgentRuntime:
+    """
+    Execution runtime owning one event loop for its whole lifetime.
+
+    Calling ``asyncio.run`` per lead creates and destroys an event loop every
+    time, which also throws away any async HTTP connection pool. The runtime
+    keeps a single loop (and a shared ``httpx.AsyncClient``) per runner or
+    worker process and submits agent coroutines to it with bounded
+    concurrency.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """
+        Initialize runtime.
+
+        Args:
+            max_concurrency: Default number of coroutines run at once by ``map``
+        """
+        self.max_concurrency = max_concurrency or settings.AGENT_RUNTIME_MAX_CONCURRENCY
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the runtime event loop, creating it on first use."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            logger.debug("Agent runtime event loop created")
+        return self._loop
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client bound to the runtime loop."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(timeout=30.0)
+        return self._http_client
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run one coroutine to completion on the runtime loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Coroutine result
+        """
+        return self.loop.run_until_complete(coro)
+
+    def map(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        concurrency: Optional[int] = None,
+    ) -> List[R]:
+        """
+        Run ``func`` over items concurrently, at most ``concurrency`` at a time.
+
+        Exceptions raised by ``func`` propagate; callers that need per-item
+        error handling should catch inside ``func``.
+
+        Args:
+            func: Coroutine function called once per item
+            items: Items to process
+            concurrency: Maximum coroutines in flight (defaults to max_concurrency)
+
+        Returns:
+            Results in the same order as items
+        """
+        return self.run(self.gather(func, items, concurrency))
+
+    async def gather(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        concurrency: Optional[int] = None,
+    ) -> List[R]:
+        """Async counterpart of ``map`` for callers already on the loop."""
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def bounded(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+
+        return list(await asyncio.gather(*(bounded(item) for item in items)))
+
+    def close(self) -> None:
+        """Close the shared HTTP client and the event loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        if self._http_client is not None and not self._http_client.is_closed:
+            self._loop.run_until_complete(self._http_client.aclose())
+        self._http_client = None
+
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+        logger.debug("Agent runtime event loop closed")
+
+
+_runtime: Optional[AgentRuntime] = None
+_runtime_pid: Optional[int] = None
+
+
+def get_runtime() -> AgentRuntime:
+    """
+    Get the process-wide agent runtime.
+
+    A new runtime is created after a fork so that Celery prefork children
+    never share the parent's event loop.
+
+    Returns:
+        AgentRuntime instance
+    """
+    global _runtime, _runtime_pid
+
+    if _runtime is None or _runtime_pid != os.getpid():
+        _runtime = AgentRuntime()
+        _runtime_pid = os.getpid()
+
+    return _runtime
+
+
+def shutdown_runtime() -> None:
+    """Close the process-wide agent runtime if one was created."""
+    global _runtime, _runtime_pid
+
+    if _runtime is not None and _runtime_pid == os.getpid():
+        _runtime.close()
+
+    _runtime = None
+    _runtime_pid = None
@@ -1,7 +1,9 @@
 """State machine for lead status transitions."""
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Iterable
 from enum import Enum
+from uuid import UUID
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.db.models.lead import Lead, LeadStatus
@@ -100,6 +102,86 @@ class LeadStateMachine:
         
         return lead
     
+    @classmethod
+    def get_previous_states(cls, to_status: LeadStatus) -> List[LeadStatus]:
+        """
+        Get all states from which a transition to the target status is valid.
+        
+        Args:
+            to_status: Target status
+            
+        Returns:
+            List of allowed predecessor states
+        """
+        return [
+            from_status
+            for from_status, allowed in cls.VALID_TRANSITIONS.items()
+            if to_status in allowed
+        ]
+    
+    @classmethod
+    def transition_many(
+        cls,
+        lead_ids: Iterable[UUID],
+        to_status: LeadStatus,
+        db: Session,
+        reason: Optional[str] = None,
+        commit: bool = True,
+    ) -> Dict[str, List[UUID]]:
+        """
+        Transition many leads to a new status with one conditional UPDATE.
+        
+        The UPDATE only matches leads whose current status is an allowed
+        predecessor of the target, so invalid transitions are rejected by the
+        database instead of being checked lead by lead. The session is not
+        synchronized: loaded Lead instances see the new status after the
+        commit expires them.
+        
+        Args:
+            lead_ids: Lead IDs to transition
+            to_status: Target status
+            db: Database session
+            reason: Optional reason for transition
+            commit: Commit the transaction (set False to batch with other writes)
+            
+        Returns:
+            Dictionary with "moved" and "rejected" lead ID lists
+        """
+        lead_ids = list(dict.fromkeys(lead_ids))
+        if not lead_ids:
+            return {"moved": [], "rejected": []}
+        
+        predecessors = cls.get_previous_states(to_status)
+        moved: List[UUID] = []
+        
+        if predecessors:
+            stmt = (
+                update(Lead)
+                .where(Lead.id.in_(lead_ids), Lead.status.in_(predecessors))
+                .values(status=to_status)
+                .returning(Lead.id)
+                .execution_options(synchronize_session=False)
+            )
+            moved = list(db.execute(stmt).scalars().all())
+        
+        if commit:
+            db.commit()
+        
+        moved_set = set(moved)
+        rejected = [lead_id for lead_id in lead_ids if lead_id not in moved_set]
+        
+        logger.info(
+            f"Transitioned {len(moved)} leads to {to_status.value} ({len(rejected)} rejected)",
+            extra={
+                "to_status": to_status.value,
+                "moved": len(moved),
+                "rejected": len(rejected),
+                "reason": reason,
+            }
+        )
+        
+        return {"moved": moved, "rejected": rejected}
+    
     @classmethod
     def get_next_states(cls, current_status: LeadStatus) -> List[LeadStatus]:
         """
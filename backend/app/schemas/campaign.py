@@ -17,6 +17,7 @@ class CampaignResponse(BaseModel):
     target_criteria: Dict[str, Any]
     email_template: Optional[Dict[str, Any]] = None
     bant_threshold: int
+    scoring_rules: Optional[Dict[str, Any]] = None
     daily_limit: int
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -34,6 +35,7 @@ class CampaignCreate(BaseModel):
     target_criteria: Optional[Dict[str, Any]] = Field(default_factory=dict)
     email_template: Optional[Dict[str, Any]] = None
     bant_threshold: int = Field(default=60, ge=0, le=100)
+    scoring_rules: Optional[Dict[str, Any]] = None
     daily_limit: int = Field(default=50, ge=1)
 
 
@@ -44,6 +46,7 @@ class CampaignUpdate(BaseModel):
     target_criteria: Optional[Dict[str, Any]] = None
     email_template: Optional[Dict[str, Any]] = None
     bant_threshold: Optional[int] = Field(None, ge=0, le=100)
+    scoring_rules: Optional[Dict[str, Any]] = None
     daily_limit: Optional[int] = Field(None, ge=1)
 
 
@@ -54,5 +57,6 @@ class CampaignStatsResponse(BaseModel):
     leads: Dict[str, int]
     emails: Dict[str, int]
     bant: Dict[str, float]
+    leads_by_size: Dict[str, int] = {}
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
@@ -12,7 +12,8 @@ from app.db.models.campaign import Campaign, CampaignStatus
 from app.db.models.lead import Lead, LeadStatus
 from app.db.models.email import Email
 from app.db.models.user import User
-from app.orchestrator.campaign_runner import CampaignRunner
+from app.orchestrator.checkpoint import CampaignCheckpoint
+from app.services.scoring_plan import compile_scoring_plan
 
 
 class CampaignService:
@@ -96,6 +97,7 @@ class CampaignService:
         email_template: Optional[Dict[str, Any]] = None,
         bant_threshold: int = 60,
         daily_limit: int = 50,
+        scoring_rules: Optional[Dict[str, Any]] = None,
     ) -> Campaign:
         """
         Create a new campaign.
@@ -108,13 +110,19 @@ class CampaignService:
             email_template: Email template for Scheduler
             bant_threshold: BANT qualification threshold (0-100)
             daily_limit: Daily email sending limit
+            scoring_rules: Overrides of the default BANT scoring rules
             
         Returns:
             Created campaign
+            
+        Raises:
+            BadRequestError: If the scoring rules do not compile
         """
         if not user.organization_id:
             raise BadRequestError("User does not belong to an organization")
         
+        self._check_scoring_rules(scoring_rules, bant_threshold)
+        
         campaign = Campaign(
             organization_id=user.organization_id,
             created_by=user.id,
@@ -123,6 +131,7 @@ class CampaignService:
             target_criteria=target_criteria or {},
             email_template=email_template,
             bant_threshold=bant_threshold,
+            scoring_rules=scoring_rules or None,
             daily_limit=daily_limit,
             status=CampaignStatus.DRAFT,
         )
@@ -143,11 +152,13 @@ class CampaignService:
         email_template: Optional[Dict[str, Any]] = None,
         bant_threshold: Optional[int] = None,
         daily_limit: Optional[int] = None,
+        scoring_rules: Optional[Dict[str, Any]] = None,
     ) -> Campaign:
         """
         Update campaign.
         
-        Can only update DRAFT campaigns.
+        Can only update DRAFT campaigns. Changing the BANT threshold or the
+        scoring rules enqueues a backfill of the campaign's lead scores.
         
         Args:
             user: Current user
@@ -158,9 +169,13 @@ class CampaignService:
             email_template: New email template
             bant_threshold: New BANT threshold
             daily_limit: New daily limit
+            scoring_rules: New scoring rule overrides ({} for the defaults)
             
         Returns:
             Updated campaign
+            
+        Raises:
+            BadRequestError: If the scoring rules do not compile
         """
         campaign = self.get_campaign(user, campaign_id)
         
@@ -176,10 +191,16 @@ class CampaignService:
             campaign.target_criteria = target_criteria
         if email_template is not None:
             campaign.email_template = email_template
+        threshold_changed = rules_changed = False
         if bant_threshold is not None:
             if not 0 <= bant_threshold <= 100:
                 raise BadRequestError("BANT threshold must be between 0 and 100")
+            threshold_changed = bant_threshold != campaign.bant_threshold
             campaign.bant_threshold = bant_threshold
+        if scoring_rules is not None:
+            self._check_scoring_rules(scoring_rules, campaign.bant_threshold)
+            rules_changed = (scoring_rules or None) != campaign.scoring_rules
+            campaign.scoring_rules = scoring_rules or None
         if daily_limit is not None:
             if daily_limit < 1:
                 raise BadRequestError("Daily limit must be at least 1")
@@ -188,8 +209,21 @@ class CampaignService:
         self.db.commit()
         self.db.refresh(campaign)
         
+        # Re-score (and re-qualify, for a new threshold) the leads already scored
+        if threshold_changed or rules_changed:
+            from app.tasks.dispatch import dispatch_campaign_rescore
+            dispatch_campaign_rescore(campaign.id, requalify=threshold_changed)
+        
         return campaign
 
+    @staticmethod
+    def _check_scoring_rules(scoring_rules: Optional[Dict[str, Any]], bant_threshold: int) -> None:
+        """Compile a campaign's scoring rules, raising BadRequestError if they are invalid."""
+        try:
+            compile_scoring_plan(scoring_rules, bant_threshold)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+
     def launch_campaign(
         self,
         user: User,
@@ -223,9 +257,9 @@ class CampaignService:
         self.db.commit()
         self.db.refresh(campaign)
         
-        # Start campaign execution asynchronously (via Celery task)
-        # For now, we'll just update the status
-        # TODO: Trigger Celery task to run campaign
+        # Start campaign execution asynchronously, fanned out over Celery workers
+        from app.tasks.dispatch import dispatch_campaign_run
+        dispatch_campaign_run(campaign.id)
         
         return campaign
 
@@ -264,6 +298,11 @@ class CampaignService:
         """
         Resume a paused campaign.
         
+        A run is dispatched only if the campaign's checkpoint shows an
+        unfinished run, or the campaign never ran. After a completed run,
+        reactivating the campaign lets the drip scheduler contact the
+        qualified leads left over.
+        
         Args:
             user: Current user
             campaign_id: Campaign ID
@@ -281,6 +320,15 @@ class CampaignService:
         self.db.commit()
         self.db.refresh(campaign)
         
+        checkpoint = CampaignCheckpoint.for_campaign(campaign.id).load()
+        never_ran = not checkpoint and not self.db.query(
+            self.db.query(Lead).filter(Lead.campaign_id == campaign.id).exists()
+        ).scalar()
+        if CampaignCheckpoint.is_resumable(checkpoint) or never_ran:
+            # The run picks up from the campaign's checkpoint
+            from app.tasks.dispatch import dispatch_campaign_run
+            dispatch_campaign_run(campaign.id)
+        
         return campaign
 
     def delete_campaign(
@@ -337,6 +385,15 @@ class CampaignService:
             func.avg(Lead.bant_score)
         ).filter(Lead.campaign_id == campaign_id).scalar() or 0
         
+        # Leads per company size bucket, from the features stored at ingest
+        leads_by_size = {
+            bucket or "unknown": count
+            for bucket, count in self.db.query(Lead.size_bucket, func.count(Lead.id))
+            .filter(Lead.campaign_id == campaign_id)
+            .group_by(Lead.size_bucket)
+            .all()
+        }
+        
         return {
             "campaign_id": str(campaign_id),
             "status": campaign.status.value,
@@ -352,6 +409,7 @@ class CampaignService:
                 "average_score": float(avg_bant),
                 "threshold": campaign.bant_threshold,
             },
+            "leads_by_size": leads_by_size,
             "started_at": campaign.started_at.isoformat() if campaign.started_at else None,
             "completed_at": campaign.completed_at.isoformat() if campaign.completed_at else None,
         }
@@ -0,0 +1,360 @@
+"""Email draft generation streamed to the approval queue."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+import redis
+
+from app.agents.batching import extract_json
+from app.agents.llm_cache import LLMResponseCache
+from app.agents.llm_gateway import LLMGateway, LLMGatewayTimeoutError, LLMProviderError, get_llm_gateway
+from app.agents.prompting import PromptTemplate
+from app.agents.scheduler.prompts import SCHEDULER_MAIN_PROMPT
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.models.email import Email, EmailStatus
+from app.db.models.lead import Lead
+from app.db.models.user import User
+from app.services.lead import LeadService
+from app.services.scoring import BANTScoringService
+
+logger = get_logger(__name__)
+
+# The Scheduler prompt, compiled once; its example emails keep their {prénom}
+_DRAFT_PROMPT = PromptTemplate(SCHEDULER_MAIN_PROMPT, "scheduler_draft", roots=("lead", "campaign", "sender"))
+
+# Per-draft values cut out of a generated draft to make its bucket's skeleton
+SKELETON_FIELDS = (
+    "lead.first_name",
+    "lead.last_name",
+    "lead.job_title",
+    "lead.company_name",
+    "lead.company_size",
+    "lead.company_location",
+    "sender.name",
+    "sender.title",
+    "sender.company",
+)
+
+# Values shorter than this are not cut out (an initial would match everywhere)
+MIN_SKELETON_VALUE_CHARS = 2
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class EmailDraftService:
+    """
+    Service generating a lead's email draft and streaming it as it is written.
+
+    ``build_prompt`` runs within the request and uses its session. The
+    stream is iterated after the request's session is closed, so the draft
+    is saved with a short-lived session of its own on the same engine.
+    """
+
+    def __init__(self, db: Session, gateway: Optional[LLMGateway] = None):
+        self.db = db
+        self.bind = db.get_bind()
+        self.gateway = gateway
+
+    def build_prompt(self, user: User, lead_id: UUID) -> Dict[str, Any]:
+        """
+        Render the Scheduler prompt for a lead.
+
+        Args:
+            user: Current user
+            lead_id: Lead ID
+
+        Returns:
+            Dict with lead_id, campaign_id, prompt, the lead's profile
+            signature, its per-draft field values and whether a PENDING
+            draft already exists (a regeneration never reuses a skeleton)
+
+        Raises:
+            NotFoundError: If lead not found or not in user's org
+        """
+        lead = LeadService(self.db).get_lead(user=user, lead_id=lead_id)
+        campaign = lead.campaign
+        template = (campaign.email_template if campaign else None) or {}
+        enrichment = lead.enrichment_data or {}
+        industry = enrichment.get("company_industry") or enrichment.get("industry")
+
+        values = {
+            "lead": {
+                "first_name": lead.first_name,
+                "last_name": lead.last_name,
+                "job_title": lead.job_title,
+                "company_name": lead.company_name,
+                "company_industry": industry,
+                "company_size": lead.company_size,
+                "company_location": enrichment.get("location"),
+                "bant_notes": _bant_notes(lead),
+            },
+            "campaign": {
+                "value_prop": template.get("value_prop") or (campaign.description if campaign else None),
+            },
+            "sender": {
+                "name": template.get("sender_name") or user.full_name,
+                "title": template.get("sender_title"),
+                "company": template.get("sender_company")
+                or (user.organization.name if user.organization else None),
+            },
+        }
+        fields = {}
+        for path in SKELETON_FIELDS:
+            root, key = path.split(".")
+            fields[path] = str(values[root][key] or "").strip()
+
+        regenerate = (
+            self.db.query(Email.id)
+            .filter(Email.lead_id == lead.id, Email.status == EmailStatus.PENDING)
+            .first()
+            is not None
+        )
+        return {
+            "lead_id": lead.id,
+            "campaign_id": lead.campaign_id,
+            "prompt": _DRAFT_PROMPT.render(**values),
+            "signature": profile_signature(lead.campaign_id, lead.job_title, lead.company_size, industry),
+            "fields": fields,
+            "regenerate": regenerate,
+        }
+
+    async def stream_draft(self, draft: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Generate a draft and stream it as server-sent events.
+
+        Events: "start" right away, one "token" per text delta, then "done"
+        with the saved PENDING email, or "error" if generation failed.
+
+        Leads of a campaign with the same profile signature share a draft
+        skeleton: the first draft of a profile is written by the LLM and
+        stored with its per-lead values replaced by placeholders, later
+        drafts of that profile are filled from the skeleton without an LLM
+        call ("done" follows "start" directly, with "reused" set).
+
+        Args:
+            draft: Output of build_prompt
+
+        Yields:
+            Server-sent events
+        """
+        lead_id = draft["lead_id"]
+        yield sse_event("start", {"lead_id": lead_id})
+
+        cache = get_skeleton_cache() if settings.EMAIL_DRAFT_SKELETON_CACHE_ENABLED else None
+        if cache is not None and not draft["regenerate"]:
+            cached = await asyncio.to_thread(cache.get, draft["signature"])
+            filled = fill_skeleton(json.loads(cached), draft["fields"]) if cached else None
+            if filled is not None:
+                subject, body = filled
+                email_id = await asyncio.to_thread(self.save_draft, lead_id, draft["campaign_id"], subject, body)
+                logger.info(f"Email draft saved for lead {lead_id} from profile skeleton {draft['signature'][:12]}")
+                yield sse_event("done", {
+                    "email_id": email_id,
+                    "subject": subject,
+                    "body": body,
+                    "status": EmailStatus.PENDING.value,
+                    "reused": True,
+                })
+                return
+
+        gateway = self.gateway or get_llm_gateway()
+        chunks = []
+        try:
+            async for text in gateway.stream(
+                [{"role": "user", "content": draft["prompt"]}],
+                max_tokens=settings.EMAIL_DRAFT_MAX_TOKENS,
+                timeout=settings.EMAIL_DRAFT_QUEUE_TIMEOUT,
+            ):
+                chunks.append(text)
+                yield sse_event("token", {"text": text})
+        except (LLMGatewayTimeoutError, LLMProviderError) as e:
+            logger.warning(f"Email draft generation failed for lead {lead_id}: {e}")
+            yield sse_event("error", {"message": "Draft generation failed, please retry"})
+            return
+
+        content = extract_json("".join(chunks))
+        if not isinstance(content, dict) or not content.get("subject") or not content.get("body"):
+            logger.warning(f"Email draft for lead {lead_id} is not valid JSON")
+            yield sse_event("error", {"message": "Draft generation returned an invalid draft, please retry"})
+            return
+
+        subject = str(content["subject"])[:500]
+        body = str(content["body"])
+        email_id = await asyncio.to_thread(self.save_draft, lead_id, draft["campaign_id"], subject, body)
+        logger.info(f"Email draft saved for lead {lead_id}")
+        if cache is not None:
+            skeleton = make_skeleton(subject, body, draft["fields"])
+            await asyncio.to_thread(cache.set, draft["signature"], json.dumps(skeleton, ensure_ascii=False))
+
+        yield sse_event("done", {
+            "email_id": email_id,
+            "subject": subject,
+            "body": body,
+            "status": EmailStatus.PENDING.value,
+            "reused": False,
+        })
+
+    def save_draft(self, lead_id: UUID, campaign_id: UUID, subject: str, body: str) -> UUID:
+        """
+        Save a draft as the lead's PENDING email.
+
+        A PENDING email already in the approval queue is replaced, so
+        regenerating a draft does not queue the lead twice. Uses its own
+        session, closed before returning (see the class docstring).
+
+        Returns:
+            Email ID
+        """
+        with Session(self.bind) as db:
+            email = (
+                db.query(Email)
+                .filter(Email.lead_id == lead_id, Email.status == EmailStatus.PENDING)
+                .order_by(Email.created_at.desc())
+                .first()
+            )
+            if email is None:
+                email = Email(lead_id=lead_id, campaign_id=campaign_id, status=EmailStatus.PENDING)
+                db.add(email)
+            email.subject = subject
+            email.body = body
+            db.commit()
+            return email.id
+
+
+def profile_signature(
+    campaign_id: Optional[UUID],
+    job_title: Optional[str],
+    company_size: Optional[str],
+    industry: Optional[str],
+) -> str:
+    """
+    Return the profile signature of a lead within its campaign.
+
+    Leads share a signature when they are in the same campaign, in the same
+    title tier and size bucket (the BANT authority and budget tiers) and in
+    the same industry.
+
+    Returns:
+        SHA-256 hex digest of the profile
+    """
+    _, title_tier = BANTScoringService.calculate_authority_score(job_title)
+    _, size_bucket = BANTScoringService.calculate_budget_score(company_size)
+    payload = json.dumps(
+        [str(campaign_id), title_tier, size_bucket, " ".join((industry or "").lower().split())],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def make_skeleton(subject: str, body: str, fields: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Turn a generated draft into a skeleton shared by its profile.
+
+    Every occurrence of a per-draft value (whole words, longest value first)
+    is replaced by its "{lead.first_name}"-style placeholder; literal braces
+    are doubled so the skeleton renders as a PromptTemplate.
+
+    Args:
+        subject: Generated subject
+        body: Generated body
+        fields: Per-draft values keyed by placeholder
+
+    Returns:
+        Dict with the subject and body skeletons and the placeholders used
+    """
+    values = {}
+    for path, value in fields.items():
+        value = _escape(value)
+        if len(value) >= MIN_SKELETON_VALUE_CHARS:
+            values.setdefault(value, path)
+
+    used = set()
+    if values:
+        pattern = re.compile(
+            "|".join(rf"(?<!\w){re.escape(value)}(?!\w)" for value in sorted(values, key=len, reverse=True))
+        )
+
+        def placeholder(match: re.Match) -> str:
+            used.add(values[match.group(0)])
+            return "{" + values[match.group(0)] + "}"
+
+        subject, body = pattern.sub(placeholder, _escape(subject)), pattern.sub(placeholder, _escape(body))
+    else:
+        subject, body = _escape(subject), _escape(body)
+
+    return {"subject": subject, "body": body, "fields": sorted(used)}
+
+
+def fill_skeleton(skeleton: Dict[str, Any], fields: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """
+    Fill a skeleton with a lead's per-draft values.
+
+    Args:
+        skeleton: Output of make_skeleton
+        fields: Per-draft values keyed by placeholder
+
+    Returns:
+        (subject, body), or None if a placeholder of the skeleton has no
+        value for this lead (the draft must then be generated)
+    """
+    if any(not fields.get(path) for path in skeleton["fields"]):
+        return None
+    values: Dict[str, Dict[str, str]] = {}
+    for path, value in fields.items():
+        root, key = path.split(".")
+        values.setdefault(root, {})[key] = value
+    for root in ("lead", "sender"):
+        values.setdefault(root, {})
+    subject = PromptTemplate(skeleton["subject"], "draft_skeleton_subject").render(**values)
+    body = PromptTemplate(skeleton["body"], "draft_skeleton_body").render(**values)
+    return subject, body
+
+
+_skeleton_cache: Optional[LLMResponseCache] = None
+_skeleton_cache_pid: Optional[int] = None
+
+
+def get_skeleton_cache() -> LLMResponseCache:
+    """
+    Get the process-wide cache of draft skeletons, keyed by profile signature.
+
+    Returns:
+        LLMResponseCache instance (Redis-backed when REDIS_URL is set)
+    """
+    global _skeleton_cache, _skeleton_cache_pid
+
+    if _skeleton_cache is None or _skeleton_cache_pid != os.getpid():
+        client = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+        _skeleton_cache = LLMResponseCache(
+            client,
+            ttl=settings.EMAIL_DRAFT_SKELETON_TTL,
+            namespace="email:skeleton:",
+        )
+        _skeleton_cache_pid = os.getpid()
+
+    return _skeleton_cache
+
+
+def _escape(text: str) -> str:
+    """Double literal braces so the text renders as a PromptTemplate."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _bant_notes(lead: Lead) -> str:
+    """Return the BANT reasoning of a lead, one criterion per line."""
+    lines = []
+    for criterion, entry in (lead.bant_breakdown or {}).items():
+        if isinstance(entry, dict) and entry.get("reasoning"):
+            lines.append(f"- {criterion}: {entry['reasoning']}")
+    return "\n".join(lines)
@@ -5,7 +5,11 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.db.models.lead import Lead, LeadStatus
+from app.db.repositories.lead import LeadRepository
+from app.services.lead_similarity import LeadSimilarityService
 from app.services.rocketreach import RocketReachService
+from app.services.title_classifier import title_matcher
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -155,8 +159,7 @@ class EnrichmentService:
         # Job title match (0-15)
         job_title = prospect_data.get("job_title", "").lower()
         if target_criteria and "job_titles" in target_criteria:
-            target_titles = [t.lower() for t in target_criteria["job_titles"]]
-            if any(target in job_title or job_title in target for target in target_titles):
+            if title_matcher(target_criteria["job_titles"]).matches(job_title):
                 score += 15
             elif job_title:
                 score += 7
@@ -183,6 +186,10 @@ class EnrichmentService:
         """
         Process a list of prospects: enrich, check duplicates, score.
         
+        Prospects already in the campaign (same email) or near-duplicates of
+        a lead anywhere in the organization (similar name and company, or
+        same LinkedIn profile) are skipped before enrichment.
+        
         Args:
             prospects: List of prospect data dictionaries
             campaign_id: Campaign ID
@@ -195,6 +202,13 @@ class EnrichmentService:
         """
         processed = []
         
+        # One query for the whole batch instead of one SELECT per prospect
+        existing_emails = LeadRepository(self.db).existing_emails(
+            campaign_id,
+            (prospect.get("email") for prospect in prospects),
+        )
+        
+        candidates = []
         for prospect in prospects:
             # Check for duplicate
             email = prospect.get("email")
@@ -202,11 +216,27 @@ class EnrichmentService:
                 logger.warning("Prospect missing email, skipping")
                 continue
             
-            duplicate = self.check_duplicate(email, campaign_id, organization_id)
-            if duplicate:
+            if email in existing_emails:
                 logger.debug(f"Skipping duplicate prospect: {email}")
                 continue
             
+            candidates.append(prospect)
+        
+        # Same person under another email or in another campaign: skip before paying for enrichment
+        near_duplicates = {}
+        if settings.LEAD_DEDUP_ENABLED and candidates:
+            try:
+                near_duplicates = LeadSimilarityService(self.db).find_duplicates(organization_id, candidates)
+            except Exception as e:
+                # Only costs some enrichment calls: exact deduplication still applies
+                logger.warning(f"Near-duplicate lookup failed, continuing without it: {e}")
+        
+        for position, prospect in enumerate(candidates):
+            if position in near_duplicates:
+                lead_id, score = near_duplicates[position]
+                logger.debug(f"Skipping near-duplicate of lead {lead_id} (similarity {score}): {prospect.get('email')}")
+                continue
+            
             # Enrich data if requested
             if enrich:
                 prospect = await self.enrich_prospect_data(prospect)
@@ -224,6 +254,9 @@ class EnrichmentService:
         # Sort by firmographic score (descending)
         processed.sort(key=lambda x: x.get("firmographic_score", 0), reverse=True)
         
-        logger.info(f"Processed {len(processed)} prospects (skipped {len(prospects) - len(processed)} duplicates)")
+        logger.info(
+            f"Processed {len(processed)} prospects (skipped {len(prospects) - len(processed)} duplicates, "
+            f"{len(near_duplicates)} of them near-duplicates of existing leads)"
+        )
         
         return processed
@@ -13,6 +13,8 @@ from app.db.models.email import Email
 from app.db.models.meeting import Meeting
 from app.db.models.agent_run import AgentRun, AgentType
 from app.db.models.user import User
+from app.services.lead_features import SIZE_BUCKETS, apply_lead_features
+from app.services.title_classifier import SENIORITY_TIERS
 
 
 class LeadService:
@@ -32,6 +34,8 @@ class LeadService:
         search: Optional[str] = None,
         created_after: Optional[datetime] = None,
         created_before: Optional[datetime] = None,
+        size_bucket: Optional[str] = None,
+        seniority_tier: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
     ) -> tuple[List[Lead], int]:
@@ -48,6 +52,8 @@ class LeadService:
             search: Search query (name, email, company)
             created_after: Filter by creation date (after)
             created_before: Filter by creation date (before)
+            size_bucket: Company size bucket ("<10", "10-29", "30-99", "100-499", "500+")
+            seniority_tier: Seniority tier (c_level, vp, director, manager, individual)
             skip: Number of records to skip
             limit: Maximum number of records to return
             
@@ -101,6 +107,16 @@ class LeadService:
         if created_before:
             query = query.filter(Lead.created_at <= created_before)
         
+        if size_bucket:
+            if size_bucket not in {bucket for _, bucket in SIZE_BUCKETS}:
+                raise BadRequestError(f"Invalid size bucket: {size_bucket}")
+            query = query.filter(Lead.size_bucket == size_bucket)
+        
+        if seniority_tier:
+            if seniority_tier.lower() not in SENIORITY_TIERS:
+                raise BadRequestError(f"Invalid seniority tier: {seniority_tier}")
+            query = query.filter(Lead.seniority_tier == seniority_tier.lower())
+        
         total = query.count()
         leads = query.order_by(desc(Lead.created_at)).offset(skip).limit(limit).all()
         
@@ -306,6 +322,7 @@ class LeadService:
             lead.company_name = company_name
         if job_title is not None:
             lead.job_title = job_title
+            apply_lead_features(lead)
         if status is not None:
             try:
                 lead.status = LeadStatus(status.lower())
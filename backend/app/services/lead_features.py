@@ -0,0 +1,82 @@
+"""Normalized lead features parsed once at ingest."""
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.title_classifier import classify_seniority
+
+# Size buckets, aligned with the BANT budget tiers: a company falls in the
+# first bucket whose upper bound (exclusive) is above its largest headcount
+SIZE_BUCKETS: Tuple[Tuple[Optional[int], str], ...] = (
+    (10, "<10"),
+    (30, "10-29"),
+    (100, "30-99"),
+    (500, "100-499"),
+    (None, "500+"),
+)
+
+# Headcounts are stored as INTEGER; larger numbers are clamped
+MAX_EMPLOYEES = 2**31 - 1
+
+_NUMBER = re.compile(r"\d+")
+
+
+def parse_company_size(company_size: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse a free-text company size ("51-200", "10000+") into a headcount range.
+
+    Args:
+        company_size: Company size as written by the source
+
+    Returns:
+        (smallest, largest) number in the text, or (None, None) if it has none
+    """
+    if not company_size:
+        return None, None
+    numbers = [min(int(number), MAX_EMPLOYEES) for number in _NUMBER.findall(str(company_size))]
+    if not numbers:
+        return None, None
+    return min(numbers), max(numbers)
+
+
+def size_bucket(employees_max: Optional[int]) -> Optional[str]:
+    """Return the size bucket of a company's largest headcount, or None if unknown."""
+    if employees_max is None:
+        return None
+    for bound, bucket in SIZE_BUCKETS:
+        if bound is None or employees_max < bound:
+            return bucket
+    return None
+
+
+def lead_features(
+    company_size: Optional[str] = None,
+    job_title: Optional[str] = None,
+    linkedin_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the stored scoring features of a lead.
+
+    Args:
+        company_size: Company size text
+        job_title: Job title
+        linkedin_url: LinkedIn profile URL
+
+    Returns:
+        Column values: employees_min, employees_max, size_bucket,
+        seniority_tier and has_linkedin
+    """
+    employees_min, employees_max = parse_company_size(company_size)
+    return {
+        "employees_min": employees_min,
+        "employees_max": employees_max,
+        "size_bucket": size_bucket(employees_max),
+        "seniority_tier": classify_seniority(job_title),
+        "has_linkedin": bool(linkedin_url),
+    }
+
+
+def apply_lead_features(lead: Any) -> None:
+    """Recompute the stored features of a lead after its source fields changed."""
+    for column, value in lead_features(lead.company_size, lead.job_title, lead.linkedin_url).items():
+        setattr(lead, column, value)
@@ -0,0 +1,483 @@
+"""Similarity index for fuzzy lead deduplication within an organization."""
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.models.lead import Lead
+
+logger = get_logger(__name__)
+
+# Leads read and indexed per batch when building an index
+SCAN_CHUNK_ROWS = 65_536
+
+# Blocking keys per lead: (first, last name token) x (first, last company word)
+BLOCK_KEYS = 4
+# Key entries buffered before they are merged into the sorted key arrays
+KEY_MERGE_ROWS = 65_536
+
+# Weight of the name and company trigrams in a lead vector
+NAME_WEIGHT = 1.0
+COMPANY_WEIGHT = 0.7
+
+# Legal forms that do not tell two companies apart
+_COMPANY_SUFFIXES = re.compile(
+    r"\b(sas|sasu|sarl|sa|eurl|sci|inc|incorporated|ltd|limited|llc|llp|gmbh|ag|bv|plc|corp|corporation|co|group|groupe)\b"
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_LINKEDIN_SLUG = re.compile(r"linkedin\.com/(?:in|pub)/([^/?#]+)")
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse everything but letters and digits."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", plain).strip()
+
+
+def linkedin_key(url: Optional[str]) -> int:
+    """Return a 64-bit key of a LinkedIn profile URL's slug (0 if there is none)."""
+    match = _LINKEDIN_SLUG.search((url or "").lower())
+    if not match:
+        return 0
+    return int.from_bytes(hashlib.blake2b(match.group(1).encode(), digest_size=8).digest(), "little") or 1
+
+
+def _prefix_hash(field: str, token: str) -> int:
+    """Return a 64-bit hash of the first three characters of a token."""
+    return int.from_bytes(hashlib.blake2b(f"{field}:{token[:3]}".encode(), digest_size=8).digest(), "little")
+
+
+def _combine_block_keys(name_hashes: Any, company_hashes: Any) -> np.ndarray:
+    """Combine name and company prefix hashes (element-wise) into non-zero blocking keys."""
+    keys = np.asarray(name_hashes, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    keys ^= np.asarray(company_hashes, dtype=np.uint64)
+    keys[keys == 0] = 1
+    return keys
+
+
+def _block_keys(name: str, company: List[str]) -> np.ndarray:
+    """Return the blocking keys of a normalized name and company words (0-padded)."""
+    blocks = np.zeros(BLOCK_KEYS, dtype=np.uint64)
+    tokens = name.split()
+    if not tokens:
+        return blocks
+    names = sorted({_prefix_hash("n", token) for token in (tokens[0], tokens[-1])})
+    companies = sorted({_prefix_hash("c", word) for word in (company[0], company[-1])}) if company else [0]
+    keys = np.unique(_combine_block_keys(
+        [name_hash for name_hash in names for _ in companies],
+        [company_hash for _ in names for company_hash in companies],
+    ))
+    blocks[:len(keys)] = keys
+    return blocks
+
+
+def lead_features(
+    first_name: Optional[str],
+    last_name: Optional[str],
+    company_name: Optional[str],
+    linkedin_url: Optional[str] = None,
+    dimensions: Optional[int] = None,
+) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Return the similarity vector, LinkedIn key and blocking keys of a lead.
+
+    The vector hashes the character trigrams of the normalized full name and
+    company name (legal forms removed) into ``dimensions`` signed buckets and
+    is L2-normalized, so the dot product of two vectors is their cosine
+    similarity. Leads without a name get a zero vector and can only match on
+    their LinkedIn key.
+
+    The blocking keys pair the 3-character prefixes of the first and last
+    name tokens with those of the first and last company words. Lookups only
+    score the leads sharing a key, so a near-duplicate is missed when both
+    name prefixes or both company prefixes differ. A lead with a company and
+    one without never share a key; their similarity is at most ~0.82.
+
+    Args:
+        first_name: First name
+        last_name: Last name
+        company_name: Company name
+        linkedin_url: LinkedIn profile URL
+        dimensions: Vector size (defaults to LEAD_SIMILARITY_DIMENSIONS)
+
+    Returns:
+        (float32 vector, LinkedIn key, uint64 blocking keys)
+    """
+    dimensions = dimensions or settings.LEAD_SIMILARITY_DIMENSIONS
+    vector = np.zeros(dimensions, dtype=np.float32)
+    name = _normalize(f"{first_name or ''} {last_name or ''}")
+    company = _COMPANY_SUFFIXES.sub(" ", _normalize(company_name)).split()
+    if name:
+        _add_trigrams(vector, "n", name, NAME_WEIGHT)
+        if company:
+            _add_trigrams(vector, "c", " ".join(company), COMPANY_WEIGHT)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+    return vector, linkedin_key(linkedin_url), _block_keys(name, company)
+
+
+def prospect_features(
+    prospect: Dict[str, Any],
+    dimensions: Optional[int] = None,
+) -> Tuple[np.ndarray, int, np.ndarray]:
+    """Return the features of a prospect as returned by the Prospector or RocketReach search."""
+    first_name = prospect.get("first_name")
+    last_name = prospect.get("last_name")
+    if not (first_name or last_name):
+        first_name = prospect.get("name")
+    return lead_features(
+        first_name,
+        last_name,
+        prospect.get("company_name") or prospect.get("current_employer"),
+        prospect.get("linkedin_url"),
+        dimensions,
+    )
+
+
+def _add_trigrams(vector: np.ndarray, field: str, text: str, weight: float) -> None:
+    """Add the hashed, signed trigrams of text to vector."""
+    padded = f" {text} "
+    grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+    if not grams:
+        return
+    value = weight / np.sqrt(len(grams))
+    for gram in grams:
+        digest = zlib.crc32(f"{field}:{gram}".encode())
+        vector[digest % len(vector)] += value if digest & 0x80000000 else -value
+
+
+class _KeyIndex:
+    """
+    Multimap of 64-bit keys to record rows, as sorted arrays.
+
+    New entries go to a small sorted tail that is merged into the main
+    arrays once it outgrows an eighth of them, so appends stay cheap and
+    lookups are two binary searches. Zero keys are not indexed.
+    """
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._rows = np.empty(0, dtype=np.uint32)
+        self._tail_keys = np.empty(0, dtype=np.uint64)
+        self._tail_rows = np.empty(0, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._tail_keys)
+
+    def add(self, keys: np.ndarray, rows: np.ndarray) -> None:
+        """Index rows under keys (arrays of the same length)."""
+        present = keys != 0
+        keys = np.concatenate([self._tail_keys, keys[present]])
+        rows = np.concatenate([self._tail_rows, rows[present]])
+        order = np.argsort(keys, kind="stable")
+        self._tail_keys, self._tail_rows = keys[order], rows[order]
+        if len(self._tail_keys) > max(KEY_MERGE_ROWS, len(self._keys) // 8):
+            positions = np.searchsorted(self._keys, self._tail_keys, side="right")
+            self._keys = np.insert(self._keys, positions, self._tail_keys)
+            self._rows = np.insert(self._rows, positions, self._tail_rows)
+            self._tail_keys = np.empty(0, dtype=np.uint64)
+            self._tail_rows = np.empty(0, dtype=np.uint32)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Return the rows indexed under any of keys."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        parts = []
+        for sorted_keys, rows in ((self._keys, self._rows), (self._tail_keys, self._tail_rows)):
+            lows = np.searchsorted(sorted_keys, keys, side="left").tolist()
+            highs = np.searchsorted(sorted_keys, keys, side="right").tolist()
+            parts.extend(rows[low:high] for low, high in zip(lows, highs) if high > low)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint32)
+
+
+class LeadSimilarityIndex:
+    """
+    Append-only similarity index of an organization's leads.
+
+    Each lead is a fixed-size record (ID, LinkedIn key, blocking keys,
+    vector) appended to one file, so the index is persisted and updated
+    incrementally: writers append with a single write, and every process
+    catches up by indexing the records past what it has already loaded.
+
+    Records are read through a memory map, so IDs and vectors live in the
+    page cache shared by all processes of the host (~570 bytes per lead at
+    128 dimensions). Each process only keeps the sorted LinkedIn and
+    blocking keys in memory (12 bytes per key, at most 5 per lead). A lookup
+    scores exactly the leads sharing a blocking key with the query, instead
+    of every lead of the organization.
+    """
+
+    def __init__(self, path: Path, dimensions: int):
+        """
+        Initialize index (records are read on ``refresh``).
+
+        Args:
+            path: Index file
+            dimensions: Vector size
+        """
+        self.path = path
+        self.dimensions = dimensions
+        self.dtype = np.dtype([
+            ("id", "S16"),
+            ("linkedin", "<u8"),
+            ("blocks", "<u8", (BLOCK_KEYS,)),
+            ("vector", "<f4", (dimensions,)),
+        ])
+        self._records: Optional[np.ndarray] = None
+        self._size = 0
+        self._by_linkedin = _KeyIndex()
+        self._by_block = _KeyIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def refresh(self) -> int:
+        """
+        Index the records appended to the file since the last refresh.
+
+        Returns:
+            Number of records loaded
+        """
+        with self._lock:
+            try:
+                available = self.path.stat().st_size // self.dtype.itemsize
+            except FileNotFoundError:
+                return 0
+            if available <= self._size:
+                return 0
+            # A map covers the file as it was; map it again once it has grown
+            self._records = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(available,))
+            records = self._records[self._size:available]
+            rows = np.arange(self._size, available, dtype=np.uint32)
+            self._by_linkedin.add(np.asarray(records["linkedin"], dtype=np.uint64), rows)
+            self._by_block.add(
+                np.asarray(records["blocks"], dtype=np.uint64).reshape(-1),
+                np.repeat(rows, BLOCK_KEYS),
+            )
+            loaded, self._size = available - self._size, available
+            return loaded
+
+    def add(self, leads: Iterable[Tuple[UUID, np.ndarray, int, np.ndarray]]) -> int:
+        """
+        Add leads to the index and append them to its file.
+
+        Args:
+            leads: (lead ID, vector, LinkedIn key, blocking keys) tuples
+
+        Returns:
+            Number of leads added
+        """
+        leads = list(leads)
+        if not leads:
+            return 0
+        records = np.empty(len(leads), dtype=self.dtype)
+        for row, (lead_id, vector, key, blocks) in enumerate(leads):
+            records[row] = (lead_id.bytes, key, blocks, vector)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # O_APPEND writes land at the end even with other writers; the records
+        # are then loaded back in file order, with whatever others appended
+        data = memoryview(records.tobytes())
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        self.refresh()
+        return len(records)
+
+    def search(
+        self,
+        queries: List[Tuple[np.ndarray, int, np.ndarray]],
+        min_score: float,
+        k: int = 1,
+    ) -> List[List[Tuple[UUID, float]]]:
+        """
+        Return the most similar leads for each query.
+
+        A LinkedIn key match scores 1.0; otherwise the score is the cosine
+        similarity of the vectors, computed for the leads sharing a blocking
+        key with the query.
+
+        Args:
+            queries: (vector, LinkedIn key, blocking keys) tuples
+            min_score: Lowest score returned
+            k: Matches returned per query
+
+        Returns:
+            Up to k (lead ID, score) pairs per query, best first
+        """
+        self.refresh()
+        with self._lock:
+            records = self._records
+            candidates = [
+                (
+                    self._by_linkedin.lookup([key]) if key else np.empty(0, dtype=np.uint32),
+                    self._by_block.lookup(blocks[blocks != 0]),
+                )
+                for _, key, blocks in queries
+            ]
+
+        results = []
+        for (vector, _, _), (linked, blocked) in zip(queries, candidates):
+            found = dict.fromkeys(linked.tolist(), 1.0)
+            # Sorted rows read the mapped file in order
+            rows = np.setdiff1d(blocked, linked)
+            if len(rows):
+                scores = records["vector"][rows] @ np.asarray(vector, dtype=np.float32)
+                keep = scores >= min_score
+                found.update(zip(rows[keep].tolist(), scores[keep].tolist()))
+            best = sorted(found.items(), key=lambda item: item[1], reverse=True)[:k]
+            results.append([
+                (UUID(bytes=records["id"][row:row + 1].tobytes()), round(score, 4)) for row, score in best
+            ])
+        return results
+
+
+class LeadSimilarityService:
+    """Service finding near-duplicate leads across an organization's campaigns."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def index_for(self, organization_id: UUID) -> LeadSimilarityIndex:
+        """
+        Return the organization's index, building its file from the leads if missing.
+
+        Args:
+            organization_id: Organization ID
+
+        Returns:
+            Loaded index
+        """
+        index = get_similarity_index(organization_id)
+        if len(index) == 0 and not index.path.exists():
+            self._build(index, organization_id)
+        else:
+            index.refresh()
+        return index
+
+    def find_duplicates(
+        self,
+        organization_id: UUID,
+        prospects: List[Dict[str, Any]],
+        min_score: Optional[float] = None,
+    ) -> Dict[int, Tuple[UUID, float]]:
+        """
+        Find prospects that are near-duplicates of existing leads.
+
+        Args:
+            organization_id: Organization ID
+            prospects: Prospect dictionaries
+            min_score: Similarity threshold (defaults to LEAD_DEDUP_THRESHOLD)
+
+        Returns:
+            (lead ID, score) of the best match, keyed by prospect position
+        """
+        if not prospects:
+            return {}
+        index = self.index_for(organization_id)
+        queries = [prospect_features(prospect, index.dimensions) for prospect in prospects]
+        results = index.search(queries, min_score or settings.LEAD_DEDUP_THRESHOLD)
+        duplicates = {position: matches[0] for position, matches in enumerate(results) if matches}
+        if not duplicates:
+            return {}
+
+        # The index is append-only: ignore matches on leads deleted since
+        lead_ids = {lead_id for lead_id, _ in duplicates.values()}
+        live = {row.id for row in self.db.query(Lead.id).filter(Lead.id.in_(lead_ids)).all()}
+        return {position: match for position, match in duplicates.items() if match[0] in live}
+
+    def add_leads(self, organization_id: UUID, lead_ids: List[UUID]) -> int:
+        """
+        Add newly created leads to the organization's index.
+
+        Args:
+            organization_id: Organization ID
+            lead_ids: IDs of the new leads
+
+        Returns:
+            Number of leads indexed
+        """
+        if not lead_ids:
+            return 0
+        index = self.index_for(organization_id)
+        rows = (
+            self.db.query(Lead.id, Lead.first_name, Lead.last_name, Lead.company_name, Lead.linkedin_url)
+            .filter(Lead.id.in_(lead_ids))
+            .all()
+        )
+        return index.add(self._features(rows, index.dimensions))
+
+    def _build(self, index: LeadSimilarityIndex, organization_id: UUID) -> None:
+        """Index every lead of the organization."""
+        query = (
+            self.db.query(Lead.id, Lead.first_name, Lead.last_name, Lead.company_name, Lead.linkedin_url)
+            .filter(Lead.organization_id == organization_id)
+            .order_by(Lead.id)
+            .yield_per(SCAN_CHUNK_ROWS)
+        )
+        batch = []
+        for row in query:
+            batch.append(row)
+            if len(batch) == SCAN_CHUNK_ROWS:
+                index.add(self._features(batch, index.dimensions))
+                batch = []
+        index.add(self._features(batch, index.dimensions))
+        index.path.parent.mkdir(parents=True, exist_ok=True)
+        index.path.touch()
+        logger.info(f"Built lead similarity index of organization {organization_id} ({len(index)} leads)")
+
+    @staticmethod
+    def _features(rows: Iterable[Any], dimensions: int) -> List[Tuple[UUID, np.ndarray, int, np.ndarray]]:
+        """Return index entries for lead rows."""
+        return [
+            (row.id, *lead_features(row.first_name, row.last_name, row.company_name, row.linkedin_url, dimensions))
+            for row in rows
+        ]
+
+
+_indexes: Dict[UUID, LeadSimilarityIndex] = {}
+_indexes_pid: Optional[int] = None
+_indexes_lock = threading.Lock()
+
+
+def get_similarity_index(organization_id: UUID) -> LeadSimilarityIndex:
+    """
+    Get the process-wide similarity index of an organization.
+
+    Indexes are cached per process and dropped after a fork; every process
+    catches up with the shared file on refresh.
+
+    Args:
+        organization_id: Organization ID
+
+    Returns:
+        LeadSimilarityIndex instance
+    """
+    global _indexes_pid
+
+    dimensions = settings.LEAD_SIMILARITY_DIMENSIONS
+    with _indexes_lock:
+        if _indexes_pid != os.getpid():
+            _indexes.clear()
+            _indexes_pid = os.getpid()
+        index = _indexes.get(organization_id)
+        if index is None:
+            path = Path(settings.LEAD_SIMILARITY_INDEX_DIR) / f"{organization_id}.v2.d{dimensions}.idx"
+            index = _indexes[organization_id] = LeadSimilarityIndex(path, dimensions)
+        return index
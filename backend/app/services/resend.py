@@ -9,6 +9,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.usage import record_api_call
 from app.core.exceptions import BadRequestError
 
 logger = get_logger(__name__)
@@ -262,6 +263,7 @@ def send_email(
         
         # Send email (Emails is a class, we need to instantiate it)
         emails = resend.Emails()
+        record_api_call("resend")
         response = emails.send(params)
         
         logger.info(
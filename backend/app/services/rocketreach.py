@@ -1,11 +1,13 @@
 """RocketReach API integration for prospect finding and enrichment."""
 
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
+from contextlib import asynccontextmanager
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.usage import record_api_call
 
 logger = get_logger(__name__)
 
@@ -17,14 +19,21 @@ ROCKETREACH_RATE_LIMIT = 50  # requests per minute
 class RocketReachService:
     """Service for interacting with RocketReach API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         """
         Initialize RocketReach service.
         
         Args:
             api_key: RocketReach API key (defaults to settings)
+            http_client: Shared async HTTP client (optional, one client per
+                call is created when omitted)
         """
         self.api_key = api_key or settings.ROCKETREACH_API_KEY
+        self.http_client = http_client
         if not self.api_key:
             logger.warning("ROCKETREACH_API_KEY not configured")
         
@@ -34,6 +43,15 @@ class RocketReachService:
             "Content-Type": "application/json",
         } if self.api_key else {}
 
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared HTTP client, or a short-lived one if none was given."""
+        if self.http_client is not None and not self.http_client.is_closed:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                yield client
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -47,6 +65,7 @@ class RocketReachService:
         company_sizes: Optional[List[str]] = None,
         industries: Optional[List[str]] = None,
         limit: int = 50,
+        start: int = 1,
     ) -> List[Dict[str, Any]]:
         """
         Search for people using RocketReach API.
@@ -58,6 +77,8 @@ class RocketReachService:
             company_sizes: List of company sizes (e.g., ["51-200", "201-500"])
             industries: List of industries
             limit: Maximum number of results (default: 50)
+            start: Position of the first result (1-based), to page through
+                a search
             
         Returns:
             List of prospect data dictionaries
@@ -85,9 +106,12 @@ class RocketReachService:
             query["industries"] = industries
         
         query["limit"] = min(limit, 100)  # RocketReach max is 100
+        if start > 1:
+            query["start"] = start
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._client() as client:
+                record_api_call("rocketreach")
                 response = await client.post(
                     f"{self.base_url}/api/search/profile",
                     headers=self.headers,
@@ -161,7 +185,8 @@ class RocketReachService:
             return None
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._client() as client:
+                record_api_call("rocketreach")
                 response = await client.post(
                     f"{self.base_url}/api/lookup/person",
                     headers=self.headers,
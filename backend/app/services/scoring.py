@@ -1,15 +1,20 @@
 """BANT scoring service."""
 
-from typing import Dict, Any, Optional
-import re
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
 from app.core.logging import get_logger
+from app.services.scoring_plan import default_plan
 
 logger = get_logger(__name__)
 
 
 class BANTScoringService:
-    """Service for calculating BANT scores."""
+    """
+    Service for calculating BANT scores with the default rules.
+    
+    Delegates to the default ScoringPlan (qualification at 60); campaigns
+    with their own rules or threshold score with ScoringPlan.for_campaign.
+    """
 
     @staticmethod
     def calculate_budget_score(company_size: Optional[str] = None) -> tuple[int, str]:
@@ -22,28 +27,7 @@ class BANTScoringService:
         Returns:
             Tuple of (score, reasoning)
         """
-        if not company_size:
-            return (5, "Taille entreprise inconnue")
-        
-        size_str = str(company_size).lower()
-        
-        # Extract numbers
-        numbers = re.findall(r'\d+', size_str)
-        if not numbers:
-            return (5, "Taille entreprise non analysable")
-        
-        max_size = max(int(n) for n in numbers)
-        
-        if max_size < 10:
-            return (5, "Startup early-stage (<10 employés)")
-        elif max_size < 30:
-            return (8, "PME 10-30 employés, budget limité")
-        elif max_size < 100:
-            return (13, "PME 30-100 employés, budget probable")
-        elif max_size < 500:
-            return (18, "ETI 100-500 employés, budget confirmé")
-        else:
-            return (23, "Grande entreprise, budget dédié")
+        return default_plan().budget(company_size)
 
     @staticmethod
     def calculate_authority_score(job_title: Optional[str] = None) -> tuple[int, str]:
@@ -56,29 +40,7 @@ class BANTScoringService:
         Returns:
             Tuple of (score, reasoning)
         """
-        if not job_title:
-            return (5, "Poste inconnu")
-        
-        title_lower = job_title.lower()
-        
-        # C-Level / Founder
-        if any(term in title_lower for term in ['ceo', 'cto', 'cfo', 'coo', 'founder', 'co-founder', 'president']):
-            return (23, "C-Level / Founder")
-        
-        # VP / Head of
-        if any(term in title_lower for term in ['vp', 'vice president', 'head of', 'directeur général']):
-            return (18, "VP / Head of")
-        
-        # Director
-        if any(term in title_lower for term in ['director', 'directeur', 'directrice']):
-            return (13, "Directeur de département")
-        
-        # Manager
-        if any(term in title_lower for term in ['manager', 'responsable', 'chef de']):
-            return (8, "Manager d'équipe")
-        
-        # Individual contributor
-        return (5, "Contributeur individuel")
+        return default_plan().authority(job_title)
 
     @staticmethod
     def calculate_need_score(
@@ -95,33 +57,7 @@ class BANTScoringService:
         Returns:
             Tuple of (score, reasoning)
         """
-        score = 5
-        signals = []
-        
-        if industry:
-            signals.append(f"Secteur: {industry}")
-            score += 5
-        
-        if enrichment_data:
-            raw_data = enrichment_data.get("raw_data", {})
-            
-            # Check for signals in enrichment data
-            if raw_data.get("current_employer_size"):
-                signals.append("Données entreprise disponibles")
-                score += 5
-            
-            if raw_data.get("seniority_level"):
-                signals.append("Niveau seniorité identifié")
-                score += 3
-        
-        if score >= 20:
-            return (20, "Signaux forts: " + ", ".join(signals))
-        elif score >= 15:
-            return (15, "Signaux moyens: " + ", ".join(signals) if signals else "Secteur concerné")
-        elif score >= 10:
-            return (10, "Signaux faibles" + (": " + ", ".join(signals) if signals else ""))
-        else:
-            return (5, "Pas d'indicateur de besoin clair")
+        return default_plan().need(enrichment_data, industry)
 
     @staticmethod
     def calculate_timeline_score(
@@ -138,21 +74,7 @@ class BANTScoringService:
         Returns:
             Tuple of (score, reasoning)
         """
-        score = 10  # Base: activité normale
-        
-        if linkedin_url:
-            score += 3  # Profile exists
-        
-        if enrichment_data:
-            raw_data = enrichment_data.get("raw_data", {})
-            if raw_data.get("updated_at"):
-                score += 5
-                return (15, "Profil LinkedIn récemment mis à jour")
-        
-        if score >= 15:
-            return (15, "Activité récente détectée")
-        else:
-            return (10, "Activité normale sur LinkedIn")
+        return default_plan().timeline(linkedin_url, enrichment_data)
 
     @staticmethod
     def calculate_bant_score(
@@ -175,37 +97,63 @@ class BANTScoringService:
         Returns:
             Dictionary with BANT breakdown and total score
         """
-        budget_score, budget_reasoning = BANTScoringService.calculate_budget_score(company_size)
-        authority_score, authority_reasoning = BANTScoringService.calculate_authority_score(job_title)
-        need_score, need_reasoning = BANTScoringService.calculate_need_score(enrichment_data, industry)
-        timeline_score, timeline_reasoning = BANTScoringService.calculate_timeline_score(linkedin_url, enrichment_data)
-        
-        total_score = budget_score + authority_score + need_score + timeline_score
+        return default_plan().score(company_size, job_title, enrichment_data, industry, linkedin_url)
+
+    @staticmethod
+    def enrichment_signals(enrichment_data: Optional[Dict[str, Any]] = None) -> Tuple[bool, bool, bool]:
+        """
+        Return the enrichment signals used by the need and timeline scores.
         
-        breakdown = {
-            "budget": {
-                "score": budget_score,
-                "reasoning": budget_reasoning
-            },
-            "authority": {
-                "score": authority_score,
-                "reasoning": authority_reasoning
-            },
-            "need": {
-                "score": need_score,
-                "reasoning": need_reasoning
-            },
-            "timeline": {
-                "score": timeline_score,
-                "reasoning": timeline_reasoning
-            }
-        }
+        Args:
+            enrichment_data: Enrichment data dictionary
+            
+        Returns:
+            (employer size known, seniority known, profile recently updated)
+        """
+        raw_data = (enrichment_data or {}).get("raw_data") or {}
+        return (
+            bool(raw_data.get("current_employer_size")),
+            bool(raw_data.get("seniority_level")),
+            bool(raw_data.get("updated_at")),
+        )
+
+    @staticmethod
+    def calculate_bant_scores(
+        company_sizes: Sequence[Optional[str]],
+        job_titles: Sequence[Optional[str]],
+        industries: Sequence[Optional[str]],
+        signals: Sequence[Tuple[bool, bool, bool]],
+        max_employees: Optional[Sequence[Optional[int]]] = None,
+        seniority_tiers: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate BANT scores for many leads at once.
         
-        qualified = total_score >= 60
+        Returns exactly what calculate_bant_score returns for each lead, but
+        scores the columns in one pass: each distinct company size and job
+        title is parsed once, then tiers, totals and recommendations are
+        computed with NumPy over the whole batch.
         
-        return {
-            "bant_breakdown": breakdown,
-            "bant_score": total_score,
-            "qualified": qualified,
-            "recommendation": "contact" if qualified else ("nurture" if total_score >= 40 else "reject")
-        }
+        Args:
+            company_sizes: Company size per lead
+            job_titles: Job title per lead
+            industries: Industry per lead
+            signals: enrichment_signals of each lead's enrichment data (the
+                LinkedIn URL does not change the timeline score)
+            max_employees: Stored employees_max per lead; when given, sizes
+                are not parsed again (company_sizes still tells an unknown
+                size from an unparsable one)
+            seniority_tiers: Stored seniority_tier per lead; when given,
+                job_titles are not classified again
+            
+        Returns:
+            One BANT result per lead, in input order
+        """
+        return default_plan().score_columns(
+            company_sizes,
+            job_titles,
+            industries,
+            signals,
+            max_employees=max_employees,
+            seniority_tiers=seniority_tiers,
+        )
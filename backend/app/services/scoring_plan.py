@@ -0,0 +1,524 @@
+"""Per-campaign BANT scoring rules, compiled into executable plans."""
+
+import bisect
+import copy
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.title_classifier import AUTHORITY_TIERS, INDIVIDUAL_CONTRIBUTOR, UNKNOWN_TITLE, TitleClassifier
+
+BANT_CRITERIA = ("budget", "authority", "need", "timeline")
+
+DEFAULT_BANT_THRESHOLD = 60
+
+# Highest score of one criterion before its weight is applied
+MAX_CRITERION_SCORE = 25
+
+# Distinct rule sets with a compiled plan
+PLAN_CACHE_SIZE = 128
+
+# The rules every campaign starts from; a campaign's scoring_rules are
+# merged over them (nested dicts key by key, lists replaced as a whole)
+DEFAULT_SCORING_RULES: Dict[str, Any] = {
+    "weights": {criterion: 1.0 for criterion in BANT_CRITERIA},
+    # Company size: first tier whose bound (exclusive) is above the largest
+    # number in company_size; the last tier has no bound
+    "budget": {
+        "tiers": [
+            {"below": 10, "score": 5, "reasoning": "Startup early-stage (<10 employés)"},
+            {"below": 30, "score": 8, "reasoning": "PME 10-30 employés, budget limité"},
+            {"below": 100, "score": 13, "reasoning": "PME 30-100 employés, budget probable"},
+            {"below": 500, "score": 18, "reasoning": "ETI 100-500 employés, budget confirmé"},
+            {"below": None, "score": 23, "reasoning": "Grande entreprise, budget dédié"},
+        ],
+        "unknown": {"score": 5, "reasoning": "Taille entreprise inconnue"},
+        "unparsable": {"score": 5, "reasoning": "Taille entreprise non analysable"},
+    },
+    # Job title: first tier with a keyword anywhere in the lowercased title
+    "authority": {
+        "tiers": [
+            {"name": name, "keywords": list(keywords), "score": score, "reasoning": reasoning}
+            for name, keywords, score, reasoning in AUTHORITY_TIERS
+        ],
+        "default": {
+            "name": INDIVIDUAL_CONTRIBUTOR[0],
+            "score": INDIVIDUAL_CONTRIBUTOR[1],
+            "reasoning": INDIVIDUAL_CONTRIBUTOR[2],
+        },
+        "unknown": {"score": UNKNOWN_TITLE[0], "reasoning": UNKNOWN_TITLE[1]},
+    },
+    # Signal points added to the base, then the first tier whose minimum
+    # the points reach
+    "need": {
+        "base": 5,
+        "signals": {"industry": 5, "company_data": 5, "seniority": 3},
+        "tiers": [
+            {"min": 20, "score": 20, "label": "Signaux forts"},
+            {"min": 15, "score": 15, "label": "Signaux moyens"},
+            {"min": 10, "score": 10, "label": "Signaux faibles"},
+        ],
+        "default": {"score": 5, "reasoning": "Pas d'indicateur de besoin clair"},
+    },
+    # Recently updated profile or not
+    "timeline": {
+        "recent": {"score": 15, "reasoning": "Profil LinkedIn récemment mis à jour"},
+        "default": {"score": 10, "reasoning": "Activité normale sur LinkedIn"},
+    },
+    # Leads below the qualification threshold but at least this score are nurtured
+    "nurture_threshold": 40,
+}
+
+_NEED_SIGNALS = ("industry", "company_data", "seniority")
+
+_NUMBER = re.compile(r"\d+")
+
+# Parsed company size markers, and the largest headcount kept (only the
+# tier bounds matter)
+_SIZE_UNKNOWN = -1
+_SIZE_UNPARSABLE = -2
+_MAX_SIZE = 2 ** 62
+
+
+class ScoringPlan:
+    """
+    A campaign's BANT scoring rules, compiled once and reused for every lead.
+
+    Compiling merges the rules over DEFAULT_SCORING_RULES, validates them,
+    applies the weights to every tier score and builds the lookup tables
+    (budget bounds, one TitleClassifier for the authority keywords, need
+    tiers). Scoring a lead then only reads those tables.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None, threshold: Optional[int] = None):
+        """
+        Compile a plan.
+
+        Args:
+            rules: Campaign scoring rules (None for the defaults)
+            threshold: Qualification threshold (campaign bant_threshold)
+
+        Raises:
+            ValueError: If the rules or threshold are invalid
+        """
+        self.rules = _merge(DEFAULT_SCORING_RULES, rules or {})
+        self.threshold = DEFAULT_BANT_THRESHOLD if threshold is None else threshold
+        _validate(self.rules, self.threshold)
+
+        weights = self.rules["weights"]
+
+        def scored(entry: Dict[str, Any], criterion: str) -> Tuple[int, str]:
+            return int(round(entry["score"] * weights[criterion])), entry["reasoning"]
+
+        budget = self.rules["budget"]
+        self.budget_bounds = [tier["below"] for tier in budget["tiers"][:-1]]
+        self.budget_tiers = [scored(tier, "budget") for tier in budget["tiers"]] + [
+            scored(budget["unknown"], "budget"),
+            scored(budget["unparsable"], "budget"),
+        ]
+        self._budget_bounds = np.array(self.budget_bounds, dtype=np.int64)
+        self._budget_scores = np.array([score for score, _ in self.budget_tiers])
+
+        authority = self.rules["authority"]
+        keyword_tiers = [
+            (tier["name"], tuple(keyword.lower() for keyword in tier["keywords"]), *scored(tier, "authority"))
+            for tier in authority["tiers"]
+        ]
+        default = authority["default"]
+        self.titles = TitleClassifier(keyword_tiers, (default["name"], *scored(default, "authority")))
+        self.unknown_title = scored(authority["unknown"], "authority")
+        # Stored lead seniority tiers come from the default keywords
+        self.uses_stored_tiers = (
+            [(name, keywords) for name, keywords, _, _ in keyword_tiers]
+            == [(name, keywords) for name, keywords, _, _ in AUTHORITY_TIERS]
+            and default["name"] == INDIVIDUAL_CONTRIBUTOR[0]
+        )
+
+        need = self.rules["need"]
+        self.need_base = need["base"]
+        self.need_points = tuple(need["signals"][signal] for signal in _NEED_SIGNALS)
+        self.need_tiers = [
+            (tier["min"], int(round(tier["score"] * weights["need"])), tier["label"])
+            for tier in sorted(need["tiers"], key=lambda tier: tier["min"], reverse=True)
+        ]
+        self.need_default = scored(need["default"], "need")
+
+        timeline = self.rules["timeline"]
+        self.timeline_tiers = [scored(timeline["default"], "timeline"), scored(timeline["recent"], "timeline")]
+        self._timeline_scores = np.array([score for score, _ in self.timeline_tiers])
+
+        self.nurture_threshold = self.rules["nurture_threshold"]
+        # Identifies the rules a score was computed with; the threshold only
+        # decides qualification, so changing it keeps the stored scores valid
+        self.version = hashlib.sha256(
+            json.dumps(self.rules, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+
+    @classmethod
+    def for_campaign(cls, campaign: Any) -> "ScoringPlan":
+        """
+        Get the compiled plan of a campaign.
+
+        Plans are compiled once per distinct rule set and threshold.
+
+        Args:
+            campaign: Campaign with scoring_rules and bant_threshold
+        """
+        return compile_scoring_plan(campaign.scoring_rules, campaign.bant_threshold)
+
+    def budget(self, company_size: Optional[str] = None) -> Tuple[int, str]:
+        """Return the budget (score, reasoning) of a company size."""
+        return self.budget_tiers[self._budget_tier(_max_size(company_size))]
+
+    def authority(self, job_title: Optional[str] = None) -> Tuple[int, str]:
+        """Return the authority (score, reasoning) of a job title."""
+        if not job_title:
+            return self.unknown_title
+        return self.titles.classify(job_title)
+
+    def need(self, enrichment_data: Optional[Dict[str, Any]] = None, industry: Optional[str] = None) -> Tuple[int, str]:
+        """Return the need (score, reasoning) of a lead's signals."""
+        raw_data = (enrichment_data or {}).get("raw_data") or {}
+        return self._need(industry or None, bool(raw_data.get("current_employer_size")), bool(raw_data.get("seniority_level")))
+
+    def timeline(
+        self,
+        linkedin_url: Optional[str] = None,
+        enrichment_data: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, str]:
+        """Return the timeline (score, reasoning); only a recent profile update counts."""
+        raw_data = (enrichment_data or {}).get("raw_data") or {}
+        return self.timeline_tiers[1 if raw_data.get("updated_at") else 0]
+
+    def decide(self, total_score: int) -> Tuple[bool, str]:
+        """Return whether a total qualifies and the recommendation for it."""
+        qualified = total_score >= self.threshold
+        return qualified, "contact" if qualified else ("nurture" if total_score >= self.nurture_threshold else "reject")
+
+    def score(
+        self,
+        company_size: Optional[str] = None,
+        job_title: Optional[str] = None,
+        enrichment_data: Optional[Dict[str, Any]] = None,
+        industry: Optional[str] = None,
+        linkedin_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Score one lead.
+
+        Returns:
+            Dictionary with bant_breakdown, bant_score, qualified and
+            recommendation
+        """
+        breakdown = {
+            "budget": self.budget(company_size),
+            "authority": self.authority(job_title),
+            "need": self.need(enrichment_data, industry),
+            "timeline": self.timeline(linkedin_url, enrichment_data),
+        }
+        total_score = sum(score for score, _ in breakdown.values())
+        qualified, recommendation = self.decide(total_score)
+        return {
+            "bant_breakdown": {
+                criterion: {"score": score, "reasoning": reasoning}
+                for criterion, (score, reasoning) in breakdown.items()
+            },
+            "bant_score": total_score,
+            "qualified": qualified,
+            "recommendation": recommendation,
+        }
+
+    def score_columns(
+        self,
+        company_sizes: Sequence[Optional[str]],
+        job_titles: Sequence[Optional[str]],
+        industries: Sequence[Optional[str]],
+        signals: Sequence[Tuple[bool, bool, bool]],
+        max_employees: Optional[Sequence[Optional[int]]] = None,
+        seniority_tiers: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score many leads at once.
+
+        Returns exactly what score returns for each lead, but scores the
+        columns in one pass: each distinct company size and job title is
+        parsed once, then tiers, totals and recommendations are computed
+        with NumPy over the whole batch.
+
+        Args:
+            company_sizes: Company size per lead
+            job_titles: Job title per lead
+            industries: Industry per lead
+            signals: (employer size known, seniority known, profile recently
+                updated) per lead, see BANTScoringService.enrichment_signals
+            max_employees: Stored employees_max per lead; when given, sizes
+                are not parsed again (company_sizes still tells an unknown
+                size from an unparsable one)
+            seniority_tiers: Stored seniority_tier per lead; when given and
+                the plan keeps the default title keywords, job_titles are
+                not classified again
+
+        Returns:
+            One BANT result per lead, in input order
+        """
+        count = len(company_sizes)
+        lengths = {len(job_titles), len(industries), len(signals), count}
+        lengths.update(len(column) for column in (max_employees, seniority_tiers) if column is not None)
+        if lengths != {count}:
+            raise ValueError("BANT score columns must have the same length")
+        if count == 0:
+            return []
+
+        # Budget: largest number of each distinct size, then tiers in one pass
+        if max_employees is None:
+            size_codes, sizes = _factorize(company_sizes)
+            max_sizes = np.array([_max_size(size) for size in sizes], dtype=np.int64)[size_codes]
+        else:
+            max_sizes = np.fromiter(
+                (
+                    _SIZE_UNKNOWN if not size else _SIZE_UNPARSABLE if employees is None else employees
+                    for size, employees in zip(company_sizes, max_employees)
+                ),
+                dtype=np.int64,
+                count=count,
+            )
+        tier_count = len(self.budget_bounds) + 1
+        budget_tier = np.searchsorted(self._budget_bounds, max_sizes, side="right")
+        budget_tier[max_sizes == _SIZE_UNKNOWN] = tier_count
+        budget_tier[max_sizes == _SIZE_UNPARSABLE] = tier_count + 1
+        budget_scores = self._budget_scores[budget_tier]
+
+        # Authority: each distinct title (or stored tier) is classified once
+        if seniority_tiers is not None and self.uses_stored_tiers:
+            title_codes, tiers = _factorize(seniority_tiers)
+            title_tiers = [self.titles.score_of(tier) if tier else self.unknown_title for tier in tiers]
+        else:
+            title_codes, titles = _factorize(job_titles)
+            title_tiers = [self.authority(title) for title in titles]
+        authority_scores = np.array([score for score, _ in title_tiers])[title_codes]
+
+        # Need and timeline from the signal columns
+        flags = np.array(signals, dtype=bool).reshape(count, 3)
+        has_industry = np.array([bool(industry) for industry in industries])
+        industry_points, company_points, seniority_points = self.need_points
+        need_points = (
+            self.need_base + industry_points * has_industry + company_points * flags[:, 0] + seniority_points * flags[:, 1]
+        )
+        need_tier = np.select(
+            [need_points >= minimum for minimum, _, _ in self.need_tiers],
+            list(range(len(self.need_tiers))),
+            default=len(self.need_tiers),
+        )
+        need_scores = np.array([score for _, score, _ in self.need_tiers] + [self.need_default[0]])[need_tier]
+        recent = flags[:, 2].astype(np.int64)
+        timeline_scores = self._timeline_scores[recent]
+
+        totals = budget_scores + authority_scores + need_scores + timeline_scores
+        qualified = totals >= self.threshold
+        recommendations = np.where(qualified, "contact", np.where(totals >= self.nurture_threshold, "nurture", "reject"))
+
+        need_reasonings: Dict[Tuple[Any, bool, bool], str] = {}
+        results = []
+        for i, (budget, authority, need, timeline, total, is_qualified, recommendation) in enumerate(zip(
+            budget_scores.tolist(),
+            authority_scores.tolist(),
+            need_scores.tolist(),
+            timeline_scores.tolist(),
+            totals.tolist(),
+            qualified.tolist(),
+            recommendations.tolist(),
+        )):
+            need_key = (industries[i] or None, bool(flags[i, 0]), bool(flags[i, 1]))
+            need_reasoning = need_reasonings.get(need_key)
+            if need_reasoning is None:
+                need_reasoning = need_reasonings[need_key] = self._need(*need_key)[1]
+            results.append({
+                "bant_breakdown": {
+                    "budget": {"score": budget, "reasoning": self.budget_tiers[budget_tier[i]][1]},
+                    "authority": {"score": authority, "reasoning": title_tiers[title_codes[i]][1]},
+                    "need": {"score": need, "reasoning": need_reasoning},
+                    "timeline": {"score": timeline, "reasoning": self.timeline_tiers[recent[i]][1]},
+                },
+                "bant_score": total,
+                "qualified": is_qualified,
+                "recommendation": recommendation,
+            })
+        return results
+
+    def _budget_tier(self, max_size: int) -> int:
+        """Return the budget tier index of a parsed company size."""
+        if max_size == _SIZE_UNKNOWN:
+            return len(self.budget_bounds) + 1
+        if max_size == _SIZE_UNPARSABLE:
+            return len(self.budget_bounds) + 2
+        return bisect.bisect_right(self.budget_bounds, max_size)
+
+    def _need(self, industry: Optional[str], employer_size: bool, seniority: bool) -> Tuple[int, str]:
+        """Return the need (score, reasoning) of a lead's signals."""
+        industry_points, company_points, seniority_points = self.need_points
+        points = self.need_base
+        signals = []
+        if industry:
+            signals.append(f"Secteur: {industry}")
+            points += industry_points
+        if employer_size:
+            signals.append("Données entreprise disponibles")
+            points += company_points
+        if seniority:
+            signals.append("Niveau seniorité identifié")
+            points += seniority_points
+
+        for minimum, score, label in self.need_tiers:
+            if points >= minimum:
+                return score, label + (": " + ", ".join(signals) if signals else "")
+        return self.need_default
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile(rules_json: str, threshold: Optional[int]) -> ScoringPlan:
+    """Compile (once per distinct rule set and threshold) a plan."""
+    return ScoringPlan(json.loads(rules_json), threshold)
+
+
+def compile_scoring_plan(rules: Optional[Dict[str, Any]] = None, threshold: Optional[int] = None) -> ScoringPlan:
+    """
+    Get the compiled plan of a rule set.
+
+    Args:
+        rules: Campaign scoring rules (None for the defaults)
+        threshold: Qualification threshold (None for DEFAULT_BANT_THRESHOLD)
+
+    Raises:
+        ValueError: If the rules or threshold are invalid
+    """
+    if threshold is None:
+        threshold = DEFAULT_BANT_THRESHOLD
+    return _compile(json.dumps(rules or {}, sort_keys=True, ensure_ascii=False), threshold)
+
+
+def default_plan(threshold: Optional[int] = None) -> ScoringPlan:
+    """Get the compiled plan of the default rules."""
+    return compile_scoring_plan(None, threshold)
+
+
+def _max_size(company_size: Optional[str]) -> int:
+    """Return the largest number of a company size, or an unknown/unparsable marker."""
+    if not company_size:
+        return _SIZE_UNKNOWN
+    numbers = _NUMBER.findall(str(company_size))
+    if not numbers:
+        return _SIZE_UNPARSABLE
+    return min(max(int(n) for n in numbers), _MAX_SIZE)
+
+
+def _factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Return the code of each value and the distinct values, in first-seen order."""
+    index: Dict[Any, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+
+def _merge(defaults: Dict[str, Any], overrides: Dict[str, Any], path: str = "") -> Dict[str, Any]:
+    """Merge overrides over defaults: nested dicts key by key, anything else replaced."""
+    if not isinstance(overrides, dict):
+        raise ValueError(f"Scoring rules{' ' + path if path else ''} must be an object")
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        name = f"{path}.{key}" if path else key
+        if key not in defaults:
+            raise ValueError(f"Unknown scoring rule: {name}")
+        if isinstance(defaults[key], dict):
+            merged[key] = _merge(defaults[key], value, name)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _validate(rules: Dict[str, Any], threshold: Any) -> None:
+    """Check merged rules; raise ValueError naming the first invalid rule."""
+    if not _is_int(threshold) or not 0 <= threshold <= 100:
+        raise ValueError("BANT threshold must be between 0 and 100")
+
+    for criterion, weight in rules["weights"].items():
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Scoring rule weights.{criterion} must be a non-negative number")
+
+    budget = rules["budget"]
+    tiers = _entries(budget["tiers"], "budget.tiers", ("below", "score", "reasoning"))
+    bounds = [tier["below"] for tier in tiers]
+    if bounds[-1] is not None or not all(_is_int(bound) and bound > 0 for bound in bounds[:-1]):
+        raise ValueError("Scoring rule budget.tiers: every tier but the last needs a positive 'below' bound")
+    if bounds[:-1] != sorted(set(bounds[:-1])):
+        raise ValueError("Scoring rule budget.tiers: 'below' bounds must increase")
+    _entries([budget["unknown"]], "budget.unknown", ("score", "reasoning"))
+    _entries([budget["unparsable"]], "budget.unparsable", ("score", "reasoning"))
+
+    authority = rules["authority"]
+    tiers = _entries(authority["tiers"], "authority.tiers", ("name", "keywords", "score", "reasoning"))
+    for tier in tiers:
+        keywords = tier["keywords"]
+        if not isinstance(keywords, list) or not keywords or not all(isinstance(k, str) and k.strip() for k in keywords):
+            raise ValueError(f"Scoring rule authority.tiers: tier '{tier['name']}' needs a list of keywords")
+    default = _entries([authority["default"]], "authority.default", ("name", "score", "reasoning"))[0]
+    names = [tier["name"] for tier in tiers] + [default["name"]]
+    if not all(isinstance(name, str) and name for name in names) or len(set(names)) != len(names):
+        raise ValueError("Scoring rule authority.tiers: tier names must be distinct strings")
+    _entries([authority["unknown"]], "authority.unknown", ("score", "reasoning"))
+
+    need = rules["need"]
+    if not _is_int(need["base"]):
+        raise ValueError("Scoring rule need.base must be an integer")
+    for signal, points in need["signals"].items():
+        if not _is_int(points) or points < 0:
+            raise ValueError(f"Scoring rule need.signals.{signal} must be a non-negative integer")
+    tiers = _entries(need["tiers"], "need.tiers", ("min", "score", "label"), allow_empty=True)
+    if not all(_is_int(tier["min"]) for tier in tiers):
+        raise ValueError("Scoring rule need.tiers: every tier needs an integer 'min'")
+    _entries([need["default"]], "need.default", ("score", "reasoning"))
+
+    timeline = rules["timeline"]
+    _entries([timeline["recent"]], "timeline.recent", ("score", "reasoning"))
+    _entries([timeline["default"]], "timeline.default", ("score", "reasoning"))
+
+    nurture = rules["nurture_threshold"]
+    if not _is_int(nurture) or not 0 <= nurture <= 100:
+        raise ValueError("Scoring rule nurture_threshold must be between 0 and 100")
+
+    weights = rules["weights"]
+    best = {
+        "budget": [tier["score"] for tier in budget["tiers"]] + [budget["unknown"]["score"], budget["unparsable"]["score"]],
+        "authority": [tier["score"] for tier in authority["tiers"]] + [default["score"], authority["unknown"]["score"]],
+        "need": [tier["score"] for tier in need["tiers"]] + [need["default"]["score"]],
+        "timeline": [timeline["recent"]["score"], timeline["default"]["score"]],
+    }
+    if sum(int(round(max(scores) * weights[criterion])) for criterion, scores in best.items()) > 100:
+        raise ValueError("Scoring rules allow a BANT score above 100")
+
+
+def _entries(
+    entries: Any,
+    name: str,
+    keys: Tuple[str, ...],
+    allow_empty: bool = False,
+) -> List[Dict[str, Any]]:
+    """Check a list of rule entries has the expected keys and scores in range."""
+    if not isinstance(entries, list) or (not entries and not allow_empty):
+        raise ValueError(f"Scoring rule {name} must be a non-empty list")
+    for entry in entries:
+        if not isinstance(entry, dict) or set(entry) != set(keys):
+            raise ValueError(f"Scoring rule {name}: entries need exactly {', '.join(keys)}")
+        if not _is_int(entry["score"]) or not 0 <= entry["score"] <= MAX_CRITERION_SCORE:
+            raise ValueError(f"Scoring rule {name}: scores must be integers between 0 and {MAX_CRITERION_SCORE}")
+        text = entry.get("reasoning", entry.get("label"))
+        if not isinstance(text, str):
+            raise ValueError(f"Scoring rule {name}: reasoning must be a string")
+    return entries
+
+
+def _is_int(value: Any) -> bool:
+    """Return whether a value is an integer (and not a boolean)."""
+    return isinstance(value, int) and not isinstance(value, bool)
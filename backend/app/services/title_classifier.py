@@ -0,0 +1,198 @@
+"""Compiled, memoized job-title classification."""
+
+import re
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+# Distinct titles remembered per classifier; titles repeat heavily across leads
+TITLE_CACHE_SIZE = 8192
+
+# Distinct campaign title lists with a compiled matcher
+MATCHER_CACHE_SIZE = 256
+
+# (seniority tier, keywords, score, reasoning) in priority order; a title gets
+# the first tier with a keyword anywhere in its lowercased text (French and
+# English variants)
+AUTHORITY_TIERS: Tuple[Tuple[str, Tuple[str, ...], int, str], ...] = (
+    ("c_level", ("ceo", "cto", "cfo", "coo", "founder", "co-founder", "president"), 23, "C-Level / Founder"),
+    ("vp", ("vp", "vice president", "head of", "directeur général"), 18, "VP / Head of"),
+    ("director", ("director", "directeur", "directrice"), 13, "Directeur de département"),
+    ("manager", ("manager", "responsable", "chef de"), 8, "Manager d'équipe"),
+)
+INDIVIDUAL_CONTRIBUTOR = ("individual", 5, "Contributeur individuel")
+UNKNOWN_TITLE = (5, "Poste inconnu")
+
+# Seniority tiers, from most to least senior
+SENIORITY_TIERS = tuple(name for name, _, _, _ in AUTHORITY_TIERS) + (INDIVIDUAL_CONTRIBUTOR[0],)
+
+
+def _alternation(keywords: Sequence[str]) -> str:
+    """Return a regex alternation of literal keywords, longest first."""
+    return "|".join(re.escape(keyword) for keyword in sorted(set(keywords), key=len, reverse=True))
+
+
+class TitleClassifier:
+    """
+    Classifies job titles into authority tiers.
+
+    All tiers are compiled into one regex of lookaheads, one named group per
+    tier, so a single scan reports every position where a keyword starts
+    (overlapping keywords included, e.g. "cto" inside "director"). At each
+    position the highest-priority tier wins, then the best tier overall.
+    This gives the same result as testing each tier's keywords with ``in``
+    in priority order. Results are memoized per lowercased title.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Tuple[str, Sequence[str], int, str]] = AUTHORITY_TIERS,
+        default: Tuple[str, int, str] = INDIVIDUAL_CONTRIBUTOR,
+        cache_size: int = TITLE_CACHE_SIZE,
+    ):
+        """
+        Compile a classifier.
+
+        Args:
+            tiers: (tier name, keywords, score, reasoning) in priority order
+            default: (tier name, score, reasoning) of titles without any keyword
+            cache_size: Distinct titles kept in the LRU cache
+        """
+        self.names = [name for name, _, _, _ in tiers] + [default[0]]
+        self.tiers = [(score, reasoning) for _, _, score, reasoning in tiers] + [default[1:]]
+        groups = "|".join(
+            f"(?P<t{rank}>{_alternation(keywords)})" for rank, (_, keywords, _, _) in enumerate(tiers)
+        )
+        self._pattern = re.compile(f"(?=(?:{groups}))")
+        self._rank = lru_cache(maxsize=cache_size)(self._scan)
+
+    def classify(self, title: str) -> Tuple[int, str]:
+        """
+        Return the (score, reasoning) of a job title.
+
+        Args:
+            title: Job title (any case)
+        """
+        return self.tiers[self._rank(title.lower())]
+
+    def tier(self, title: str) -> str:
+        """Return the name of a job title's tier (e.g. "c_level")."""
+        return self.names[self._rank(title.lower())]
+
+    def score_of(self, tier: str) -> Tuple[int, str]:
+        """Return the (score, reasoning) of a tier name."""
+        return self.tiers[self.names.index(tier)]
+
+    def cache_info(self):
+        """Return the LRU cache statistics (hits, misses, size)."""
+        return self._rank.cache_info()
+
+    def cache_clear(self) -> None:
+        """Empty the LRU cache."""
+        self._rank.cache_clear()
+
+    def _scan(self, title: str) -> int:
+        """Return the tier rank of a lowercased title with one regex scan."""
+        best = len(self.tiers) - 1
+        for match in self._pattern.finditer(title):
+            best = min(best, int(match.lastgroup[1:]))
+            if best == 0:
+                break
+        return best
+
+
+class TitleMatcher:
+    """
+    Matches job titles against a campaign's target titles.
+
+    A title matches when a target is part of it or it is part of a target
+    (both lowercased), as the firmographic score has always compared them.
+    Targets are compiled into one alternation regex and results memoized.
+    """
+
+    def __init__(self, targets: Sequence[str], cache_size: int = TITLE_CACHE_SIZE):
+        """
+        Compile a matcher.
+
+        Args:
+            targets: Target job titles
+            cache_size: Distinct titles kept in the LRU cache
+        """
+        self.targets = tuple(target.lower() for target in targets)
+        self._pattern = re.compile(_alternation(self.targets)) if self.targets else None
+        self._matches = lru_cache(maxsize=cache_size)(self._match)
+
+    def matches(self, title: str) -> bool:
+        """Return whether a job title matches one of the targets."""
+        return self._matches(title.lower())
+
+    def _match(self, title: str) -> bool:
+        """Match a lowercased title."""
+        if self._pattern is None:
+            return False
+        return self._pattern.search(title) is not None or any(title in target for target in self.targets)
+
+
+_authority_classifier = TitleClassifier()
+
+
+def classify_authority(job_title: Optional[str]) -> Tuple[int, str]:
+    """
+    Return the authority (score, reasoning) of a job title.
+
+    Args:
+        job_title: Job title (None or empty for an unknown title)
+    """
+    if not job_title:
+        return UNKNOWN_TITLE
+    return _authority_classifier.classify(job_title)
+
+
+def classify_seniority(job_title: Optional[str]) -> Optional[str]:
+    """
+    Return the seniority tier of a job title (one of SENIORITY_TIERS).
+
+    Args:
+        job_title: Job title (None or empty for an unknown title)
+
+    Returns:
+        Tier name, or None for an unknown title
+    """
+    if not job_title:
+        return None
+    return _authority_classifier.tier(job_title)
+
+
+def authority_of_seniority(tier: Optional[str]) -> Tuple[int, str]:
+    """
+    Return the authority (score, reasoning) of a stored seniority tier.
+
+    Gives the same result as classify_authority on the title the tier was
+    computed from, without reading the title again.
+    """
+    if not tier:
+        return UNKNOWN_TITLE
+    return _authority_classifier.score_of(tier)
+
+
+def get_authority_classifier() -> TitleClassifier:
+    """Get the process-wide authority classifier."""
+    return _authority_classifier
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _title_matcher(targets: Tuple[str, ...]) -> TitleMatcher:
+    """Build (once per target list) a title matcher."""
+    return TitleMatcher(targets)
+
+
+def title_matcher(targets: Sequence[str]) -> TitleMatcher:
+    """
+    Get the compiled matcher of a target title list.
+
+    Matchers are built once per distinct list, so scoring every prospect of
+    a campaign reuses the same compiled regex and cache.
+
+    Args:
+        targets: Target job titles (campaign criteria)
+    """
+    return _title_matcher(tuple(targets))
@@ -1,6 +1,5 @@
 """Celery tasks."""
 
-# Import tasks to register them with Celery
-from app.tasks import prospector, bant, scheduler  # noqa: F401
-
-__all__ = ["prospector", "bant", "scheduler"]
+# Task modules are registered through the Celery app's ``include`` list, so
+# importing this package (e.g. to dispatch a task) does not load the agents
+__all__ = ["prospector", "bant", "scheduler", "intent", "campaign", "dispatch"]
@@ -1,12 +1,15 @@
 """Celery tasks for BANT qualifier agent."""
 
+from uuid import UUID
+
 from app.tasks.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.agents.bant.agent import BANTAgent
 from app.orchestrator.state_machine import LeadStateMachine, TransitionError
 from app.db.models.lead import Lead, LeadStatus
+from app.services.scoring_plan import ScoringPlan
+from app.orchestrator.runtime import get_runtime
 from app.core.logging import get_logger
-import asyncio
 
 logger = get_logger(__name__)
 
@@ -37,14 +40,18 @@ def qualify_lead(self, lead_id: str, lead_data: dict) -> dict:
             pass  # Already in scoring or invalid transition
         
         agent = BANTAgent(db=db)
+        campaign = dict(lead_data.get("campaign") or {})
+        if lead.campaign:
+            agent.use_scoring_plan(lead.campaign_id, ScoringPlan.for_campaign(lead.campaign))
+            campaign["id"] = str(lead.campaign_id)
         
         input_data = {
             "lead_id": lead_id,
             "lead_data": lead_data,
-            "campaign": lead_data.get("campaign", {}),
+            "campaign": campaign,
         }
         
-        result = asyncio.run(agent.execute(input_data))
+        result = get_runtime().run(agent.execute(input_data))
         
         # Update lead status based on result
         if result["success"]:
@@ -64,3 +71,50 @@ def qualify_lead(self, lead_id: str, lead_data: dict) -> dict:
         raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
     finally:
         db.close()
+
+
+@celery_app.task(name="bant.rescore_campaign", bind=True, max_retries=3)
+def rescore_campaign(self, campaign_id: str, full: bool = False) -> dict:
+    """
+    Task to re-score the stale leads of a campaign in one batch.
+    
+    Args:
+        campaign_id: ID of the campaign to re-score
+        full: Re-score every lead, stale or not
+    
+    Returns:
+        dict: Number of leads scored and qualified
+    """
+    db = SessionLocal()
+    try:
+        agent = BANTAgent(db=db)
+        return agent.rescore_campaign(UUID(campaign_id), full=full)
+        
+    except Exception as e:
+        logger.error(f"Error in bant.rescore_campaign: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="bant.requalify_campaign", bind=True, max_retries=3)
+def requalify_campaign(self, campaign_id: str) -> dict:
+    """
+    Task to apply a campaign's changed threshold or scoring rules to its leads.
+    
+    Args:
+        campaign_id: ID of the campaign to re-qualify
+    
+    Returns:
+        dict: Number of leads re-scored and rejected
+    """
+    db = SessionLocal()
+    try:
+        agent = BANTAgent(db=db)
+        return agent.requalify_campaign(UUID(campaign_id))
+        
+    except Exception as e:
+        logger.error(f"Error in bant.requalify_campaign: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
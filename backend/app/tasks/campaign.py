@@ -0,0 +1,342 @@
+"""Celery tasks for distributed campaign execution."""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from celery import chord, group
+from sqlalchemy.orm import Session
+
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.lead import Lead, LeadStatus
+from app.orchestrator.campaign_runner import CampaignRunner
+from app.orchestrator.checkpoint import CampaignCheckpoint
+from app.orchestrator.drip import DripScheduler
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    """Split items into lists of at most size elements."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _get_active_campaign(db: Session, campaign_id: str) -> Optional[Campaign]:
+    """Return the campaign if it is still ACTIVE, None otherwise (e.g. paused)."""
+    campaign = db.query(Campaign).filter(Campaign.id == UUID(campaign_id)).first()
+    if not campaign:
+        raise ValueError(f"Campaign {campaign_id} not found")
+    if campaign.status != CampaignStatus.ACTIVE:
+        logger.info(f"Campaign {campaign_id} is {campaign.status.value}, skipping")
+        return None
+    return campaign
+
+
+def _fail_run(db: Session, campaign_id: str, error: str) -> None:
+    """
+    Stop a distributed run that cannot finish.
+
+    Like a failed inline run, the checkpoint is marked failed (keeping its
+    phase, so the run can be resumed) and an ACTIVE campaign is paused.
+    """
+    db.rollback()
+    campaign = db.query(Campaign).filter(Campaign.id == UUID(campaign_id)).first()
+    if campaign and campaign.status == CampaignStatus.ACTIVE:
+        campaign.status = CampaignStatus.PAUSED
+        db.commit()
+    CampaignCheckpoint.for_campaign(UUID(campaign_id)).fail(error)
+    logger.error(f"Campaign {campaign_id} run failed, campaign paused: {error}")
+
+
+def _lead_ids(db: Session, campaign_id: str, status: LeadStatus) -> List[str]:
+    """Return IDs of the campaign's leads in the given status."""
+    rows = db.query(Lead.id).filter(
+        Lead.campaign_id == UUID(campaign_id),
+        Lead.status == status
+    ).order_by(Lead.id).all()
+    return [str(row.id) for row in rows]
+
+
+@celery_app.task(name="campaign.run", bind=True, max_retries=3)
+def run_campaign(self, campaign_id: str) -> dict:
+    """
+    Task to start a distributed campaign run.
+
+    Prospecting runs once in this task; qualification is then fanned out as
+    a chord of per-batch tasks whose callback fans out scheduling the same
+    way, so the work spreads over every worker. If the campaign's checkpoint
+    shows an interrupted run, finished phases are skipped. Leads an earlier
+    run left in SCORING are qualified again. A failed prospecting phase
+    fails the checkpoint (keeping its phase) and retries the task. Once the
+    retries (or those of a batch task) are exhausted, the campaign is
+    paused so the run can be resumed.
+
+    Args:
+        campaign_id: ID of the campaign
+
+    Returns:
+        dict: Prospecting result and number of qualification batches
+    """
+    db = SessionLocal()
+    try:
+        campaign = _get_active_campaign(db, campaign_id)
+        if not campaign:
+            return {"success": False, "error": "Campaign is not active"}
+
+        runner = CampaignRunner(db, mode="phased")
+        try:
+            runner.check_creator_verified(campaign)
+        except ValueError as e:
+            # Not retryable: pause until the creator verifies their email
+            campaign.status = CampaignStatus.PAUSED
+            db.commit()
+            return {"success": False, "error": str(e)}
+
+        checkpoint = CampaignCheckpoint.for_campaign(campaign.id)
+        resume_from = checkpoint.load()
+        resume = checkpoint.is_resumable(resume_from)
+        if resume:
+            checkpoint.resume()
+        else:
+            resume_from = {}
+            checkpoint.start("distributed")
+
+        if checkpoint.phase_done(resume_from, "prospecting"):
+            prospecting = {"success": True, "skipped": True}
+        else:
+            prospecting = runner.run_prospecting(campaign)
+            if not prospecting["success"]:
+                error = prospecting.get("error", "unknown error")
+                checkpoint.fail(error)
+                raise RuntimeError(f"Campaign prospecting failed: {error}")
+            checkpoint.set_phase("qualification")
+
+        batches = []
+        if not checkpoint.phase_done(resume_from, "qualification"):
+            # Includes leads left over (or stranded in SCORING) by a previous run
+            lead_ids = _lead_ids(db, campaign_id, LeadStatus.ENRICHED)
+            lead_ids += _lead_ids(db, campaign_id, LeadStatus.SCORING)
+            batches = _chunks(lead_ids, settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE)
+
+        if batches:
+            chord(
+                group(qualify_batch.s(campaign_id, batch, True) for batch in batches)
+            )(schedule_qualified.s(campaign_id).on_error(fail_run.s(campaign_id)))
+        else:
+            schedule_qualified.delay([], campaign_id)
+
+        return {
+            "success": True,
+            "prospecting": prospecting,
+            "qualification_batches": len(batches),
+            "resumed_from": resume_from.get("phase"),
+        }
+
+    except Exception as e:
+        logger.error(f"Error in campaign.run: {e}", exc_info=True)
+        if self.request.retries >= self.max_retries:
+            _fail_run(db, campaign_id, str(e))
+            raise
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.qualify_batch", bind=True, max_retries=3)
+def qualify_batch(self, campaign_id: str, lead_ids: List[str], include_scoring: bool = False) -> dict:
+    """
+    Task to qualify one batch of enriched leads.
+
+    Args:
+        campaign_id: ID of the campaign
+        lead_ids: IDs of the leads in the batch
+        include_scoring: Also qualify leads left in SCORING by an interrupted run
+
+    Returns:
+        dict: Qualified and rejected counts
+    """
+    db = SessionLocal()
+    try:
+        campaign = _get_active_campaign(db, campaign_id)
+        if not campaign:
+            return {"qualified": 0, "rejected": 0}
+
+        runner = CampaignRunner(db, mode="phased")
+        counts = runner.qualify_leads(
+            campaign,
+            [UUID(lead_id) for lead_id in lead_ids],
+            include_scoring=include_scoring,
+        )
+        CampaignCheckpoint.for_campaign(campaign.id).advance(**counts)
+        return counts
+
+    except Exception as e:
+        logger.error(f"Error in campaign.qualify_batch: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.schedule_qualified", bind=True, max_retries=3)
+def schedule_qualified(self, qualification_results: List[dict], campaign_id: str) -> dict:
+    """
+    Chord callback fanning out email scheduling once qualification is done.
+
+    Args:
+        qualification_results: Results of the qualification batches
+        campaign_id: ID of the campaign
+
+    Returns:
+        dict: Qualification totals and number of scheduling batches
+    """
+    db = SessionLocal()
+    try:
+        qualification = {
+            "qualified": sum(result.get("qualified", 0) for result in qualification_results),
+            "rejected": sum(result.get("rejected", 0) for result in qualification_results),
+        }
+
+        campaign = _get_active_campaign(db, campaign_id)
+        if not campaign:
+            return {"qualification": qualification, "scheduling_batches": 0}
+
+        CampaignCheckpoint.for_campaign(campaign.id).set_phase("scheduling")
+
+        # Best-scored leads within today's quota; the rest is dripped later
+        drip = DripScheduler(db)
+        lead_ids = drip.next_lead_ids(campaign.id, drip.remaining_today(campaign))
+        batches = _chunks(
+            [str(lead_id) for lead_id in lead_ids],
+            settings.CAMPAIGN_SCHEDULING_BATCH_SIZE,
+        )
+
+        if batches:
+            chord(
+                group(schedule_batch.s(campaign_id, batch) for batch in batches)
+            )(finalize_campaign.s(campaign_id).on_error(fail_run.s(campaign_id)))
+        else:
+            finalize_campaign.delay([], campaign_id)
+
+        return {"qualification": qualification, "scheduling_batches": len(batches)}
+
+    except Exception as e:
+        logger.error(f"Error in campaign.schedule_qualified: {e}", exc_info=True)
+        if self.request.retries >= self.max_retries:
+            _fail_run(db, campaign_id, str(e))
+            raise
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.schedule_batch", bind=True, max_retries=3)
+def schedule_batch(self, campaign_id: str, lead_ids: List[str]) -> dict:
+    """
+    Task to send outreach emails to one batch of qualified leads.
+
+    Args:
+        campaign_id: ID of the campaign
+        lead_ids: IDs of the leads in the batch
+
+    Returns:
+        dict: Sent and failed counts
+    """
+    db = SessionLocal()
+    try:
+        campaign = _get_active_campaign(db, campaign_id)
+        if not campaign:
+            return {"sent": 0, "failed": 0}
+
+        runner = CampaignRunner(db, mode="phased")
+        counts = runner.schedule_leads(campaign, [UUID(lead_id) for lead_id in lead_ids])
+        CampaignCheckpoint.for_campaign(campaign.id).advance(**counts)
+        return counts
+
+    except Exception as e:
+        logger.error(f"Error in campaign.schedule_batch: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.finalize")
+def finalize_campaign(scheduling_results: List[dict], campaign_id: str) -> dict:
+    """
+    Chord callback marking the campaign COMPLETED after the last batch.
+
+    If qualified leads are left over today's quota, the campaign stays
+    ACTIVE and the drip scheduler completes it later.
+
+    Args:
+        scheduling_results: Results of the scheduling batches
+        campaign_id: ID of the campaign
+
+    Returns:
+        dict: Scheduling totals and final campaign status
+    """
+    db = SessionLocal()
+    try:
+        scheduling = {
+            "sent": sum(result.get("sent", 0) for result in scheduling_results),
+            "failed": sum(result.get("failed", 0) for result in scheduling_results),
+        }
+
+        campaign = _get_active_campaign(db, campaign_id)
+        if not campaign:
+            return {"scheduling": scheduling, "completed": False}
+
+        CampaignCheckpoint.for_campaign(campaign.id).complete()
+
+        if DripScheduler(db).has_pending_leads(campaign.id):
+            return {"scheduling": scheduling, "completed": False}
+
+        campaign.status = CampaignStatus.COMPLETED
+        campaign.completed_at = datetime.utcnow()
+        db.commit()
+
+        logger.info(f"Campaign {campaign_id} completed", extra={"campaign_id": campaign_id, **scheduling})
+
+        return {"scheduling": scheduling, "completed": True}
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.fail_run")
+def fail_run(request, exc, traceback, campaign_id: str) -> None:
+    """
+    Errback of the qualification and scheduling chords.
+
+    A batch task that exhausted its retries fails the chord, so its callback
+    never runs; this pauses the campaign and fails the checkpoint instead of
+    leaving the run ACTIVE and "running" forever.
+
+    Args:
+        request: Request of the failed task
+        exc: Exception that failed the chord
+        traceback: Traceback of the exception
+        campaign_id: ID of the campaign
+    """
+    db = SessionLocal()
+    try:
+        _fail_run(db, campaign_id, str(exc))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="campaign.drip_tick")
+def drip_tick() -> dict:
+    """
+    Periodic task sending each active campaign's paced share of daily_limit.
+
+    Returns:
+        dict: Per-campaign sent/failed counts and completed campaign IDs
+    """
+    db = SessionLocal()
+    try:
+        return DripScheduler(db).tick()
+    finally:
+        db.close()
@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.signals import worker_process_shutdown
 
 from app.core.config import settings
 
@@ -9,8 +10,15 @@ celery_app = Celery(
     "vectra",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    # Tasks will be auto-discovered from app.tasks module
-    # include=["app.tasks.prospector", "app.tasks.bant", "app.tasks.scheduler"],
+    # Task modules load the agents, so only workers import them; the API
+    # enqueues tasks by name (see app.tasks.dispatch)
+    include=[
+        "app.tasks.prospector",
+        "app.tasks.bant",
+        "app.tasks.scheduler",
+        "app.tasks.intent",
+        "app.tasks.campaign",
+    ],
 )
 
 # Celery configuration
@@ -23,4 +31,18 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    beat_schedule={
+        "campaign-drip": {
+            "task": "campaign.drip_tick",
+            "schedule": settings.DRIP_TICK_SECONDS,
+        },
+    },
 )
+
+
+@worker_process_shutdown.connect
+def close_agent_runtime(**kwargs) -> None:
+    """Close the worker's agent runtime event loop on shutdown."""
+    from app.orchestrator.runtime import shutdown_runtime
+
+    shutdown_runtime()
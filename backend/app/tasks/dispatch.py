@@ -0,0 +1,47 @@
+"""Enqueue Celery tasks by name from the API process."""
+
+from uuid import UUID
+
+from app.tasks.celery_app import celery_app
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def dispatch_campaign_run(campaign_id: UUID) -> str:
+    """
+    Enqueue a distributed run of a launched campaign.
+
+    Sends the ``campaign.run`` task by name, so the API process never
+    imports the orchestrator and its agents.
+
+    Args:
+        campaign_id: Campaign ID
+
+    Returns:
+        Celery task ID of the run
+    """
+    result = celery_app.send_task("campaign.run", args=[str(campaign_id)])
+    logger.info(f"Dispatched campaign {campaign_id} run as task {result.id}")
+    return result.id
+
+
+def dispatch_campaign_rescore(campaign_id: UUID, requalify: bool = False) -> str:
+    """
+    Enqueue the backfill of a campaign's lead scores after its scoring changed.
+
+    Sends ``bant.requalify_campaign`` (re-score stale leads, then reject the
+    QUALIFIED leads now below the threshold) or ``bant.rescore_campaign``
+    (re-score stale leads only) by name.
+
+    Args:
+        campaign_id: Campaign ID
+        requalify: The threshold changed, so outcomes must be re-applied
+
+    Returns:
+        Celery task ID of the backfill
+    """
+    task_name = "bant.requalify_campaign" if requalify else "bant.rescore_campaign"
+    result = celery_app.send_task(task_name, args=[str(campaign_id)])
+    logger.info(f"Dispatched campaign {campaign_id} {task_name} as task {result.id}")
+    return result.id
@@ -0,0 +1,38 @@
+"""Celery tasks for Intent classifier agent."""
+
+from app.tasks.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.agents.intent.agent import IntentClassifierAgent
+from app.orchestrator.runtime import get_runtime
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(name="intent.classify_replies", bind=True, max_retries=3)
+def classify_replies(self, replies: list, campaign_id: str = None) -> dict:
+    """
+    Task to classify the intent of inbound replies.
+    
+    Args:
+        replies: Replies as {"lead_id": str, "text": str}
+        campaign_id: Campaign of the replies (optional)
+    
+    Returns:
+        dict: Intent and confidence per reply
+    """
+    db = SessionLocal()
+    try:
+        agent = IntentClassifierAgent(db=db)
+        
+        input_data = {"replies": replies}
+        if campaign_id:
+            input_data["campaign_id"] = campaign_id
+        
+        return get_runtime().run(agent.execute(input_data))
+        
+    except Exception as e:
+        logger.error(f"Error in intent.classify_replies: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
@@ -4,8 +4,9 @@ from uuid import UUID
 from app.tasks.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.agents.prospector.agent import ProspectorAgent
+from app.orchestrator.runtime import get_runtime
+from app.services.rocketreach import RocketReachService
 from app.core.logging import get_logger
-import asyncio
 
 logger = get_logger(__name__)
 
@@ -24,7 +25,11 @@ def find_leads(self, campaign_id: str, criteria: dict) -> dict:
     """
     db = SessionLocal()
     try:
-        agent = ProspectorAgent(db=db)
+        runtime = get_runtime()
+        agent = ProspectorAgent(
+            db=db,
+            rocketreach_service=RocketReachService(http_client=runtime.http_client),
+        )
         
         input_data = {
             "campaign_id": campaign_id,
@@ -35,7 +40,7 @@ def find_leads(self, campaign_id: str, criteria: dict) -> dict:
             "limit": criteria.get("limit", 50),
         }
         
-        result = asyncio.run(agent.execute(input_data))
+        result = runtime.run(agent.execute(input_data))
         
         return result
         
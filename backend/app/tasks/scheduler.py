@@ -5,8 +5,8 @@ from app.db.session import SessionLocal
 from app.agents.scheduler.agent import SchedulerAgent
 from app.orchestrator.state_machine import LeadStateMachine, TransitionError
 from app.db.models.lead import Lead, LeadStatus
+from app.orchestrator.runtime import get_runtime
 from app.core.logging import get_logger
-import asyncio
 
 logger = get_logger(__name__)
 
@@ -38,7 +38,7 @@ def send_email(self, lead_id: str, email_data: dict) -> dict:
             "send_email": True,
         }
         
-        result = asyncio.run(agent.execute(input_data))
+        result = get_runtime().run(agent.execute(input_data))
         
         # Update lead status if email sent
         if result["success"] and result["data"].get("sent"):
@@ -0,0 +1,64 @@
+"""Benchmark a campaign run end to end against fake external services."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import SessionLocal
+from app.orchestrator.dry_run import CampaignDryRun, FaultProfile, format_report
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prospects", type=int, default=100, help="Synthetic prospects to generate")
+    parser.add_argument("--mode", choices=["pipelined", "phased"], help="Execution mode (defaults to settings)")
+    parser.add_argument("--seed", type=int, help="Random seed for prospects and faults")
+    parser.add_argument("--keep", action="store_true", help="Keep the campaign and its leads")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    for service, latency in (("rocketreach", 300), ("llm", 2000), ("email", 150)):
+        parser.add_argument(f"--{service}-latency-ms", type=float, default=latency)
+        parser.add_argument(f"--{service}-jitter-ms", type=float, default=latency / 2)
+        parser.add_argument(f"--{service}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{service}-rate-limit-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+def fault_profile(args: argparse.Namespace, service: str) -> FaultProfile:
+    """Build the fault profile of one fake service from the arguments."""
+    return FaultProfile(
+        latency_ms=getattr(args, f"{service}_latency_ms"),
+        jitter_ms=getattr(args, f"{service}_jitter_ms"),
+        error_rate=getattr(args, f"{service}_error_rate"),
+        rate_limit_rate=getattr(args, f"{service}_rate_limit_rate"),
+        seed=args.seed,
+    )
+
+
+def dry_run_campaign():
+    """Run the dry run and print its report."""
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        report = CampaignDryRun(
+            db,
+            prospects=args.prospects,
+            mode=args.mode,
+            rocketreach=fault_profile(args, "rocketreach"),
+            llm=fault_profile(args, "llm"),
+            email=fault_profile(args, "email"),
+            seed=args.seed,
+            keep=args.keep,
+        ).run()
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    dry_run_campaign()
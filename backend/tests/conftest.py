@@ -14,7 +14,9 @@ from app.core.config import settings
 # Replace only the database name, not the user
 TEST_DATABASE_URL = settings.DATABASE_URL.replace("/vectra", "/vectra_test").replace("vectra_test:", "vectra:")
 
-engine = create_engine(TEST_DATABASE_URL, pool_pre_ping=True)
+# Tables (and their enum types) are recreated for every test, which would
+# invalidate statements psycopg prepares on pooled connections
+engine = create_engine(TEST_DATABASE_URL, pool_pre_ping=True, connect_args={"prepare_threshold": None})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -42,6 +44,58 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def campaign_dispatch():
+    """Keep launched campaigns from being enqueued on a real Celery broker."""
+    from unittest.mock import patch
+
+    with patch("app.tasks.dispatch.dispatch_campaign_run", return_value="test-task-id") as dispatch:
+        yield dispatch
+
+
+@pytest.fixture(autouse=True)
+def rescore_dispatch():
+    """Keep scoring changes from enqueuing backfills on a real Celery broker."""
+    from unittest.mock import patch
+
+    with patch("app.tasks.dispatch.dispatch_campaign_rescore", return_value="test-task-id") as dispatch:
+        yield dispatch
+
+
+@pytest.fixture(autouse=True)
+def agent_registry():
+    """Give every test a fresh agent registry so patched agents do not leak."""
+    from app.agents.registry import get_agent_registry
+
+    registry = get_agent_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+@pytest.fixture(autouse=True)
+def lead_similarity_dir(tmp_path):
+    """Keep lead similarity index files in a per-test directory."""
+    from unittest.mock import patch
+    from app.services import lead_similarity
+
+    lead_similarity._indexes.clear()
+    with patch.object(settings, "LEAD_SIMILARITY_INDEX_DIR", str(tmp_path / "lead_similarity")):
+        yield tmp_path / "lead_similarity"
+    lead_similarity._indexes.clear()
+
+
+@pytest.fixture(autouse=True)
+def draft_skeleton_cache():
+    """Keep email draft skeletons in-process and per test."""
+    from unittest.mock import patch
+    from app.agents.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(None, namespace="email:skeleton:")
+    with patch("app.services.email_draft.get_skeleton_cache", return_value=cache):
+        yield cache
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database override."""
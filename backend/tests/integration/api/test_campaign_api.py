@@ -61,6 +61,18 @@ class TestCreateCampaign:
         assert data["name"] == "New Campaign"
         assert data["status"] == CampaignStatus.DRAFT.value
         assert data["bant_threshold"] == 70
+        assert data["scoring_rules"] is None
+
+    def test_create_campaign_invalid_scoring_rules(self, client, auth_headers):
+        """Should reject scoring rules that do not compile."""
+        payload = {
+            "name": "New Campaign",
+            "scoring_rules": {"budget": {"tiers": [{"below": 10, "score": 40, "reasoning": "Trop"}]}},
+        }
+
+        response = client.post("/api/v1/user/campaigns", json=payload, headers=auth_headers)
+
+        assert response.status_code == 400
 
     def test_create_campaign_requires_auth(self, client):
         """Should require authentication."""
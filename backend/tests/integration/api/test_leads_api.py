@@ -1,9 +1,14 @@
 """Integration tests for leads API endpoints."""
 
+import json
 import pytest
+from unittest.mock import patch
 from uuid import uuid4
+from app.agents.llm_gateway import LLMProviderError
 from app.db.models.campaign import Campaign, CampaignStatus
-from app.db.models.lead import Lead, LeadStatus
+from app.db.models.email import Email, EmailStatus
+from app.db.models.lead import Lead, LeadIntent, LeadStatus
+from app.services.email_draft import EmailDraftService
 
 
 class TestListLeads:
@@ -124,6 +129,37 @@ class TestGetLead:
         assert "emails" in data
         assert "meetings" in data
 
+    def test_get_lead_returns_intent_confidence(self, client, auth_headers, db_session, test_user, test_organization):
+        """Should return the stored intent and its confidence."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Test Campaign",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        lead = Lead(
+            campaign_id=campaign.id,
+            organization_id=test_organization.id,
+            email="lead@example.com",
+            status=LeadStatus.CONTACTED,
+            intent=LeadIntent.OUT_OF_OFFICE,
+            intent_confidence=0.95,
+            enrichment_data={},
+        )
+        db_session.add(lead)
+        db_session.commit()
+
+        response = client.get(f"/api/v1/user/leads/{lead.id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["intent"] == "out_of_office"
+        assert data["intent_confidence"] == 0.95
+
     def test_get_lead_not_found(self, client, auth_headers):
         """Should return 404 if lead doesn't exist."""
         response = client.get(f"/api/v1/user/leads/{uuid4()}", headers=auth_headers)
@@ -204,3 +240,224 @@ class TestUpdateLead:
         assert data["first_name"] == "New"
         assert data["last_name"] == "Name"
         assert data["status"] == "qualified"
+
+
+class _FakeGateway:
+    """Gateway streaming canned text deltas."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.messages = None
+        self.calls = 0
+
+    async def stream(self, messages, **kwargs):
+        self.messages = messages
+        self.calls += 1
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+
+def _events(response):
+    """Parse server-sent events into (event, data) pairs."""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamEmailDraft:
+    """Tests for POST /api/v1/user/leads/{lead_id}/email-draft."""
+
+    @pytest.fixture
+    def lead(self, db_session, test_user, test_organization):
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Test Campaign",
+            description="Agents IA de prospection B2B",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        lead = Lead(
+            campaign_id=campaign.id,
+            organization_id=test_organization.id,
+            email="lead@example.com",
+            first_name="Jane",
+            job_title="VP Sales",
+            status=LeadStatus.QUALIFIED,
+            enrichment_data={"location": "Lyon"},
+        )
+        db_session.add(lead)
+        db_session.commit()
+        return lead
+
+    def test_streams_tokens_and_saves_pending_email(self, client, auth_headers, db_session, lead):
+        """Tokens should be streamed, then the draft saved as a PENDING email."""
+        gateway = _FakeGateway(['{"subject": "Question ', 'rapide", ', '"body": "Bonjour Jane"}'])
+
+        with patch("app.services.email_draft.get_llm_gateway", return_value=gateway):
+            response = client.post(f"/api/v1/user/leads/{lead.id}/email-draft", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response)
+        assert [name for name, _ in events] == ["start", "token", "token", "token", "done"]
+        assert events[1][1] == {"text": '{"subject": "Question '}
+        done = events[-1][1]
+        assert done["subject"] == "Question rapide"
+        assert done["status"] == "pending"
+
+        # The Scheduler prompt is filled from the lead
+        prompt = gateway.messages[0]["content"]
+        assert "Prénom: Jane" in prompt and "Localisation: Lyon" in prompt
+        assert "{prénom}" in prompt
+
+        email = db_session.query(Email).filter(Email.lead_id == lead.id).one()
+        assert str(email.id) == done["email_id"]
+        assert email.status == EmailStatus.PENDING
+        assert email.body == "Bonjour Jane"
+
+    def test_regenerate_replaces_pending_draft(self, client, auth_headers, db_session, lead):
+        """Regenerating should update the pending draft instead of adding one."""
+        for body in ("Première version", "Seconde version"):
+            gateway = _FakeGateway([json.dumps({"subject": "Objet", "body": body})])
+            with patch("app.services.email_draft.get_llm_gateway", return_value=gateway):
+                client.post(f"/api/v1/user/leads/{lead.id}/email-draft", headers=auth_headers)
+
+        emails = db_session.query(Email).filter(Email.lead_id == lead.id).all()
+        assert len(emails) == 1
+        db_session.refresh(emails[0])
+        assert emails[0].body == "Seconde version"
+
+    def test_provider_error_is_an_error_event(self, client, auth_headers, db_session, lead):
+        """A failed generation should end the stream with an error and save nothing."""
+        gateway = _FakeGateway(["{"], error=LLMProviderError("ollama", "HTTP 500"))
+
+        with patch("app.services.email_draft.get_llm_gateway", return_value=gateway):
+            response = client.post(f"/api/v1/user/leads/{lead.id}/email-draft", headers=auth_headers)
+
+        assert [name for name, _ in _events(response)] == ["start", "token", "error"]
+        assert db_session.query(Email).count() == 0
+
+    def test_save_does_not_reopen_request_session(self, db_session, lead):
+        """Saving after the request's session is closed should use a session of its own."""
+        lead_id, campaign_id = lead.id, lead.campaign_id
+        service = EmailDraftService(db_session)
+        db_session.close()
+
+        email_id = service.save_draft(lead_id, campaign_id, "Objet", "Bonjour")
+
+        assert not db_session.in_transaction()
+        email = db_session.get(Email, email_id)
+        assert email.status == EmailStatus.PENDING
+        assert email.body == "Bonjour"
+
+    def test_lead_not_found(self, client, auth_headers):
+        """Should return 404 before streaming if the lead doesn't exist."""
+        response = client.post(f"/api/v1/user/leads/{uuid4()}/email-draft", headers=auth_headers)
+
+        assert response.status_code == 404
+
+
+class TestEmailDraftSkeletonReuse:
+    """Tests for draft reuse across leads with the same profile."""
+
+    @pytest.fixture
+    def campaign(self, db_session, test_user, test_organization):
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Test Campaign",
+            description="Agents IA de prospection B2B",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+        return campaign
+
+    def _lead(self, db_session, campaign, email, first_name, company_name, job_title="VP Sales"):
+        lead = Lead(
+            campaign_id=campaign.id,
+            organization_id=campaign.organization_id,
+            email=email,
+            first_name=first_name,
+            job_title=job_title,
+            company_name=company_name,
+            company_size="51-200",
+            status=LeadStatus.QUALIFIED,
+            enrichment_data={"industry": "SaaS"},
+        )
+        db_session.add(lead)
+        db_session.commit()
+        return lead
+
+    def _draft(self, client, auth_headers, lead, gateway):
+        with patch("app.services.email_draft.get_llm_gateway", return_value=gateway):
+            response = client.post(f"/api/v1/user/leads/{lead.id}/email-draft", headers=auth_headers)
+        return _events(response)
+
+    def test_same_profile_reuses_generated_draft(self, client, auth_headers, db_session, campaign):
+        """A second lead with the same profile should be drafted without an LLM call."""
+        jane = self._lead(db_session, campaign, "jane@acme.io", "Jane", "Acme")
+        john = self._lead(db_session, campaign, "john@globex.io", "John", "Globex")
+        gateway = _FakeGateway([json.dumps({
+            "subject": "Une idée pour Acme",
+            "body": "Bonjour Jane,\n\nEn tant que VP Sales chez Acme, {vous} connaissez le défi.",
+        })])
+
+        first = self._draft(client, auth_headers, jane, gateway)
+        second = self._draft(client, auth_headers, john, gateway)
+
+        assert gateway.calls == 1
+        assert first[-1][1]["reused"] is False
+        assert [name for name, _ in second] == ["start", "done"]
+        done = second[-1][1]
+        assert done["reused"] is True
+        assert done["subject"] == "Une idée pour Globex"
+        assert done["body"] == "Bonjour John,\n\nEn tant que VP Sales chez Globex, {vous} connaissez le défi."
+
+        email = db_session.query(Email).filter(Email.lead_id == john.id).one()
+        assert email.status == EmailStatus.PENDING
+        assert email.body == done["body"]
+
+    def test_different_profile_is_generated(self, client, auth_headers, db_session, campaign):
+        """Leads in another title tier should get their own LLM draft."""
+        jane = self._lead(db_session, campaign, "jane@acme.io", "Jane", "Acme")
+        john = self._lead(db_session, campaign, "john@globex.io", "John", "Globex", job_title="CEO")
+        gateway = _FakeGateway([json.dumps({"subject": "Objet", "body": "Bonjour"})])
+
+        self._draft(client, auth_headers, jane, gateway)
+        events = self._draft(client, auth_headers, john, gateway)
+
+        assert gateway.calls == 2
+        assert events[-1][1]["reused"] is False
+
+    def test_missing_field_is_generated(self, client, auth_headers, db_session, campaign):
+        """A lead without a value used by the skeleton should not get a half-filled draft."""
+        jane = self._lead(db_session, campaign, "jane@acme.io", "Jane", "Acme")
+        anonymous = self._lead(db_session, campaign, "contact@globex.io", None, "Globex")
+        gateway = _FakeGateway([json.dumps({"subject": "Objet", "body": "Bonjour Jane"})])
+
+        self._draft(client, auth_headers, jane, gateway)
+        self._draft(client, auth_headers, anonymous, gateway)
+
+        assert gateway.calls == 2
+
+    def test_regeneration_calls_llm(self, client, auth_headers, db_session, campaign):
+        """Regenerating a lead's pending draft should never reuse a skeleton."""
+        jane = self._lead(db_session, campaign, "jane@acme.io", "Jane", "Acme")
+        gateway = _FakeGateway([json.dumps({"subject": "Objet", "body": "Bonjour Jane"})])
+
+        self._draft(client, auth_headers, jane, gateway)
+        events = self._draft(client, auth_headers, jane, gateway)
+
+        assert gateway.calls == 2
+        assert events[-1][1]["reused"] is False
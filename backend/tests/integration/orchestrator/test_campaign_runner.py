@@ -1,6 +1,9 @@
 """Integration tests for campaign runner."""
 
+import asyncio
+
 import pytest
+from unittest.mock import Mock
 from uuid import uuid4
 from sqlalchemy.orm import Session
 
@@ -78,3 +81,516 @@ def test_run_campaign_success(db_session, test_campaign_with_criteria):
         # Campaign should be marked as completed
         campaign = db_session.query(Campaign).filter(Campaign.id == test_campaign_with_criteria.id).first()
         assert campaign.status == CampaignStatus.COMPLETED
+
+
+def _add_enriched_leads(db_session, campaign, count):
+    """Create enriched leads ready for qualification."""
+    for i in range(count):
+        db_session.add(Lead(
+            campaign_id=campaign.id,
+            organization_id=campaign.organization_id,
+            email=f"lead{i}@example.com",
+            job_title="VP Sales",
+            company_size="51-200",
+            status=LeadStatus.ENRICHED,
+        ))
+    db_session.commit()
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_run_campaign_modes_process_every_lead(db_session, test_campaign_with_criteria, mode):
+    """Both execution modes should qualify and contact every lead."""
+    from unittest.mock import patch, AsyncMock
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 5)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode=mode)
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["mode"] == mode
+    assert result["qualification"]["qualified"] == 5
+    assert result["scheduling"]["sent"] == 5
+
+    contacted = db_session.query(Lead).filter(
+        Lead.campaign_id == test_campaign_with_criteria.id,
+        Lead.status == LeadStatus.CONTACTED,
+    ).count()
+    assert contacted == 5
+
+
+def test_run_campaign_pipelined_reports_stage_stats(db_session, test_campaign_with_criteria):
+    """Pipelined mode should report per-stage throughput and queue depth."""
+    from unittest.mock import patch, AsyncMock
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 3)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode="pipelined")
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": False, "bant_score": 30}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    stages = result["pipeline"]["stages"]
+    assert set(stages) == {"prospecting", "qualification", "scheduling"}
+    assert stages["qualification"]["processed"] == 3
+    assert "throughput_per_s" in stages["qualification"]
+    assert "max_queue_depth" in stages["scheduling"]
+    assert result["qualification"]["rejected"] == 3
+    assert result["pipeline"]["time_to_first_email_s"] is None
+
+
+def test_run_campaign_pipelined_qualifies_while_prospecting(db_session, test_campaign_with_criteria):
+    """Pipelined mode should qualify each page of prospects before the next page is searched."""
+    from unittest.mock import patch, AsyncMock
+
+    bant_calls_per_page = []
+
+    def prospects(count, offset):
+        return [
+            {"email": f"prospect{offset + i}@example.com", "job_title": "VP Sales", "company_size": "51-200"}
+            for i in range(count)
+        ]
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_PROSPECTING_PAGE_SIZE', 2):
+
+        runner = CampaignRunner(db_session, mode="pipelined")
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        async def search(input_data):
+            # Give the qualification stage a chance to run
+            for _ in range(10):
+                await asyncio.sleep(0)
+            bant_calls_per_page.append(runner.bant.execute.call_count)
+            count = 2 if input_data["start"] == 1 else 1
+            return {"success": True, "data": {"prospects": prospects(count, input_data["start"]), "total_found": count}}
+
+        runner.prospector.execute = AsyncMock(side_effect=search)
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["prospecting"] == {"success": True, "leads_found": 3, "leads_created": 3, "leads_skipped": 0}
+    assert [call.args[0]["start"] for call in runner.prospector.execute.call_args_list] == [1, 3]
+    # The first page was already qualified when the second one was searched
+    assert bant_calls_per_page == [0, 2]
+    assert result["scheduling"]["sent"] == 3
+
+
+def test_run_campaign_pipelined_qualifies_in_batches(db_session, test_campaign_with_criteria):
+    """Pipelined qualification should write scores and outcomes per batch, not per lead."""
+    from unittest.mock import patch, AsyncMock
+    from app.db.repositories.lead import LeadRepository
+    from app.services.scoring_plan import ScoringPlan
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 6)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_PIPELINE_BANT_BATCH_SIZE', 3):
+
+        runner = CampaignRunner(db_session, mode="pipelined")
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 75}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        with patch.object(LeadRepository, "update_scores", autospec=True, side_effect=LeadRepository.update_scores) as update_scores:
+            result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["qualification"] == {"success": True, "qualified": 6, "rejected": 0}
+    assert [len(call.args[1]) for call in update_scores.call_args_list] == [3, 3]
+    assert result["pipeline"]["stages"]["qualification"]["processed"] == 6
+    assert result["scheduling"]["sent"] == 6
+
+    scores = [
+        lead.bant_score
+        for lead in db_session.query(Lead).filter(Lead.campaign_id == test_campaign_with_criteria.id)
+    ]
+    assert scores == [75] * 6
+    # Scored by the campaign's plan, so a rescore finds nothing stale
+    plan = ScoringPlan.for_campaign(test_campaign_with_criteria)
+    assert LeadRepository(db_session).scoring_columns(test_campaign_with_criteria.id, stale_for=plan.version)["ids"] == []
+
+
+def test_run_campaign_pipelined_stages_use_own_sessions(db_session, test_campaign_with_criteria):
+    """Qualification and scheduling should each commit through their own session, once per batch."""
+    from unittest.mock import patch, AsyncMock
+    from app.db.models.email import Email, EmailStatus
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 6)
+    stages = []
+    stage_runner = CampaignRunner._stage_runner
+
+    def track_stage(runner):
+        stage = stage_runner(runner)
+        stage.db.commit = Mock(wraps=stage.db.commit)
+        stages.append(stage)
+        return stage
+
+    batches = []
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_PIPELINE_SCHEDULER_BATCH_SIZE', 3), \
+         patch.object(CampaignRunner, "_stage_runner", autospec=True, side_effect=track_stage):
+
+        runner = CampaignRunner(db_session, mode="pipelined")
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 75}})
+        runner.scheduler.execute = AsyncMock(return_value={
+            "success": True,
+            "data": {"sent": True, "subject": "Hello", "body": "<p>Hi</p>"},
+        })
+        schedule_batch = CampaignRunner._schedule_batch_outcomes
+
+        async def track_batch(stage, campaign, leads):
+            batches.append(len(leads))
+            return await schedule_batch(stage, campaign, leads)
+
+        with patch.object(CampaignRunner, "_schedule_batch_outcomes", autospec=True, side_effect=track_batch):
+            result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["scheduling"]["sent"] == 6
+    qualifying, scheduling = stages
+    assert len({id(db_session), id(qualifying.db), id(scheduling.db)}) == 3
+    assert qualifying.bant.db is qualifying.db
+    # The scheduling session commits once per batch
+    assert sum(batches) == 6
+    assert scheduling.db.commit.call_count == len(batches)
+    for call in runner.scheduler.execute.call_args_list:
+        assert "lead_id" not in call.args[0]
+
+    emails = db_session.query(Email).filter(Email.campaign_id == test_campaign_with_criteria.id).all()
+    assert len(emails) == 6
+    assert {email.status for email in emails} == {EmailStatus.SENT}
+    statuses = {
+        lead.status
+        for lead in db_session.query(Lead).filter(Lead.campaign_id == test_campaign_with_criteria.id)
+    }
+    assert statuses == {LeadStatus.CONTACTED}
+
+
+def test_campaign_runner_rejects_unknown_mode(db_session):
+    """An unknown execution mode should be rejected."""
+    with pytest.raises(ValueError):
+        CampaignRunner(db_session, mode="burst")
+
+
+def test_phased_qualification_commits_per_batch(db_session, test_campaign_with_criteria):
+    """Phased qualification should commit per batch, not per lead."""
+    from unittest.mock import patch, AsyncMock
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 5)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE', 2):
+
+        runner = CampaignRunner(db_session, mode="phased")
+        runner.bant.execute = AsyncMock(side_effect=[
+            {"success": True, "data": {"qualified": i % 2 == 0, "bant_score": 70 if i % 2 == 0 else 20}}
+            for i in range(5)
+        ])
+
+        with patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+            result = runner._run_qualification(test_campaign_with_criteria)
+
+    assert result == {"success": True, "qualified": 3, "rejected": 2}
+    # Three batches, two commits each
+    assert commit.call_count == 6
+    for call in runner.bant.execute.call_args_list:
+        assert "lead_id" not in call.args[0]
+
+    scores = sorted(
+        lead.bant_score
+        for lead in db_session.query(Lead).filter(Lead.campaign_id == test_campaign_with_criteria.id)
+    )
+    assert scores == [20, 20, 70, 70, 70]
+
+
+def test_qualification_uses_campaign_scoring_plan(db_session, test_campaign_with_criteria):
+    """Leads should be scored with the plan compiled from the campaign's rules and threshold."""
+    from unittest.mock import patch
+
+    # VP Sales at 51-200 without signals scores 51
+    test_campaign_with_criteria.bant_threshold = 50
+    db_session.commit()
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 3)
+    lead_ids = [lead.id for lead in db_session.query(Lead).filter(Lead.campaign_id == test_campaign_with_criteria.id)]
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+        runner = CampaignRunner(db_session, mode="phased")
+        counts = runner.qualify_leads(test_campaign_with_criteria, lead_ids[:2])
+
+        test_campaign_with_criteria.scoring_rules = {"budget": {"tiers": [{"below": None, "score": 0, "reasoning": "Budget ignoré"}]}}
+        db_session.commit()
+        rejected = runner.qualify_leads(test_campaign_with_criteria, lead_ids[2:])
+
+    assert counts == {"qualified": 2, "rejected": 0}
+    assert rejected == {"qualified": 0, "rejected": 1}
+    plan = runner.bant.scoring_plans[str(test_campaign_with_criteria.id)]
+    assert plan.threshold == 50
+    assert plan.budget("51-200") == (0, "Budget ignoré")
+
+
+def test_qualification_with_llm_analysis(db_session, test_campaign_with_criteria):
+    """With LLM analysis enabled, leads the LLM could not score should fall back to the rules."""
+    from unittest.mock import patch, AsyncMock
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 3)
+    leads = db_session.query(Lead).filter(Lead.campaign_id == test_campaign_with_criteria.id).order_by(Lead.id).all()
+    lead_ids = [lead.id for lead in leads]
+    breakdown = {"budget": {"score": 20, "reasoning": "LLM"}}
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_BANT_LLM_ANALYSIS', True):
+        runner = CampaignRunner(db_session, mode="phased")
+        runner.bant.analyze_leads = AsyncMock(return_value={
+            str(lead_ids[0]): {"bant_score": 80, "bant_breakdown": breakdown, "qualified": True},
+            str(lead_ids[1]): {"bant_score": 30, "bant_breakdown": breakdown, "qualified": False},
+        })
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 65}})
+
+        counts = runner.qualify_leads(test_campaign_with_criteria, lead_ids)
+
+    assert counts == {"qualified": 2, "rejected": 1}
+    analyzed, campaign = runner.bant.analyze_leads.call_args.args
+    assert set(analyzed) == {str(lead_id) for lead_id in lead_ids}
+    assert campaign["bant_threshold"] == 60
+    # Only the lead the LLM left out is scored by the rules
+    runner.bant.execute.assert_called_once()
+
+    db_session.expire_all()
+    scored = [db_session.get(Lead, lead_id) for lead_id in lead_ids]
+    assert [lead.bant_score for lead in scored] == [80, 30, 65]
+    assert [lead.status for lead in scored] == [LeadStatus.QUALIFIED, LeadStatus.REJECTED, LeadStatus.QUALIFIED]
+    # LLM scores are not the plan's, so rescores recompute them
+    assert scored[0].scoring_plan_version is None
+    assert scored[2].scoring_plan_version is not None
+
+
+def test_qualification_records_agent_runs_without_extra_commits(db_session, test_campaign_with_criteria):
+    """Every BANT run should be recorded, flushed with the batch commits."""
+    from unittest.mock import patch
+    from app.db.models.agent_run import AgentRun, AgentRunStatus, AgentType
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 5)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.orchestrator.campaign_runner.settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE', 2):
+
+        runner = CampaignRunner(db_session, mode="phased")
+
+        with patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+            runner._run_qualification(test_campaign_with_criteria)
+
+    assert commit.call_count == 6
+
+    runs = db_session.query(AgentRun).filter(
+        AgentRun.campaign_id == test_campaign_with_criteria.id
+    ).all()
+    assert len(runs) == 5
+    assert all(run.agent_type == AgentType.BANT_QUALIFIER for run in runs)
+    assert all(run.status == AgentRunStatus.COMPLETED for run in runs)
+    assert all(run.duration_ms is not None and run.started_at <= run.completed_at for run in runs)
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_run_campaign_resumes_from_checkpoint(db_session, test_campaign_with_criteria, mode):
+    """An interrupted run should resume without redoing finished work."""
+    from unittest.mock import patch, AsyncMock
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 5)
+
+    # Simulate a run that stopped during qualification: one lead was left
+    # in SCORING, one was already qualified
+    leads = db_session.query(Lead).filter(
+        Lead.campaign_id == test_campaign_with_criteria.id
+    ).order_by(Lead.id).all()
+    leads[0].status = LeadStatus.QUALIFIED
+    leads[1].status = LeadStatus.SCORING
+    db_session.commit()
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode=mode)
+        checkpoint = CampaignCheckpoint(test_campaign_with_criteria.id, runner.redis_client)
+        checkpoint.start(mode)
+        checkpoint.set_phase("qualification")
+        checkpoint.advance(cursor=str(leads[1].id), qualified=1)
+
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["resumed_from"] == "qualification"
+    runner.prospector.execute.assert_not_called()
+    # The stranded SCORING lead and the three after the cursor
+    assert runner.bant.execute.call_count == 4
+    assert result["scheduling"]["sent"] == 5
+
+    record = checkpoint.load()
+    assert record["status"] == "completed"
+    assert record["counts"] == {"qualified": 5, "sent": 5}
+
+
+def test_run_campaign_failure_keeps_checkpoint(db_session, test_campaign_with_criteria):
+    """A failed run should leave a resumable checkpoint and skip done phases next time."""
+    from unittest.mock import patch, AsyncMock
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 3)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode="phased")
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        with patch.object(runner, "_run_scheduling", side_effect=RuntimeError("worker lost")):
+            failed = runner.run_campaign(test_campaign_with_criteria.id)
+
+        assert failed["success"] is False
+        checkpoint = CampaignCheckpoint(test_campaign_with_criteria.id, runner.redis_client)
+        record = checkpoint.load()
+        assert record["status"] == "failed"
+        assert record["phase"] == "scheduling"
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["resumed_from"] == "scheduling"
+    assert result["qualification"]["skipped"] is True
+    assert runner.prospector.execute.call_count == 1
+    assert result["scheduling"]["sent"] == 3
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_run_campaign_stops_when_prospecting_fails(db_session, test_campaign_with_criteria, mode):
+    """A failed prospecting phase should fail the run without advancing the checkpoint."""
+    from unittest.mock import patch, AsyncMock
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode=mode)
+        runner.prospector.execute = AsyncMock(return_value={"success": False, "error": "RocketReach unavailable"})
+        runner.bant.execute = AsyncMock()
+        runner.scheduler.execute = AsyncMock()
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is False
+    assert "RocketReach unavailable" in result["error"]
+
+    record = CampaignCheckpoint(test_campaign_with_criteria.id, runner.redis_client).load()
+    assert record["status"] == "failed"
+    assert record["phase"] == "prospecting"
+
+    db_session.refresh(test_campaign_with_criteria)
+    assert test_campaign_with_criteria.status == CampaignStatus.PAUSED
+
+
+def test_run_campaign_stops_when_qualification_fails(db_session, test_campaign_with_criteria):
+    """A failed qualification phase should not move on to scheduling."""
+    from unittest.mock import patch, AsyncMock
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode="phased")
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+
+        with patch.object(runner, "_run_qualification", return_value={"success": False, "error": "db down"}), \
+             patch.object(runner, "_run_scheduling") as run_scheduling:
+            result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is False
+    run_scheduling.assert_not_called()
+
+    record = CampaignCheckpoint(test_campaign_with_criteria.id, runner.redis_client).load()
+    assert record["status"] == "failed"
+    assert record["phase"] == "qualification"
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_fresh_run_qualifies_leads_stranded_in_scoring(db_session, test_campaign_with_criteria, mode):
+    """A new run (no resumable checkpoint) should still qualify leads left in SCORING."""
+    from unittest.mock import patch, AsyncMock
+
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 3)
+    stranded = db_session.query(Lead).filter(
+        Lead.campaign_id == test_campaign_with_criteria.id
+    ).order_by(Lead.id).first()
+    stranded.status = LeadStatus.SCORING
+    db_session.commit()
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode=mode)
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": False, "bant_score": 20}})
+        runner.scheduler.execute = AsyncMock()
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["resumed_from"] is None
+    assert result["qualification"]["rejected"] == 3
+    assert db_session.query(Lead).filter(
+        Lead.campaign_id == test_campaign_with_criteria.id,
+        Lead.status == LeadStatus.SCORING,
+    ).count() == 0
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_run_campaign_respects_daily_limit(db_session, test_campaign_with_criteria, mode):
+    """Leads over the daily limit should be deferred to the drip scheduler."""
+    from unittest.mock import patch, AsyncMock
+
+    test_campaign_with_criteria.daily_limit = 2
+    db_session.commit()
+    _add_enriched_leads(db_session, test_campaign_with_criteria, 5)
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+
+        runner = CampaignRunner(db_session, mode=mode)
+        runner.prospector.execute = AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})
+        runner.bant.execute = AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})
+        runner.scheduler.execute = AsyncMock(return_value={"success": True, "data": {"sent": True}})
+
+        result = runner.run_campaign(test_campaign_with_criteria.id)
+
+    assert result["success"] is True
+    assert result["scheduling"]["sent"] == 2
+    assert result["scheduling"]["deferred"] == 3
+
+    campaign = db_session.query(Campaign).filter(Campaign.id == test_campaign_with_criteria.id).first()
+    assert campaign.status == CampaignStatus.ACTIVE
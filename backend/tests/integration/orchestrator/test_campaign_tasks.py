@@ -0,0 +1,207 @@
+"""Integration tests for distributed campaign tasks."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.lead import Lead, LeadStatus
+from app.tasks import campaign as campaign_tasks
+from app.tasks.celery_app import celery_app
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def active_campaign(db_session, test_organization):
+    """Create an active campaign with enriched leads."""
+    campaign = Campaign(
+        organization_id=test_organization.id,
+        name="Distributed Campaign",
+        status=CampaignStatus.ACTIVE,
+        target_criteria={"job_titles": ["VP Sales"]},
+        bant_threshold=60,
+        daily_limit=10,
+    )
+    db_session.add(campaign)
+    db_session.commit()
+
+    for i in range(5):
+        db_session.add(Lead(
+            campaign_id=campaign.id,
+            organization_id=campaign.organization_id,
+            email=f"lead{i}@example.com",
+            job_title="VP Sales",
+            status=LeadStatus.ENRICHED,
+        ))
+    db_session.commit()
+    db_session.refresh(campaign)
+    return campaign
+
+
+@pytest.fixture
+def eager_tasks():
+    """Run Celery tasks (including chords) inline against the test database."""
+    celery_app.conf.task_always_eager = True
+    with patch("app.tasks.campaign.SessionLocal", TestingSessionLocal), \
+         patch("app.agents.crew.get_llm", return_value=None), \
+         patch("app.agents.crew.get_memory", return_value=None), \
+         patch("app.agents.prospector.agent.ProspectorAgent.execute",
+               AsyncMock(return_value={"success": True, "data": {"prospects": [], "total_found": 0}})), \
+         patch("app.agents.bant.agent.BANTAgent.execute",
+               AsyncMock(return_value={"success": True, "data": {"qualified": True, "bant_score": 80}})), \
+         patch("app.agents.scheduler.agent.SchedulerAgent.execute",
+               AsyncMock(return_value={"success": True, "data": {"sent": True}})):
+        yield
+    celery_app.conf.task_always_eager = False
+
+
+def test_run_campaign_fans_out_and_completes(db_session, active_campaign, eager_tasks):
+    """A distributed run should qualify, contact every lead and complete the campaign."""
+    with patch("app.tasks.campaign.settings.CAMPAIGN_QUALIFICATION_BATCH_SIZE", 2), \
+         patch("app.tasks.campaign.settings.CAMPAIGN_SCHEDULING_BATCH_SIZE", 2):
+        result = campaign_tasks.run_campaign.delay(str(active_campaign.id)).get()
+
+    assert result["success"] is True
+    assert result["qualification_batches"] == 3
+
+    db_session.expire_all()
+    campaign = db_session.get(Campaign, active_campaign.id)
+    assert campaign.status == CampaignStatus.COMPLETED
+    assert campaign.completed_at is not None
+
+    contacted = db_session.query(Lead).filter(
+        Lead.campaign_id == active_campaign.id,
+        Lead.status == LeadStatus.CONTACTED,
+    ).count()
+    assert contacted == 5
+
+
+def test_run_campaign_qualifies_leads_stranded_in_scoring(db_session, active_campaign, eager_tasks):
+    """A fresh distributed run should also qualify leads an earlier run left in SCORING."""
+    stranded = db_session.query(Lead).filter(Lead.campaign_id == active_campaign.id).first()
+    stranded.status = LeadStatus.SCORING
+    db_session.commit()
+
+    result = campaign_tasks.run_campaign.delay(str(active_campaign.id)).get()
+
+    assert result["success"] is True
+    assert result["resumed_from"] is None
+
+    db_session.expire_all()
+    contacted = db_session.query(Lead).filter(
+        Lead.campaign_id == active_campaign.id,
+        Lead.status == LeadStatus.CONTACTED,
+    ).count()
+    assert contacted == 5
+
+
+def test_run_campaign_prospecting_failure_keeps_phase(db_session, active_campaign, eager_tasks):
+    """Failed prospecting should fail the checkpoint and retry instead of fanning out qualification."""
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    with patch("app.agents.prospector.agent.ProspectorAgent.execute",
+               AsyncMock(return_value={"success": False, "error": "RocketReach unavailable"})), \
+         patch.object(campaign_tasks.qualify_batch, "s") as qualify_signature, \
+         patch.object(campaign_tasks.run_campaign, "retry", side_effect=RuntimeError("retried")):
+        with pytest.raises(RuntimeError, match="retried"):
+            campaign_tasks.run_campaign.apply(args=[str(active_campaign.id)], throw=True)
+
+    qualify_signature.assert_not_called()
+    checkpoint = CampaignCheckpoint.for_campaign(active_campaign.id)
+    record = checkpoint.load()
+    checkpoint.redis_client.delete(checkpoint.key)
+    assert record["status"] == "failed"
+    assert record["phase"] == "prospecting"
+    assert "RocketReach unavailable" in record["error"]
+
+
+def test_run_campaign_pauses_after_last_retry(db_session, active_campaign, eager_tasks):
+    """Once its retries are exhausted, the run should pause the campaign and fail the checkpoint."""
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    with patch("app.agents.prospector.agent.ProspectorAgent.execute",
+               AsyncMock(side_effect=RuntimeError("RocketReach unavailable"))):
+        with pytest.raises(RuntimeError):
+            campaign_tasks.run_campaign.apply(args=[str(active_campaign.id)], retries=3, throw=True)
+
+    db_session.expire_all()
+    assert db_session.get(Campaign, active_campaign.id).status == CampaignStatus.PAUSED
+    checkpoint = CampaignCheckpoint.for_campaign(active_campaign.id)
+    record = checkpoint.load()
+    checkpoint.redis_client.delete(checkpoint.key)
+    assert record["status"] == "failed"
+    assert record["phase"] == "prospecting"
+
+
+def test_failed_chord_pauses_campaign(db_session, active_campaign, eager_tasks):
+    """A batch that exhausted its retries should reach the chord errback, which pauses the run."""
+    from celery.app.task import Context
+    from app.orchestrator.checkpoint import CampaignCheckpoint
+
+    with patch("app.tasks.campaign.chord") as chord:
+        campaign_tasks.run_campaign.apply(args=[str(active_campaign.id)], throw=True)
+
+    callback = chord.return_value.call_args.args[0]
+    assert callback.task == "campaign.schedule_qualified"
+    errbacks = callback.options["link_error"]
+
+    # What the result backend does when a header task of the chord fails
+    celery_app.backend._call_task_errbacks(
+        Context(id="chord-callback", errbacks=errbacks, delivery_info={}),
+        RuntimeError("qualify_batch failed"),
+        None,
+    )
+
+    db_session.expire_all()
+    assert db_session.get(Campaign, active_campaign.id).status == CampaignStatus.PAUSED
+    checkpoint = CampaignCheckpoint.for_campaign(active_campaign.id)
+    record = checkpoint.load()
+    checkpoint.redis_client.delete(checkpoint.key)
+    assert record["status"] == "failed"
+    assert record["phase"] == "qualification"
+    assert "qualify_batch failed" in record["error"]
+
+
+def test_run_campaign_skips_paused_campaign(db_session, active_campaign, eager_tasks):
+    """A paused campaign should not be processed or completed."""
+    active_campaign.status = CampaignStatus.PAUSED
+    db_session.commit()
+
+    result = campaign_tasks.run_campaign.delay(str(active_campaign.id)).get()
+
+    assert result["success"] is False
+    db_session.expire_all()
+    assert db_session.get(Campaign, active_campaign.id).status == CampaignStatus.PAUSED
+
+
+def test_finalize_sums_batch_results(db_session, active_campaign):
+    """The completion callback should total the scheduling batches."""
+    db_session.query(Lead).update({Lead.status: LeadStatus.CONTACTED})
+    db_session.commit()
+
+    with patch("app.tasks.campaign.SessionLocal", TestingSessionLocal):
+        result = campaign_tasks.finalize_campaign(
+            [{"sent": 2, "failed": 0}, {"sent": 1, "failed": 1}],
+            str(active_campaign.id),
+        )
+
+    assert result == {"scheduling": {"sent": 3, "failed": 1}, "completed": True}
+
+
+def test_finalize_leaves_campaign_active_with_pending_leads(db_session, active_campaign):
+    """Leads over today's quota keep the campaign ACTIVE for the drip scheduler."""
+    with patch("app.tasks.campaign.SessionLocal", TestingSessionLocal):
+        result = campaign_tasks.finalize_campaign([], str(active_campaign.id))
+
+    assert result["completed"] is False
+    db_session.expire_all()
+    assert db_session.get(Campaign, active_campaign.id).status == CampaignStatus.ACTIVE
+
+
+def test_drip_tick_task(db_session, active_campaign):
+    """The periodic task should run a drip tick."""
+    with patch("app.tasks.campaign.SessionLocal", TestingSessionLocal), \
+         patch("app.tasks.campaign.DripScheduler.tick", return_value={"campaigns": {}, "completed": []}) as tick:
+        result = campaign_tasks.drip_tick()
+
+    tick.assert_called_once()
+    assert result == {"campaigns": {}, "completed": []}
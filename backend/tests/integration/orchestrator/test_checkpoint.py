@@ -0,0 +1,78 @@
+"""Integration tests for campaign run checkpoints."""
+
+import pytest
+import redis
+from uuid import uuid4
+
+from app.core.config import settings
+from app.orchestrator.checkpoint import CampaignCheckpoint
+
+
+@pytest.fixture
+def checkpoint():
+    """Checkpoint for a random campaign on the configured Redis server."""
+    checkpoint = CampaignCheckpoint(uuid4(), redis.from_url(settings.REDIS_URL))
+    yield checkpoint
+    checkpoint.redis_client.delete(checkpoint.key)
+
+
+def test_checkpoint_records_phase_cursor_and_counts(checkpoint):
+    """Progress should round-trip through Redis."""
+    checkpoint.start("phased")
+    checkpoint.set_phase("qualification")
+    checkpoint.advance(cursor="abc", qualified=2, rejected=1)
+    checkpoint.advance(cursor="def", qualified=3)
+
+    record = checkpoint.load()
+
+    assert record["status"] == "running"
+    assert record["mode"] == "phased"
+    assert record["phase"] == "qualification"
+    assert record["cursor"] == "def"
+    assert record["counts"] == {"qualified": 5, "rejected": 1}
+
+
+def test_checkpoint_start_resets_previous_run(checkpoint):
+    """Starting a new run should drop the previous counts."""
+    checkpoint.start("phased")
+    checkpoint.advance(sent=4)
+    checkpoint.complete()
+
+    checkpoint.start("phased")
+
+    assert checkpoint.load()["counts"] == {}
+
+
+def test_checkpoint_resumable_states(checkpoint):
+    """Only interrupted runs should be resumable."""
+    assert CampaignCheckpoint.is_resumable(checkpoint.load()) is False
+
+    checkpoint.start("phased")
+    assert CampaignCheckpoint.is_resumable(checkpoint.load()) is True
+
+    checkpoint.fail("boom")
+    record = checkpoint.load()
+    assert CampaignCheckpoint.is_resumable(record) is True
+    assert record["error"] == "boom"
+
+    checkpoint.complete()
+    assert CampaignCheckpoint.is_resumable(checkpoint.load()) is False
+
+
+def test_phase_done():
+    """A phase is done once the record moved past it."""
+    record = {"phase": "qualification"}
+
+    assert CampaignCheckpoint.phase_done(record, "prospecting") is True
+    assert CampaignCheckpoint.phase_done(record, "qualification") is False
+    assert CampaignCheckpoint.phase_done({}, "prospecting") is False
+
+
+def test_checkpoint_without_redis_is_noop():
+    """Without Redis, checkpoints are disabled."""
+    checkpoint = CampaignCheckpoint(uuid4(), None)
+
+    checkpoint.start("phased")
+    checkpoint.advance(cursor="abc", qualified=1)
+
+    assert checkpoint.load() == {}
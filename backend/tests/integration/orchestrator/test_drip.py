@@ -0,0 +1,121 @@
+"""Integration tests for the drip scheduler."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.email import Email, EmailStatus
+from app.db.models.lead import Lead, LeadStatus
+from app.orchestrator.drip import DripScheduler
+
+# Middle of the default 08:00-18:00 UTC send window
+MIDDAY = datetime(2026, 3, 2, 13, 0)
+
+
+@pytest.fixture
+def drip_campaign(db_session, test_organization):
+    """Create an active campaign with qualified leads scored 10..60."""
+    campaign = Campaign(
+        organization_id=test_organization.id,
+        name="Drip Campaign",
+        status=CampaignStatus.ACTIVE,
+        target_criteria={},
+        daily_limit=4,
+    )
+    db_session.add(campaign)
+    db_session.commit()
+
+    for i in range(6):
+        db_session.add(Lead(
+            campaign_id=campaign.id,
+            organization_id=campaign.organization_id,
+            email=f"lead{i}@example.com",
+            bant_score=(i + 1) * 10,
+            status=LeadStatus.QUALIFIED,
+        ))
+    db_session.commit()
+    db_session.refresh(campaign)
+    return campaign
+
+
+def _contacting_runner(db_session):
+    """Runner stub marking scheduled leads as contacted."""
+    def schedule_leads(campaign, lead_ids):
+        db_session.query(Lead).filter(Lead.id.in_(lead_ids)).update(
+            {Lead.status: LeadStatus.CONTACTED}, synchronize_session=False
+        )
+        db_session.commit()
+        return {"sent": len(lead_ids), "failed": 0}
+
+    runner = Mock()
+    runner.schedule_leads.side_effect = schedule_leads
+    return runner
+
+
+def test_window_fraction():
+    """Sends are only allowed inside the send window."""
+    day = datetime(2026, 3, 2)
+
+    assert DripScheduler.window_fraction(day.replace(hour=7)) == 0.0
+    assert DripScheduler.window_fraction(day.replace(hour=13)) == pytest.approx(0.5)
+    assert DripScheduler.window_fraction(day.replace(hour=18)) == 0.0
+
+
+def test_allowance_is_paced_over_the_window(db_session, drip_campaign):
+    """The allowance grows through the day up to daily_limit."""
+    drip = DripScheduler(db_session, runner=Mock())
+    day = datetime(2026, 3, 2)
+
+    assert drip.allowance(drip_campaign, 0, day.replace(hour=7)) == 0
+    assert drip.allowance(drip_campaign, 0, MIDDAY) == 2
+    assert drip.allowance(drip_campaign, 1, MIDDAY) == 1
+    assert drip.allowance(drip_campaign, 0, day.replace(hour=17, minute=59)) == 4
+    assert drip.allowance(drip_campaign, 5, day.replace(hour=17, minute=59)) == 0
+
+
+def test_tick_sends_best_scored_leads_within_allowance(db_session, drip_campaign):
+    """A tick should send today's remaining paced allowance, best scores first."""
+    sent_lead = db_session.query(Lead).filter(Lead.bant_score == 10).first()
+    db_session.add(Email(
+        lead_id=sent_lead.id,
+        campaign_id=drip_campaign.id,
+        subject="Hello",
+        body="Body",
+        status=EmailStatus.SENT,
+        sent_at=MIDDAY - timedelta(hours=1),
+    ))
+    db_session.commit()
+
+    runner = _contacting_runner(db_session)
+    result = DripScheduler(db_session, runner=runner).tick(now=MIDDAY)
+
+    assert result["campaigns"] == {str(drip_campaign.id): {"sent": 1, "failed": 0}}
+    _, lead_ids = runner.schedule_leads.call_args.args
+    top = db_session.query(Lead).filter(Lead.bant_score == 60).first()
+    assert lead_ids == [top.id]
+
+
+def test_tick_resumes_next_day(db_session, drip_campaign):
+    """Yesterday's sends do not count against today's quota."""
+    runner = _contacting_runner(db_session)
+    drip = DripScheduler(db_session, runner=runner)
+
+    drip.tick(now=MIDDAY.replace(hour=17, minute=59))
+    result = drip.tick(now=MIDDAY + timedelta(days=1, hours=4, minutes=59))
+
+    assert result["campaigns"][str(drip_campaign.id)]["sent"] == 2
+
+
+def test_tick_completes_campaign_after_last_lead(db_session, drip_campaign):
+    """The campaign completes once every qualified lead was contacted."""
+    drip_campaign.daily_limit = 10
+    db_session.commit()
+
+    result = DripScheduler(db_session, runner=_contacting_runner(db_session)).tick(
+        now=MIDDAY.replace(hour=17, minute=59)
+    )
+
+    assert result["completed"] == [str(drip_campaign.id)]
+    db_session.refresh(drip_campaign)
+    assert drip_campaign.status == CampaignStatus.COMPLETED
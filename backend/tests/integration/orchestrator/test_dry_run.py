@@ -0,0 +1,107 @@
+"""Integration tests for the campaign dry-run mode."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.db.models.campaign import Campaign
+from app.db.models.lead import Lead
+from app.db.models.organization import Organization
+from app.orchestrator.dry_run import (
+    CampaignDryRun,
+    FakeLLM,
+    FakeMailer,
+    FaultProfile,
+    format_report,
+    synthetic_prospects,
+)
+from app.core.exceptions import BadRequestError
+
+
+@pytest.fixture
+def no_default_llm():
+    """Keep agent construction from resolving a real LLM or memory."""
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None):
+        yield
+
+
+@pytest.mark.parametrize("mode", ["pipelined", "phased"])
+def test_dry_run_reports_every_phase(db_session, no_default_llm, mode):
+    """A dry run should process every synthetic prospect and clean up after itself."""
+    report = CampaignDryRun(db_session, prospects=12, mode=mode, seed=7).run()
+
+    assert report["success"] is True
+    assert report["mode"] == mode
+    assert report["phases"]["prospecting"]["runs"] == 1
+    assert report["phases"]["qualification"]["runs"] == 12
+    assert report["phases"]["scheduling"]["runs"] == report["fakes"]["email"]["calls"]
+    assert report["fakes"]["rocketreach"]["calls"] == 13  # one search, twelve lookups
+    assert "qualification" in format_report(report)
+
+    db_session.expire_all()
+    assert db_session.query(Organization).count() == 0
+    assert db_session.query(Campaign).count() == 0
+    assert db_session.query(Lead).count() == 0
+
+
+def test_dry_run_survives_injected_email_failures(db_session, no_default_llm):
+    """Failed sends should show up as failed scheduling runs, not crash the run."""
+    report = CampaignDryRun(
+        db_session,
+        prospects=10,
+        mode="phased",
+        email=FaultProfile(error_rate=1.0),
+        seed=3,
+    ).run()
+
+    assert report["success"] is True
+    assert report["fakes"]["email"]["errors"] == report["fakes"]["email"]["calls"]
+
+
+def test_dry_run_keep(db_session, no_default_llm):
+    """With keep, the campaign and its leads should stay for inspection."""
+    CampaignDryRun(db_session, prospects=3, mode="phased", keep=True).run()
+
+    assert db_session.query(Lead).count() == 3
+
+
+def test_fault_profile_injection_rates():
+    """Faults should be drawn at the configured rates."""
+    profile = FaultProfile(error_rate=0.2, rate_limit_rate=0.3, seed=1)
+
+    faults = [profile.draw_fault() for _ in range(2000)]
+
+    assert 300 < faults.count("error") < 500
+    assert 500 < faults.count("rate_limit") < 700
+
+
+def test_fault_profile_rejects_invalid_rates():
+    """Rates adding up to more than 1 should be rejected."""
+    with pytest.raises(ValueError):
+        FaultProfile(error_rate=0.6, rate_limit_rate=0.6)
+
+
+def test_fake_mailer_rate_limit():
+    """Injected 429s should raise like the Resend integration does."""
+    mailer = FakeMailer(FaultProfile(rate_limit_rate=1.0))
+
+    with pytest.raises(BadRequestError):
+        mailer(to="lead@example.com", subject="Hello", html_content="Hi")
+
+    assert mailer.stats.rate_limited == 1
+
+
+def test_fake_llm_returns_canned_response():
+    """The fake LLM should answer every call with its canned response."""
+    llm = FakeLLM(response='{"qualified": true}')
+
+    assert llm.call("Score this lead") == '{"qualified": true}'
+    assert llm.stats.calls == 1
+
+
+def test_synthetic_prospects_are_unique():
+    """Generated prospects should have distinct emails."""
+    prospects = synthetic_prospects(50, seed=1)
+
+    assert len({prospect["email"] for prospect in prospects}) == 50
@@ -87,3 +87,64 @@ def test_can_transition():
     assert LeadStateMachine.can_transition(LeadStatus.NEW, LeadStatus.ENRICHED) is True
     assert LeadStateMachine.can_transition(LeadStatus.NEW, LeadStatus.QUALIFIED) is False
     assert LeadStateMachine.can_transition(LeadStatus.REJECTED, LeadStatus.QUALIFIED) is False
+
+
+def _add_leads(db_session, test_organization, test_campaign, statuses):
+    """Create one lead per status and return their IDs."""
+    leads = [
+        Lead(
+            campaign_id=test_campaign.id,
+            organization_id=test_organization.id,
+            email=f"lead{i}@example.com",
+            status=status,
+        )
+        for i, status in enumerate(statuses)
+    ]
+    db_session.add_all(leads)
+    db_session.commit()
+    return [lead.id for lead in leads]
+
+
+def test_transition_many(db_session, test_organization, test_campaign):
+    """Test batch transition moves valid leads and rejects the others."""
+    lead_ids = _add_leads(
+        db_session,
+        test_organization,
+        test_campaign,
+        [LeadStatus.ENRICHED, LeadStatus.ENRICHED, LeadStatus.NEW, LeadStatus.REJECTED],
+    )
+    
+    result = LeadStateMachine.transition_many(lead_ids, LeadStatus.SCORING, db_session)
+    
+    assert set(result["moved"]) == set(lead_ids[:2])
+    assert result["rejected"] == lead_ids[2:]
+    
+    statuses = [db_session.get(Lead, lead_id).status for lead_id in lead_ids]
+    assert statuses == [LeadStatus.SCORING, LeadStatus.SCORING, LeadStatus.NEW, LeadStatus.REJECTED]
+
+
+def test_transition_many_without_commit(db_session, test_organization, test_campaign):
+    """Test batch transition leaves the commit to the caller."""
+    lead_ids = _add_leads(db_session, test_organization, test_campaign, [LeadStatus.SCORING])
+    
+    result = LeadStateMachine.transition_many(
+        lead_ids, LeadStatus.QUALIFIED, db_session, commit=False
+    )
+    db_session.rollback()
+    
+    assert result["moved"] == lead_ids
+    assert db_session.get(Lead, lead_ids[0]).status == LeadStatus.SCORING
+
+
+def test_transition_many_empty(db_session):
+    """Test batch transition with no leads."""
+    assert LeadStateMachine.transition_many([], LeadStatus.SCORING, db_session) == {
+        "moved": [],
+        "rejected": [],
+    }
+
+
+def test_get_previous_states():
+    """Test get_previous_states method."""
+    assert LeadStateMachine.get_previous_states(LeadStatus.SCORING) == [LeadStatus.ENRICHED]
+    assert LeadStateMachine.get_previous_states(LeadStatus.NEW) == []
@@ -0,0 +1,189 @@
+"""Integration tests for LeadRepository."""
+
+import pytest
+
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.lead import Lead, LeadStatus
+from app.db.repositories.lead import LeadRepository
+
+
+@pytest.fixture
+def test_campaign(db_session, test_organization):
+    """Create a test campaign."""
+    campaign = Campaign(
+        organization_id=test_organization.id,
+        name="Ingestion Campaign",
+        status=CampaignStatus.ACTIVE,
+        target_criteria={},
+    )
+    db_session.add(campaign)
+    db_session.commit()
+    db_session.refresh(campaign)
+    return campaign
+
+
+def _prospects(count, prefix="lead"):
+    return [
+        {
+            "email": f"{prefix}{i}@example.com",
+            "first_name": "Lead",
+            "last_name": str(i),
+            "job_title": "VP Sales",
+            "company_name": "Acme",
+        }
+        for i in range(count)
+    ]
+
+
+class TestLeadRepository:
+    """Tests for LeadRepository bulk operations."""
+
+    def test_bulk_insert_creates_leads(self, db_session, test_campaign):
+        """Should insert every prospect as an enriched lead."""
+        repo = LeadRepository(db_session)
+
+        result = repo.bulk_insert(test_campaign.id, test_campaign.organization_id, _prospects(5))
+
+        assert result["inserted"] == 5
+        assert result["skipped"] == 0
+        assert len(result["lead_ids"]) == 5
+        leads = db_session.query(Lead).filter(Lead.campaign_id == test_campaign.id).all()
+        assert len(leads) == 5
+        assert all(lead.status == LeadStatus.ENRICHED for lead in leads)
+
+    def test_bulk_insert_skips_existing_and_repeated(self, db_session, test_campaign):
+        """Should skip emails already in the campaign and repeated in the batch."""
+        repo = LeadRepository(db_session)
+        repo.bulk_insert(test_campaign.id, test_campaign.organization_id, _prospects(3))
+
+        prospects = _prospects(5) + _prospects(1)
+        result = repo.bulk_insert(test_campaign.id, test_campaign.organization_id, prospects)
+
+        assert result["inserted"] == 2
+        assert result["skipped"] == 4
+        assert db_session.query(Lead).filter(Lead.campaign_id == test_campaign.id).count() == 5
+
+    def test_bulk_insert_counts_invalid(self, db_session, test_campaign):
+        """Should count prospects without email as invalid."""
+        repo = LeadRepository(db_session)
+
+        result = repo.bulk_insert(
+            test_campaign.id,
+            test_campaign.organization_id,
+            _prospects(2) + [{"first_name": "No email"}],
+        )
+
+        assert result["inserted"] == 2
+        assert result["invalid"] == 1
+        assert result["skipped"] == 0
+
+    def test_bulk_insert_batches(self, db_session, test_campaign):
+        """Should insert across several statements when above batch size."""
+        repo = LeadRepository(db_session)
+
+        result = repo.bulk_insert(
+            test_campaign.id, test_campaign.organization_id, _prospects(7), batch_size=3
+        )
+
+        assert result["inserted"] == 7
+
+    def test_existing_emails(self, db_session, test_campaign):
+        """Should return only emails already present in the campaign."""
+        repo = LeadRepository(db_session)
+        repo.bulk_insert(test_campaign.id, test_campaign.organization_id, _prospects(2))
+
+        existing = repo.existing_emails(
+            test_campaign.id,
+            ["lead0@example.com", "lead1@example.com", "new@example.com", None],
+            batch_size=1,
+        )
+
+        assert existing == {"lead0@example.com", "lead1@example.com"}
+
+    def test_update_scores(self, db_session, test_campaign):
+        """Should write every score and breakdown, one UPDATE per batch."""
+        repo = LeadRepository(db_session)
+        lead_ids = repo.bulk_insert(test_campaign.id, test_campaign.organization_id, _prospects(5))["lead_ids"]
+
+        updated = repo.update_scores(
+            [
+                {"id": lead_id, "bant_score": 40 + i, "bant_breakdown": {"budget": {"score": i, "reasoning": "é"}}}
+                for i, lead_id in enumerate(lead_ids)
+            ],
+            batch_size=2,
+        )
+        db_session.commit()
+
+        assert updated == 5
+        leads = {lead.id: lead for lead in db_session.query(Lead).all()}
+        for i, lead_id in enumerate(lead_ids):
+            assert leads[lead_id].bant_score == 40 + i
+            assert leads[lead_id].bant_breakdown == {"budget": {"score": i, "reasoning": "é"}}
+
+    def test_scoring_columns(self, db_session, test_campaign):
+        """Should load the scorer inputs and the enrichment signals it reads."""
+        repo = LeadRepository(db_session)
+        prospects = _prospects(2)
+        prospects[0]["company_size"] = "51-200"
+        prospects[0]["enrichment_data"] = {"raw_data": {"seniority_level": "vp", "updated_at": "2024-01-01"}}
+        repo.bulk_insert(test_campaign.id, test_campaign.organization_id, prospects)
+
+        columns = repo.scoring_columns(test_campaign.id)
+
+        rows = sorted(
+            zip(
+                columns["company_sizes"],
+                columns["max_employees"],
+                columns["seniority_tiers"],
+                columns["industries"],
+                columns["signals"],
+            ),
+            key=lambda row: row[0] or "",
+        )
+        assert rows == [
+            (None, None, "vp", "Acme", (False, False, False)),
+            ("51-200", 200, "vp", "Acme", (False, True, True)),
+        ]
+        assert len(columns["ids"]) == 2
+
+    def test_scoring_columns_stale_for(self, db_session, test_campaign):
+        """Only leads not scored by the plan version from their current inputs are stale."""
+        repo = LeadRepository(db_session)
+        lead_ids = repo.bulk_insert(test_campaign.id, test_campaign.organization_id, _prospects(3))["lead_ids"]
+
+        assert sorted(repo.scoring_columns(test_campaign.id, stale_for="v1")["ids"]) == sorted(lead_ids)
+
+        repo.update_scores(
+            [{"id": lead_id, "bant_score": 50, "bant_breakdown": None} for lead_id in lead_ids],
+            plan_version="v1",
+        )
+        db_session.commit()
+
+        assert repo.scoring_columns(test_campaign.id, stale_for="v1")["ids"] == []
+        assert sorted(repo.scoring_columns(test_campaign.id, stale_for="v2")["ids"]) == sorted(lead_ids)
+
+        # A changed scoring input makes the lead stale again
+        changed = db_session.get(Lead, lead_ids[0])
+        changed.job_title = "Sales Intern"
+        # Scores written without a plan version clear the fingerprint
+        repo.update_scores([{"id": lead_ids[1], "bant_score": 70, "bant_breakdown": None}])
+        db_session.commit()
+
+        assert sorted(repo.scoring_columns(test_campaign.id, stale_for="v1")["ids"]) == sorted(lead_ids[:2])
+        assert len(repo.scoring_columns(test_campaign.id)["ids"]) == 3
+
+    def test_bulk_insert_stores_features(self, db_session, test_campaign):
+        """Company size and title should be parsed into feature columns at ingest."""
+        repo = LeadRepository(db_session)
+        prospects = _prospects(1)
+        prospects[0].update({
+            "company_size": "51-200",
+            "job_title": "Directrice Commerciale",
+            "linkedin_url": "https://linkedin.com/in/lead0",
+        })
+        repo.bulk_insert(test_campaign.id, test_campaign.organization_id, prospects)
+
+        lead = db_session.query(Lead).one()
+        assert (lead.employees_min, lead.employees_max, lead.size_bucket) == (51, 200, "100-499")
+        assert lead.seniority_tier == "director"
+        assert lead.has_linkedin is True
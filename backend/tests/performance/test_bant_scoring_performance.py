@@ -0,0 +1,34 @@
+"""Throughput of the columnar BANT scorer."""
+
+import random
+import time
+
+from app.services.scoring import BANTScoringService
+
+LEADS = 100_000
+
+SIZES = [None, "1-10", "11-50", "51-200", "201-500", "501-1000", "1001-5000", "5001-10000", "10001+"]
+TITLES = [
+    "CEO", "Founder", "VP Sales", "Head of Marketing", "Sales Director", "Directrice Commerciale",
+    "Account Manager", "Responsable Marketing", "Software Engineer", "Business Developer", None,
+]
+INDUSTRIES = [None, "SaaS", "Conseil", "Industrie", "Retail"]
+
+
+class TestBANTScoringPerformance:
+    """Whole-campaign re-scoring must stay a matter of seconds."""
+
+    def test_rescore_100k_leads(self):
+        """Scoring 100k leads in one pass should take a few seconds at most."""
+        rng = random.Random(0)
+        sizes = [rng.choice(SIZES) for _ in range(LEADS)]
+        titles = [rng.choice(TITLES) for _ in range(LEADS)]
+        industries = [rng.choice(INDUSTRIES) for _ in range(LEADS)]
+        signals = [(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.3) for _ in range(LEADS)]
+
+        start = time.perf_counter()
+        results = BANTScoringService.calculate_bant_scores(sizes, titles, industries, signals)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == LEADS
+        assert elapsed < 3.0, f"{elapsed:.2f} s for {LEADS} leads"
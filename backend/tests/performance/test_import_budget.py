@@ -0,0 +1,63 @@
+"""Import-time budget for the API process."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Modules only needed when a campaign actually runs (Celery workers)
+HEAVY_MODULES = [
+    "crewai",
+    "litellm",
+    "celery",
+    "app.agents.base",
+    "app.orchestrator.campaign_runner",
+    "app.tasks",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed_s": elapsed,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _import_app_main() -> dict:
+    """Import app.main in a fresh interpreter and report what it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestAPIImportBudget:
+    """The API must start without the agent and orchestrator stack."""
+
+    def test_app_main_does_not_import_heavy_modules(self):
+        """Importing app.main should not load CrewAI, Celery or the agents."""
+        report = _import_app_main()
+
+        assert report["loaded"] == [], (
+            f"app.main pulled in {report['loaded']}; import them lazily where a campaign runs"
+        )
+
+    def test_app_main_import_time(self):
+        """app.main should import well under the time CrewAI alone takes."""
+        report = _import_app_main()
+
+        # ~1s locally; CrewAI alone adds >1s. Tolerance for slow CI machines.
+        assert report["elapsed_s"] < 5, f"app.main took {report['elapsed_s']:.2f}s to import"
@@ -0,0 +1,76 @@
+"""Lookup time of the lead similarity index."""
+
+import itertools
+import string
+import time
+from uuid import uuid4
+
+import numpy as np
+
+from app.services.lead_similarity import (
+    LeadSimilarityIndex,
+    _combine_block_keys,
+    _prefix_hash,
+    lead_features,
+)
+
+LEADS = 1_000_000
+LOOKUPS = 100
+
+# Every 3-letter prefix, drawn with Zipf (1/rank) frequencies like real names
+PREFIXES = ["".join(letters) for letters in itertools.product(string.ascii_lowercase, repeat=3)]
+
+
+def _zipf_prefixes(rng, size):
+    weights = 1.0 / np.arange(1, len(PREFIXES) + 1)
+    return rng.choice(len(PREFIXES), size=size, p=weights / weights.sum())
+
+
+def _organization_file(path, index, rng):
+    """Write LEADS records with skewed name and company prefixes to path."""
+    name_hashes = np.array([_prefix_hash("n", prefix) for prefix in PREFIXES], dtype=np.uint64)
+    company_hashes = np.array([_prefix_hash("c", prefix) for prefix in PREFIXES], dtype=np.uint64)
+    first, last = name_hashes[_zipf_prefixes(rng, LEADS)], name_hashes[_zipf_prefixes(rng, LEADS)]
+    company = company_hashes[_zipf_prefixes(rng, LEADS)]
+
+    records = np.zeros(LEADS, dtype=index.dtype)
+    records["id"] = np.frombuffer(rng.bytes(16 * LEADS), dtype="S16")
+    records["blocks"][:, 0] = _combine_block_keys(first, company)
+    records["blocks"][:, 1] = _combine_block_keys(last, company)
+    vectors = rng.standard_normal((LEADS, index.dimensions)).astype(np.float32)
+    records["vector"] = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    target = uuid4()
+    vector, _, blocks = lead_features("Jean", "Dupont", "Acme")
+    records[LEADS // 2] = (target.bytes, 0, blocks, vector)
+    records.tofile(path)
+    return target
+
+
+class TestLeadSimilarityPerformance:
+    """Near-duplicate lookups must stay cheap on large organizations."""
+
+    def test_lookup_time(self, tmp_path):
+        """Lookups over 1M leads should take well under 10 ms per prospect, batched or not."""
+        index = LeadSimilarityIndex(tmp_path / "org.idx", 128)
+        rng = np.random.default_rng(0)
+        target = _organization_file(index.path, index, rng)
+        assert index.refresh() == LEADS
+
+        # Prospects with the most common prefixes hit the largest blocks
+        common = [PREFIXES[rank].capitalize() for rank in _zipf_prefixes(rng, 3 * (LOOKUPS - 1))]
+        queries = [lead_features(*common[i:i + 3]) for i in range(0, len(common), 3)]
+        queries.append(lead_features("Jean", "Dupond", "ACME SAS"))
+
+        start = time.perf_counter()
+        results = index.search(queries, min_score=0.85)
+        batched = (time.perf_counter() - start) / LOOKUPS
+
+        start = time.perf_counter()
+        single = index.search([queries[-1]], min_score=0.85)
+        once = time.perf_counter() - start
+
+        assert results[-1][0][0] == target
+        assert single[0][0][0] == target
+        assert batched < 0.01, f"{batched * 1000:.1f} ms per batched lookup"
+        assert once < 0.01, f"{once * 1000:.1f} ms for a single lookup"
@@ -0,0 +1,53 @@
+"""Micro-benchmark of the compiled job-title classifier."""
+
+import random
+import time
+
+from app.services.title_classifier import TitleClassifier
+
+LOOKUPS = 200_000
+
+TITLES = [
+    "Chief Executive Officer", "VP of Sales EMEA", "Head of Business Development", "Directeur Général Adjoint",
+    "Directrice des Ressources Humaines", "Senior Account Manager", "Responsable Grands Comptes",
+    "Chef de projet digital", "Senior Software Engineer", "Business Developer", "Customer Success Specialist",
+    "Talent Acquisition Partner", "Marketing Operations Analyst", "Développeur Full Stack",
+]
+
+
+def keyword_authority(title):
+    """The per-tier keyword scan the classifier replaces."""
+    title_lower = title.lower()
+    if any(term in title_lower for term in ['ceo', 'cto', 'cfo', 'coo', 'founder', 'co-founder', 'president']):
+        return (23, "C-Level / Founder")
+    if any(term in title_lower for term in ['vp', 'vice president', 'head of', 'directeur général']):
+        return (18, "VP / Head of")
+    if any(term in title_lower for term in ['director', 'directeur', 'directrice']):
+        return (13, "Directeur de département")
+    if any(term in title_lower for term in ['manager', 'responsable', 'chef de']):
+        return (8, "Manager d'équipe")
+    return (5, "Contributeur individuel")
+
+
+class TestTitleClassifierPerformance:
+    """Title classification should cost a cache lookup for repeated titles."""
+
+    def test_classifier_beats_keyword_scan(self):
+        """Classifying repeated titles should be much faster than the keyword scan."""
+        rng = random.Random(0)
+        titles = [rng.choice(TITLES) for _ in range(LOOKUPS)]
+        classifier = TitleClassifier()
+
+        start = time.perf_counter()
+        expected = [keyword_authority(title) for title in titles]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [classifier.classify(title) for title in titles]
+        classifier_time = time.perf_counter() - start
+
+        assert results == expected
+        assert classifier.cache_info().misses == len(TITLES)
+        assert classifier_time * 2 < scan_time, (
+            f"classifier {classifier_time * 1000:.0f} ms vs keyword scan {scan_time * 1000:.0f} ms"
+        )
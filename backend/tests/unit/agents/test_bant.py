@@ -6,6 +6,7 @@ from uuid import uuid4
 
 from app.agents.bant.agent import BANTAgent
 from app.services.scoring import BANTScoringService
+from app.services.scoring_plan import ScoringPlan
 
 
 @pytest.fixture
@@ -56,3 +57,97 @@ async def test_bant_agent_execute(mock_memory, mock_llm, mock_db):
     assert "bant_score" in result["data"]
     assert result["data"]["bant_score"] >= 0
     assert result["data"]["bant_score"] <= 100
+
+
+@pytest.mark.asyncio
+@patch('app.agents.crew.get_llm', return_value=None)
+@patch('app.agents.crew.get_memory', return_value=None)
+async def test_bant_agent_execute_uses_campaign_plan(mock_memory, mock_llm, mock_db):
+    """Qualification should follow the campaign's threshold and its registered plan."""
+    with patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = BANTAgent(db=mock_db, config={"llm": None, "memory": None})
+    
+    campaign_id = str(uuid4())
+    lead_data = {"company_size": "51-200", "job_title": "VP Sales", "company_industry": "Technology"}
+    
+    # 56 points: below the default threshold, above a campaign threshold of 50
+    result = await agent.execute({"lead_data": lead_data, "campaign": {"id": campaign_id}})
+    assert result["data"]["bant_score"] == 56
+    assert result["data"]["qualified"] is False
+    
+    result = await agent.execute({"lead_data": lead_data, "campaign": {"id": campaign_id, "bant_threshold": 50}})
+    assert result["data"]["qualified"] is True
+    
+    agent.use_scoring_plan(campaign_id, ScoringPlan({"weights": {"authority": 0.0}}, threshold=50))
+    result = await agent.execute({"lead_data": lead_data, "campaign": {"id": campaign_id, "bant_threshold": 50}})
+    assert result["data"]["bant_breakdown"]["authority"]["score"] == 0
+    assert result["data"]["bant_score"] == 38
+    assert result["data"]["qualified"] is False
+    assert result["data"]["recommendation"] == "reject"
+
+
+@patch('app.agents.crew.get_llm', return_value=None)
+@patch('app.agents.crew.get_memory', return_value=None)
+def test_bant_agent_rescore_campaign(mock_memory, mock_llm, mock_db):
+    """Re-scoring should score all leads at once and write them back with one commit."""
+    with patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = BANTAgent(db=mock_db, config={"llm": None, "memory": None})
+    
+    lead_ids = [uuid4(), uuid4()]
+    repository = Mock()
+    repository.scoring_columns.return_value = {
+        "ids": lead_ids,
+        "company_sizes": ["1001-5000", None],
+        "max_employees": [5000, None],
+        "job_titles": ["CEO", None],
+        "seniority_tiers": ["c_level", None],
+        "industries": ["Acme", None],
+        "signals": [(True, True, True), (False, False, False)],
+    }
+    mock_db.query.return_value.filter.return_value.first.return_value = Mock(scoring_rules=None, bant_threshold=60)
+    
+    with patch('app.agents.bant.agent.LeadRepository', return_value=repository):
+        result = agent.rescore_campaign(uuid4())
+    
+    assert result == {"success": True, "data": {"scored": 2, "qualified": 1}}
+    plan_version = ScoringPlan().version
+    assert repository.scoring_columns.call_args.kwargs["stale_for"] == plan_version
+    assert repository.update_scores.call_args.kwargs["plan_version"] == plan_version
+    scores = repository.update_scores.call_args.args[0]
+    assert [score["id"] for score in scores] == lead_ids
+    assert scores[0]["bant_score"] == BANTScoringService.calculate_bant_score(
+        company_size="1001-5000",
+        job_title="CEO",
+        industry="Acme",
+        enrichment_data={"raw_data": {"current_employer_size": 1, "seniority_level": "c", "updated_at": "x"}},
+    )["bant_score"]
+    mock_db.commit.assert_called_once()
+
+
+@patch('app.agents.crew.get_llm', return_value=None)
+@patch('app.agents.crew.get_memory', return_value=None)
+def test_bant_agent_requalify_campaign(mock_memory, mock_llm, mock_db):
+    """Re-qualifying should only re-score stale leads and reject those below the new threshold."""
+    with patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = BANTAgent(db=mock_db, config={"llm": None, "memory": None})
+    
+    campaign_id = uuid4()
+    below = [uuid4()]
+    repository = Mock()
+    repository.scoring_columns.return_value = {
+        "ids": [], "company_sizes": [], "max_employees": [], "job_titles": [],
+        "seniority_tiers": [], "industries": [], "signals": [],
+    }
+    repository.qualified_below.return_value = below
+    mock_db.query.return_value.filter.return_value.first.return_value = Mock(scoring_rules=None, bant_threshold=75)
+    
+    with patch('app.agents.bant.agent.LeadRepository', return_value=repository), \
+            patch('app.agents.bant.agent.LeadStateMachine.transition_many', return_value={"moved": below, "rejected": []}) as transition_many:
+        result = agent.requalify_campaign(campaign_id)
+    
+    assert result == {"success": True, "data": {"scored": 0, "rejected": 1}}
+    # The threshold is not part of the plan version: stored scores stay valid
+    assert repository.scoring_columns.call_args.kwargs["stale_for"] == ScoringPlan().version
+    repository.qualified_below.assert_called_once_with(campaign_id, 75)
+    assert transition_many.call_args.args[0] == below
+    assert agent.scoring_plans[str(campaign_id)].threshold == 75
@@ -0,0 +1,208 @@
+"""Tests for batched multi-lead LLM analysis."""
+
+import asyncio
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crewai.crews.crew_output import CrewOutput
+
+from app.agents.bant.agent import BANTAgent
+from app.agents.batching import extract_json, parse_batch_results, plan_batches
+from app.agents.prospector.agent import ProspectorAgent
+
+# IDs of the items in a prompt (the output template's "..." is not one)
+_ID = re.compile(r'"id": "([^".]+)"')
+
+
+class TestPlanBatches:
+    """Tests for context-window-aware batch sizing."""
+
+    def test_respects_max_items(self):
+        """Batches should hold at most max_items items."""
+        batches = plan_batches(["x" * 40] * 10, prompt_tokens=100, context_window=100_000,
+                               output_tokens_per_item=10, max_items=4)
+
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_fits_context_window(self):
+        """A smaller context window should give smaller batches."""
+        items = ["x" * 400] * 20  # ~101 tokens each
+
+        large = plan_batches(items, prompt_tokens=500, context_window=32_000,
+                             output_tokens_per_item=300, max_items=50)
+        small = plan_batches(items, prompt_tokens=500, context_window=4_000,
+                             output_tokens_per_item=300, max_items=50)
+
+        assert len(large) == 1
+        assert len(small) == 3
+        assert all(len(batch) * 401 <= 3_500 for batch in small)
+        assert [index for batch in small for index in batch] == list(range(20))
+
+    def test_oversized_item_gets_own_batch(self):
+        """An item larger than the budget should still be sent."""
+        batches = plan_batches(["x" * 40, "x" * 40_000, "x" * 40], prompt_tokens=100,
+                               context_window=2_000, output_tokens_per_item=10, max_items=10)
+
+        assert batches == [[0], [1], [2]]
+
+
+class TestParseBatchResults:
+    """Tests for robust parsing of batched answers."""
+
+    def test_results_object_in_fence(self):
+        """JSON inside a Markdown fence with prose around it should parse."""
+        raw = 'Voici les résultats:\n```json\n{"results": [{"id": "a", "score": 70}, {"id": "b", "score": 20}]}\n```'
+
+        assert parse_batch_results(raw, ["a", "b"]) == {
+            "a": {"id": "a", "score": 70},
+            "b": {"id": "b", "score": 20},
+        }
+
+    def test_bare_list_with_trailing_text(self):
+        """A list followed by text should parse up to the end of the list."""
+        raw = '[{"id": "a", "score": 70}] J\'espère que cela aide.'
+
+        assert parse_batch_results(raw, ["a"]) == {"a": {"id": "a", "score": 70}}
+
+    def test_object_keyed_by_id(self):
+        """An object keyed by item ID should be accepted."""
+        raw = '{"a": {"score": 70}, "b": {"score": 20}}'
+
+        assert parse_batch_results(raw, ["a", "b"])["b"] == {"score": 20, "id": "b"}
+
+    def test_ignores_unknown_and_malformed_entries(self):
+        """Unknown IDs and non-object entries should be dropped."""
+        raw = '{"results": [{"id": "z", "score": 1}, "oops", {"score": 2}, {"id": "a", "score": 3}]}'
+
+        assert parse_batch_results(raw, ["a", "b"]) == {"a": {"id": "a", "score": 3}}
+
+    def test_no_json(self):
+        """An answer without JSON should give no results."""
+        assert parse_batch_results("Je ne peux pas répondre.", ["a"]) == {}
+        assert extract_json("") is None
+
+
+def _agent(agent_class):
+    with patch("app.agents.crew.get_llm", return_value=None), \
+         patch("app.agents.crew.get_memory", return_value=None), \
+         patch("app.agents.base.Agent", return_value=MagicMock()):
+        return agent_class()
+
+
+def _bant_answer(ids, score=20):
+    return {
+        "results": [
+            {
+                "id": item_id,
+                **{
+                    criterion: {"score": score, "reasoning": criterion}
+                    for criterion in ("budget", "authority", "need", "timeline")
+                },
+                "total_score": 4 * score,
+                "summary": f"Lead {item_id}",
+            }
+            for item_id in ids
+        ]
+    }
+
+
+@pytest.fixture
+def llm_calls():
+    """Prompts sent to the LLM by agents under test."""
+    return []
+
+
+def _patch_crew(agent, llm_calls, answer):
+    """Answer each task from the IDs in its prompt."""
+
+    def execute_crew(tasks):
+        prompt = tasks[0]
+        llm_calls.append(prompt)
+        return CrewOutput(raw=answer(_ID.findall(prompt)), tasks_output=[])
+
+    agent._create_task = lambda description, expected_output="": description
+    agent._execute_crew = execute_crew
+
+
+class TestBANTAnalyzeLeads:
+    """Tests for BANTAgent.analyze_leads."""
+
+    def test_batches_leads_into_few_requests(self, llm_calls):
+        """Fifty leads should need only a couple of LLM requests."""
+        agent = _agent(BANTAgent)
+        agent._context_window = lambda: 32_000
+        _patch_crew(agent, llm_calls, lambda ids: json.dumps(_bant_answer(ids)))
+        leads = {f"lead-{i}": {"job_title": "CTO", "company_size": "51-200"} for i in range(50)}
+
+        results = asyncio.run(agent.analyze_leads(leads, {"bant_threshold": 60}))
+
+        assert len(results) == 50
+        assert len(llm_calls) == 2
+        assert results["lead-7"]["bant_score"] == 80
+        assert results["lead-7"]["qualified"] is True
+        assert results["lead-7"]["bant_breakdown"]["need"] == {"score": 20, "reasoning": "need"}
+
+    def test_missing_entries_fall_back_to_single_requests(self, llm_calls):
+        """Leads left out of a batch answer should be retried alone."""
+        agent = _agent(BANTAgent)
+
+        def answer(ids):
+            # The batch answer drops its last lead and mangles the second
+            if len(ids) > 1:
+                data = _bant_answer(ids[:-1])
+                data["results"][1]["budget"] = "élevé"
+                return json.dumps(data)
+            return "```json\n" + json.dumps(_bant_answer(ids, score=10)) + "\n```"
+
+        _patch_crew(agent, llm_calls, answer)
+        leads = {f"lead-{i}": {"job_title": "CTO"} for i in range(3)}
+
+        results = asyncio.run(agent.analyze_leads(leads, {"bant_threshold": 60}))
+
+        assert len(llm_calls) == 3
+        assert results["lead-0"]["bant_score"] == 80
+        assert results["lead-1"]["bant_score"] == 40
+        assert results["lead-2"]["bant_score"] == 40
+        assert results["lead-2"]["recommendation"] == "nurture"
+
+    def test_small_context_window_means_more_requests(self, llm_calls):
+        """Batches should shrink to fit a small context window."""
+        agent = _agent(BANTAgent)
+        agent._context_window = lambda: 4_096
+        _patch_crew(agent, llm_calls, lambda ids: json.dumps(_bant_answer(ids)))
+        leads = {f"lead-{i}": {"job_title": "CTO"} for i in range(50)}
+
+        results = asyncio.run(agent.analyze_leads(leads, {"bant_threshold": 60}))
+
+        assert len(results) == 50
+        assert 2 < len(llm_calls) < 50
+
+    def test_scores_are_clamped_and_recomputed(self, llm_calls):
+        """Out-of-range scores and wrong totals from the model should be corrected."""
+        agent = _agent(BANTAgent)
+        _patch_crew(agent, llm_calls, lambda ids: json.dumps(_bant_answer(ids, score=40)))
+
+        results = asyncio.run(agent.analyze_leads({"a": {"job_title": "CEO"}}, {"bant_threshold": 90}))
+
+        assert results["a"]["bant_score"] == 100
+        assert results["a"]["qualified"] is True
+
+
+class TestProspectorAnalyzeProspects:
+    """Tests for ProspectorAgent.analyze_prospects."""
+
+    def test_analysis_keyed_by_index(self, llm_calls):
+        """Each prospect's analysis should come back under its index."""
+        agent = _agent(ProspectorAgent)
+        _patch_crew(agent, llm_calls, lambda ids: json.dumps({
+            "results": [{"id": item_id, "score": 75, "recommendation": "contact"} for item_id in ids]
+        }))
+        prospects = [{"id": 991, "name": f"Prospect {i}", "current_title": "VP Sales"} for i in range(5)]
+
+        results = asyncio.run(agent.analyze_prospects(prospects, {"job_titles": ["VP Sales"]}))
+
+        assert sorted(results) == ["0", "1", "2", "3", "4"]
+        assert len(llm_calls) == 1
+        assert "VP Sales" in llm_calls[0]
@@ -0,0 +1,165 @@
+"""Tests for the Intent classifier agent."""
+
+import asyncio
+import json
+import re
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+from crewai.crews.crew_output import CrewOutput
+
+from app.agents.intent.agent import IntentClassifierAgent
+from app.agents.intent.rules import classify_by_rules, normalize_reply
+from app.db.models.lead import LeadIntent
+
+# IDs of the replies in a prompt (the output template's "..." is not one)
+_ID = re.compile(r'"id": "([^".]+)"')
+
+
+class TestIntentRules:
+    """Tests for the deterministic intent rules."""
+
+    @pytest.mark.parametrize("text, intent", [
+        ("Automatic reply: I am out of the office until Monday.", LeadIntent.OUT_OF_OFFICE),
+        ("Bonjour, je suis absente du bureau jusqu'au 3 mars.", LeadIntent.OUT_OF_OFFICE),
+        ("Réponse automatique : en congés, de retour le 12.", LeadIntent.OUT_OF_OFFICE),
+        ("I'm not the right person for this, try our CTO.", LeadIntent.WRONG_PERSON),
+        ("Je ne travaille plus chez Acme depuis janvier.", LeadIntent.WRONG_PERSON),
+        ("Please unsubscribe me from this list.", LeadIntent.NOT_INTERESTED),
+        ("Merci de me désinscrire.", LeadIntent.NOT_INTERESTED),
+        ("STOP", LeadIntent.NOT_INTERESTED),
+    ])
+    def test_easy_replies(self, text, intent):
+        """Common easy replies should be classified without the LLM."""
+        match = classify_by_rules(text)
+
+        assert match is not None
+        assert match[0] == intent
+        assert 0 < match[1] <= 1
+
+    @pytest.mark.parametrize("text", [
+        "Intéressant, pouvez-vous m'envoyer vos tarifs ?",
+        "Not right now, maybe next quarter.",
+        "Can you stop by our booth next week?",
+        "",
+    ])
+    def test_other_replies_are_left_to_the_llm(self, text):
+        """Replies no rule covers should not be guessed."""
+        assert classify_by_rules(text) is None
+
+    def test_conflicting_rules_are_ambiguous(self):
+        """A reply matching rules of different intents should go to the LLM."""
+        text = "I'm out of the office. Also, I'm not the right person, please unsubscribe."
+
+        assert classify_by_rules(text) is None
+
+    def test_quoted_original_is_ignored(self):
+        """Words of our own quoted email should not trigger a rule."""
+        text = (
+            "Oui, appelons-nous mardi.\n\n"
+            "Le lun. 3 mars 2026, Vectra <hello@vectra.io> a écrit :\n"
+            "> Pour vous désinscrire, répondez STOP.\n"
+        )
+
+        assert normalize_reply(text) == "oui, appelons-nous mardi."
+        assert classify_by_rules(text) is None
+
+
+def _agent(db=None):
+    with patch("app.agents.crew.get_llm", return_value=None), \
+         patch("app.agents.crew.get_memory", return_value=None), \
+         patch("app.agents.base.Agent", return_value=MagicMock()):
+        return IntentClassifierAgent(db=db)
+
+
+def _patch_crew(agent, answer):
+    """Answer each task from the IDs in its prompt and return the prompts sent."""
+    prompts = []
+
+    def execute_crew(tasks):
+        prompts.append(tasks[0])
+        return CrewOutput(raw=answer(_ID.findall(tasks[0])), tasks_output=[])
+
+    agent._create_task = lambda description, expected_output="": description
+    agent._execute_crew = execute_crew
+    return prompts
+
+
+class TestIntentClassifierAgent:
+    """Tests for IntentClassifierAgent."""
+
+    def test_rules_only_needs_no_llm(self):
+        """Replies covered by rules should not reach the LLM."""
+        agent = _agent()
+        prompts = _patch_crew(agent, lambda ids: "{}")
+
+        result = asyncio.run(agent.execute({"replies": [
+            {"lead_id": None, "text": "Out of office until Monday"},
+            {"lead_id": None, "text": "Unsubscribe"},
+        ]}))
+
+        assert result["success"] is True
+        assert prompts == []
+        assert [r["intent"] for r in result["data"]["results"]] == ["out_of_office", "not_interested"]
+        assert result["data"]["classified_by_rules"] == 2
+
+    def test_ambiguous_replies_are_batched(self):
+        """Ambiguous replies should be classified together in one LLM request."""
+        agent = _agent()
+        prompts = _patch_crew(agent, lambda ids: json.dumps({"results": [
+            {"id": item_id, "intent": "interested_later", "confidence": 0.7} for item_id in ids
+        ]}))
+        replies = [{"lead_id": None, "text": f"Peut-être au trimestre {i}, relancez-moi."} for i in range(10)]
+        replies.append({"lead_id": None, "text": "Absent du bureau jusqu'à lundi."})
+
+        result = asyncio.run(agent.execute({"replies": replies}))
+
+        data = result["data"]
+        assert len(prompts) == 1
+        assert data["classified_by_llm"] == 10
+        assert data["classified_by_rules"] == 1
+        assert data["results"][0] == {
+            "lead_id": None, "intent": "interested_later", "confidence": 0.7, "source": "llm",
+        }
+        assert data["results"][10]["source"] == "rule:out_of_office"
+
+    def test_unknown_llm_intent_is_unclassified(self):
+        """An intent outside LeadIntent should be retried, then left unclassified."""
+        agent = _agent()
+        prompts = _patch_crew(agent, lambda ids: json.dumps({"results": [
+            {"id": item_id, "intent": "maybe", "confidence": 0.9} for item_id in ids
+        ]}))
+
+        result = asyncio.run(agent.execute({"replies": [
+            {"lead_id": None, "text": "Hmm, pourquoi pas."},
+            {"lead_id": None, "text": "On verra."},
+        ]}))
+
+        # One batch, then one retry per reply
+        assert len(prompts) == 3
+        assert result["data"]["unclassified"] == 2
+        assert result["data"]["results"][0]["intent"] is None
+
+    def test_stores_intent_and_confidence(self):
+        """Classified leads should get intent and confidence with one commit."""
+        lead = Mock(id=uuid4(), intent=None, intent_confidence=None)
+        db = Mock()
+        db.query.return_value.filter.return_value.all.return_value = [lead]
+        agent = _agent(db=db)
+
+        result = asyncio.run(agent.execute({"replies": [
+            {"lead_id": str(lead.id), "text": "I have left the company."},
+            {"lead_id": str(uuid4()), "text": ""},
+        ]}))
+
+        assert result["success"] is True
+        assert lead.intent == LeadIntent.WRONG_PERSON
+        assert lead.intent_confidence == 0.9
+        db.commit.assert_called_once()
+
+    def test_requires_replies(self):
+        """Missing replies should fail."""
+        result = asyncio.run(_agent().execute({}))
+
+        assert result["success"] is False
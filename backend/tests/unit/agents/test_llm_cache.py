@@ -0,0 +1,210 @@
+"""Tests for the LLM response cache."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from crewai.crews.crew_output import CrewOutput
+from crewai.types.usage_metrics import UsageMetrics
+
+from app.agents.bant.agent import BANTAgent
+from app.agents.llm_cache import LLMResponseCache
+
+
+class DictRedis:
+    """Minimal in-memory stand-in for the Redis commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+
+
+def _key(prompt="Score this lead"):
+    return LLMResponseCache.make_key(model="llama3", role="BANT Qualification Expert", prompts=[(prompt, "JSON")])
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache tiers and metrics."""
+
+    def test_key_depends_on_every_input(self):
+        """Model, role and prompts should all be part of the key."""
+        base = _key()
+
+        assert base == _key()
+        assert base != _key("Score another lead")
+        assert base != LLMResponseCache.make_key("gpt-4o", "BANT Qualification Expert", [("Score this lead", "JSON")])
+        assert base != LLMResponseCache.make_key("llama3", "Prospector", [("Score this lead", "JSON")])
+
+    def test_local_hit(self):
+        """A stored response should be served from the LRU."""
+        cache = LLMResponseCache(max_entries=10, ttl=60)
+
+        assert cache.get(_key()) is None
+        cache.set(_key(), '{"score": 80}')
+
+        assert cache.get(_key()) == '{"score": 80}'
+        stats = cache.stats()
+        assert stats["local_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_redis_hit_fills_local_tier(self):
+        """An entry written by another worker should be read from Redis once."""
+        shared = DictRedis()
+        LLMResponseCache(shared, ttl=60).set(_key(), "cached answer")
+        cache = LLMResponseCache(shared, ttl=60)
+
+        assert cache.get(_key()) == "cached answer"
+        assert cache.get(_key()) == "cached answer"
+
+        stats = cache.stats()
+        assert stats["redis_hits"] == 1
+        assert stats["local_hits"] == 1
+
+    def test_lru_eviction(self):
+        """The least recently used entry should be evicted first."""
+        cache = LLMResponseCache(max_entries=2, ttl=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Expired entries should be misses."""
+        cache = LLMResponseCache(max_entries=10, ttl=60)
+
+        with patch("app.agents.llm_cache.time.monotonic", return_value=1000.0):
+            cache.set("a", "1")
+        with patch("app.agents.llm_cache.time.monotonic", return_value=1061.0):
+            assert cache.get("a") is None
+
+    def test_redis_errors_are_misses(self):
+        """A Redis outage should degrade to the local tier."""
+        client = MagicMock()
+        client.get.side_effect = redis.ConnectionError("down")
+        client.setex.side_effect = redis.ConnectionError("down")
+        cache = LLMResponseCache(client, ttl=60)
+
+        assert cache.get("a") is None
+        cache.set("a", "1")
+        assert cache.get("a") == "1"
+
+
+@pytest.fixture
+def cache():
+    """Fresh in-process cache used by agents."""
+    cache = LLMResponseCache(max_entries=10, ttl=60)
+    with patch("app.agents.base.get_llm_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def crew_class():
+    """CrewAI Crew whose kickoff returns a fixed output."""
+    with patch("app.agents.base.Crew") as crew_class:
+        crew_class.return_value.kickoff.return_value = CrewOutput(
+            raw='{"qualified": true}', tasks_output=[], token_usage=UsageMetrics(total_tokens=42)
+        )
+        yield crew_class
+
+
+def _agent(config=None):
+    with patch("app.agents.crew.get_llm", return_value=None), \
+         patch("app.agents.crew.get_memory", return_value=None), \
+         patch("app.agents.base.Agent", return_value=MagicMock()):
+        return BANTAgent(config=config)
+
+
+def _tasks(description="Qualify lead 1"):
+    task = MagicMock()
+    task.description = description
+    task.expected_output = "JSON"
+    return [task]
+
+
+class TestExecuteCrewCaching:
+    """Tests for caching in BaseVectraAgent._execute_crew."""
+
+    def test_identical_requests_hit_cache(self, cache, crew_class):
+        """The second identical request should not reach the LLM."""
+        agent = _agent()
+
+        first = agent._execute_crew(_tasks())
+        second = agent._execute_crew(_tasks())
+
+        assert crew_class.return_value.kickoff.call_count == 1
+        assert second.raw == first.raw == '{"qualified": true}'
+        assert cache.stats()["local_hits"] == 1
+
+    def test_different_prompts_miss(self, cache, crew_class):
+        """Different task prompts should each reach the LLM."""
+        agent = _agent()
+
+        agent._execute_crew(_tasks("Qualify lead 1"))
+        agent._execute_crew(_tasks("Qualify lead 2"))
+
+        assert crew_class.return_value.kickoff.call_count == 2
+
+    def test_agent_opt_out(self, cache, crew_class):
+        """Agents configured with llm_cache=False should bypass the cache."""
+        agent = _agent({"llm_cache": False})
+
+        agent._execute_crew(_tasks())
+        agent._execute_crew(_tasks())
+
+        assert crew_class.return_value.kickoff.call_count == 2
+        assert cache.stats()["sets"] == 0
+
+    def test_class_opt_out(self, cache, crew_class):
+        """Agent classes can disable caching for every instance."""
+        agent = _agent()
+
+        with patch.object(BANTAgent, "llm_cache_enabled", False):
+            agent._execute_crew(_tasks())
+            agent._execute_crew(_tasks())
+
+        assert crew_class.return_value.kickoff.call_count == 2
+
+
+class TestExecuteCrewConcurrency:
+    """Tests for concurrent crews of one agent class."""
+
+    def test_concurrent_crews_overlap(self, cache):
+        """Crews sharing the registry's agent should run at once, each with its own copy."""
+        first = _agent({"llm_cache": False})
+        second = _agent({"llm_cache": False})
+        assert first.crewai_agent is second.crewai_agent
+        first.crewai_agent.copy.side_effect = lambda: MagicMock()
+
+        # Both kickoffs must be in progress together to pass the barrier
+        both_running = threading.Barrier(2, timeout=5)
+        crew_agents = []
+
+        def build_crew(agents, tasks, **kwargs):
+            crew_agents.extend(agents)
+            crew = MagicMock()
+            crew.kickoff.side_effect = lambda: (
+                both_running.wait(),
+                CrewOutput(raw="{}", tasks_output=[], token_usage=UsageMetrics()),
+            )[1]
+            return crew
+
+        with patch("app.agents.base.Crew", side_effect=build_crew), \
+             ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda agent: agent._execute_crew(_tasks()), [first, second]))
+
+        assert [result.raw for result in results] == ["{}", "{}"]
+        assert len(crew_agents) == 2
+        assert crew_agents[0] is not crew_agents[1]
+        assert first.crewai_agent not in crew_agents
@@ -0,0 +1,500 @@
+"""Tests for the LLM gateway."""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.agents.crew import GatewayLLM, get_llm
+from app.agents.llm_gateway import (
+    ClaudeProvider,
+    LLMGateway,
+    LLMGatewayTimeoutError,
+    LLMProviderError,
+    OllamaProvider,
+    TokenBucket,
+    build_providers,
+)
+from app.core.usage import track_usage
+
+MESSAGES = [{"role": "user", "content": "Qualifie ce prospect"}]
+
+
+def _ollama_reply(text="ok", prompt_tokens=10, completion_tokens=5):
+    return httpx.Response(200, json={
+        "message": {"role": "assistant", "content": text},
+        "prompt_eval_count": prompt_tokens,
+        "eval_count": completion_tokens,
+    })
+
+
+@pytest.fixture
+def make_gateway():
+    """Build gateways over a mock transport and close them after the test."""
+    gateways = []
+
+    def make(handler, provider=None, **kwargs):
+        providers = provider if isinstance(provider, list) else [provider]
+        gateway = LLMGateway(
+            [p or OllamaProvider("http://ollama.test", "llama3") for p in providers],
+            transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+        gateways.append(gateway)
+        return gateway
+
+    yield make
+    for gateway in gateways:
+        gateway.close()
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_refills_over_time(self):
+        """Tokens should come back at the per-minute rate."""
+        bucket = TokenBucket(60, now=0.0)
+        bucket.take(60, now=0.0)
+
+        assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+        assert bucket.wait_time(1, now=1.0) == 0.0
+        assert bucket.wait_time(30, now=1.0) == pytest.approx(29.0)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """A request above capacity should not wait forever."""
+        bucket = TokenBucket(60, now=0.0)
+
+        assert bucket.wait_time(500, now=0.0) == 0.0
+        bucket.take(500, now=0.0)
+        assert bucket.wait_time(500, now=0.0) == pytest.approx(500.0)
+
+    def test_adjust_caps_at_capacity(self):
+        """Refunds should never overfill the bucket."""
+        bucket = TokenBucket(60, now=0.0)
+        bucket.take(10, now=0.0)
+        bucket.adjust(100)
+
+        assert bucket.level == 60
+
+
+class TestLLMGateway:
+    """Tests for LLMGateway limits and provider handling."""
+
+    def test_complete_returns_text_and_usage(self, make_gateway):
+        """A completion should return the text and token counts."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return _ollama_reply("bonjour")
+
+        gateway = make_gateway(handler)
+        response = asyncio.run(gateway.complete(MESSAGES, max_tokens=100, temperature=0.2))
+
+        assert response == {
+            "text": "bonjour",
+            "provider": "ollama",
+            "model": "llama3",
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+        }
+        assert requests[0]["options"] == {"num_predict": 100, "temperature": 0.2}
+        assert requests[0]["stream"] is False
+        assert gateway.stats()["ollama"]["tokens"] == 15
+
+    def test_complete_sync_refuses_running_loop(self, make_gateway):
+        """Blocking calls from a coroutine should fail instead of stalling the loop."""
+        gateway = make_gateway(lambda request: _ollama_reply())
+
+        async def call_from_coroutine():
+            return gateway.complete_sync(MESSAGES)
+
+        with pytest.raises(RuntimeError, match="await complete"):
+            asyncio.run(call_from_coroutine())
+
+    def test_concurrency_limit(self, make_gateway):
+        """No more than the provider's concurrency should be in flight."""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return _ollama_reply()
+
+        gateway = make_gateway(handler, OllamaProvider("http://ollama.test", "llama3", concurrency=3))
+
+        async def run():
+            return await asyncio.gather(*(gateway.complete(MESSAGES) for _ in range(12)))
+
+        results = asyncio.run(run())
+
+        assert len(results) == 12
+        assert peak == 3
+        assert gateway.stats()["ollama"]["requests"] == 12
+
+    def test_requests_per_minute_queue_deadline(self, make_gateway):
+        """A request that cannot get budget before its deadline should time out."""
+        gateway = make_gateway(
+            lambda request: _ollama_reply(),
+            OllamaProvider("http://ollama.test", "llama3", requests_per_minute=1),
+        )
+
+        gateway.complete_sync(MESSAGES)
+        start = time.monotonic()
+        with pytest.raises(LLMGatewayTimeoutError):
+            gateway.complete_sync(MESSAGES, timeout=0.2)
+
+        # Fails fast instead of sleeping until the bucket refills
+        assert time.monotonic() - start < 1
+        assert gateway.stats()["ollama"]["timeouts"] == 1
+        assert gateway.stats()["ollama"]["queued"] == 0
+
+    def test_tokens_per_minute_refund(self, make_gateway):
+        """Unused reserved tokens should be given back after the response."""
+        gateway = make_gateway(
+            lambda request: _ollama_reply(prompt_tokens=10, completion_tokens=5),
+            OllamaProvider("http://ollama.test", "llama3", tokens_per_minute=4_500),
+        )
+
+        # Each request reserves ~2k tokens: without refunds the third would wait
+        for _ in range(5):
+            gateway.complete_sync(MESSAGES, max_tokens=2_000, timeout=0.2)
+
+        assert gateway.stats()["ollama"]["requests"] == 5
+
+    def test_rate_limit_pauses_and_retries(self, make_gateway):
+        """A 429 should pause the provider for Retry-After and then retry."""
+        calls = []
+
+        def handler(request):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0.1"})
+            return _ollama_reply("après pause")
+
+        gateway = make_gateway(handler)
+        response = gateway.complete_sync(MESSAGES)
+
+        assert response["text"] == "après pause"
+        assert calls[1] - calls[0] >= 0.09
+        assert gateway.stats()["ollama"]["rate_limited"] == 1
+
+    def test_rate_limit_retries_exhausted(self, make_gateway):
+        """Persistent 429s should raise once the retries are used up."""
+        gateway = make_gateway(
+            lambda request: httpx.Response(429, headers={"Retry-After": "0"}),
+            max_retries=2,
+        )
+
+        with pytest.raises(LLMProviderError) as exc_info:
+            gateway.complete_sync(MESSAGES)
+
+        assert exc_info.value.status_code == 429
+        assert gateway.stats()["ollama"]["rate_limited"] == 3
+
+    def test_provider_error(self, make_gateway):
+        """HTTP errors should raise LLMProviderError with the status."""
+        gateway = make_gateway(lambda request: httpx.Response(500, text="boom"))
+
+        with pytest.raises(LLMProviderError) as exc_info:
+            gateway.complete_sync(MESSAGES)
+
+        assert exc_info.value.status_code == 500
+        assert gateway.stats()["ollama"]["errors"] == 1
+
+    def test_claude_wire_format(self, make_gateway):
+        """Claude requests should move system messages out and read usage."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={
+                "content": [{"type": "text", "text": "Qualifié"}],
+                "usage": {"input_tokens": 30, "output_tokens": 4},
+            })
+
+        provider = ClaudeProvider(
+            "https://api.anthropic.test", "claude-test", headers={"x-api-key": "key"}
+        )
+        gateway = make_gateway(handler, provider)
+        response = gateway.complete_sync(
+            [{"role": "system", "content": "Tu es un expert"}] + MESSAGES,
+            stop=["\nObservation"],
+        )
+
+        body = json.loads(requests[0].content)
+        assert requests[0].url.path == "/v1/messages"
+        assert requests[0].headers["x-api-key"] == "key"
+        assert body["system"] == "Tu es un expert"
+        assert body["messages"] == MESSAGES
+        assert body["stop_sequences"] == ["\nObservation"]
+        assert response["text"] == "Qualifié"
+        assert response["prompt_tokens"] == 30
+
+    def test_unknown_provider(self, make_gateway):
+        """Requests for an unconfigured provider should fail."""
+        gateway = make_gateway(lambda request: _ollama_reply())
+
+        with pytest.raises(LLMProviderError):
+            gateway.complete_sync(MESSAGES, provider="claude")
+
+
+class TestProviderSelection:
+    """Tests for building providers from settings and get_llm."""
+
+    def test_claude_preferred_when_configured(self):
+        """LLM_PROVIDER other than ollama should put Claude first."""
+        with patch("app.agents.llm_gateway.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "claude"
+            mock_settings.OLLAMA_API_KEY = ""
+            mock_settings.OLLAMA_BASE_URL = "http://ollama.test"
+            mock_settings.CLAUDE_API_KEY = "key"
+
+            providers = build_providers()
+
+        assert [provider.name for provider in providers] == ["claude", "ollama"]
+
+    def test_ollama_cloud_uses_bearer_key(self):
+        """An Ollama API key should select the cloud host with a bearer token."""
+        with patch("app.agents.llm_gateway.settings") as mock_settings:
+            mock_settings.LLM_PROVIDER = "ollama"
+            mock_settings.OLLAMA_API_KEY = "secret"
+            mock_settings.OLLAMA_CLOUD_HOST = "https://ollama.com"
+            mock_settings.CLAUDE_API_KEY = ""
+
+            providers = build_providers()
+
+        assert providers[0].base_url == "https://ollama.com"
+        assert providers[0].headers == {"Authorization": "Bearer secret"}
+
+    def test_get_llm_goes_through_gateway(self, make_gateway):
+        """get_llm should return an LLM whose calls use the gateway."""
+        gateway = make_gateway(lambda request: _ollama_reply("réponse", 20, 7))
+
+        with patch("app.agents.crew.get_llm_gateway", return_value=gateway):
+            llm = get_llm()
+            with track_usage() as usage:
+                text = llm.call("Bonjour")
+
+        assert isinstance(llm, GatewayLLM)
+        assert llm.model == "llama3"
+        assert text == "réponse"
+        assert usage["tokens"] == 27
+
+
+def _claude_reply(text="claude"):
+    return httpx.Response(200, json={
+        "content": [{"type": "text", "text": text}],
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    })
+
+
+async def _slow_ollama(request, delay=2.0):
+    await asyncio.sleep(delay)
+    return _ollama_reply("ollama")
+
+
+@pytest.fixture
+def hedging(make_gateway):
+    """Build an Ollama-then-Claude gateway with a short hedge threshold."""
+
+    def build(primary_handler, secondary_handler=lambda request: _claude_reply()):
+        async def handler(request):
+            if request.url.host == "ollama.test":
+                response = primary_handler(request)
+            else:
+                response = secondary_handler(request)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        return make_gateway(handler, [
+            OllamaProvider("http://ollama.test", "llama3"),
+            ClaudeProvider("https://claude.test", "claude-test"),
+        ])
+
+    with patch("app.agents.llm_gateway.settings.LLM_GATEWAY_HEDGE_DELAY", 0.05):
+        yield build
+
+
+class TestHedging:
+    """Tests for hedged requests, latency budget and provider demotion."""
+
+    def test_fast_primary_is_not_hedged(self, hedging):
+        """A primary answering within the threshold should be the only request."""
+        gateway = hedging(lambda request: _ollama_reply("ollama"))
+
+        response = gateway.complete_sync(MESSAGES)
+
+        assert response["provider"] == "ollama"
+        assert gateway.stats()["claude"]["hedged"] == 0
+
+    def test_slow_primary_is_hedged_and_cancelled(self, hedging):
+        """A stalled primary should lose to the secondary and be cancelled."""
+        gateway = hedging(_slow_ollama)
+
+        start = time.monotonic()
+        response = gateway.complete_sync(MESSAGES, model="llama3-custom")
+
+        assert time.monotonic() - start < 1
+        assert response["provider"] == "claude"
+        # The requested model only applies to the requested provider
+        assert response["model"] == "claude-test"
+        stats = gateway.stats()
+        assert stats["claude"]["hedge_wins"] == 1
+        assert stats["ollama"]["in_flight"] == 0
+
+    def test_failing_primary_hedges_immediately(self, hedging):
+        """A primary error should send the request to the secondary at once."""
+        gateway = hedging(lambda request: httpx.Response(503, text="down"))
+
+        response = gateway.complete_sync(MESSAGES)
+
+        assert response["provider"] == "claude"
+        assert gateway.stats()["ollama"]["errors"] == 1
+
+    def test_both_failing_raises_last_error(self, hedging):
+        """When every provider fails, the last error should be raised."""
+        gateway = hedging(
+            lambda request: httpx.Response(503, text="down"),
+            lambda request: httpx.Response(500, text="boom"),
+        )
+
+        with pytest.raises(LLMProviderError) as exc_info:
+            gateway.complete_sync(MESSAGES)
+
+        assert exc_info.value.provider == "claude"
+
+    def test_latency_budget_bounds_the_call(self, hedging):
+        """A call should give up once its budget is spent."""
+
+        async def slow_claude(request):
+            await asyncio.sleep(2)
+            return _claude_reply()
+
+        gateway = hedging(_slow_ollama, slow_claude)
+
+        start = time.monotonic()
+        with pytest.raises(LLMGatewayTimeoutError):
+            gateway.complete_sync(MESSAGES, budget=0.3)
+
+        assert time.monotonic() - start < 1
+
+    def test_single_provider_budget(self, make_gateway):
+        """Without a secondary, the budget should still bound the call."""
+        gateway = make_gateway(_slow_ollama)
+
+        with pytest.raises(LLMGatewayTimeoutError):
+            gateway.complete_sync(MESSAGES, budget=0.2)
+
+    def test_slow_provider_is_demoted(self, hedging):
+        """A provider losing hedges repeatedly should be tried last for a while."""
+        primary_calls = []
+
+        def primary(request):
+            primary_calls.append(request)
+            return _slow_ollama(request)
+
+        gateway = hedging(primary)
+
+        with patch("app.agents.llm_gateway.settings.LLM_GATEWAY_DEMOTE_AFTER", 2):
+            gateway.complete_sync(MESSAGES)
+            gateway.complete_sync(MESSAGES)
+            response = gateway.complete_sync(MESSAGES)
+
+        assert response["provider"] == "claude"
+        assert len(primary_calls) == 2
+        assert gateway.stats()["ollama"]["demotions"] == 1
+
+    def test_hedge_threshold_follows_latency_percentile(self, make_gateway):
+        """The hedge threshold should come from recent primary latencies."""
+        gateway = make_gateway(lambda request: _ollama_reply())
+
+        for _ in range(30):
+            gateway.complete_sync(MESSAGES)
+        state = gateway._states["ollama"]
+
+        assert state.latency_percentile(0.95) is not None
+        assert state.latency_percentile(0.95) >= state.latency_percentile(0.5)
+
+
+def _collect(gateway, **kwargs):
+    """Consume a streamed completion and return its text deltas."""
+    async def run():
+        return [text async for text in gateway.stream(MESSAGES, **kwargs)]
+
+    return asyncio.run(run())
+
+
+class TestStreaming:
+    """Tests for streamed completions."""
+
+    def test_ollama_stream(self, make_gateway):
+        """Ollama NDJSON lines should be yielded as text deltas."""
+        bodies = []
+
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            lines = [
+                {"message": {"content": "Bon"}, "done": False},
+                {"message": {"content": "jour"}, "done": False},
+                {"message": {"content": ""}, "done": True, "prompt_eval_count": 12, "eval_count": 2},
+            ]
+            return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines))
+
+        gateway = make_gateway(handler)
+
+        assert _collect(gateway) == ["Bon", "jour"]
+        assert bodies[0]["stream"] is True
+        assert gateway.stats()["ollama"]["tokens"] == 14
+
+    def test_claude_stream(self, make_gateway):
+        """Claude server-sent events should be yielded as text deltas."""
+        events = [
+            ("message_start", {"type": "message_start", "message": {"usage": {"input_tokens": 20, "output_tokens": 1}}}),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hello"}}),
+            ("ping", {"type": "ping"}),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": " Jane"}}),
+            ("message_delta", {"type": "message_delta", "usage": {"output_tokens": 3}}),
+        ]
+        body = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events)
+        gateway = make_gateway(
+            lambda request: httpx.Response(200, content=body),
+            ClaudeProvider("https://claude.test", "claude-test"),
+        )
+
+        assert _collect(gateway) == ["Hello", " Jane"]
+        assert gateway.stats()["claude"]["tokens"] == 23
+
+    def test_stream_retries_after_429(self, make_gateway):
+        """A rate-limited stream should be retried before any text is sent."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"retry-after": "0"})
+            return httpx.Response(200, content=json.dumps({"message": {"content": "ok"}, "done": True}))
+
+        gateway = make_gateway(handler)
+
+        assert _collect(gateway) == ["ok"]
+        assert gateway.stats()["ollama"]["rate_limited"] == 1
+
+    def test_stream_error(self, make_gateway):
+        """A provider error should be raised to the consumer."""
+        gateway = make_gateway(lambda request: httpx.Response(500, text="boom"))
+
+        with pytest.raises(LLMProviderError):
+            _collect(gateway)
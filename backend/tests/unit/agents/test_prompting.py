@@ -0,0 +1,170 @@
+"""Tests for compact agent prompts."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crewai.crews.crew_output import CrewOutput
+
+from app.agents.bant.agent import BANTAgent
+from app.agents.batching import estimate_tokens
+from app.agents.prompting import PromptBuilder, PromptTemplate, fit, project, truncate
+from app.agents.prospector.agent import ProspectorAgent
+
+_RAW_DATA = {
+    "id": 12345,
+    "current_title": "VP Sales",
+    "job_history": [{"title": f"Role {i}", "company": f"Company {i}"} for i in range(30)],
+    "education": [{"school": f"School {i}", "degree": "MSc"} for i in range(10)],
+    "updated_at": "2026-03-01",
+}
+
+
+def _lead(**overrides):
+    lead = {
+        "job_title": "VP Sales",
+        "company_name": "Acme",
+        "company_size": "51-200",
+        "linkedin_url": "https://linkedin.com/in/jane",
+        "enrichment_data": {
+            "seniority_level": "VP",
+            "location": "Paris",
+            "raw_data": _RAW_DATA,
+        },
+    }
+    lead.update(overrides)
+    return lead
+
+
+class TestProjection:
+    """Tests for field projection and truncation."""
+
+    def test_keeps_only_listed_fields(self):
+        """Nested fields should be flattened and everything else dropped."""
+        projected = project(_lead(), ("job_title", "enrichment_data.location",
+                                      "enrichment_data.raw_data.updated_at", "email"))
+
+        assert projected == {"job_title": "VP Sales", "location": "Paris", "updated_at": "2026-03-01"}
+
+    def test_first_non_empty_value_wins(self):
+        """A top-level value should win over the same key in enrichment data."""
+        lead = _lead(company_industry="", enrichment_data={"company_industry": "SaaS"})
+
+        assert project(lead, ("company_industry", "enrichment_data.company_industry")) == {
+            "company_industry": "SaaS"
+        }
+
+    def test_lists_of_scalars_become_text(self):
+        """Lists of scalars should be joined so they can be truncated."""
+        assert project({"skills": ["CRM", "SaaS"]}, ("skills",)) == {"skills": "CRM, SaaS"}
+
+    def test_truncate(self):
+        """Long text should be cut to the budget with an ellipsis."""
+        text = "mot " * 500
+
+        assert truncate("court", 10) == "court"
+        assert truncate(text, 50).endswith("…")
+        assert len(truncate(text, 50)) <= 200
+
+    def test_fit_shrinks_longest_field(self):
+        """The longest field should be cut until the item fits its budget."""
+        item = {"job_title": "CEO", "notes": "x" * 4000}
+
+        fitted = fit(item, 100)
+
+        assert fitted["job_title"] == "CEO"
+        assert fitted["notes"].endswith("…")
+        assert estimate_tokens(json.dumps(fitted, ensure_ascii=False)) <= 100
+        assert len(item["notes"]) == 4000
+
+
+class TestPromptTemplate:
+    """Tests for compiled prompt templates."""
+
+    def test_renders_like_format(self):
+        """A compiled template should render exactly like str.format."""
+        template = "Produit: {product}\n{{\"id\": \"...\"}}\nLeads:\n{leads}"
+
+        rendered = PromptTemplate(template).render(product="CRM", leads="{}")
+
+        assert rendered == template.format(product="CRM", leads="{}")
+
+    def test_missing_value(self):
+        """A missing value should raise KeyError."""
+        with pytest.raises(KeyError):
+            PromptTemplate("{a} {b}").render(a=1)
+
+    def test_rejects_format_specs(self):
+        """Placeholders other than plain names should be rejected at compile time."""
+        with pytest.raises(ValueError):
+            PromptTemplate("{score:.2f}")
+
+
+def _agent(agent_class):
+    with patch("app.agents.crew.get_llm", return_value=None), \
+         patch("app.agents.crew.get_memory", return_value=None), \
+         patch("app.agents.base.Agent", return_value=MagicMock()):
+        return agent_class()
+
+
+def _capture_prompts(agent):
+    prompts = []
+
+    def execute_crew(tasks):
+        prompts.append(tasks[0])
+        return CrewOutput(raw="{}", tasks_output=[])
+
+    agent._create_task = lambda description, expected_output="": description
+    agent._execute_crew = execute_crew
+    agent._context_window = lambda: 100_000
+    return prompts
+
+
+class TestAgentPrompts:
+    """Tests for the size of the agents' batch prompts."""
+
+    def test_bant_prompt_leaves_out_raw_data(self):
+        """The BANT prompt should hold the needed fields, not the RocketReach dump."""
+        agent = _agent(BANTAgent)
+        prompts = _capture_prompts(agent)
+
+        asyncio.run(agent.analyze_leads({"a": _lead()}, {"bant_threshold": 60}))
+
+        prompt = prompts[0]
+        assert "VP Sales" in prompt and "Paris" in prompt and "2026-03-01" in prompt
+        assert "job_history" not in prompt and "School 1" not in prompt
+
+    def test_long_product_description_is_truncated(self):
+        """Context values should be cut to the prompt's context budget."""
+        agent = _agent(BANTAgent)
+        prompts = _capture_prompts(agent)
+        description = "Notre produit fait beaucoup de choses. " * 500
+
+        asyncio.run(agent.analyze_leads({"a": _lead()}, {"product_description": description}))
+
+        assert description not in prompts[0]
+        assert estimate_tokens(prompts[0]) < estimate_tokens(description)
+
+    def test_prospector_prompt_leaves_out_raw_data(self):
+        """Prospector profiles should be projected before batching."""
+        agent = _agent(ProspectorAgent)
+        prompts = _capture_prompts(agent)
+        prospects = [
+            {"name": f"Prospect {i}", "job_title": "VP Sales", "email": f"p{i}@acme.io", "raw_data": _RAW_DATA}
+            for i in range(3)
+        ]
+
+        asyncio.run(agent.analyze_prospects(prospects, {"job_titles": ["VP Sales"]}))
+
+        assert "Prospect 2" in prompts[0]
+        assert "job_history" not in prompts[0] and "p0@acme.io" not in prompts[0]
+
+    def test_builder_serializes_items_within_budget(self):
+        """Every compact item should fit the builder's per-item budget."""
+        builder = PromptBuilder("{items}", "test", item_fields=("job_title", "notes"), item_token_budget=60)
+
+        item = builder.item({"job_title": "CEO", "notes": "x" * 2000, "raw_data": _RAW_DATA})
+
+        assert set(item) == {"job_title", "notes"}
+        assert estimate_tokens(json.dumps(item, ensure_ascii=False)) <= 60
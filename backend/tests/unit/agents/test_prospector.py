@@ -33,13 +33,17 @@ def mock_rocketreach_service():
             "company_size": "51-200",
         }
     ])
+    service.enrich_prospect = AsyncMock(return_value={})
     return service
 
 
 @pytest.fixture
 def mock_db():
     """Mock database session."""
-    return Mock()
+    db = Mock()
+    # No existing leads for the duplicate check
+    db.query.return_value.filter.return_value.all.return_value = []
+    return db
 
 
 @pytest.mark.asyncio
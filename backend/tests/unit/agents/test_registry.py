@@ -0,0 +1,111 @@
+"""Tests for the process-wide agent registry."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.bant.agent import BANTAgent
+from app.agents.scheduler.agent import SchedulerAgent
+from app.agents.registry import AgentRegistry, get_agent_registry
+
+
+@pytest.fixture
+def mock_crewai():
+    """Patch LLM/memory resolution and the CrewAI Agent class."""
+    with patch('app.agents.crew.get_llm', return_value=None) as get_llm, \
+         patch('app.agents.crew.get_memory', return_value=None) as get_memory, \
+         patch('app.agents.base.Agent', side_effect=lambda **kwargs: MagicMock()) as agent_class:
+        yield {"get_llm": get_llm, "get_memory": get_memory, "Agent": agent_class}
+
+
+class TestAgentRegistry:
+    """Tests for AgentRegistry."""
+
+    def test_builds_each_agent_type_once(self, mock_crewai):
+        """Instances of the same class should share one CrewAI agent."""
+        first = BANTAgent()
+        second = BANTAgent()
+
+        assert first.crewai_agent is second.crewai_agent
+        assert first.tools is second.tools
+        assert mock_crewai["Agent"].call_count == 1
+
+    def test_builds_per_agent_type_and_config(self, mock_crewai):
+        """Different classes or configs should get their own CrewAI agent."""
+        bant = BANTAgent()
+        scheduler = SchedulerAgent()
+        quiet = BANTAgent(config={"verbose": False})
+
+        assert bant.crewai_agent is not scheduler.crewai_agent
+        assert bant.crewai_agent is not quiet.crewai_agent
+        assert mock_crewai["Agent"].call_count == 3
+
+    def test_resolves_defaults_once(self, mock_crewai):
+        """LLM and memory should be resolved once for every agent built."""
+        BANTAgent()
+        SchedulerAgent()
+        BANTAgent(config={"max_iter": 5})
+
+        assert mock_crewai["get_llm"].call_count == 1
+        assert mock_crewai["get_memory"].call_count == 1
+
+    def test_gets_tools_once_per_build(self, mock_crewai):
+        """Tools should be collected once per built agent."""
+        with patch.object(BANTAgent, '_get_tools', return_value=[]) as get_tools:
+            BANTAgent()
+            BANTAgent()
+
+        assert get_tools.call_count == 1
+
+    def test_stats(self, mock_crewai, agent_registry):
+        """Stats should report builds, hits and build time per agent class."""
+        BANTAgent()
+        BANTAgent()
+        SchedulerAgent()
+
+        stats = agent_registry.stats()
+
+        assert stats["agents"]["BANTAgent"]["builds"] == 1
+        assert stats["agents"]["BANTAgent"]["hits"] == 1
+        assert stats["agents"]["SchedulerAgent"]["builds"] == 1
+        assert stats["agents"]["BANTAgent"]["build_ms"] >= 0
+        assert stats["defaults_ms"] >= 0
+
+    def test_reset(self, mock_crewai, agent_registry):
+        """Reset should drop cached agents and stats."""
+        first = BANTAgent()
+        agent_registry.reset()
+        second = BANTAgent()
+
+        assert first.crewai_agent is not second.crewai_agent
+        assert agent_registry.stats()["agents"]["BANTAgent"]["builds"] == 1
+
+    def test_unhashable_config_values(self, mock_crewai):
+        """Configs holding unhashable values should still be cached."""
+        registry = AgentRegistry()
+        llm = {"model": "test"}
+        agent = MagicMock(spec=BANTAgent)
+
+        first = registry.get(agent, {"llm": llm})
+        second = registry.get(agent, {"llm": llm})
+
+        assert first is second
+
+    def test_equal_configs_share_agent(self, mock_crewai):
+        """Configs are keyed by value, not by the identity of their objects."""
+        registry = AgentRegistry()
+        agent = MagicMock(spec=BANTAgent)
+
+        first = registry.get(agent, {"llm": {"model": "test"}})
+        second = registry.get(agent, {"llm": {"model": "test"}})
+        other = registry.get(agent, {"llm": {"model": "other"}})
+
+        assert first is second
+        assert other is not first
+
+    def test_new_registry_after_fork(self):
+        """A different process should get its own registry."""
+        registry = get_agent_registry()
+
+        with patch('app.agents.registry.os.getpid', return_value=-1):
+            assert get_agent_registry() is not registry
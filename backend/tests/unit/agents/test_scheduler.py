@@ -1,5 +1,7 @@
 """Tests for Scheduler agent."""
 
+import threading
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from uuid import uuid4
@@ -93,6 +95,29 @@ async def test_scheduler_agent_execute_with_send(mock_base_config, mock_db, samp
         assert "body" in result["data"]
 
 
+@pytest.mark.asyncio
+async def test_scheduler_agent_sends_off_the_event_loop(mock_base_config, mock_db, sample_lead_data, sample_campaign_data):
+    """The blocking email sender should run in a worker thread."""
+    sender_threads = []
+    
+    def email_sender(**kwargs):
+        sender_threads.append(threading.get_ident())
+        return {"id": "test_email_id"}
+    
+    with patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = SchedulerAgent(db=mock_db, config={"llm": None, "memory": None}, email_sender=email_sender)
+    
+    result = await agent.execute({
+        "lead_data": sample_lead_data,
+        "campaign": sample_campaign_data,
+        "send_email": True,
+    })
+    
+    assert result["success"] is True
+    assert result["data"]["sent"] is True
+    assert sender_threads and sender_threads[0] != threading.get_ident()
+
+
 @pytest.mark.asyncio
 async def test_scheduler_agent_missing_lead_data(mock_base_config, mock_db):
     """Test scheduler agent with missing lead_data."""
@@ -0,0 +1,231 @@
+"""Tests for agent run telemetry."""
+
+import asyncio
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.agents.base import BaseVectraAgent
+from app.agents.telemetry import AgentRunRecorder
+from app.core.usage import record_api_call, record_tokens, track_usage
+from app.db.models.agent_run import AgentRunStatus, AgentType
+
+
+class EchoAgent(BaseVectraAgent):
+    """Minimal agent reporting usage from its task."""
+
+    agent_type = AgentType.BANT_QUALIFIER
+
+    def _get_role(self) -> str:
+        return "Echo"
+
+    def _get_goal(self) -> str:
+        return "Echo"
+
+    def _get_backstory(self) -> str:
+        return "Echo"
+
+    async def _execute(self, input_data):
+        if input_data.get("raise"):
+            raise RuntimeError("boom")
+        record_tokens(input_data.get("tokens", 0))
+        for _ in range(input_data.get("calls", 0)):
+            record_api_call("rocketreach")
+        await asyncio.sleep(0)
+        return {"success": not input_data.get("fail"), "error": "bad lead", "data": {"echo": True}}
+
+
+@pytest.fixture
+def agent():
+    """Echo agent with a mock run recorder."""
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = EchoAgent()
+    agent.run_recorder = Mock(spec=AgentRunRecorder)
+    return agent
+
+
+class TestExecuteTelemetry:
+    """Tests for BaseVectraAgent.execute instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_records_successful_run(self, agent):
+        """A run should be recorded with timing, tokens and API calls."""
+        campaign_id = uuid4()
+
+        result = await agent.execute({"campaign": {"id": str(campaign_id)}, "tokens": 120, "calls": 2})
+
+        assert result["success"] is True
+        record = agent.run_recorder.record.call_args.kwargs
+        assert record["agent_type"] == AgentType.BANT_QUALIFIER
+        assert record["campaign_id"] == campaign_id
+        assert record["success"] is True
+        assert record["tokens_used"] == 120
+        assert record["api_calls"] == 2
+        assert record["duration_ms"] >= 0
+        assert record["completed_at"] >= record["started_at"]
+        assert record["output_data"] == {"echo": True}
+
+    @pytest.mark.asyncio
+    async def test_records_failed_result(self, agent):
+        """An unsuccessful result should be recorded with its error."""
+        await agent.execute({"campaign_id": str(uuid4()), "fail": True})
+
+        record = agent.run_recorder.record.call_args.kwargs
+        assert record["success"] is False
+        assert record["error_message"] == "bad lead"
+
+    @pytest.mark.asyncio
+    async def test_records_and_reraises_exception(self, agent):
+        """An exception should be recorded, then propagate."""
+        with pytest.raises(RuntimeError):
+            await agent.execute({"campaign_id": str(uuid4()), "raise": True})
+
+        record = agent.run_recorder.record.call_args.kwargs
+        assert record["success"] is False
+        assert record["error_message"] == "boom"
+        assert record["output_data"] is None
+
+    @pytest.mark.asyncio
+    async def test_skips_recording_without_campaign(self, agent):
+        """Runs outside a campaign are only logged."""
+        await agent.execute({"tokens": 10})
+
+        agent.run_recorder.record.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_keep_usage_apart(self, agent):
+        """Usage of concurrent runs on one loop should not mix."""
+        campaign_id = str(uuid4())
+
+        await asyncio.gather(
+            agent.execute({"campaign_id": campaign_id, "tokens": 5, "calls": 1}),
+            agent.execute({"campaign_id": campaign_id, "tokens": 7, "calls": 3}),
+        )
+
+        usage = sorted(
+            (call.kwargs["tokens_used"], call.kwargs["api_calls"])
+            for call in agent.run_recorder.record.call_args_list
+        )
+        assert usage == [(5, 1), (7, 3)]
+
+
+    @pytest.mark.asyncio
+    async def test_records_input_summary(self, agent):
+        """The recorded input should leave out raw payloads and list records by count."""
+        campaign_id = str(uuid4())
+
+        await agent.execute({
+            "campaign": {"id": campaign_id, "bant_threshold": 60, "product_description": "x" * 2000},
+            "lead_data": {"job_title": "VP Sales", "enrichment_data": {"raw_data": {"bio": "..."}}},
+            "job_titles": ["VP Sales", "CTO"],
+            "prospects": [{"email": "a@example.com"}, {"email": "b@example.com"}],
+        })
+
+        summary = agent.run_recorder.record.call_args.kwargs["input_data"]
+        assert summary["campaign"]["id"] == campaign_id
+        assert summary["campaign"]["bant_threshold"] == 60
+        assert len(summary["campaign"]["product_description"]) < 300
+        assert summary["lead_data"] == {"job_title": "VP Sales"}
+        assert summary["job_titles"] == ["VP Sales", "CTO"]
+        assert summary["prospects_count"] == 2
+        assert "prospects" not in summary
+
+
+def test_bant_input_summary_keeps_prompt_fields():
+    """BANT runs should record the lead fields its prompt reads."""
+    from app.agents.bant.agent import BANTAgent
+
+    with patch('app.agents.crew.get_llm', return_value=None), \
+         patch('app.agents.crew.get_memory', return_value=None), \
+         patch('app.agents.base.Agent', return_value=MagicMock()):
+        agent = BANTAgent()
+
+    summary = agent._summarize_input({
+        "lead_id": "lead-1",
+        "lead_data": {
+            "job_title": "VP Sales",
+            "company_size": "51-200",
+            "enrichment_data": {
+                "location": "Paris",
+                "raw_data": {"updated_at": "2024-01-01", "employment_history": ["..."] * 50},
+            },
+        },
+        "campaign": {"id": "campaign-1", "bant_threshold": 60},
+    })
+
+    assert summary["lead_id"] == "lead-1"
+    assert summary["lead_data"] == {
+        "job_title": "VP Sales",
+        "company_size": "51-200",
+        "location": "Paris",
+        "updated_at": "2024-01-01",
+    }
+    assert summary["campaign"] == {"id": "campaign-1", "bant_threshold": 60}
+
+
+def test_usage_outside_tracking_is_ignored():
+    """Usage reported outside an agent run should be dropped."""
+    record_tokens(10)
+    record_api_call("resend")
+
+    with track_usage() as usage:
+        record_api_call("resend")
+
+    assert usage == {"tokens": 0, "api_calls": {"resend": 1}}
+
+
+class TestAgentRunRecorder:
+    """Tests for AgentRunRecorder buffering."""
+
+    def _record(self, recorder):
+        recorder.record(
+            agent_type=AgentType.SCHEDULER,
+            campaign_id=uuid4(),
+            started_at=None,
+            completed_at=None,
+            duration_ms=5,
+            success=True,
+            input_data={"lead_id": uuid4()},
+        )
+
+    def test_buffers_until_batch_size(self):
+        """Rows should be inserted in one statement once the buffer is full."""
+        db = MagicMock()
+        recorder = AgentRunRecorder(db, batch_size=3)
+
+        self._record(recorder)
+        self._record(recorder)
+        db.execute.assert_not_called()
+        assert recorder.pending == 2
+
+        self._record(recorder)
+
+        db.execute.assert_called_once()
+        rows = db.execute.call_args.args[1]
+        assert len(rows) == 3
+        assert rows[0]["status"] == AgentRunStatus.COMPLETED
+        assert isinstance(rows[0]["input_data"]["lead_id"], str)
+        assert recorder.pending == 0
+        db.commit.assert_not_called()
+
+    def test_flush_empty(self):
+        """Flushing an empty buffer should not touch the database."""
+        db = MagicMock()
+
+        assert AgentRunRecorder(db).flush() == 0
+        db.execute.assert_not_called()
+
+    def test_flush_failure_drops_rows(self):
+        """A failed insert should only drop the telemetry."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        db = MagicMock()
+        db.execute.side_effect = SQLAlchemyError("insert failed")
+        recorder = AgentRunRecorder(db, batch_size=10)
+        self._record(recorder)
+
+        assert recorder.flush() == 0
+        assert recorder.pending == 0
@@ -0,0 +1,128 @@
+"""Tests for the campaign execution pipeline."""
+
+import asyncio
+
+import pytest
+
+from app.orchestrator.pipeline import Pipeline, PipelineStage
+
+
+@pytest.mark.asyncio
+async def test_pipeline_moves_items_through_stages():
+    """Items should flow through every stage and be counted per stage."""
+    seen = []
+
+    async def source(emit):
+        for i in range(10):
+            await emit(i)
+        return {"emitted": 10}
+
+    async def double(item):
+        return item * 2
+
+    async def keep_even_tens(item):
+        seen.append(item)
+        return item if item % 4 == 0 else None
+
+    pipeline = Pipeline(
+        source=source,
+        stages=[
+            PipelineStage("double", double, concurrency=3),
+            PipelineStage("filter", keep_even_tens, concurrency=2),
+        ],
+        queue_size=2,
+    )
+    report = await pipeline.run()
+
+    assert report["source"] == {"emitted": 10}
+    assert sorted(seen) == [i * 2 for i in range(10)]
+    assert report["outputs"] == 5
+    assert report["stages"]["double"]["processed"] == 10
+    assert report["stages"]["filter"]["forwarded"] == 5
+    assert report["stages"]["double"]["max_queue_depth"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_first_output_before_source_finishes():
+    """The last stage should produce output while the source is still emitting."""
+    source_done_at = None
+    loop = asyncio.get_running_loop()
+
+    async def source(emit):
+        nonlocal source_done_at
+        for i in range(5):
+            await emit(i)
+            await asyncio.sleep(0.02)
+        source_done_at = loop.time()
+
+    async def passthrough(item):
+        return item
+
+    pipeline = Pipeline(source=source, stages=[PipelineStage("out", passthrough)])
+    report = await pipeline.run()
+
+    assert report["outputs"] == 5
+    assert report["time_to_first_output_s"] is not None
+    assert report["time_to_first_output_s"] < report["elapsed_s"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stage_errors_are_counted():
+    """A failing handler should not stop the pipeline."""
+
+    async def source(emit):
+        for i in range(4):
+            await emit(i)
+
+    async def flaky(item):
+        if item == 2:
+            raise RuntimeError("boom")
+        return item
+
+    pipeline = Pipeline(source=source, stages=[PipelineStage("flaky", flaky, concurrency=2)])
+    report = await pipeline.run()
+
+    assert report["outputs"] == 3
+    assert report["stages"]["flaky"]["failed"] == 1
+
+
+def test_pipeline_stage_requires_positive_concurrency():
+    """Stages must have at least one worker."""
+
+    async def handler(item):
+        return item
+
+    with pytest.raises(ValueError):
+        PipelineStage("bad", handler, concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batched_stage_takes_queued_items():
+    """A batched stage should get the items already queued, up to its batch size."""
+    batches = []
+
+    async def source(emit):
+        for i in range(7):
+            await emit(i)
+
+    async def collect(items):
+        batches.append(list(items))
+        return [item for item in items if item % 2 == 0]
+
+    pipeline = Pipeline(source=source, stages=[PipelineStage("batch", collect, batch_size=3)])
+    report = await pipeline.run()
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert report["outputs"] == 4
+    assert report["stages"]["batch"]["processed"] == 7
+    assert report["stages"]["batch"]["forwarded"] == 4
+
+
+def test_pipeline_stage_requires_positive_batch_size():
+    """Batched stages must take at least one item."""
+
+    async def handler(items):
+        return items
+
+    with pytest.raises(ValueError):
+        PipelineStage("bad", handler, batch_size=0)
@@ -0,0 +1,67 @@
+"""Tests for the long-lived agent runtime."""
+
+import asyncio
+
+from app.orchestrator.runtime import AgentRuntime, get_runtime, shutdown_runtime
+
+
+def test_runtime_reuses_one_event_loop():
+    """Successive runs should execute on the same event loop."""
+    runtime = AgentRuntime()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    try:
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+        assert first is second
+        assert not first.is_closed()
+    finally:
+        runtime.close()
+
+
+def test_runtime_map_bounds_concurrency():
+    """map should never run more coroutines than the concurrency limit."""
+    runtime = AgentRuntime()
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item * 10
+
+    try:
+        results = runtime.map(work, range(20), concurrency=4)
+    finally:
+        runtime.close()
+
+    assert results == [i * 10 for i in range(20)]
+    assert peak == 4
+
+
+def test_runtime_shares_http_client_across_runs():
+    """The HTTP client should survive between runs."""
+    runtime = AgentRuntime()
+    try:
+        client = runtime.http_client
+        runtime.run(asyncio.sleep(0))
+        assert runtime.http_client is client
+    finally:
+        runtime.close()
+
+    assert client.is_closed
+
+
+def test_get_runtime_is_process_wide():
+    """get_runtime should return the same runtime until shut down."""
+    runtime = get_runtime()
+    assert get_runtime() is runtime
+
+    shutdown_runtime()
+    assert get_runtime() is not runtime
+    shutdown_runtime()
@@ -1,8 +1,14 @@
 """Unit tests for CampaignService."""
 
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
 import pytest
 from uuid import uuid4
 from datetime import datetime, timezone
+from unittest.mock import patch
 from app.services.campaign import CampaignService
 from app.core.exceptions import BadRequestError, NotFoundError
 from app.db.models.campaign import Campaign, CampaignStatus
@@ -119,6 +125,19 @@ class TestCreateCampaign:
         assert campaign.bant_threshold == 70
         assert campaign.daily_limit == 100
 
+    def test_create_campaign_with_scoring_rules(self, db_session, test_user, test_organization):
+        """Should store scoring rules that compile, and reject the others."""
+        service = CampaignService(db_session)
+        rules = {"weights": {"authority": 1.5, "budget": 0.5}, "nurture_threshold": 30}
+        campaign = service.create_campaign(user=test_user, name="Tuned", scoring_rules=rules)
+
+        assert campaign.scoring_rules == rules
+
+        with pytest.raises(BadRequestError) as exc_info:
+            service.create_campaign(user=test_user, name="Broken", scoring_rules={"budjet": {}})
+
+        assert "budjet" in str(exc_info.value.detail)
+
 
 class TestUpdateCampaign:
     """Tests for CampaignService.update_campaign method."""
@@ -146,6 +165,57 @@ class TestUpdateCampaign:
         assert updated.name == "Updated Name"
         assert updated.bant_threshold == 75
 
+    def test_update_campaign_scoring_rules(self, db_session, test_user, test_organization):
+        """Should replace the scoring rules, and reset them to the defaults with {}."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Draft",
+            status=CampaignStatus.DRAFT,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        service = CampaignService(db_session)
+        rules = {"need": {"signals": {"industry": 10}}}
+        assert service.update_campaign(test_user, campaign.id, scoring_rules=rules).scoring_rules == rules
+
+        with pytest.raises(BadRequestError):
+            service.update_campaign(test_user, campaign.id, scoring_rules={"weights": {"need": 5}})
+        db_session.rollback()
+
+        assert service.update_campaign(test_user, campaign.id, scoring_rules={}).scoring_rules is None
+
+    def test_update_campaign_dispatches_backfill(self, db_session, test_user, test_organization, rescore_dispatch):
+        """A changed threshold should re-qualify the leads, changed rules only re-score them."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Draft",
+            status=CampaignStatus.DRAFT,
+            target_criteria={},
+            bant_threshold=60,
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        service = CampaignService(db_session)
+        service.update_campaign(test_user, campaign.id, name="Renamed", bant_threshold=60)
+        rescore_dispatch.assert_not_called()
+
+        service.update_campaign(test_user, campaign.id, bant_threshold=70)
+        rescore_dispatch.assert_called_once_with(campaign.id, requalify=True)
+
+        rescore_dispatch.reset_mock()
+        rules = {"need": {"signals": {"industry": 10}}}
+        service.update_campaign(test_user, campaign.id, scoring_rules=rules)
+        rescore_dispatch.assert_called_once_with(campaign.id, requalify=False)
+
+        rescore_dispatch.reset_mock()
+        service.update_campaign(test_user, campaign.id, scoring_rules=rules)
+        rescore_dispatch.assert_not_called()
+
     def test_update_campaign_non_draft_raises(self, db_session, test_user, test_organization):
         """Should raise BadRequestError for non-draft campaigns."""
         campaign = Campaign(
@@ -191,6 +261,58 @@ class TestLaunchCampaign:
         assert launched.status == CampaignStatus.ACTIVE
         assert launched.started_at is not None
 
+    def test_launch_campaign_dispatches_run(self, db_session, test_user, test_organization, campaign_dispatch):
+        """Should enqueue a distributed run of the launched campaign."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Campaign to Dispatch",
+            status=CampaignStatus.DRAFT,
+            target_criteria={"job_titles": ["VP Sales"]},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        service = CampaignService(db_session)
+        service.launch_campaign(user=test_user, campaign_id=campaign.id)
+
+        campaign_dispatch.assert_called_once_with(campaign.id)
+
+    def test_launch_campaign_does_not_load_agents(self):
+        """Launching should enqueue the run by name without importing CrewAI or the campaign runner."""
+        script = textwrap.dedent("""
+            import sys
+            from unittest.mock import MagicMock, patch
+            from uuid import uuid4
+
+            from app.db.models.campaign import Campaign, CampaignStatus
+            from app.services.campaign import CampaignService
+            from app.tasks.celery_app import celery_app
+
+            campaign = Campaign(id=uuid4(), status=CampaignStatus.DRAFT, target_criteria={"job_titles": ["VP Sales"]})
+            db = MagicMock()
+            db.query.return_value.filter.return_value.first.return_value = campaign
+
+            with patch.object(celery_app, "send_task") as send_task:
+                CampaignService(db).launch_campaign(MagicMock(organization_id=uuid4()), campaign.id)
+
+            send_task.assert_called_once_with("campaign.run", args=[str(campaign.id)])
+            loaded = [
+                name for name in sys.modules
+                if name.split(".")[0] == "crewai" or name == "app.orchestrator.campaign_runner"
+            ]
+            assert not loaded, loaded
+        """)
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[3],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
     def test_launch_campaign_non_draft_raises(self, db_session, test_user, test_organization):
         """Should raise BadRequestError for non-draft campaigns."""
         campaign = Campaign(
@@ -271,6 +393,42 @@ class TestResumeCampaign:
 
         assert resumed.status == CampaignStatus.ACTIVE
 
+    @pytest.mark.parametrize("checkpoint, has_leads, dispatched", [
+        ({"status": "failed", "phase": "qualification"}, True, True),
+        ({"status": "running", "phase": "prospecting"}, False, True),
+        ({"status": "completed", "phase": "scheduling"}, True, False),
+        ({}, False, True),
+    ])
+    def test_resume_campaign_dispatches_only_unfinished_runs(
+        self, db_session, test_user, test_organization, campaign_dispatch, checkpoint, has_leads, dispatched
+    ):
+        """Should dispatch a run only for an interrupted run or a campaign that never ran."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Paused Campaign",
+            status=CampaignStatus.PAUSED,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+        if has_leads:
+            db_session.add(Lead(
+                campaign_id=campaign.id,
+                organization_id=test_organization.id,
+                email="qualified@example.com",
+                status=LeadStatus.QUALIFIED,
+            ))
+            db_session.commit()
+
+        service = CampaignService(db_session)
+        with patch("app.services.campaign.CampaignCheckpoint.for_campaign") as for_campaign:
+            for_campaign.return_value.load.return_value = checkpoint
+            resumed = service.resume_campaign(user=test_user, campaign_id=campaign.id)
+
+        assert resumed.status == CampaignStatus.ACTIVE
+        assert campaign_dispatch.called is dispatched
+
 
 class TestDeleteCampaign:
     """Tests for CampaignService.delete_campaign method."""
@@ -337,3 +495,4 @@ class TestGetCampaignStats:
         assert stats["leads"]["rejected"] == 1
         assert stats["bant"]["average_score"] == 57.5
         assert stats["bant"]["threshold"] == 60
+        assert stats["leads_by_size"] == {"unknown": 2}
@@ -0,0 +1,44 @@
+"""Tests for the lead features parsed at ingest."""
+
+import pytest
+
+from app.services.lead_features import lead_features, parse_company_size, size_bucket
+
+
+@pytest.mark.parametrize("company_size, expected", [
+    (None, (None, None)),
+    ("", (None, None)),
+    ("Unknown", (None, None)),
+    ("51-200", (51, 200)),
+    ("10000+", (10000, 10000)),
+    ("99999999999", (2**31 - 1, 2**31 - 1)),
+])
+def test_parse_company_size(company_size, expected):
+    """Should read the headcount range from the numbers in the text."""
+    assert parse_company_size(company_size) == expected
+
+
+@pytest.mark.parametrize("employees_max, expected", [
+    (None, None), (0, "<10"), (9, "<10"), (10, "10-29"), (99, "30-99"), (499, "100-499"), (500, "500+"),
+])
+def test_size_bucket_follows_budget_tiers(employees_max, expected):
+    """Bucket bounds should be the BANT budget tier bounds."""
+    assert size_bucket(employees_max) == expected
+
+
+def test_lead_features():
+    """Should compute every stored feature of a lead."""
+    assert lead_features("201-500", "Directeur Général", "https://linkedin.com/in/x") == {
+        "employees_min": 201,
+        "employees_max": 500,
+        "size_bucket": "500+",
+        "seniority_tier": "vp",
+        "has_linkedin": True,
+    }
+    assert lead_features() == {
+        "employees_min": None,
+        "employees_max": None,
+        "size_bucket": None,
+        "seniority_tier": None,
+        "has_linkedin": False,
+    }
@@ -211,6 +211,43 @@ class TestListLeads:
         assert len(leads) == 1
         assert leads[0].company_name == "Acme Corp"
 
+    def test_list_leads_with_size_and_seniority_filters(self, db_session, test_user, test_organization):
+        """Should filter on the size bucket and seniority tier stored at ingest."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Test Campaign",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        for email, size_bucket, seniority_tier in [
+            ("ceo@example.com", "100-499", "c_level"),
+            ("vp@example.com", "100-499", "vp"),
+            ("dev@example.com", "<10", "individual"),
+        ]:
+            db_session.add(Lead(
+                campaign_id=campaign.id,
+                organization_id=test_organization.id,
+                email=email,
+                size_bucket=size_bucket,
+                seniority_tier=seniority_tier,
+                enrichment_data={},
+            ))
+        db_session.commit()
+
+        service = LeadService(db_session)
+        leads, total = service.list_leads(user=test_user, size_bucket="100-499")
+        assert total == 2
+
+        leads, total = service.list_leads(user=test_user, size_bucket="100-499", seniority_tier="VP")
+        assert [lead.email for lead in leads] == ["vp@example.com"]
+
+        with pytest.raises(BadRequestError):
+            service.list_leads(user=test_user, size_bucket="51-200")
+
     def test_list_leads_without_organization_raises(self, db_session):
         """Should raise BadRequestError if user has no organization."""
         from app.db.models.user import User, UserRole
@@ -395,6 +432,34 @@ class TestUpdateLead:
         assert result.last_name == "Name"
         assert result.status == LeadStatus.QUALIFIED
 
+    def test_update_lead_job_title_updates_seniority(self, db_session, test_user, test_organization):
+        """Changing the job title should recompute the stored seniority tier."""
+        campaign = Campaign(
+            organization_id=test_organization.id,
+            created_by=test_user.id,
+            name="Test Campaign",
+            status=CampaignStatus.ACTIVE,
+            target_criteria={},
+        )
+        db_session.add(campaign)
+        db_session.commit()
+
+        lead = Lead(
+            campaign_id=campaign.id,
+            organization_id=test_organization.id,
+            email="lead@example.com",
+            job_title="Engineer",
+            seniority_tier="individual",
+            enrichment_data={},
+        )
+        db_session.add(lead)
+        db_session.commit()
+
+        service = LeadService(db_session)
+        result = service.update_lead(user=test_user, lead_id=lead.id, job_title="Head of Sales")
+
+        assert result.seniority_tier == "vp"
+
     def test_update_lead_with_notes(self, db_session, test_user, test_organization):
         """Should store notes in enrichment_data."""
         campaign = Campaign(
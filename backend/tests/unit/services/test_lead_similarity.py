@@ -0,0 +1,180 @@
+"""Tests for fuzzy lead deduplication."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import BACKEND_DIR, Settings, settings
+from app.db.models.campaign import Campaign, CampaignStatus
+from app.db.models.lead import Lead, LeadStatus
+from app.services.enrichment import EnrichmentService
+from app.services.lead_similarity import (
+    LeadSimilarityIndex,
+    LeadSimilarityService,
+    lead_features,
+    linkedin_key,
+)
+
+
+def _score(a, b):
+    return float(lead_features(*a)[0] @ lead_features(*b)[0])
+
+
+class TestLeadFeatures:
+    """Tests for lead similarity vectors."""
+
+    @pytest.mark.parametrize("other", [
+        ("Jean", "Dupont", "ACME"),
+        ("jean", "DUPONT", "Acme SAS"),
+        ("Jean", "Dupond", "Acme"),
+        ("Jéan", "Dupont", "Acme Software"),
+    ])
+    def test_near_duplicates(self, other):
+        """Case, accents, legal forms and small typos should still match."""
+        assert _score(("Jean", "Dupont", "Acme SAS"), other) >= settings.LEAD_DEDUP_THRESHOLD
+
+    @pytest.mark.parametrize("other", [
+        ("Jean", "Dupont", "Globex"),
+        ("Marie", "Dupont", "Acme"),
+        ("Jean", "Martin", "Acme"),
+    ])
+    def test_different_people(self, other):
+        """Homonyms at other companies and colleagues should not match."""
+        assert _score(("Jean", "Dupont", "Acme SAS"), other) < settings.LEAD_DEDUP_THRESHOLD
+
+    def test_linkedin_key_ignores_url_variants(self):
+        """The same profile should give the same key whatever the URL form."""
+        key = linkedin_key("https://www.linkedin.com/in/jean-dupont")
+
+        assert key != 0
+        assert linkedin_key("http://linkedin.com/in/Jean-Dupont/?trk=abc") == key
+        assert linkedin_key("https://linkedin.com/company/acme") == 0
+        assert linkedin_key(None) == 0
+
+
+class TestLeadSimilarityIndex:
+    """Tests for the append-only index."""
+
+    def test_search_and_persistence(self, tmp_path):
+        """Added leads should be found, also by another index reading the same file."""
+        path = tmp_path / "org.idx"
+        index = LeadSimilarityIndex(path, 128)
+        jean, marie = uuid4(), uuid4()
+        index.add([
+            (jean, *lead_features("Jean", "Dupont", "Acme")),
+            (marie, *lead_features("Marie", "Curie", "Radium", "https://linkedin.com/in/mcurie")),
+        ])
+
+        reader = LeadSimilarityIndex(path, 128)
+        reader.refresh()
+        results = reader.search([
+            lead_features("Jean", "Dupond", "Acme"),
+            lead_features("M.", "Sklodowska", None, "https://linkedin.com/in/mcurie/"),
+            lead_features("Paul", "Bernard", "Initech"),
+        ], min_score=0.85)
+
+        assert results[0][0][0] == jean
+        assert results[1] == [(marie, 1.0)]
+        assert results[2] == []
+
+    def test_incremental_updates_across_instances(self, tmp_path):
+        """Each process should see the leads appended by the others."""
+        path = tmp_path / "org.idx"
+        first = LeadSimilarityIndex(path, 64)
+        second = LeadSimilarityIndex(path, 64)
+        first.add([(uuid4(), *lead_features("Jean", "Dupont", "Acme", dimensions=64))])
+        second.add([(uuid4(), *lead_features("Marie", "Curie", "Radium", dimensions=64))])
+
+        first.refresh()
+
+        assert len(first) == len(second) == 2
+        assert np.array_equal(first._records["id"], second._records["id"])
+
+    def test_index_dir_must_be_absolute(self):
+        """A relative index directory would resolve differently in each process."""
+        with pytest.raises(ValidationError):
+            Settings(LEAD_SIMILARITY_INDEX_DIR="var/lead_similarity")
+
+        assert Settings(LEAD_SIMILARITY_INDEX_DIR="/srv/index").LEAD_SIMILARITY_INDEX_DIR == "/srv/index"
+
+    def test_default_index_dir_is_writable(self, monkeypatch):
+        """Without configuration, the index lives in the backend's var/ directory."""
+        monkeypatch.delenv("LEAD_SIMILARITY_INDEX_DIR", raising=False)
+        index_dir = Path(Settings(_env_file=None).LEAD_SIMILARITY_INDEX_DIR)
+
+        assert index_dir == BACKEND_DIR / "var" / "lead_similarity"
+        assert os.access(BACKEND_DIR, os.W_OK)
+
+
+def _campaign(db_session, organization, user):
+    campaign = Campaign(
+        organization_id=organization.id,
+        created_by=user.id,
+        name="Q1",
+        status=CampaignStatus.ACTIVE,
+        target_criteria={},
+    )
+    db_session.add(campaign)
+    db_session.commit()
+    return campaign
+
+
+class TestLeadSimilarityService:
+    """Tests for near-duplicate detection against the database."""
+
+    def test_find_duplicates_builds_index_from_leads(self, db_session, test_organization, test_user):
+        """Leads of other campaigns should be found, deleted ones ignored."""
+        campaign = _campaign(db_session, test_organization, test_user)
+        kept = Lead(campaign_id=campaign.id, organization_id=test_organization.id, email="jean@acme.io",
+                    first_name="Jean", last_name="Dupont", company_name="Acme", status=LeadStatus.NEW)
+        deleted = Lead(campaign_id=campaign.id, organization_id=test_organization.id, email="marie@globex.io",
+                       first_name="Marie", last_name="Curie", company_name="Globex", status=LeadStatus.NEW)
+        db_session.add_all([kept, deleted])
+        db_session.commit()
+        service = LeadSimilarityService(db_session)
+        service.index_for(test_organization.id)
+        db_session.delete(deleted)
+        db_session.commit()
+
+        duplicates = service.find_duplicates(test_organization.id, [
+            {"email": "j.dupont@gmail.com", "first_name": "Jean", "last_name": "Dupont", "company_name": "ACME SAS"},
+            {"email": "marie@curie.fr", "first_name": "Marie", "last_name": "Curie", "company_name": "Globex"},
+            {"email": "paul@initech.com", "name": "Paul Bernard", "current_employer": "Initech"},
+        ])
+
+        assert list(duplicates) == [0]
+        assert duplicates[0][0] == kept.id
+
+    def test_process_prospects_skips_near_duplicates_before_enrichment(
+        self, db_session, test_organization, test_user
+    ):
+        """A near-duplicate should not be enriched or returned."""
+        campaign = _campaign(db_session, test_organization, test_user)
+        lead = Lead(campaign_id=campaign.id, organization_id=test_organization.id, email="jean@acme.io",
+                    first_name="Jean", last_name="Dupont", company_name="Acme", status=LeadStatus.NEW)
+        db_session.add(lead)
+        db_session.commit()
+        LeadSimilarityService(db_session).add_leads(test_organization.id, [lead.id])
+
+        rocketreach = Mock()
+        rocketreach.enrich_prospect = AsyncMock(return_value={})
+        service = EnrichmentService(db_session, rocketreach)
+        new_campaign = _campaign(db_session, test_organization, test_user)
+
+        processed = asyncio.run(service.process_prospects(
+            prospects=[
+                {"email": "jdupont@gmail.com", "first_name": "Jean", "last_name": "Dupont", "company_name": "Acme"},
+                {"email": "paul@initech.com", "first_name": "Paul", "last_name": "Bernard", "company_name": "Initech"},
+            ],
+            campaign_id=new_campaign.id,
+            organization_id=test_organization.id,
+        ))
+
+        assert [p["email"] for p in processed] == ["paul@initech.com"]
+        assert rocketreach.enrich_prospect.await_count == 1
@@ -2,6 +2,7 @@
 
 import pytest
 
+from app.services.lead_features import lead_features
 from app.services.scoring import BANTScoringService
 
 
@@ -43,3 +44,83 @@ def test_calculate_bant_score_complete():
         result["bant_breakdown"]["need"]["score"] +
         result["bant_breakdown"]["timeline"]["score"]
     )
+
+
+def _parity_cases():
+    """Inputs covering every branch of the per-lead scoring functions."""
+    sizes = [None, "", "abc", "1-9", "10", "11-50", "51-200", "201-500", "500", "1001-5000", "10000+", "٣٠٠"]
+    titles = [
+        None, "", "CEO", "Co-Founder & CTO", "VP Sales", "Head of Growth", "Directeur Général",
+        "Sales Director", "Directrice marketing", "Marketing Manager", "Chef de projet", "Engineer",
+    ]
+    industries = [None, "", "SaaS", "Conseil"]
+    enrichments = [
+        None,
+        {},
+        {"raw_data": {}},
+        {"raw_data": {"current_employer_size": 150}},
+        {"raw_data": {"seniority_level": "senior"}},
+        {"raw_data": {"current_employer_size": 150, "seniority_level": "senior", "updated_at": "2024-01-01"}},
+        {"raw_data": {"updated_at": "2024-01-01", "current_employer_size": ""}},
+    ]
+    cases = []
+    for i, size in enumerate(sizes):
+        for j, title in enumerate(titles):
+            for k, industry in enumerate(industries):
+                enrichment = enrichments[(i + j + k) % len(enrichments)]
+                cases.append((size, title, industry, enrichment))
+    return cases
+
+
+def test_calculate_bant_scores_matches_per_lead_scoring():
+    """The columnar scorer should return exactly the per-lead results."""
+    cases = _parity_cases()
+    
+    results = BANTScoringService.calculate_bant_scores(
+        [size for size, _, _, _ in cases],
+        [title for _, title, _, _ in cases],
+        [industry for _, _, industry, _ in cases],
+        [BANTScoringService.enrichment_signals(enrichment) for _, _, _, enrichment in cases],
+    )
+    
+    expected = [
+        BANTScoringService.calculate_bant_score(
+            company_size=size,
+            job_title=title,
+            enrichment_data=enrichment,
+            industry=industry,
+            linkedin_url="https://linkedin.com/in/lead",
+        )
+        for size, title, industry, enrichment in cases
+    ]
+    assert results == expected
+    assert all(type(result["bant_score"]) is int for result in results)
+    assert all(type(result["qualified"]) is bool for result in results)
+
+
+def test_calculate_bant_scores_from_stored_features():
+    """Scoring from the features stored at ingest should give the same results."""
+    cases = _parity_cases()
+    features = [lead_features(size, title) for size, title, _, _ in cases]
+    columns = (
+        [size for size, _, _, _ in cases],
+        [title for _, title, _, _ in cases],
+        [industry for _, _, industry, _ in cases],
+        [BANTScoringService.enrichment_signals(enrichment) for _, _, _, enrichment in cases],
+    )
+    
+    results = BANTScoringService.calculate_bant_scores(
+        *columns,
+        max_employees=[feature["employees_max"] for feature in features],
+        seniority_tiers=[feature["seniority_tier"] for feature in features],
+    )
+    
+    assert results == BANTScoringService.calculate_bant_scores(*columns)
+
+
+def test_calculate_bant_scores_empty_and_mismatched_columns():
+    """Empty columns give no results; columns of different lengths are rejected."""
+    assert BANTScoringService.calculate_bant_scores([], [], [], []) == []
+    
+    with pytest.raises(ValueError):
+        BANTScoringService.calculate_bant_scores(["51-200"], [], [None], [(False, False, False)])
@@ -0,0 +1,135 @@
+"""Tests for compiled per-campaign scoring plans."""
+
+import pytest
+
+from app.services.lead_features import lead_features
+from app.services.scoring import BANTScoringService
+from app.services.scoring_plan import ScoringPlan, compile_scoring_plan, default_plan
+
+LEADS = [
+    ("1001-5000", "Chief Executive Officer (CEO)", "Acme", {"raw_data": {"current_employer_size": 1, "updated_at": "x"}}),
+    ("51-200", "Head of Growth", None, {"raw_data": {"seniority_level": "vp"}}),
+    ("11-50", "Responsable Achats", "Retail", None),
+    ("2-10", "Sales Engineer", None, {}),
+    (None, None, "Banking", {"raw_data": {"current_employer_size": 1, "seniority_level": "c"}}),
+    ("unknown", "Directrice Marketing", "", None),
+]
+
+CUSTOM_RULES = {
+    "weights": {"authority": 1.4, "timeline": 0.5},
+    "budget": {
+        "tiers": [
+            {"below": 50, "score": 4, "reasoning": "Petite structure"},
+            {"below": None, "score": 20, "reasoning": "Structure établie"},
+        ],
+    },
+    "authority": {
+        "tiers": [
+            {"name": "buyer", "keywords": ["achats", "procurement"], "score": 25, "reasoning": "Acheteur"},
+            {"name": "exec", "keywords": ["ceo", "founder"], "score": 15, "reasoning": "Dirigeant"},
+        ],
+    },
+    "need": {"signals": {"industry": 10}},
+    "nurture_threshold": 30,
+}
+
+
+def _columns(leads):
+    return (
+        [size for size, _, _, _ in leads],
+        [title for _, title, _, _ in leads],
+        [industry for _, _, industry, _ in leads],
+        [BANTScoringService.enrichment_signals(data) for _, _, _, data in leads],
+    )
+
+
+def test_default_plan_matches_scoring_service():
+    """The default plan should score exactly like BANTScoringService."""
+    plan = default_plan()
+
+    for size, title, industry, data in LEADS:
+        assert plan.score(size, title, data, industry) == BANTScoringService.calculate_bant_score(
+            company_size=size, job_title=title, enrichment_data=data, industry=industry
+        )
+
+
+def test_threshold_decides_qualification():
+    """Qualification should follow the plan's threshold instead of a fixed 60."""
+    # VP at 51-200 with an industry scores 56
+    assert default_plan().score("51-200", "VP Sales", None, "Tech")["qualified"] is False
+
+    result = default_plan(50).score("51-200", "VP Sales", None, "Tech")
+    assert result["bant_score"] == 56
+    assert result["qualified"] is True
+    assert result["recommendation"] == "contact"
+
+
+def test_custom_rules_are_applied():
+    """Tiers, keywords, signal points and weights should come from the rules."""
+    plan = ScoringPlan(CUSTOM_RULES, threshold=55)
+
+    result = plan.score("11-30", "Responsable Achats", None, "Retail")
+    breakdown = result["bant_breakdown"]
+    assert breakdown["budget"] == {"score": 4, "reasoning": "Petite structure"}
+    assert breakdown["authority"] == {"score": 35, "reasoning": "Acheteur"}
+    assert breakdown["need"] == {"score": 15, "reasoning": "Signaux moyens: Secteur: Retail"}
+    assert breakdown["timeline"] == {"score": 5, "reasoning": "Activité normale sur LinkedIn"}
+    assert result["bant_score"] == 59
+    assert result["qualified"] is True
+
+    # "Manager" is no longer a keyword: default tier, weighted
+    assert plan.authority("Sales Manager") == (7, "Contributeur individuel")
+    assert plan.score("2-10", "Sales Manager", None, "Retail")["recommendation"] == "nurture"
+
+
+def test_score_columns_match_score_with_custom_rules():
+    """The columnar path should agree with per-lead scoring for any plan."""
+    for plan in (default_plan(), ScoringPlan(CUSTOM_RULES, threshold=45)):
+        sizes, titles, industries, signals = _columns(LEADS)
+        expected = [plan.score(size, title, data, industry) for size, title, industry, data in LEADS]
+
+        assert plan.score_columns(sizes, titles, industries, signals) == expected
+
+        features = [lead_features(size, title) for size, title, _, _ in LEADS]
+        assert plan.score_columns(
+            sizes,
+            titles,
+            industries,
+            signals,
+            max_employees=[feature["employees_max"] for feature in features],
+            seniority_tiers=[feature["seniority_tier"] for feature in features],
+        ) == expected
+
+
+def test_plans_are_compiled_once_per_rule_set():
+    """Equal rules and threshold should share one compiled plan; the version ignores the threshold."""
+    plan = compile_scoring_plan({"nurture_threshold": 30}, 70)
+
+    assert compile_scoring_plan({"nurture_threshold": 30}, 70) is plan
+    assert compile_scoring_plan(None, 70) is not plan
+    assert compile_scoring_plan(None, 60) is default_plan()
+    assert ScoringPlan({"nurture_threshold": 30}, 70).version == plan.version
+    assert ScoringPlan({"nurture_threshold": 30}, 71).version == plan.version
+    assert ScoringPlan({"nurture_threshold": 35}, 70).version != plan.version
+    assert ScoringPlan({"weights": {"budget": 1.0}}).version == default_plan().version
+
+
+@pytest.mark.parametrize("rules, threshold, message", [
+    ({"budjet": {}}, 60, "Unknown scoring rule: budjet"),
+    ({"weights": {"need": -1}}, 60, "weights.need"),
+    ({"budget": {"tiers": [{"below": 10, "score": 5, "reasoning": "x"}]}}, 60, "'below' bound"),
+    ({"budget": {"tiers": [
+        {"below": 50, "score": 5, "reasoning": "x"},
+        {"below": 10, "score": 8, "reasoning": "y"},
+        {"below": None, "score": 9, "reasoning": "z"},
+    ]}}, 60, "must increase"),
+    ({"authority": {"tiers": [{"name": "exec", "keywords": [], "score": 20, "reasoning": "x"}]}}, 60, "keywords"),
+    ({"need": {"default": {"score": 30, "reasoning": "x"}}}, 60, "between 0 and 25"),
+    ({"weights": {"authority": 3}}, 60, "above 100"),
+    ({"timeline": []}, 60, "must be an object"),
+    (None, 120, "threshold"),
+])
+def test_invalid_rules_are_rejected(rules, threshold, message):
+    """Rules that cannot be compiled should raise ValueError naming the problem."""
+    with pytest.raises(ValueError, match=message):
+        ScoringPlan(rules, threshold)
@@ -0,0 +1,77 @@
+"""Tests for the compiled job-title classifier."""
+
+import pytest
+
+from app.services.title_classifier import (
+    TitleClassifier,
+    TitleMatcher,
+    authority_of_seniority,
+    classify_authority,
+    classify_seniority,
+    title_matcher,
+)
+
+TITLES = [
+    "CEO", "Co-Founder & CTO", "Président", "President of the Board", "VP Sales", "Vice President Marketing",
+    "Head of Growth", "Directeur Général", "DIRECTEUR GÉNÉRAL ADJOINT", "Sales Director", "Directeur commercial",
+    "Directrice marketing", "Marketing Manager", "Responsable des ventes", "Chef de projet", "Software Engineer",
+    "Business Developer", "Product Owner", "Actor", "directeur",
+]
+
+
+def keyword_authority(title):
+    """The per-tier keyword scan the classifier replaces."""
+    title_lower = title.lower()
+    if any(term in title_lower for term in ['ceo', 'cto', 'cfo', 'coo', 'founder', 'co-founder', 'president']):
+        return (23, "C-Level / Founder")
+    if any(term in title_lower for term in ['vp', 'vice president', 'head of', 'directeur général']):
+        return (18, "VP / Head of")
+    if any(term in title_lower for term in ['director', 'directeur', 'directrice']):
+        return (13, "Directeur de département")
+    if any(term in title_lower for term in ['manager', 'responsable', 'chef de']):
+        return (8, "Manager d'équipe")
+    return (5, "Contributeur individuel")
+
+
+@pytest.mark.parametrize("title", TITLES)
+def test_classify_authority_matches_keyword_scan(title):
+    """Every title should get the tier of the keyword scan, overlaps included."""
+    assert classify_authority(title) == keyword_authority(title)
+
+
+def test_classify_authority_unknown_title():
+    """Missing titles are unknown, not individual contributors."""
+    assert classify_authority(None) == (5, "Poste inconnu")
+    assert classify_authority("") == (5, "Poste inconnu")
+
+
+def test_classifier_memoizes_lowercased_titles():
+    """Repeated titles, in any case, should be answered from the cache."""
+    classifier = TitleClassifier()
+
+    for title in ["VP Sales", "vp sales", "VP SALES", "Engineer"]:
+        classifier.classify(title)
+
+    info = classifier.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+def test_title_matcher_matches_both_ways():
+    """A target inside the title, or the title inside a target, is a match."""
+    matcher = TitleMatcher(["Head of Sales", "CEO"])
+
+    assert matcher.matches("CEO & Founder")
+    assert matcher.matches("head of")
+    assert not matcher.matches("Engineer")
+    assert not TitleMatcher([]).matches("CEO")
+
+
+def test_title_matcher_is_built_once_per_target_list():
+    """Scoring a campaign's prospects should reuse one compiled matcher."""
+    assert title_matcher(["CEO", "CTO"]) is title_matcher(["CEO", "CTO"])
+
+
+@pytest.mark.parametrize("title", TITLES + [None, ""])
+def test_stored_seniority_gives_same_authority(title):
+    """The seniority tier stored at ingest should map back to the title's authority."""
+    assert authority_of_seniority(classify_seniority(title)) == classify_authority(title)